@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test Circuit Breaker Registry
+Verifies the OPEN -> HALF_OPEN -> CLOSED cycle on the timing wheel and that the
+risk agent closes its breakers once their conditions clear.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'waves_quant_agi'))
+
+from engine_agents.shared_utils.circuit_breaker_registry import CircuitBreakerRegistry, CircuitState
+from engine_agents.shared_utils.timing_wheel import HierarchicalTimingWheel
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _registry(clock: FakeClock) -> CircuitBreakerRegistry:
+    return CircuitBreakerRegistry({}, timing_wheel=HierarchicalTimingWheel(tick_seconds=0.05, clock=clock))
+
+
+def test_trip_recover_and_close():
+    clock = FakeClock()
+    registry = _registry(clock)
+    registry.register("orders", failure_threshold=2, recovery_timeout=10.0)
+    events = []
+    registry.subscribe(lambda event: events.append(event["to_state"]))
+
+    registry.record_failure("orders")
+    assert registry.is_allowed("orders")
+    registry.record_failure("orders")
+    assert registry.is_open("orders") and not registry.is_allowed("orders")
+
+    clock.now = 10.0
+    assert registry.is_allowed("orders")  # lazily advanced into HALF_OPEN, probe admitted
+    assert registry.breakers["orders"].state == CircuitState.HALF_OPEN
+    assert not registry.is_allowed("orders")  # single probe in flight
+
+    registry.record_success("orders")
+    assert registry.breakers["orders"].state == CircuitState.CLOSED
+    assert not registry.any_tripped() and registry.get_status() == {}
+    assert events == ["OPEN", "HALF_OPEN", "CLOSED"]
+
+
+def test_half_open_failure_reopens():
+    clock = FakeClock()
+    registry = _registry(clock)
+    registry.trip("feed", "stale", recovery_timeout=1.0)
+
+    clock.now = 1.0
+    assert registry.is_allowed("feed")
+    registry.record_failure("feed", "still_stale")
+    assert registry.is_open("feed")
+    assert registry.breakers["feed"].last_reason == "still_stale"
+
+
+def _bare_risk_agent(clock: FakeClock):
+    """Risk agent with only the breaker state (no Redis/logging startup)."""
+    from engine_agents.risk_management.enhanced_risk_management_agent import EnhancedRiskManagementAgent
+    agent = EnhancedRiskManagementAgent.__new__(EnhancedRiskManagementAgent)
+    agent.config = {}
+    agent.logger = logging.getLogger("test_risk")
+    agent.circuit_breaker = _registry(clock)
+    agent.stats = {"circuit_breakers_triggered": 0, "risk_limit_violations": 0}
+    asyncio.run(agent._setup_default_circuit_breakers())
+    return agent
+
+
+def test_risk_breakers_close_when_condition_clears():
+    clock = FakeClock()
+    agent = _bare_risk_agent(clock)
+    breakers = agent.circuit_breaker
+
+    breached = agent._check_risk_alerts({"daily_loss": -0.08, "max_position_size": 0.02, "drawdown": 0.0})
+    agent._apply_risk_conditions(breached, agent._handle_risk_limit_violations([]))
+    assert breakers.is_open("max_daily_loss")
+    assert breakers.tripped == {"max_daily_loss"}
+
+    # Condition cleared, but the breaker only closes once it has reached HALF_OPEN
+    clear = agent._check_risk_alerts({"daily_loss": -0.01})
+    agent._apply_risk_conditions(clear, agent._handle_risk_limit_violations([]))
+    assert breakers.is_open("max_daily_loss")
+
+    clock.now = breakers.breakers["max_daily_loss"].recovery_timeout
+    breakers.timing_wheel.advance()
+    assert breakers.breakers["max_daily_loss"].state == CircuitState.HALF_OPEN
+    agent._apply_risk_conditions(clear, agent._handle_risk_limit_violations([]))
+    assert not breakers.any_tripped()
+
+
+def test_risk_breakers_need_every_source_clear():
+    clock = FakeClock()
+    agent = _bare_risk_agent(clock)
+    breakers = agent.circuit_breaker
+
+    violation = agent._handle_risk_limit_violations([{"type": "exposure"}])
+    agent._apply_risk_conditions(agent._check_risk_alerts({}), violation)
+    assert breakers.tripped == {"max_position_size"}
+
+    clock.now = breakers.breakers["max_position_size"].recovery_timeout
+    breakers.timing_wheel.advance()
+
+    # Alerts are clear but limits could not be evaluated: stay HALF_OPEN
+    agent._apply_risk_conditions(agent._check_risk_alerts({}), None)
+    assert breakers.breakers["max_position_size"].state == CircuitState.HALF_OPEN
+
+    agent._apply_risk_conditions(agent._check_risk_alerts({}), agent._handle_risk_limit_violations([]))
+    assert not breakers.any_tripped()
+    assert agent.stats["circuit_breakers_triggered"] == 1
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test Correlation Service
+Verifies that correlations are built once per bar however many consumers
+query them, that contagion paths follow the strongest chain, and that the
+agents hosting the consumers feed the service.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'waves_quant_agi'))
+
+from engine_agents.market_conditions.core import detector_runtime
+from engine_agents.market_conditions.core.detector_runtime import DetectorRuntime
+from engine_agents.shared_utils.correlation_service import IncrementalCorrelationService
+
+
+@pytest.fixture(autouse=True)
+def plain_loggers(monkeypatch):
+    """The shared logger publishes every record to Redis, which stalls without a server."""
+    monkeypatch.setattr(detector_runtime, "get_shared_logger",
+                        lambda agent, component="main": logging.getLogger(f"{agent}.{component}"))
+
+
+def _chained_service(bars=200):
+    """A drives B, B drives C, D is independent."""
+    rng = np.random.default_rng(7)
+    service = IncrementalCorrelationService({"correlation_min_bars": 20, "correlation_ewma_alpha": 0.02})
+    for _ in range(bars):
+        a = rng.normal(0, 0.01)
+        b = 0.9 * a + rng.normal(0, 0.003)
+        c = 0.9 * b + rng.normal(0, 0.003)
+        service.update_bar({"A": a, "B": b, "C": c, "D": rng.normal(0, 0.01)})
+    return service
+
+
+def test_correlations_are_built_once_per_bar():
+    service = _chained_service()
+    builds = service.stats["correlation_builds"]
+    for _ in range(3):
+        pairs = service.pairs_above(0.7)
+        service.contagion_paths("A", 0.7, 3)
+    assert service.stats["correlation_builds"] == builds + 1
+    assert service.stats["edge_builds"] == 1
+    assert {frozenset(pair[:2]) for pair in pairs} >= {frozenset("AB"), frozenset("BC")}
+    assert all("D" not in pair[:2] for pair in pairs)
+
+    service.update_bar({"A": 0.001, "B": 0.001})
+    service.pairs_above(0.7)
+    assert service.stats["correlation_builds"] == builds + 2
+
+
+def test_contagion_follows_strongest_path_within_depth():
+    service = _chained_service()
+    paths = service.contagion_paths("A", 0.7, 3)
+    assert "D" not in paths and paths["B"]["depth"] == 1
+    assert paths["C"]["strength"] >= abs(service.correlation("A", "B")) * abs(service.correlation("B", "C")) - 1e-12
+    assert service.contagion_paths("A", 0.7, 1).keys() <= {"B", "C"}
+    assert service.contagion_paths("UNKNOWN") == {}
+
+
+def test_detector_runtime_attaches_contagion_to_domino_chains():
+    runtime = DetectorRuntime({"contagion_exposure_high": 1.0}, correlation_service=_chained_service())
+    results = runtime.scan([{"symbol": "A", "crisis_score": 0.75}, {"symbol": "D", "crisis_score": 0.75}])
+    chains = {chain["symbol"]: chain for chain in results["domino_chain"]}
+
+    assert [reach["symbol"] for reach in chains["A"]["contagion_paths"]][0] == "B"
+    assert chains["A"]["contagion_exposure"] > 1.0 and chains["A"]["predicted_impact"] == "high"
+    assert chains["D"]["contagion_paths"] == [] and chains["D"]["predicted_impact"] == "moderate"
+
+
+def test_intelligence_agent_feeds_each_snapshot_once():
+    from engine_agents.intelligence.enhanced_intelligence_agent import EnhancedIntelligenceAgent
+    agent = EnhancedIntelligenceAgent.__new__(EnhancedIntelligenceAgent)
+    agent.correlation_service = IncrementalCorrelationService({})
+    agent.correlation_matrix = None
+    agent.intelligence_state = {"last_correlation_timestamp": None}
+
+    async def run():
+        await agent._update_correlations({"timestamp": 1.0, "price_data": {"EURUSD": 1.10, "GBPUSD": {"price": 1.30}}})
+        await agent._update_correlations({"timestamp": 1.0, "price_data": {"EURUSD": 1.20, "GBPUSD": 1.40}})
+        await agent._update_correlations({"timestamp": 2.0, "price_data": {"EURUSD": 1.11, "GBPUSD": "bad"}})
+
+    asyncio.run(run())
+    # The first snapshot only sets reference prices; the repeated one is skipped
+    service = agent.correlation_service
+    assert service.symbols == ["EURUSD", "GBPUSD"] and service.stats["bars"] == 1
+    assert service.count[service.index["EURUSD"]] == 1 and service.count[service.index["GBPUSD"]] == 0
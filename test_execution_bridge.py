@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test Execution Bridge
+Verifies that signal intake errors make the processing loop back off instead of
+spinning on empty batches.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'waves_quant_agi'))
+
+from engine_agents.execution.python_bridge import ExecutionBridge
+
+
+class FailingIntake:
+    def __init__(self):
+        self.calls = 0
+
+    async def next_batch(self):
+        self.calls += 1
+        await asyncio.sleep(0)  # a real read yields; keeps a spinning loop from starving the test
+        raise ConnectionError("redis down")
+
+
+class BridgeLogger:
+    def __init__(self):
+        self.errors = []
+        self.logger = logging.getLogger("test_bridge")
+
+    def log_error(self, message):
+        self.errors.append(message)
+
+    def __getattr__(self, name):
+        return getattr(self.logger, name)
+
+
+def test_intake_errors_back_off():
+    bridge = ExecutionBridge.__new__(ExecutionBridge)
+    bridge.config = {}
+    bridge.logger = BridgeLogger()
+    bridge.signal_intake = FailingIntake()
+    bridge.last_maintenance = float("inf")
+    bridge.is_running = True
+
+    async def run():
+        task = asyncio.create_task(bridge._signal_processing_loop())
+        await asyncio.sleep(0.2)
+        bridge.is_running = False
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(run())
+    # One failed read, then the loop sleeps before retrying
+    assert bridge.signal_intake.calls == 1
+    assert "redis down" in bridge.logger.errors[0]
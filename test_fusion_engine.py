@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test Fusion Engine
+Verifies that record fusion matches the per-record fuser, honors each
+record's own model weights, fuses records with a different number of
+scores, and that band edges fall on the same side as the per-record rules.
+"""
+
+import logging
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'waves_quant_agi'))
+
+from engine_agents.market_conditions.core import fusion_engine
+from engine_agents.market_conditions.core.fusion_engine import SensorFusionEngine
+
+
+@pytest.fixture(autouse=True)
+def plain_loggers(monkeypatch):
+    """The shared logger publishes every record to Redis, which stalls without a server."""
+    monkeypatch.setattr(fusion_engine, "get_shared_logger",
+                        lambda agent, component="main": logging.getLogger(f"{agent}.{component}"))
+
+
+def _reference_score(scores, weights, accuracy, volatility, liquidity):
+    """Per-record fused score, as in ShiftPredictorFuser._calculate_fused_prediction_score."""
+    total = sum(weights)
+    weights = [w / total for w in weights] if total > 0 else [1.0 / len(weights)] * len(weights)
+    base = sum(score * weight for score, weight in zip(scores, weights))
+    vol = -0.2 if volatility > 0.08 else -0.1 if volatility > 0.05 else -0.05 if volatility > 0.02 else 0.0
+    liq = -0.15 if liquidity < 0.3 else -0.1 if liquidity < 0.6 else -0.05 if liquidity < 0.8 else 0.0
+    acc = 0.0
+    if accuracy:
+        avg = sum(accuracy) / len(accuracy)
+        acc = 0.1 if avg > 0.8 else 0.05 if avg > 0.6 else -0.05 if avg > 0.4 else -0.1
+    mean = sum(scores) / len(scores)
+    std = (sum((s - mean) ** 2 for s in scores) / len(scores)) ** 0.5
+    div = -0.1 if std > 0.5 else -0.05 if std > 0.3 else 0.0 if std > 0.1 else 0.05
+    return max(-1.0, min(1.0, base * (1.0 + vol + liq + acc + div)))
+
+
+def _records(rng, rows, lengths, own_weights):
+    records = []
+    for i in range(rows):
+        length = lengths[i % len(lengths)]
+        record = {"symbol": f"SYM{i}", "prediction_scores": rng.uniform(-1, 1, length).tolist(),
+                  "historical_accuracy": rng.uniform(0.3, 0.9, length).tolist(),
+                  "volatility": float(rng.uniform(0, 0.1)), "liquidity_ratio": float(rng.uniform(0.2, 1.0))}
+        if own_weights:
+            record["model_weights"] = rng.uniform(0.1, 1.0, length).tolist()
+        records.append(record)
+    return records
+
+
+def test_records_with_own_weights_and_mixed_lengths_match_the_per_record_fuser():
+    rng = np.random.default_rng(3)
+    engine = SensorFusionEngine({"fusion_models": ["a", "b", "c", "d"]})
+    records = _records(rng, 40, [4, 3, 6], own_weights=True) + _records(rng, 40, [4, 2], own_weights=False)
+    records.append({"symbol": "SHORT", "prediction_scores": [0.5]})
+
+    fused = engine.fuse_records(records)
+    assert len(fused) == 80 and engine.stats["rows_skipped"] == 1
+    engine_weights = engine.weights.tolist()
+    for record, result in zip(records, fused):
+        scores = record["prediction_scores"]
+        weights = record.get("model_weights") or (engine_weights if len(scores) == 4 else [1.0] * len(scores))
+        expected = _reference_score(scores, weights, record["historical_accuracy"],
+                                    record["volatility"], record["liquidity_ratio"])
+        assert result["symbol"] == record["symbol"]
+        assert abs(result["fused_score"] - expected) < 1e-12
+        assert 0.0 <= result["fusion_confidence"] <= 1.0
+        assert abs(sum(result["model_weights"]) - 1.0) < 1e-12
+
+
+def test_own_weights_change_the_fused_score():
+    engine = SensorFusionEngine({})
+    base = {"symbol": "EURUSD", "prediction_scores": [0.9, -0.9], "volatility": 0.0, "liquidity_ratio": 1.0}
+    even, leaning = engine.fuse_records([base, {**base, "model_weights": [3.0, 1.0]}])
+    assert even["model_weights"] == [0.5, 0.5] and abs(even["fused_score"]) < 1e-12
+    assert leaning["model_weights"] == [0.75, 0.25] and leaning["fused_score"] > 0.3
+    # Weights for models without a score drop off after normalizing over all of them
+    extra, = engine.fuse_records([{**base, "model_weights": [1.0, 1.0, 2.0]}])
+    assert extra["model_weights"] == [0.25, 0.25] and abs(extra["fused_score"]) < 1e-12
+
+
+def test_values_on_band_edges_match_the_per_record_rules():
+    engine = SensorFusionEngine({})
+    volatility = np.array([0.02, 0.05, 0.08, 0.0800001])
+    liquidity = np.array([0.3, 0.6, 0.8, 0.2999999])
+    predictions = np.full((4, 2), 0.5)
+    scores, _ = engine.fuse(predictions, volatility, liquidity)
+    expected = [_reference_score([0.5, 0.5], [1.0, 1.0], [], v, l) for v, l in zip(volatility, liquidity)]
+    assert np.allclose(scores, expected, atol=1e-12)
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Test Native Order Gateway
+Verifies that native mode executes orders in-process with final results,
+that Redis mode forwards every order to the Rust execution service, and that
+forwarded orders stay open until reported or expired.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sys
+
+import fakeredis
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'waves_quant_agi'))
+
+from engine_agents.execution.core.native_executor import NativeOrderGateway
+from engine_agents.execution.core.order_state import OrderStateMachine, OrderStatus
+
+
+class FakeRedisConnector:
+    """SharedRedisConnector surface used by the gateway, backed by fakeredis."""
+
+    def __init__(self):
+        self.redis_async = fakeredis.FakeAsyncRedis()
+        self.published = []
+
+    async def ensure_async_connection(self) -> bool:
+        return True
+
+    async def publish_async(self, channel, message) -> bool:
+        self.published.append((channel, message))
+        return True
+
+
+class FakeNativeExecutor:
+    """Stands in for quantum_execution.NativeExecutor: rejects orders above a size limit, fills the rest."""
+
+    def __init__(self, max_order_size: float):
+        self.max_order_size = max_order_size
+        self.batches = []
+
+    def execute_batch(self, orders):
+        self.batches.append(orders)
+        return [("filled", size, price or expected_price, "") if size <= self.max_order_size
+                else ("rejected", 0.0, 0.0, "Order size exceeds limit")
+                for _, _, size, expected_price, price in orders]
+
+
+ORDERS = [
+    {"client_order_id": "c1", "symbol": "EURUSD", "side": "BUY", "quantity": 1.0, "expected_price": 1.1},
+    {"client_order_id": "c2", "symbol": "EURUSD", "side": "SELL", "quantity": 500.0, "expected_price": 1.1},
+    {"client_order_id": "c3", "symbol": "GBPUSD", "side": "SELL", "quantity": 2.0, "expected_price": 1.3},
+]
+
+
+async def _submit_and_capture(gateway: NativeOrderGateway, redis_conn: FakeRedisConnector):
+    pubsub = redis_conn.redis_async.pubsub(ignore_subscribe_messages=True)
+    await pubsub.subscribe(gateway.channel)
+    results = await gateway.submit_batch(ORDERS)
+    forwarded = []
+    # get_message returns None for the swallowed subscribe confirmation too, so poll a few times
+    for _ in range(10):
+        message = await pubsub.get_message(timeout=0.05)
+        if message is not None:
+            forwarded.append(json.loads(message["data"]))
+    await pubsub.aclose()
+    return results, forwarded
+
+
+def test_redis_mode_forwards_every_order():
+    redis_conn = FakeRedisConnector()
+    gateway = NativeOrderGateway({"native_execution": False}, redis_conn)
+    results, forwarded = asyncio.run(_submit_and_capture(gateway, redis_conn))
+
+    assert gateway.mode == "redis"
+    assert [r["success"] for r in results] == [True, True, True]
+    assert all(r["status"] == "submitted" for r in results)
+    assert [f["client_order_id"] for f in forwarded] == ["c1", "c2", "c3"]
+
+
+def test_native_mode_executes_in_process():
+    redis_conn = FakeRedisConnector()
+    gateway = NativeOrderGateway({"native_execution": False}, redis_conn)
+    gateway.native = FakeNativeExecutor(max_order_size=100.0)
+    results, forwarded = asyncio.run(_submit_and_capture(gateway, redis_conn))
+
+    assert gateway.mode == "native"
+    assert [r["status"] for r in results] == ["filled", "rejected", "filled"]
+    assert results[0]["order_id"] == "c1" and results[0]["executed_quantity"] == 1.0
+    assert results[0]["executed_price"] == 1.1
+    assert results[1]["error"] == "Order size exceeds limit"
+    # One native call for the batch and nothing published
+    assert len(gateway.native.batches) == 1 and forwarded == []
+    assert gateway.stats["native_orders"] == 2 and gateway.stats["rejected_orders"] == 1
+
+
+def test_native_mode_reports_execution_failure():
+    class BrokenExecutor:
+        def execute_batch(self, orders):
+            raise RuntimeError("executor poisoned")
+
+    gateway = NativeOrderGateway({"native_execution": False}, FakeRedisConnector())
+    gateway.native = BrokenExecutor()
+    results = asyncio.run(gateway.submit_batch(ORDERS))
+
+    assert not any(r["success"] for r in results)
+    assert gateway.stats["native_orders"] == 0 and gateway.stats["failed_batches"] == 1
+
+
+def _bare_agent():
+    """Execution agent with only the state the order path touches (no Redis/logging startup)."""
+    from engine_agents.execution.enhanced_execution_agent_v2 import EnhancedExecutionAgentV2
+    agent = EnhancedExecutionAgentV2.__new__(EnhancedExecutionAgentV2)
+    agent.agent_name = "test_execution"
+    agent.config = {}
+    agent.logger = logging.getLogger("test_execution")
+    agent.redis_conn = FakeRedisConnector()
+    agent.order_states = OrderStateMachine({})
+    agent.order_gateway = None
+    agent.execution_bridge = None
+    agent.slippage_manager = None
+    agent.execution_optimizer = None
+    agent.execution_sequence = 0
+    agent.execution_state = {"active_executions": {}, "execution_history": [], "last_execution_time": None}
+    agent.execution_stats = {"total_signals_processed": 0, "successful_executions": 0, "failed_executions": 0}
+    return agent
+
+
+def test_submitted_orders_stay_open_until_filled():
+    agent = _bare_agent()
+    agent.order_gateway = NativeOrderGateway({"native_execution": False}, agent.redis_conn)
+
+    async def run():
+        result = await agent.execute_order_request({"symbol": "EURUSD", "side": "BUY", "quantity": 2.0})
+        order_id = result["order_id"]
+        assert agent.order_states.get(order_id).status == OrderStatus.SENT
+        assert order_id in await agent.get_active_executions()
+
+        assert agent.on_execution_report({"client_order_id": order_id, "status": "ack", "broker_order_id": "B1"})
+        assert agent.on_execution_report({"order_id": "B1", "status": "partial", "fill_quantity": 1.0, "fill_price": 1.1})
+        assert agent.order_states.get(order_id).status == OrderStatus.PARTIAL
+        assert agent.on_execution_report({"client_order_id": order_id, "status": "fill",
+                                          "fill_quantity": 1.0, "fill_price": 1.2})
+        order = agent.order_states.get(order_id)
+        assert order.status == OrderStatus.FILLED
+        assert abs(order.avg_fill_price - 1.15) < 1e-12
+        assert await agent.get_active_executions() == {}
+
+    asyncio.run(run())
+
+
+def test_rejected_report_closes_order():
+    agent = _bare_agent()
+    agent.order_gateway = NativeOrderGateway({"native_execution": False}, agent.redis_conn)
+
+    async def run():
+        result = await agent.execute_order_request({"symbol": "EURUSD", "side": "SELL", "quantity": 1.0})
+        assert agent.on_execution_report({"client_order_id": result["order_id"], "status": "rejected",
+                                          "reason": "market closed"})
+        order = agent.order_states.get(result["order_id"])
+        assert order.status == OrderStatus.REJECTED and order.reason == "market closed"
+        assert not agent.on_execution_report({"client_order_id": "unknown", "status": "bogus"})
+
+    asyncio.run(run())
+
+
+def test_native_results_close_orders_through_the_gateway():
+    agent = _bare_agent()
+    agent.order_gateway = NativeOrderGateway({"native_execution": False}, agent.redis_conn)
+    agent.order_gateway.native = FakeNativeExecutor(max_order_size=100.0)
+
+    async def run():
+        filled = await agent.execute_order_request({"symbol": "EURUSD", "side": "BUY", "quantity": 2.0,
+                                                    "expected_price": 1.1})
+        rejected, accepted = await agent.execute_order_batch([
+            {"symbol": "EURUSD", "side": "SELL", "quantity": 500.0, "expected_price": 1.1},
+            {"symbol": "GBPUSD", "side": "SELL", "quantity": 1.0, "expected_price": 1.3, "price": 1.2999},
+        ])
+        return filled, rejected, accepted, await agent.get_active_executions()
+
+    filled, rejected, accepted, active = asyncio.run(run())
+    order = agent.order_states.get(filled["order_id"])
+    assert order.status == OrderStatus.FILLED and order.filled_quantity == 2.0 and order.avg_fill_price == 1.1
+    assert agent.order_states.get(rejected["order_id"]).status == OrderStatus.REJECTED
+    assert agent.order_states.get(accepted["order_id"]).avg_fill_price == 1.2999
+    assert active == {} and agent.order_states.open_ids == {}
+    assert agent.redis_conn.published and all(channel == "execution:results"
+                                              for channel, _ in agent.redis_conn.published)
+
+
+def test_unreported_orders_expire():
+    agent = _bare_agent()
+    agent.config = {"order_report_timeout_seconds": 0.0}
+    agent.order_gateway = NativeOrderGateway({"native_execution": False}, agent.redis_conn)
+
+    async def run():
+        forwarded = await agent.execute_order_request({"symbol": "EURUSD", "side": "BUY", "quantity": 1.0})
+        acked = await agent.execute_order_request({"symbol": "EURUSD", "side": "BUY", "quantity": 1.0})
+        agent.on_execution_report({"client_order_id": acked["order_id"], "status": "ack"})
+        await agent._monitor_execution_health()
+        return forwarded["order_id"], acked["order_id"]
+
+    forwarded_id, acked_id = asyncio.run(run())
+    order = agent.order_states.get(forwarded_id)
+    assert order.status == OrderStatus.CANCELLED and order.reason == "expired: no execution report"
+    # Acknowledged orders may be resting at the broker and are left alone
+    assert agent.order_states.get(acked_id).status == OrderStatus.ACK
+    assert agent.order_states.stats["expired"] == 1
+
+
+def test_fill_reports_record_slippage():
+    from engine_agents.execution.core.slippage_manager import SlippageManager
+    agent = _bare_agent()
+    agent.order_gateway = NativeOrderGateway({"native_execution": False}, agent.redis_conn)
+    agent.slippage_manager = SlippageManager({})
+
+    async def run():
+        result = await agent.execute_order_request({"symbol": "SLIPTEST", "side": "SELL", "quantity": 1.0,
+                                                    "expected_price": 2.0})
+        assert agent.on_execution_report({"client_order_id": result["order_id"], "status": "fill",
+                                          "fill_quantity": 1.0, "fill_price": 1.99, "broker": "b1"})
+
+    asyncio.run(run())
+    record = agent.slippage_manager.get_recent_slippage("SLIPTEST")[-1]
+    assert record["expected_price"] == 2.0 and record["actual_price"] == 1.99
+    # Selling below the expected price is a cost
+    expected = agent.slippage_manager.analytics.expected_slippage("SLIPTEST", "b1", "market", quantile="p50",
+                                                                  min_samples=1)
+    assert expected is not None and abs(expected - 0.005) < 1e-4
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test Order Normalizer
+Verifies symbol resolution, tick/lot rounding, per-broker layouts, order
+validation, table rebuilds after symbol metadata changes and the refresh
+schedule.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'waves_quant_agi'))
+
+from engine_agents.adapters.normalizer import CompiledNormalizer, SymbolMetadataCache
+
+SPECS = {
+    "EURUSDm": {"name": "EURUSDm", "currency_base": "EUR", "currency_profit": "USD", "digits": 5,
+                "trade_tick_size": 0.00001, "volume_step": 0.01, "volume_min": 0.01, "volume_max": 50.0},
+    "EURUSD": {"name": "EURUSD", "currency_base": "EUR", "currency_profit": "USD", "digits": 5},
+    "XAUUSDm": {"name": "XAUUSDm", "currency_base": "XAU", "currency_profit": "USD", "digits": 2,
+                "trade_tick_size": 0.05, "volume_step": 0.1, "volume_min": 0.1, "volume_max": 10.0},
+    "USDJPYm": {"name": "USDJPYm", "currency_base": "USD", "currency_profit": "JPY", "digits": 3,
+                "visible": False},
+}
+
+
+def _cache(specs=SPECS):
+    cache = SymbolMetadataCache("exness_mt5", lambda symbols: [specs[name] for name in (symbols or specs)])
+    cache.load()
+    return cache
+
+
+def test_pairs_resolve_to_the_suffixed_symbol():
+    cache = _cache()
+    assert cache.resolve("eur", "usd") == "EURUSDm"
+    assert cache.resolve("XAUUSD") == "XAUUSDm"
+    assert "USDJPYm" not in cache.symbols(weekday=0)
+
+
+def test_mt5_orders_round_to_tick_and_lot_step():
+    normalizer = CompiledNormalizer(_cache(), "mt5")
+    order = normalizer.normalize({"base": "XAU", "quote": "USD", "side": "BUY", "type": "market",
+                                  "amount": 1.27, "price": 2010.37, "stop_loss": 2000.01})
+    assert order == {"symbol": "XAUUSDm", "order_type": "buy", "volume": 1.2, "price": 2010.35,
+                     "sl": 2000.0, "tp": None, "comment": "Engine order", "type": "market"}
+    # An explicit broker symbol bypasses the pair lookup
+    assert normalizer.normalize({"symbol": "EURUSD", "side": "sell", "amount": 0.015})["volume"] == 0.01
+
+
+def test_broker_layouts():
+    cache = _cache()
+    order = {"base": "EUR", "quote": "USD", "side": "buy", "type": "limit", "amount": 0.5, "price": 1.0812345}
+    assert CompiledNormalizer(cache, "binance").normalize(order) == {
+        "symbol": "EURUSDm", "side": "BUY", "type": "LIMIT", "quantity": 0.5, "price": 1.08123}
+    assert CompiledNormalizer(cache, "exness").normalize(order) == {
+        "instrument": "EURUSDm", "type": "limit", "side": "buy", "volume": 0.5, "price": 1.08123}
+
+
+@pytest.mark.parametrize("order, message", [
+    ({"symbol": "GBPUSD", "side": "buy", "amount": 1.0}, "Unknown symbol"),
+    ({"symbol": "USDJPYm", "side": "buy", "amount": 1.0}, "not tradable"),
+    ({"symbol": "EURUSDm", "side": "hold", "amount": 1.0}, "Invalid side"),
+    ({"symbol": "EURUSDm", "side": "buy", "amount": 75.0}, "outside"),
+    ({"symbol": "EURUSDm", "side": "buy", "type": "limit", "amount": 1.0}, "without price"),
+    ({"symbol": "EURUSDm", "side": "buy"}, "Malformed"),
+])
+def test_invalid_orders_are_rejected(order, message):
+    normalizer = CompiledNormalizer(_cache())
+    with pytest.raises(ValueError, match=message):
+        normalizer.normalize(order)
+    assert normalizer.rejected == 1 and normalizer.normalized == 0
+
+
+def test_tables_rebuild_when_metadata_changes():
+    specs = {name: dict(spec) for name, spec in SPECS.items()}
+    cache = _cache(specs)
+    normalizer = CompiledNormalizer(cache)
+    order = {"symbol": "EURUSDm", "side": "buy", "amount": 1.27}
+    assert normalizer.normalize(order)["volume"] == 1.27
+
+    # Unchanged specs do not bump the version; a changed lot step does
+    assert cache.refresh(["EURUSD"]) == 0
+    specs["EURUSDm"]["volume_step"] = 0.1
+    assert cache.refresh(["EURUSDm"]) == 1
+    assert normalizer.normalize(order)["volume"] == 1.2
+    assert normalizer.version == cache.version
+
+
+def test_scheduled_refresh_runs_once_per_interval():
+    requested = []
+
+    def loader(symbols):
+        requested.append(symbols)
+        return [SPECS[name] for name in (symbols or SPECS)]
+
+    cache = SymbolMetadataCache("exness_mt5", loader, {"symbol_refresh_interval": 60, "symbol_refresh_ttl": 0})
+    cache.refresh_if_due(now=0.0)
+    cache.refresh_if_due(now=30.0)
+    assert requested == [None] and cache.stats["full_loads"] == 1
+
+    # Once due, only stale specs are re-fetched
+    cache.refresh_if_due(now=61.0)
+    assert sorted(requested[1]) == sorted(SPECS) and cache.stats["refreshes"] == 1
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test Order Routing Retry
+Verifies that the adapters agent resends an order only when it reached no
+venue, always under the same client order id, never resends rejects or
+timeouts, and routes a duplicate client order id once.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+from collections import OrderedDict
+
+import pytest
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'waves_quant_agi'))
+
+from engine_agents.adapters.core import broker_router, smart_order_router
+from engine_agents.adapters.core.broker_router import BrokerRouter
+from engine_agents.adapters.retry_engine import retry_handler
+from engine_agents.adapters.retry_engine.retry_handler import RetryHandler
+
+
+@pytest.fixture(autouse=True)
+def plain_loggers(monkeypatch):
+    """The shared logger publishes every record to Redis, which stalls without a server."""
+    for module in (broker_router, smart_order_router, retry_handler):
+        monkeypatch.setattr(module, "get_shared_logger",
+                            lambda agent, component="main": logging.getLogger(f"{agent}.{component}"))
+
+
+class ScriptedVenue:
+    """Venue that answers each send with the next scripted outcome and records client order ids."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.received = []
+
+    async def execute_order(self, order):
+        self.received.append(order["client_order_id"])
+        outcome = self.outcomes.pop(0) if len(self.outcomes) > 1 else self.outcomes[0]
+        if isinstance(outcome, Exception):
+            raise outcome
+        if outcome == "slow":
+            await asyncio.sleep(1.0)
+        return {"status": outcome, "price": 1.1}
+
+
+def _bare_agent(venue):
+    """Adapters agent with only the state the routing path touches (no Redis/logging startup)."""
+    from engine_agents.adapters.enhanced_adapters_agent_v2 import EnhancedAdaptersAgentV2
+    agent = EnhancedAdaptersAgentV2.__new__(EnhancedAdaptersAgentV2)
+    agent.config = {}
+    agent.logger = logging.getLogger("test_adapters")
+    agent.stats = {"duplicate_orders": 0}
+    agent.routed_orders = OrderedDict()
+    agent.order_sequence = 0
+    agent.retry_handler = RetryHandler(config={"retry_policies": {
+        "order": {"max_attempts": 3, "base_delay": 0.001, "max_delay": 0.002, "attempt_timeout": 0.5,
+                  "retry_on_timeout": False}}})
+
+    agent.broker_router = BrokerRouter({"router_order_timeout_seconds": 0.05})
+    agent.broker_router.register_broker_adapter("exness_mt5", venue, {})
+
+    async def is_available(broker):
+        return True
+
+    agent.broker_router._is_broker_available = is_available
+    return agent
+
+
+ORDER = {"symbol": "EURUSD", "quantity": 1.0, "price": 1.1, "strategy_type": "statistical"}
+
+
+def test_unreachable_venue_is_retried_under_the_same_id():
+    venue = ScriptedVenue(ConnectionRefusedError("refused"), ConnectionRefusedError("refused"), "filled")
+    agent = _bare_agent(venue)
+    result = asyncio.run(agent._route_with_retry(dict(ORDER), "statistical"))
+
+    assert result["success"] and result["response"]["status"] == "filled"
+    assert len(venue.received) == 3 and len(set(venue.received)) == 1
+    assert agent.retry_handler.stats["retries"] == 2
+
+
+@pytest.mark.parametrize("outcome", ["rejected", "slow", RuntimeError("venue error")])
+def test_rejects_and_unknown_outcomes_are_not_resent(outcome):
+    venue = ScriptedVenue(outcome)
+    agent = _bare_agent(venue)
+    result = asyncio.run(agent._route_with_retry({**ORDER, "client_order_id": "c1"}, "statistical"))
+
+    assert not result["success"]
+    assert venue.received == ["c1"]
+    assert agent.retry_handler.stats["retries"] == 0
+
+
+def test_duplicate_client_order_id_is_routed_once():
+    venue = ScriptedVenue("filled")
+    agent = _bare_agent(venue)
+
+    async def run():
+        order = {**ORDER, "client_order_id": "c1"}
+        concurrent = await asyncio.gather(agent._route_with_retry(order, "statistical"),
+                                          agent._route_with_retry(order, "statistical"))
+        later = await agent._route_with_retry(order, "statistical")
+        return concurrent, later
+
+    (first, second), later = asyncio.run(run())
+    assert first["success"] and second is first and later is first
+    assert venue.received == ["c1"] and agent.stats["duplicate_orders"] == 2
+
+
+def test_order_timeout_is_not_retried_by_the_handler():
+    handler = RetryHandler(config={"retry_policies": {
+        "order": {"max_attempts": 3, "base_delay": 0.001, "attempt_timeout": 0.02, "retry_on_timeout": False}}})
+    calls = []
+
+    async def slow_send():
+        calls.append(1)
+        await asyncio.sleep(1.0)
+
+    assert asyncio.run(handler.execute_with_retry(slow_send, operation="order")) is None
+    assert calls == [1] and handler.stats["unknown_outcomes"] == 1
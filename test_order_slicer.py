@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Test Order Slicer
+Verifies that finished parent orders are evicted past the retention cap without
+losing their slippage, that the execution agent works large orders as
+parents whose children go back through its own order path, and that only
+confirmed child fills count, with late fills reconciled into the parent.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+
+import fakeredis
+import pytest
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'waves_quant_agi'))
+
+from engine_agents.execution.core.order_slicer import (
+    AgentOrderBroker, OrderSlicingEngine, SimulatedBroker
+)
+from engine_agents.execution.core import execution_optimizer, order_slicer, order_state
+from engine_agents.execution.core.order_state import OrderStateMachine, OrderStatus
+
+FAST_SLICING = {"slice_interval_seconds": 0.02, "slice_wheel_tick_seconds": 0.005}
+
+
+@pytest.fixture(autouse=True)
+def plain_loggers(monkeypatch):
+    """The shared logger publishes every record to Redis, which stalls without a server."""
+    for module in (execution_optimizer, order_slicer, order_state):
+        monkeypatch.setattr(module, "get_shared_logger",
+                            lambda agent, component="main": logging.getLogger(f"{agent}.{component}"))
+
+
+class FakeRedisConnector:
+    """SharedRedisConnector surface used by the agent and the slicer broker, backed by fakeredis."""
+
+    def __init__(self):
+        self.redis_client = fakeredis.FakeRedis(decode_responses=True)
+        self.redis_async = fakeredis.FakeAsyncRedis()
+
+    def hgetall(self, name):
+        return self.redis_client.hgetall(name)
+
+    async def ensure_async_connection(self) -> bool:
+        return True
+
+    async def publish_async(self, channel, message) -> bool:
+        return True
+
+
+class FillingBridge:
+    """Execution bridge that fills every order at a fixed price."""
+
+    def __init__(self, price: float):
+        self.price = price
+        self.orders = []
+
+    async def execute_order(self, order_data, strategy_type):
+        self.orders.append((order_data, strategy_type))
+        await asyncio.sleep(0)
+        return {"success": True, "order_id": f"B{len(self.orders)}",
+                "executed_quantity": order_data["quantity"], "executed_price": self.price}
+
+
+def test_finished_parents_are_evicted_past_retention():
+    broker = SimulatedBroker(seed=3)
+    broker.add_market("EURUSD", mid=1.1, spread=0.0001, volume_rate=5000.0, volatility=0.0001)
+
+    async def run():
+        engine = OrderSlicingEngine({**FAST_SLICING, "slice_retain_finished_parents": 2}, broker)
+        engine.start()
+        parent_ids = [engine.submit({"symbol": "EURUSD", "side": "buy", "quantity": 100.0,
+                                     "algorithm": "twap", "duration_seconds": 0.1})
+                      for _ in range(5)]
+        await engine.wait_all()
+        cancelled_id = engine.submit({"symbol": "EURUSD", "side": "sell", "quantity": 100.0,
+                                      "duration_seconds": 60.0})
+        assert engine.cancel(cancelled_id)
+        await engine.stop()
+        return engine, parent_ids, cancelled_id
+
+    engine, parent_ids, cancelled_id = asyncio.run(run())
+    assert len(engine.parents) == 2
+    assert engine.get_parent_report(cancelled_id)["status"] == "cancelled"
+    assert all(engine.get_parent_report(order_id) is None for order_id in parent_ids[:4])
+    # Evicted parents still count in the per-algorithm slippage summary
+    assert engine.get_slippage_summary()["twap"]["orders"] == 5
+
+
+def _bare_agent(redis_conn):
+    """Execution agent with only the state the order path touches (no Redis/logging startup)."""
+    from engine_agents.execution.enhanced_execution_agent_v2 import EnhancedExecutionAgentV2
+    agent = EnhancedExecutionAgentV2.__new__(EnhancedExecutionAgentV2)
+    agent.agent_name = "test_execution"
+    agent.config = dict(FAST_SLICING)
+    agent.logger = logging.getLogger("test_execution")
+    agent.redis_conn = redis_conn
+    agent.order_states = OrderStateMachine({})
+    agent.order_gateway = None
+    agent.execution_bridge = None
+    agent.slippage_manager = None
+    agent.execution_optimizer = None
+    agent.execution_sequence = 0
+    agent.execution_state = {"active_executions": {}, "execution_history": [], "last_execution_time": None}
+    agent.execution_stats = {"total_signals_processed": 0, "successful_executions": 0, "failed_executions": 0}
+    return agent
+
+
+def test_agent_works_large_orders_as_parents():
+    redis_conn = FakeRedisConnector()
+    redis_conn.redis_client.hset("market_data:EURUSD", mapping={"bid": 1.0999, "ask": 1.1001, "volume": 0})
+    agent = _bare_agent(redis_conn)
+    agent.execution_bridge = FillingBridge(price=1.1002)
+
+    async def run():
+        await agent._initialize_execution_optimization()
+        engine = agent.execution_optimizer.slicing_engine
+        assert engine is not None
+
+        result = await agent.execute_order_request({"symbol": "EURUSD", "side": "BUY", "quantity": 30.0,
+                                                    "algorithm": "twap", "duration_seconds": 0.1})
+        assert result["status"] == "working"
+        await engine.wait_all()
+        await agent.execution_optimizer.cleanup()
+        return engine.get_parent_report(result["parent_order_id"])
+
+    report = asyncio.run(run())
+    children = agent.execution_bridge.orders
+    assert report["status"] == "filled" and abs(report["filled_quantity"] - 30.0) < 1e-9
+    assert report["arrival_price"] == 1.1 and report["slippage_bps"] > 0
+    # Children went through the normal path once each and were never re-sliced
+    assert children and all(strategy == "order_slicing" for _, strategy in children)
+    assert abs(sum(order["quantity"] for order, _ in children) - 30.0) < 1e-9
+    assert all(order.status == OrderStatus.FILLED for order in agent.order_states.orders.values())
+
+
+def test_broker_waits_for_forwarded_child_fills():
+    redis_conn = FakeRedisConnector()
+    redis_conn.redis_client.hset("market_data:EURUSD", mapping={"price": 1.2})
+    order_states = OrderStateMachine({})
+
+    async def submit(order):
+        order_states.create("child_1", order["symbol"], order["side"], order["quantity"],
+                            order["expected_price"], "order_slicing")
+        order_states.mark_sent("child_1")
+        asyncio.get_running_loop().call_later(0.02, order_states.fill, "child_1", 4.0, 1.21)
+        return {"success": True, "status": "submitted", "order_id": "child_1"}
+
+    broker = AgentOrderBroker({"slice_child_fill_poll_seconds": 0.005}, redis_conn, submit, order_states)
+    fill = asyncio.run(broker.submit_child_order({"symbol": "EURUSD", "side": "buy", "quantity": 4.0,
+                                                 "limit_price": None}))
+    assert fill == {"status": "filled", "order_id": "child_1", "quantity": 4.0, "price": 1.21}
+
+
+def test_unconfirmed_children_do_not_count_as_fills():
+    redis_conn = FakeRedisConnector()
+    redis_conn.redis_client.hset("market_data:EURUSD", mapping={"price": 1.2})
+    order_states = OrderStateMachine({})
+
+    async def submit(order):
+        client_id = f"child_{len(order_states.orders) + 1}"
+        order_states.create(client_id, order["symbol"], order["side"], order["quantity"], order["expected_price"])
+        order_states.mark_sent(client_id)
+        if client_id == "child_1":
+            order_states.fill(client_id, 1.0, 1.21)
+        return {"success": True, "status": "submitted", "order_id": client_id}
+
+    async def no_report(order):
+        return {"success": True, "status": "submitted", "order_id": "untracked"}
+
+    config = {"slice_child_fill_timeout_seconds": 0.01, "slice_child_fill_poll_seconds": 0.005}
+    broker = AgentOrderBroker(config, redis_conn, submit, order_states)
+    child = {"parent_id": "p1", "symbol": "EURUSD", "side": "buy", "quantity": 4.0, "limit_price": None}
+    partly_filled = asyncio.run(broker.submit_child_order(child))
+    untracked = asyncio.run(AgentOrderBroker(config, redis_conn, no_report).submit_child_order(child))
+
+    assert partly_filled["status"] == "working" and partly_filled["quantity"] == 1.0
+    assert partly_filled["pending_quantity"] == 3.0 and "child_1" in broker.watching
+    assert untracked["status"] == "unfilled" and untracked["quantity"] == 0.0
+
+
+def test_late_child_fills_are_reconciled_into_the_parent():
+    redis_conn = FakeRedisConnector()
+    redis_conn.redis_client.hset("market_data:EURUSD", mapping={"price": 1.2})
+    order_states = OrderStateMachine({})
+    fill_on_submit = []
+
+    async def submit(order):
+        client_id = f"child_{len(order_states.orders) + 1}"
+        order_states.create(client_id, order["symbol"], order["side"], order["quantity"], order["expected_price"])
+        order_states.mark_sent(client_id)
+        if fill_on_submit:
+            order_states.fill(client_id, order["quantity"], 1.22)
+        return {"success": True, "status": "submitted", "order_id": client_id}
+
+    broker = AgentOrderBroker({"slice_child_fill_timeout_seconds": 0.01, "slice_child_fill_poll_seconds": 0.005},
+                              redis_conn, submit, order_states)
+
+    async def run():
+        engine = OrderSlicingEngine(FAST_SLICING, broker)
+        engine.start()
+        parent_id = engine.submit({"symbol": "EURUSD", "side": "buy", "quantity": 10.0,
+                                   "algorithm": "twap", "duration_seconds": 0.1})
+        await asyncio.sleep(0.3)
+        parent = engine.parents[parent_id]
+        # Nothing confirmed yet: the whole parent is pending at the venue and nothing was resent
+        assert parent_id in engine.active and parent.filled_quantity == 0.0
+        assert abs(parent.pending_quantity - 10.0) < 1e-9
+        assert abs(sum(order.quantity for order in order_states.orders.values()) - 10.0) < 1e-9
+
+        first, *rest = list(order_states.orders.values())
+        fill_on_submit.append(True)
+        order_states.cancel(first.client_id, "expired")
+        for order in rest:
+            order_states.fill(order.client_id, order.quantity, 1.21)
+        await engine.wait_all()
+        await engine.stop()
+        return engine, engine.get_parent_report(parent_id), first.quantity, len(rest)
+
+    engine, report, resent, late = asyncio.run(run())
+    assert report["status"] == "filled" and abs(report["filled_quantity"] - 10.0) < 1e-9
+    assert report["pending_quantity"] == 0.0 and not broker.watching
+    # Only the cancelled child's quantity went out again
+    assert abs(sum(order.quantity for order in order_states.orders.values()) - (10.0 + resent)) < 1e-9
+    expected_price = (1.21 * (10.0 - resent) + 1.22 * resent) / 10.0
+    assert abs(report["average_price"] - expected_price) < 1e-12
+    assert engine.stats["late_fills"] == late
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test Order State
+Verifies lifecycle transitions, fill averaging, broker-id lookups, terminal
+eviction and crash recovery from the write-behind journal.
+"""
+
+import asyncio
+import os
+import sys
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'waves_quant_agi'))
+
+from engine_agents.execution.core.order_state import (
+    OrderStateMachine, OrderStatus, WriteBehindJournal
+)
+
+
+def test_fills_accumulate_and_complete_the_order():
+    states = OrderStateMachine({})
+    events = []
+    states.subscribe(lambda order, previous: events.append((previous, order.status)))
+
+    states.create("c1", "EURUSD", "buy", 3.0, 1.1)
+    assert states.mark_sent("c1")
+    assert states.acknowledge("c1", "B1")
+    assert states.fill("B1", 1.0, 1.10)
+    assert states.get("c1").status == OrderStatus.PARTIAL
+    assert states.fill("c1", 2.0, 1.13)
+
+    order = states.get_by_broker("B1")
+    assert order.status == OrderStatus.FILLED and not order.is_open
+    assert order.filled_quantity == 3.0
+    assert abs(order.avg_fill_price - 1.12) < 1e-12
+    assert states.open_orders() == []
+    assert events[0] == (None, OrderStatus.NEW) and events[-1] == (OrderStatus.PARTIAL, OrderStatus.FILLED)
+
+
+def test_invalid_and_unknown_events_are_ignored():
+    states = OrderStateMachine({})
+    states.create("c1", "EURUSD", "sell", 1.0)
+    assert not states.acknowledge("c1")  # NEW cannot skip SENT
+    states.mark_sent("c1")
+    assert states.fill("c1", 1.0, 1.2)
+    # A late cancel after the fill must not reopen or relabel the order
+    assert not states.cancel("c1", "late")
+    assert states.get("c1").status == OrderStatus.FILLED
+    assert not states.fill("missing", 1.0, 1.0)
+    assert states.stats["invalid_transitions"] == 2 and states.stats["unknown_orders"] == 1
+    # Re-creating an existing client id returns the same order
+    assert states.create("c1", "EURUSD", "sell", 5.0).quantity == 1.0
+
+
+def test_terminal_orders_are_evicted_past_retention():
+    states = OrderStateMachine({"order_state_retain_terminal": 2})
+    for i in range(4):
+        states.create(f"c{i}", "EURUSD", "buy", 1.0)
+        states.mark_sent(f"c{i}")
+        states.acknowledge(f"c{i}", f"B{i}")
+        states.reject(f"c{i}", "no liquidity")
+    states.create("open", "EURUSD", "buy", 1.0)
+
+    assert states.get("c0") is None and states.get_by_broker("B0") is None
+    assert states.get("c3").reason == "no liquidity"
+    assert set(states.orders) == {"c2", "c3", "open"}
+    assert [order.client_id for order in states.open_orders()] == ["open"]
+
+
+def test_recovery_replays_and_compacts_the_journal(tmp_path):
+    config = {"order_journal_backend": "file", "order_journal_path": str(tmp_path / "journal.jsonl"),
+              "order_journal_compact_after": 5}
+
+    async def run():
+        journal = WriteBehindJournal(config)
+        states = OrderStateMachine(config, journal)
+        states.create("c1", "EURUSD", "buy", 2.0, 1.1)
+        states.mark_sent("c1")
+        states.fill("c1", 1.0, 1.1, "B1")
+        states.create("c2", "GBPUSD", "sell", 1.0)
+        states.mark_sent("c2")
+        states.cancel("c2", "user")
+        await journal.stop()
+
+        recovered_journal = WriteBehindJournal(config)
+        recovered = OrderStateMachine(config, recovered_journal)
+        open_count = await recovered.recover()
+        compacted = await recovered_journal.replay()
+        return recovered, open_count, compacted
+
+    recovered, open_count, compacted = asyncio.run(run())
+    order = recovered.get_by_broker("B1")
+    assert open_count == 1 and order.client_id == "c1"
+    assert order.status == OrderStatus.PARTIAL and order.filled_quantity == 1.0
+    assert recovered.get("c2").status == OrderStatus.CANCELLED
+    # Six records exceeded compact_after, so the log is now one snapshot per order
+    assert [record["e"] for record in compacted] == ["snapshot", "snapshot"]
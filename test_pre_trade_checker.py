@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test Pre-Trade Checker
+Verifies the compiled limit checks, limit refreshes, reference prices and
+position headroom.
+"""
+
+import asyncio
+import importlib.util
+import os
+import sys
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'waves_quant_agi'))
+
+# Loaded by path: the strategy_engine package __init__ pulls in its full agent stack
+_spec = importlib.util.spec_from_file_location("pre_trade_checker", os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "waves_quant_agi", "engine_agents", "strategy_engine", "risk_management", "pre_trade", "pre_trade_checker.py"))
+_module = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_module)
+PreTradeChecker, PreTradeVerdict = _module.PreTradeChecker, _module.PreTradeVerdict
+
+CONFIG = {
+    "pre_trade_default_limits": {"max_order_size": 5.0, "price_band_pct": 0.01, "max_position": 8.0,
+                                 "max_notional": 1000.0},
+    "pre_trade_limits": {"EURUSD": {"max_order_size": 3.0}}
+}
+
+
+def test_verdicts():
+    checker = PreTradeChecker(CONFIG)
+    checker.update_reference_price("EURUSD", 100.0)
+
+    assert checker.check("EURUSD", True, 2.0, 100.0) == PreTradeVerdict.ACCEPT
+    assert checker.check("EURUSD", True, 0.0, 100.0) == PreTradeVerdict.INVALID_ORDER
+    assert checker.check("EURUSD", True, 4.0, 100.0) == PreTradeVerdict.MAX_ORDER_SIZE
+    assert checker.check("EURUSD", True, 1.0, 102.0) == PreTradeVerdict.PRICE_BAND
+    assert checker.check("GBPUSD", True, 5.0, 300.0) == PreTradeVerdict.NOTIONAL_CAP
+
+    counters = checker.get_counters()
+    assert counters["checks"] == 5 and counters["total_rejects"] == 4
+    assert counters["rejects"]["PRICE_BAND"] == 1
+
+
+def test_price_band_needs_reference_price():
+    checker = PreTradeChecker(CONFIG)
+    assert checker.check("USDJPY", True, 1.0, 150.0) == PreTradeVerdict.ACCEPT
+    checker.update_reference_price("USDJPY", 100.0)
+    assert checker.check("USDJPY", True, 1.0, 150.0) == PreTradeVerdict.PRICE_BAND
+
+    strict = PreTradeChecker({**CONFIG, "pre_trade_allow_unknown_symbols": False})
+    strict.update_reference_price("USDJPY", 100.0)
+    assert strict.check("USDJPY", True, 1.0, 100.0) == PreTradeVerdict.UNKNOWN_SYMBOL
+
+
+def test_position_headroom_follows_fills():
+    checker = PreTradeChecker(CONFIG)
+    checker.on_fill("EURUSD", 3.0)
+    checker.on_fill("EURUSD", 3.0)
+    assert checker.check("EURUSD", True, 3.0, 100.0) == PreTradeVerdict.POSITION_LIMIT
+    assert checker.check("EURUSD", False, 3.0, 100.0) == PreTradeVerdict.ACCEPT
+    checker.on_fill("EURUSD", -3.0)
+    assert checker.check("EURUSD", True, 3.0, 100.0) == PreTradeVerdict.ACCEPT
+
+
+def test_refresh_keeps_symbol_limits_and_position():
+    checker = PreTradeChecker(CONFIG)
+    checker.on_fill("EURUSD", 2.0)
+
+    async def run():
+        async def loader():
+            return {"EURUSD": {"reference_price": 100.0}}
+        task = asyncio.create_task(checker.run_refresh_loop(loader, interval=0.01))
+        await asyncio.sleep(0.05)
+        task.cancel()
+
+    asyncio.run(run())
+    limits = checker.limits["EURUSD"]
+    assert limits.reference_price == 100.0
+    assert limits.max_order_size == 3.0 and limits.position == 2.0
+    assert checker.last_refresh > 0
+
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test Rate Limiter
+Verifies that Redis-backed quotas are shared across processes with the
+configured burst, and that the in-process fallback used while Redis is
+unreachable enforces the same burst.
+"""
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'waves_quant_agi'))
+
+# Loaded by path: the strategy_engine package __init__ pulls in its full agent stack
+_spec = importlib.util.spec_from_file_location("sliding_window", os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "waves_quant_agi", "engine_agents", "strategy_engine", "risk_management", "rate_limiting", "sliding_window.py"))
+_module = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_module)
+MultiScopeRateLimiter, RedisRateLimiter = _module.MultiScopeRateLimiter, _module.RedisRateLimiter
+
+fakeredis = pytest.importorskip("fakeredis")
+
+# One order per second on average, at most three back to back
+SHARED_LIMITS = {"symbol_rate_limit": {"limit": 60, "window_seconds": 60, "burst": 3}}
+
+
+def test_processes_share_one_quota_through_redis():
+    pytest.importorskip("lupa")  # fakeredis runs Lua scripts through lupa
+    server = fakeredis.FakeServer()
+    first = RedisRateLimiter(fakeredis.FakeStrictRedis(server=server), SHARED_LIMITS)
+    second = RedisRateLimiter(fakeredis.FakeStrictRedis(server=server), SHARED_LIMITS)
+
+    admitted = [limiter.try_acquire(symbol="EURUSD")["admitted"] for limiter in (first, second, first)]
+    assert admitted == [True, True, True]
+
+    rejected = second.try_acquire(symbol="EURUSD")
+    assert not rejected["admitted"] and rejected["blocking_scope"] == "symbol"
+    assert 0.0 < rejected["retry_after"] <= 1.0
+    assert second.check(symbol="GBPUSD")["admitted"]
+    assert first.stats["errors"] == second.stats["errors"] == 0
+
+
+def test_local_fallback_enforces_the_configured_burst():
+    server = fakeredis.FakeServer()
+    server.connected = False
+    limiter = RedisRateLimiter(fakeredis.FakeStrictRedis(server=server), SHARED_LIMITS)
+
+    results = [limiter.try_acquire(symbol="EURUSD") for _ in range(4)]
+    assert [result["admitted"] for result in results] == [True, True, True, False]
+    assert all(result["local"] for result in results)
+    assert limiter.check(symbol="EURUSD")["blocking_scope"] == "symbol"
+    assert limiter.stats["local_fallbacks"] == 5
+
+
+def test_gcra_scope_burst_defaults_to_the_limit():
+    limiter = MultiScopeRateLimiter({"rate_limit_algorithm": "gcra",
+                                     "symbol_rate_limit": {"limit": 5, "window_seconds": 60}})
+    assert sum(limiter.try_acquire(symbol="EURUSD", now=0.0) for _ in range(6)) == 5
+    limiter.set_scope_limit("symbol", 5, 60, burst=2)
+    assert sum(limiter.try_acquire(symbol="GBPUSD", now=0.0) for _ in range(6)) == 2
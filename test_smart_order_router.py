@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test Smart Order Router
+Verifies venue-level cancels for losing parallel legs, overfill reporting, and
+that broker selection only ranks available brokers.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'waves_quant_agi'))
+
+from engine_agents.adapters.core.smart_order_router import SmartOrderRouter, FakeVenue
+
+ORDER = {"symbol": "EURUSD", "quantity": 1000, "price": 1.1, "client_order_id": "ord1"}
+
+
+class IgnoresCancelVenue(FakeVenue):
+    """Fills even after a cancel, like a venue whose fill raced the cancel."""
+
+    async def cancel_order(self, order_id: str) -> bool:
+        self.cancels += 1
+        return False
+
+
+def _router(slow_venue_cls=FakeVenue):
+    router = SmartOrderRouter({}, fee_models={})
+    router.register_venue("fast", FakeVenue("fast", 1.0, 0.0, 0.0), {"taker_fee": 0.0002})
+    router.register_venue("slow", slow_venue_cls("slow", 30.0, 0.0, 0.0), {"taker_fee": 0.0001})
+    return router
+
+
+def test_parallel_losing_leg_is_cancelled_at_venue():
+    router = _router()
+    winner = asyncio.run(router.route_parallel(ORDER, fan_out=2))
+
+    slow = router.adapters["slow"]
+    assert winner["venue"] == "fast" and "overfills" not in winner
+    assert slow.cancelled_ids == {"ord1:slow"} and slow.fills == 0
+    assert router.stats["cancels_sent"] == 1 and router.stats["overfills"] == 0
+    # A leg we cancelled is not counted against the venue
+    assert router.venues["slow"].orders == 0
+
+
+def test_parallel_late_fill_is_reported_as_overfill():
+    router = _router(IgnoresCancelVenue)
+    winner = asyncio.run(router.route_parallel(ORDER, fan_out=2))
+
+    assert winner["venue"] == "fast"
+    assert [fill["venue"] for fill in winner["overfills"]] == ["slow"]
+    assert router.stats["overfills"] == 1
+
+
+def test_select_broker_skips_unavailable_brokers():
+    from engine_agents.adapters.core.broker_router import BrokerRouter
+    router = BrokerRouter.__new__(BrokerRouter)
+    router.logger = logging.getLogger("test_router")
+    router.smart_router = _router()
+
+    async def is_available(broker):
+        return broker != "slow"
+
+    router._is_broker_available = is_available
+    # "slow" is cheaper but down
+    selected = asyncio.run(router._select_broker(ORDER, {"preferred_brokers": ["slow", "fast"]}))
+    assert selected == "fast"
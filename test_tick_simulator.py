@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test Tick Simulator
+Verifies latency-delayed crossing with taker fees, queue position for resting
+limit orders, pro rata queue shrink on cancels, IOC outcomes and cancels.
+"""
+
+import asyncio
+import os
+import sys
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'waves_quant_agi'))
+
+from engine_agents.execution.core.tick_simulator import MarketEvent, TickSimulator
+
+BOOK = [
+    MarketEvent(0.0, "EURUSD", "book", "buy", 99.99, 5.0),
+    MarketEvent(0.0, "EURUSD", "book", "sell", 100.01, 1.0),
+    MarketEvent(0.0, "EURUSD", "book", "sell", 100.02, 4.0),
+]
+
+
+def _simulator(extra_events=(), **config):
+    simulator = TickSimulator({"sim_latency_ms": 1.0, "sim_taker_fee_bps": 1.0, **config})
+    simulator.load(BOOK + list(extra_events))
+    simulator.advance_to(0.0)
+    return simulator
+
+
+def test_market_order_walks_the_book_after_latency():
+    simulator = _simulator()
+    order = simulator.submit("EURUSD", "buy", 3.0)
+    assert order.status == "pending" and order.arrive_ts == 0.001
+
+    simulator.advance_to(0.001)
+    assert order.status == "filled"
+    assert abs(order.avg_price - (100.01 + 2 * 100.02) / 3) < 1e-12
+    assert abs(order.fees - (100.01 + 2 * 100.02) * 1e-4) < 1e-12
+    book = simulator.book("EURUSD")
+    assert book.best_ask == 100.02 and book.size_at("sell", 100.02) == 2.0
+
+
+def test_resting_order_fills_once_queue_ahead_trades():
+    trades = [
+        MarketEvent(0.01, "EURUSD", "trade", "sell", 99.99, 4.0),
+        MarketEvent(0.02, "EURUSD", "trade", "sell", 99.99, 3.0),
+    ]
+    simulator = _simulator(trades)
+    order = simulator.submit("EURUSD", "buy", 2.0, limit_price=99.99)
+
+    simulator.advance_to(0.01)
+    assert order.status == "open" and order.queue_ahead == 1.0 and order.filled == 0.0
+    simulator.advance_to(0.02)
+    assert order.status == "filled" and order.maker_quantity == 2.0 and order.fees == 0.0
+    assert simulator.get_stats()["resting_orders"] == 0
+
+
+def test_cancelled_size_shrinks_queue_pro_rata():
+    events = [
+        MarketEvent(0.01, "EURUSD", "book", "buy", 99.99, 2.0),   # 3 lots cancelled, no trades
+        MarketEvent(0.02, "EURUSD", "trade", "sell", 99.99, 3.0),
+    ]
+    simulator = _simulator(events)
+    order = simulator.submit("EURUSD", "buy", 2.0, limit_price=99.99)
+
+    simulator.advance_to(0.01)
+    assert order.queue_ahead == 2.0
+    simulator.advance_to(0.02)
+    assert order.status == "partial" and order.filled == 1.0
+
+
+def test_ioc_outcomes_and_cancel():
+    simulator = _simulator()
+
+    async def run():
+        unfilled_limit = await simulator.execute_order({"symbol": "EURUSD", "side": "buy", "quantity": 1.0,
+                                                        "type": "limit", "limit_price": 100.0, "ioc": True})
+        no_bids = await simulator.execute_order({"symbol": "GBPUSD", "side": "sell", "quantity": 1.0})
+        resting = await simulator.execute_order({"symbol": "EURUSD", "side": "sell", "quantity": 1.0,
+                                                 "type": "limit", "limit_price": 100.05})
+        cancelled = await simulator.cancel_order(resting["order_id"])
+        return unfilled_limit, no_bids, resting, cancelled
+
+    unfilled_limit, no_bids, resting, cancelled = asyncio.run(run())
+    assert unfilled_limit["status"] == "cancelled" and unfilled_limit["quantity"] == 0.0
+    assert no_bids["status"] == "rejected"
+    assert resting["status"] == "accepted" and cancelled
+    assert simulator.orders[resting["order_id"]].status == "cancelled"
+    assert not simulator.confirm_order(no_bids["order_id"])
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test Hierarchical Timing Wheel
+Drives the wheel with a fake clock and checks that timers fire on their tick,
+including timers cascading from coarser levels while level 0 is busy.
+"""
+
+import os
+import random
+import sys
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'waves_quant_agi'))
+
+from engine_agents.shared_utils.timing_wheel import HierarchicalTimingWheel
+
+TICK = 0.01
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _drive(wheel: HierarchicalTimingWheel, clock: FakeClock, until: float, externals=()):
+    """Sleep exactly as the async driver would, injecting ``(time, action)`` events."""
+    externals = sorted(externals, key=lambda event: event[0])
+    while clock.now < until:
+        delay = wheel.next_wakeup_delay()
+        wake = clock.now + delay if delay is not None else float("inf")
+        if externals and externals[0][0] < wake:
+            clock.now, action = externals.pop(0)
+            wheel.advance()
+            action()
+        elif wake == float("inf"):
+            break
+        else:
+            clock.now = wake
+        wheel.advance()
+
+
+def test_level_zero_timer_does_not_hide_cascade():
+    clock = FakeClock()
+    wheel = HierarchicalTimingWheel(tick_seconds=TICK, wheel_size=16, levels=3, clock=clock)
+    fired = {}
+    wheel.schedule(0.20, lambda: fired.setdefault("coarse", clock.now))  # level 1, cascades at tick 16
+
+    # Scheduled later, lands on level 0 beyond the coarse timer's cascade boundary
+    externals = [(0.10, lambda: wheel.schedule(0.12, lambda: fired.setdefault("fine", clock.now)))]
+    _drive(wheel, clock, until=1.0, externals=externals)
+
+    assert 0.20 - 1e-9 <= fired["coarse"] <= 0.20 + TICK + 1e-9
+    assert 0.22 - 1e-9 <= fired["fine"] <= 0.22 + TICK + 1e-9
+
+
+def test_schedule_syncs_current_tick():
+    clock = FakeClock()
+    wheel = HierarchicalTimingWheel(tick_seconds=TICK, wheel_size=16, levels=3, clock=clock)
+    fired = []
+    wheel.schedule(0.5, fired.append, "due")
+
+    clock.now = 1.0
+    handle = wheel.schedule(0.05, fired.append, "next")
+
+    # Catching up fires the overdue timer and places the new one relative to now
+    assert fired == ["due"]
+    assert wheel.current_tick == 100
+    assert handle.level == 0 and handle.expiry_tick == 105
+
+    clock.now = 1.04
+    wheel.advance()
+    assert fired == ["due"]
+    clock.now = 1.05
+    wheel.advance()
+    assert fired == ["due", "next"]
+
+
+def test_random_schedules_fire_within_one_tick():
+    for seed in range(100):
+        rng = random.Random(seed)
+        clock = FakeClock()
+        wheel = HierarchicalTimingWheel(tick_seconds=TICK, wheel_size=16, levels=3, clock=clock)
+        outcomes = []
+
+        def make(due, depth):
+            def callback():
+                outcomes.append(due - 1e-9 <= clock.now <= due + TICK + 1e-9)
+                if depth < 2 and rng.random() < 0.5:
+                    delay = rng.uniform(0, 6)
+                    wheel.schedule(delay, make(clock.now + delay, depth + 1))
+            return callback
+
+        def external():
+            delay = rng.uniform(0, 6)
+            wheel.schedule(delay, make(clock.now + delay, 0))
+
+        _drive(wheel, clock, until=40.0, externals=[(rng.uniform(0, 20), external) for _ in range(30)])
+
+        assert outcomes and all(outcomes), f"seed {seed}"
+        assert wheel.pending == 0
+
+
+def test_cancelled_timer_does_not_fire():
+    clock = FakeClock()
+    wheel = HierarchicalTimingWheel(tick_seconds=TICK, clock=clock)
+    fired = []
+    handle = wheel.schedule(0.1, fired.append, "cancelled")
+    wheel.schedule(0.2, fired.append, "kept")
+    wheel.cancel(handle)
+
+    clock.now = 0.3
+    wheel.advance()
+    assert fired == ["kept"]
+    assert wheel.next_wakeup_delay() is None
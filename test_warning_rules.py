@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test Warning Rules
+Verifies that only rules reading changed inputs are re-evaluated, and that
+firing rules are deduplicated, escalate, re-arm and respect their cooldown.
+"""
+
+import asyncio
+import os
+import sys
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'waves_quant_agi'))
+
+from engine_agents.market_conditions.core.warning_rules import WarningRule, WarningRuleEngine
+
+
+def _threshold_rule(name, field, calls, cooldown=None):
+    def evaluate(values):
+        calls.append(name)
+        value = values.get(field, 0.0)
+        if value > 2.0:
+            return {"type": name, "severity": "critical", "probability": value}
+        if value > 1.0:
+            return {"type": name, "severity": "high", "probability": value}
+        return None
+    return WarningRule(name, [field], evaluate, cooldown=cooldown)
+
+
+def test_only_rules_reading_changed_fields_run():
+    calls = []
+    engine = WarningRuleEngine({"warning_cooldown": 0})
+    engine.add_rule(_threshold_rule("volatility", "vol", calls))
+    engine.add_rule(_threshold_rule("liquidity", "spread", calls))
+
+    async def run():
+        await engine.evaluate({"vol": 0.5, "spread": 0.5}, now=0.0)
+        calls.clear()
+        await engine.evaluate({"vol": 0.5, "spread": 0.7}, now=1.0)
+        only_spread = list(calls)
+        calls.clear()
+        await engine.evaluate({"vol": 0.5, "spread": 0.7}, now=2.0)
+        nothing = list(calls)
+        engine.invalidate(["vol"])
+        await engine.evaluate({}, now=3.0)
+        return only_spread, nothing
+
+    only_spread, nothing = asyncio.run(run())
+    assert only_spread == ["liquidity"] and nothing == [] and calls == ["volatility"]
+    assert engine.stats["rules_skipped"] == 1 + 2 + 1
+
+
+def test_dedup_escalation_and_rearm():
+    engine = WarningRuleEngine({"warning_cooldown": 0})
+    engine.add_rule(_threshold_rule("volatility", "vol", []))
+
+    async def run():
+        return [
+            await engine.evaluate({"vol": 1.5}, now=0.0),   # onset
+            await engine.evaluate({"vol": 1.6}, now=1.0),   # still high: duplicate
+            await engine.evaluate({"vol": 2.5}, now=2.0),   # escalates to critical
+            await engine.evaluate({"vol": 0.5}, now=3.0),   # clears
+            await engine.evaluate({"vol": 1.2}, now=4.0),   # new onset
+        ]
+
+    emitted = asyncio.run(run())
+    assert [[w["severity"] for w in batch] for batch in emitted] == [["high"], [], ["critical"], [], ["high"]]
+    assert engine.stats["deduplicated"] == 1
+
+
+def test_cooldown_defers_until_elapsed_and_limit_orders_by_severity():
+    engine = WarningRuleEngine({"warning_cooldown": 10})
+    engine.add_rule(_threshold_rule("volatility", "vol", []))
+    engine.add_rule(_threshold_rule("liquidity", "spread", [], cooldown=0))
+
+    async def run():
+        first = await engine.evaluate({"vol": 1.5, "spread": 2.5}, now=0.0, limit=1)
+        leftover = await engine.evaluate({}, now=1.0)
+        await engine.evaluate({"vol": 0.5}, now=2.0)
+        cooling = await engine.evaluate({"vol": 1.5}, now=3.0)
+        released = await engine.evaluate({}, now=11.5)
+        return first, leftover, cooling, released
+
+    first, leftover, cooling, released = asyncio.run(run())
+    # The critical warning goes first; the limited-out one waits for the next update
+    assert [w["type"] for w in first] == ["liquidity"]
+    assert [w["type"] for w in leftover] == ["volatility"]
+    # Re-firing within the cooldown is held back, then released without re-evaluation
+    assert cooling == [] and [w["type"] for w in released] == ["volatility"]
+    assert engine.stats["cooldown_suppressed"] >= 1
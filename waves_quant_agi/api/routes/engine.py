@@ -32,6 +32,8 @@ ENGINE_STATUS = {
     "total_trades": 0,
     "active_pairs": []
 }
+# Kept across starts so symbol lists are served from its symbol cache
+MT5_BROKER = None
 
 
 # === Routes ===
@@ -87,7 +89,7 @@ async def start_engine():
     """
     Start the trading engine and fetch active pairs from MT5.
     """
-    global ENGINE_STATUS
+    global ENGINE_STATUS, MT5_BROKER
     import os
     from waves_quant_agi.engine_agents.adapters.brokers.mt5_plugin import MT5Broker
 
@@ -98,9 +100,10 @@ async def start_engine():
         mt5_server = os.getenv("MT5_SERVER")
         
         if mt5_login and mt5_password and mt5_server:
-            mt5_broker = MT5Broker(login=mt5_login, password=mt5_password, server=mt5_server)
-            mt5_broker.connect()
-            all_symbols = mt5_broker.get_all_symbols()
+            if MT5_BROKER is None or not MT5_BROKER.is_connected:
+                MT5_BROKER = MT5Broker(login=mt5_login, password=mt5_password, server=mt5_server)
+                MT5_BROKER.connect()
+            all_symbols = MT5_BROKER.get_all_symbols()
             # Filter for common forex pairs and gold, especially with 'm' suffix for Exness
             desired_pairs = ["XAUUSD", "EURUSD", "GBPUSD", "USDJPY", "AUDUSD", "USDCAD"]
             active_pairs = [s for s in all_symbols if any(p in s for p in desired_pairs) and s.endswith('m')]
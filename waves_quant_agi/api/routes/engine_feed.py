@@ -1,10 +1,28 @@
 from fastapi import APIRouter
 from pydantic import BaseModel
-from typing import List
+from typing import List, Dict, Any, Callable
 from datetime import datetime
 
 router = APIRouter()
 
+# Broker clients are created and connected once, then reused across requests
+_brokers: Dict[str, Any] = {}
+
+def _get_broker(name: str, factory: Callable[[], Any]) -> Any:
+    broker = _brokers.get(name)
+    if broker is None:
+        broker = _brokers[name] = factory()
+    return broker
+
+def _drop_broker(name: str):
+    """Forget a broker client so the next request reconnects it."""
+    broker = _brokers.pop(name, None)
+    if broker is not None and hasattr(broker, "disconnect"):
+        try:
+            broker.disconnect()
+        except Exception as e:
+            print(f"Error disconnecting {name} broker: {e}")
+
 class MarketData(BaseModel):
     timestamp: datetime
     symbol: str
@@ -37,7 +55,7 @@ async def get_live_signals():
         if binance_api_key and binance_api_secret:
             try:
                 from waves_quant_agi.engine.brokers.binance_plugin import BinanceBroker
-                binance = BinanceBroker(binance_api_key, binance_api_secret)
+                binance = _get_broker("binance", lambda: BinanceBroker(binance_api_key, binance_api_secret))
                 
                 # Get real prices for crypto pairs
                 crypto_symbols = ["BTCUSDT", "ETHUSDT", "ADAUSDT", "DOTUSDT", "LINKUSDT"]
@@ -70,8 +88,13 @@ async def get_live_signals():
         if mt5_login and mt5_password:
             try:
                 from waves_quant_agi.engine_agents.adapters.brokers.mt5_plugin import MT5Broker
-                mt5 = MT5Broker(int(mt5_login), mt5_password, mt5_server)
-                mt5.connect()
+                def connect_mt5():
+                    mt5 = MT5Broker(int(mt5_login), mt5_password, mt5_server)
+                    # Raising keeps a failed client out of the cache, so the next request retries
+                    if not mt5.connect():
+                        raise ConnectionError(f"MT5 connection to {mt5_server} failed")
+                    return mt5
+                mt5 = _get_broker("mt5", connect_mt5)
                 
                 # Get real forex data
                 forex_symbols = ["EURUSD", "GBPUSD", "USDJPY", "AUDUSD", "USDCAD"]
@@ -79,6 +102,8 @@ async def get_live_signals():
                     try:
                         # Get account info to check connection
                         balance_info = mt5.get_balance()
+                        if "error" in balance_info:
+                            raise ConnectionError(balance_info["error"])
                         
                         # Generate signal based on market conditions (simplified)
                         signal_type = random.choice(["buy", "sell", "hold"])
@@ -95,6 +120,8 @@ async def get_live_signals():
                         })
                     except Exception as e:
                         print(f"Error getting MT5 data for {symbol}: {e}")
+                        _drop_broker("mt5")
+                        break
             except Exception as e:
                 print(f"Error initializing MT5 broker: {e}")
         
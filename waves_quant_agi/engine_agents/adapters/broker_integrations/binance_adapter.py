@@ -2,6 +2,7 @@ from typing import Dict, Any, Optional
 import ccxt.async_support as ccxt
 import time
 from .base_adapter import BaseAdapter
+from ..core.connection_pool import get_connection_pool
 
 class BinanceAdapter(BaseAdapter):
     """Binance exchange adapter with comprehensive error handling and monitoring."""
@@ -21,6 +22,11 @@ class BinanceAdapter(BaseAdapter):
             }
         })
         
+        # Shared keepalive pool with warm standby connections to the REST API
+        self.pool = get_connection_pool()
+        self.pool.register_host("binance", "https://api.binance.com", warm_path="/api/v3/ping",
+                                warm_connections=config.get('warm_connections', 2) if config else 2)
+        
         # Binance-specific settings
         self.min_order_size = config.get('min_order_size', 0.001) if config else 0.001
         self.max_order_size = config.get('max_order_size', 1000000.0) if config else 1000000.0
@@ -30,6 +36,11 @@ class BinanceAdapter(BaseAdapter):
     async def connect(self) -> bool:
         """Establish connection to Binance."""
         try:
+            # Route CCXT through the pooled session; CCXT will not close a session it did not create
+            self.client.session = self.pool.get_session("binance")
+            self.client.own_session = False
+            await self.pool.warm("binance")
+            
             # Test connection by fetching account info
             await self.client.load_markets()
             account_info = await self.client.fetch_balance()
@@ -1,16 +1,21 @@
 from typing import Dict, Any, Optional
 import requests
 from .base_adapter import BaseAdapter
+from ..core.connection_pool import get_connection_pool
 
 class ExnessAdapter(BaseAdapter):
     def __init__(self, api_key: str, api_secret: str):
         super().__init__("exness", api_key, api_secret)
         self.base_url = "https://api.exness.com/v2"
-        self.session = requests.Session()
-        self.session.headers.update({
+        headers = {
             'Authorization': f'Bearer {api_key}:{api_secret}',
             'Content-Type': 'application/json'
-        })
+        }
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+        # Async order path shares keepalive connections instead of blocking on requests
+        self.pool = get_connection_pool()
+        self.pool.register_host("exness", self.base_url, headers=headers)
 
     def format_order(self, order: Dict[str, Any]) -> Dict[str, Any]:
         """Format internal order to Exness-specific format."""
@@ -26,9 +31,7 @@ class ExnessAdapter(BaseAdapter):
     async def send_order(self, formatted_order: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Send order to Exness and return response."""
         try:
-            response = self.session.post(f"{self.base_url}/orders", json=formatted_order)
-            response.raise_for_status()
-            result = response.json()
+            result = await self.pool.request("POST", "/orders", pool="exness", json=formatted_order)
             self.log_request(formatted_order, result)
             return result
         except Exception as e:
@@ -2,6 +2,7 @@ import os
 from typing import Dict, Any, Optional, List
 from .base_adapter import BaseAdapter
 from ..brokers.mt5_plugin import MT5Broker
+from ..normalizer.order_normalizer import CompiledNormalizer
 
 class ExnessMT5Adapter(BaseAdapter):
     """Exness adapter using MT5 connection instead of API."""
@@ -16,9 +17,13 @@ class ExnessMT5Adapter(BaseAdapter):
         super().__init__("exness_mt5", str(mt5_login), mt5_password, config)
         
         # Initialize MT5 broker
-        self.mt5_broker = MT5Broker(mt5_login, mt5_password, mt5_server)
+        self.mt5_broker = MT5Broker(mt5_login, mt5_password, mt5_server, config)
         self.mt5_connected = False
         
+        # Symbol specs are loaded once per connection and refreshed incrementally
+        self.symbol_cache = self.mt5_broker.symbol_cache
+        self.normalizer = CompiledNormalizer(self.symbol_cache, "mt5")
+        
         # Connect to MT5
         self._connect_mt5()
     
@@ -31,6 +36,7 @@ class ExnessMT5Adapter(BaseAdapter):
                 self.is_connected = True
                 balance_info = self.mt5_broker.get_balance()
                 self.logger.log(f"Account balance: {balance_info.get('balance', 0)} {balance_info.get('currency', 'USD')}")
+                self.logger.log(f"Loaded {self.symbol_cache.load()} symbol specs")
             else:
                 self.logger.log_error("Failed to connect to Exness MT5")
                 self.is_connected = False
@@ -40,8 +46,27 @@ class ExnessMT5Adapter(BaseAdapter):
             self.is_connected = False
             return False
     
+    def refresh_symbol_metadata(self, symbols: Optional[List[str]] = None) -> int:
+        """Re-fetch the given symbol specs, or stale ones when the refresh is due; returns how many changed."""
+        if not self.mt5_connected:
+            return 0
+        if symbols is None:
+            return self.symbol_cache.refresh_if_due()
+        return self.symbol_cache.refresh(symbols)
+    
+    def _symbol_names(self) -> List[str]:
+        """Tradable symbols for today from the shared symbol cache."""
+        return self.mt5_broker.get_all_symbols()
+    
     def format_order(self, order: Dict[str, Any]) -> Dict[str, Any]:
         """Format internal order to MT5-compatible format."""
+        if self.symbol_cache.specs:
+            try:
+                return self.normalizer.normalize(order)
+            except ValueError as e:
+                self.logger.log_error(f"Error formatting order: {e}")
+                return {}
+        
         try:
             # Convert internal order format to MT5 format
             formatted = {
@@ -70,8 +95,12 @@ class ExnessMT5Adapter(BaseAdapter):
         # Common forex pairs
         symbol = f"{base}{quote}".upper()
         
+        resolved = self.symbol_cache.resolve(base, quote)
+        if resolved:
+            return resolved
+        
         # Check if we need the 'm' suffix (common for Exness)
-        available_symbols = self.mt5_broker.get_all_symbols()
+        available_symbols = self._symbol_names()
         
         # First try with 'm' suffix
         if f"{symbol}m" in available_symbols:
@@ -206,7 +235,7 @@ class ExnessMT5Adapter(BaseAdapter):
             is_weekend = current_time.weekday() >= 5  # Saturday = 5, Sunday = 6
             
             # Get all symbols from MT5
-            all_symbols = self.mt5_broker.get_all_symbols()
+            all_symbols = self._symbol_names()
             
             if is_weekend:
                 # Weekend: filter to crypto symbols only
@@ -230,7 +259,7 @@ class ExnessMT5Adapter(BaseAdapter):
     def get_crypto_symbols(self) -> List[str]:
         """Get only cryptocurrency symbols."""
         try:
-            all_symbols = self.mt5_broker.get_all_symbols()
+            all_symbols = self._symbol_names()
             crypto_symbols = [s for s in all_symbols if self._is_crypto_symbol(s)]
             return crypto_symbols
         except Exception as e:
@@ -240,7 +269,7 @@ class ExnessMT5Adapter(BaseAdapter):
     def get_forex_symbols(self) -> List[str]:
         """Get only forex symbols."""
         try:
-            all_symbols = self.mt5_broker.get_all_symbols()
+            all_symbols = self._symbol_names()
             forex_symbols = [s for s in all_symbols if not self._is_crypto_symbol(s)]
             return forex_symbols
         except Exception as e:
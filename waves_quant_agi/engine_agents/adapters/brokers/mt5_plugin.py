@@ -3,17 +3,21 @@ import pandas as pd
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 import logging
+from ..normalizer.symbol_metadata import SymbolMetadataCache
 
 class MT5Broker:
     """MetaTrader 5 broker implementation for Exness integration."""
     
-    def __init__(self, login: int, password: str, server: str):
+    def __init__(self, login: int, password: str, server: str, config: Optional[Dict[str, Any]] = None):
         self.login = login
         self.password = password
         self.server = server
         self.is_connected = False
         self.logger = logging.getLogger(__name__)
         
+        # Symbol lists are served from cached specs instead of querying the terminal each time
+        self.symbol_cache = SymbolMetadataCache("exness_mt5", self.get_symbol_specs, config)
+        
     def connect(self) -> bool:
         """Connect to MT5 terminal with Exness credentials."""
         try:
@@ -154,26 +158,20 @@ class MT5Broker:
             return []
         
         try:
-            symbols = mt5.symbols_get()
-            if symbols is None:
-                return []
-            
-            all_symbols = [symbol.name for symbol in symbols if symbol.visible]
+            # Loads on first use, then re-fetches only stale specs on the refresh schedule
+            self.symbol_cache.refresh_if_due()
             
             # Weekend detection - only cryptos available on weekends
             import datetime
             now = datetime.datetime.now()
             is_weekend = now.weekday() >= 5  # Saturday = 5, Sunday = 6
+            symbols = self.symbol_cache.symbols(now.weekday())
             
             if is_weekend:
-                # Weekend: Only crypto pairs (typically end with 'm' on Exness)
-                crypto_symbols = [s for s in all_symbols if any(crypto in s.upper() for crypto in ['BTC', 'ETH', 'LTC', 'XRP', 'ADA', 'DOT', 'LINK', 'BCH', 'XLM', 'EOS', 'ATOM', 'SOL', 'MATIC', 'AVAX', 'UNI', 'AAVE', 'COMP', 'MKR', 'SNX', 'SUSHI'])]
-                self.logger.info(f"🌅 Weekend detected - Trading {len(crypto_symbols)} crypto pairs")
-                return crypto_symbols
+                self.logger.info(f"🌅 Weekend detected - Trading {len(symbols)} crypto pairs")
             else:
-                # Weekday: All assets available
-                self.logger.info(f"🏢 Weekday - Trading {len(all_symbols)} total assets")
-                return all_symbols
+                self.logger.info(f"🏢 Weekday - Trading {len(symbols)} total assets")
+            return symbols
             
         except Exception as e:
             self.logger.error(f"Error getting symbols: {e}")
@@ -210,6 +208,36 @@ class MT5Broker:
             self.logger.error(f"Error getting symbol info for {symbol}: {e}")
             return {}
     
+    def get_symbol_specs(self, symbols: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Trading specs for all symbols (one terminal call) or for the given symbols."""
+        if not self.is_connected:
+            return []
+        
+        try:
+            if symbols is None:
+                infos = mt5.symbols_get() or []
+            else:
+                infos = [info for info in (mt5.symbol_info(symbol) for symbol in symbols) if info is not None]
+            
+            return [{
+                "name": info.name,
+                "currency_base": info.currency_base,
+                "currency_profit": info.currency_profit,
+                "digits": info.digits,
+                "point": info.point,
+                "trade_tick_size": info.trade_tick_size,
+                "trade_contract_size": info.trade_contract_size,
+                "volume_min": info.volume_min,
+                "volume_max": info.volume_max,
+                "volume_step": info.volume_step,
+                "trade_mode": info.trade_mode,
+                "visible": info.visible
+            } for info in infos]
+            
+        except Exception as e:
+            self.logger.error(f"Error getting symbol specs: {e}")
+            return []
+    
     def get_symbol_tick(self, symbol: str) -> Dict[str, Any]:
         """Get current tick data for a symbol."""
         if not self.is_connected:
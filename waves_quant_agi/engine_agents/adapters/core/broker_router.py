@@ -9,6 +9,7 @@ import time
 import asyncio
 from typing import Dict, Any, List, Optional
 from ...shared_utils import get_shared_logger
+from .smart_order_router import SmartOrderRouter
 
 class BrokerRouter:
     """
@@ -68,6 +69,9 @@ class BrokerRouter:
             "optimization_metrics": {}
         }
         
+        # Cost-based venue selection from live broker stats and fee models
+        self.smart_router = SmartOrderRouter(config)
+        
         # Performance tracking
         self.performance_metrics = {
             "total_routes": 0,
@@ -76,6 +80,21 @@ class BrokerRouter:
             "average_routing_time_ms": 0.0
         }
     
+    async def initialize_routing(self):
+        """Register every broker named in the routing rules with the smart router."""
+        try:
+            brokers = {broker for rules in self.routing_rules.values() for broker in rules["preferred_brokers"]}
+            for broker in brokers:
+                if broker not in self.smart_router.venues:
+                    self.smart_router.register_venue(broker)
+            self.logger.info(f"Smart routing initialized for {len(brokers)} brokers")
+        except Exception as e:
+            self.logger.warning(f"Error initializing routing: {e}")
+    
+    def register_broker_adapter(self, broker: str, adapter: Any, fee_model: Optional[Dict[str, float]] = None):
+        """Route real orders for ``broker`` through an adapter instead of the simulation."""
+        self.smart_router.register_venue(broker, adapter, fee_model)
+    
     async def route_order(self, order_data: Dict[str, Any], strategy_type: str) -> Dict[str, Any]:
         """Route order to appropriate broker based on strategy."""
         try:
@@ -96,6 +115,10 @@ class BrokerRouter:
             
             return routing_result
             
+        except ConnectionError:
+            # Nothing reached a venue: the caller may resend
+            self.performance_metrics["failed_routes"] += 1
+            raise
         except Exception as e:
             self.logger.warning(f"Error routing order: {e}")
             self.performance_metrics["failed_routes"] += 1
@@ -185,11 +208,16 @@ class BrokerRouter:
         """Select the best broker for an order."""
         try:
             preferred_brokers = routing_rules.get("preferred_brokers", ["exness_mt5"])
+            available_brokers = [broker for broker in preferred_brokers if await self._is_broker_available(broker)]
+            
+            # Cheapest available preferred broker by expected total cost, when the smart router knows them
+            selected = self.smart_router.select_venue(order_data, candidates=available_brokers)
+            if selected:
+                return selected
             
             # Simple broker selection (first available preferred broker)
-            for broker in preferred_brokers:
-                if await self._is_broker_available(broker):
-                    return broker
+            if available_brokers:
+                return available_brokers[0]
             
             # Fallback to any available broker
             return await self._get_fallback_broker()
@@ -201,6 +229,26 @@ class BrokerRouter:
     async def _execute_routing(self, order_data: Dict[str, Any], broker: str, routing_rules: Dict[str, Any]) -> Dict[str, Any]:
         """Execute the order routing."""
         try:
+            # Real adapters go through the smart router, which also records venue stats
+            if broker in self.smart_router.adapters:
+                candidates = [broker] + [b for b in routing_rules.get("preferred_brokers", []) if b != broker]
+                if routing_rules.get("redundancy") == "high":
+                    response = await self.smart_router.route_parallel(order_data, fan_out=2, candidates=candidates)
+                else:
+                    response = await self.smart_router.route(order_data, candidates=candidates)
+                result = {
+                    "success": response is not None,
+                    "broker": response.get("venue", broker) if response else broker,
+                    "order_id": order_data.get("order_id", f"route_{int(time.time() * 1000)}"),
+                    "latency_ms": response.get("latency_ms", 0.0) if response else 0.0,
+                    "response": response,
+                    "overfills": response.get("overfills", []) if response else [],
+                    "timestamp": time.time()
+                }
+                routes = self.routing_state["active_routes"] if response else self.routing_state["failed_routes"]
+                routes[result["order_id"]] = result
+                return result
+            
             # Simulate routing execution
             await asyncio.sleep(0.01)  # 10ms routing time
             
@@ -209,6 +257,7 @@ class BrokerRouter:
             success = random.random() > 0.05
             
             latency_ms = self._simulate_routing_latency(routing_rules)
+            self.smart_router.record_result(broker, latency_ms, filled=success, rejected=not success)
             
             result = {
                 "success": success,
@@ -227,6 +276,8 @@ class BrokerRouter:
             
             return result
             
+        except ConnectionError:
+            raise
         except Exception as e:
             self.logger.warning(f"Error executing routing: {e}")
             return {
@@ -368,5 +419,6 @@ class BrokerRouter:
             "routing_state": self.routing_state,
             "active_routes_count": len(self.routing_state["active_routes"]),
             "failed_routes_count": len(self.routing_state["failed_routes"]),
+            "venue_stats": self.smart_router.get_venue_stats(),
             "routing_efficiency": self._calculate_routing_efficiency()
         }
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Connection Pool - Shared keepalive HTTP/WebSocket connections for brokers
+One aiohttp session per host with per-host concurrency limits, long-lived
+keepalive connections, warm standby connections kept open ahead of the
+order/quote path, and shared WebSockets with heartbeats.
+"""
+
+import time
+import asyncio
+from urllib.parse import urlsplit
+from typing import Dict, Any, List, Optional
+import aiohttp
+from ...shared_utils import get_shared_logger
+
+
+class HostStats:
+    """Observed request latency and connection reuse for one pooled host."""
+
+    __slots__ = ("requests", "errors", "handshakes", "reused", "ewma_latency_ms",
+                 "last_used", "last_error", "consecutive_errors")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.handshakes = 0
+        self.reused = 0
+        self.ewma_latency_ms = 0.0
+        self.last_used = 0.0
+        self.last_error = ""
+        self.consecutive_errors = 0
+
+    def record(self, latency_ms: float, ok: bool, error: str = ""):
+        self.requests += 1
+        self.last_used = time.time()
+        if self.ewma_latency_ms == 0.0:
+            self.ewma_latency_ms = latency_ms
+        else:
+            self.ewma_latency_ms += 0.1 * (latency_ms - self.ewma_latency_ms)
+        if ok:
+            self.consecutive_errors = 0
+        else:
+            self.errors += 1
+            self.consecutive_errors += 1
+            self.last_error = error
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "handshakes": self.handshakes,
+            "reused": self.reused,
+            "reuse_ratio": self.reused / max(self.reused + self.handshakes, 1),
+            "ewma_latency_ms": round(self.ewma_latency_ms, 3),
+            "idle_seconds": round(time.time() - self.last_used, 1) if self.last_used else None,
+            "consecutive_errors": self.consecutive_errors,
+            "last_error": self.last_error
+        }
+
+
+class AsyncConnectionPool:
+    """Per-host keepalive pools shared by all broker integrations.
+
+    Sessions are keyed by a pool name (the URL's host by default), so CCXT
+    clients and plain REST adapters can share the same connections.
+    ``register_host`` sets per-host limits and a warm-up path; hosts with
+    ``warm_connections`` are topped up by the keepalive loop before their
+    idle connections expire, so the order path never pays a TLS handshake.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = config or {}
+        self.logger = get_shared_logger("adapters", "connection_pool")
+
+        self.limit_per_host = self.config.get("pool_limit_per_host", 32)
+        self.keepalive_timeout = self.config.get("pool_keepalive_timeout", 75.0)
+        self.keepalive_interval = self.config.get("pool_keepalive_interval", 20.0)
+        self.request_timeout = self.config.get("pool_request_timeout", 10.0)
+        self.ws_heartbeat = self.config.get("pool_ws_heartbeat", 15.0)
+
+        self.hosts: Dict[str, Dict[str, Any]] = {}
+        self.sessions: Dict[str, aiohttp.ClientSession] = {}
+        self.host_stats: Dict[str, HostStats] = {}
+        self.websockets: Dict[str, aiohttp.ClientWebSocketResponse] = {}
+        self._ws_locks: Dict[str, asyncio.Lock] = {}
+        self.keepalive_task: Optional[asyncio.Task] = None
+
+    # ============= HOSTS AND SESSIONS =============
+
+    def register_host(self, name: str, base_url: str, limit: Optional[int] = None,
+                      warm_path: Optional[str] = None, warm_connections: int = 0,
+                      headers: Optional[Dict[str, str]] = None):
+        """Declare a host's limits and warm standby connection count."""
+        self.hosts[name] = {
+            "base_url": base_url.rstrip("/"),
+            "limit": limit or self.limit_per_host,
+            "warm_path": warm_path,
+            "warm_connections": warm_connections,
+            "headers": headers or {}
+        }
+        self.host_stats.setdefault(name, HostStats())
+
+    @staticmethod
+    def pool_name(url: str) -> str:
+        return urlsplit(url).netloc or url
+
+    def get_session(self, name: str) -> aiohttp.ClientSession:
+        """Shared session for a pool name; created on first use inside the event loop."""
+        session = self.sessions.get(name)
+        if session is None or session.closed:
+            host = self.hosts.get(name, {})
+            stats = self.host_stats.setdefault(name, HostStats())
+            connector = aiohttp.TCPConnector(
+                limit=host.get("limit", self.limit_per_host),
+                limit_per_host=host.get("limit", self.limit_per_host),
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=300,
+                enable_cleanup_closed=True
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                headers=host.get("headers"),
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+                trace_configs=[self._trace_config(stats)]
+            )
+            self.sessions[name] = session
+        return session
+
+    @staticmethod
+    def _trace_config(stats: HostStats) -> aiohttp.TraceConfig:
+        """Count new handshakes versus reused keepalive connections."""
+        trace = aiohttp.TraceConfig()
+
+        async def on_create(session, context, params):
+            stats.handshakes += 1
+
+        async def on_reuse(session, context, params):
+            stats.reused += 1
+
+        trace.on_connection_create_end.append(on_create)
+        trace.on_connection_reuseconn.append(on_reuse)
+        return trace
+
+    # ============= REQUESTS =============
+
+    async def request(self, method: str, url: str, pool: Optional[str] = None, **kwargs) -> Any:
+        """Send a request on the pooled session and return the decoded body.
+
+        Raises aiohttp.ClientResponseError for HTTP error statuses, like
+        ``raise_for_status()`` on a requests.Session.
+        """
+        name = pool or self.pool_name(url)
+        if not url.startswith("http") and name in self.hosts:
+            url = self.hosts[name]["base_url"] + url
+        stats = self.host_stats.setdefault(name, HostStats())
+        started = time.perf_counter()
+        try:
+            async with self.get_session(name).request(method, url, **kwargs) as response:
+                response.raise_for_status()
+                if response.content_type == "application/json":
+                    body = await response.json()
+                else:
+                    body = await response.text()
+            stats.record((time.perf_counter() - started) * 1000, True)
+            return body
+        except Exception as e:
+            stats.record((time.perf_counter() - started) * 1000, False, str(e))
+            raise
+
+    async def request_many(self, requests: List[Dict[str, Any]]) -> List[Any]:
+        """Issue several requests concurrently over the kept-alive connections.
+
+        Each item holds ``method``, ``url`` and optional request kwargs.
+        Results come back in order; failures are returned as exceptions.
+        """
+        return await asyncio.gather(
+            *(self.request(item.get("method", "GET"), item["url"],
+                           **{k: v for k, v in item.items() if k not in ("method", "url")})
+              for item in requests),
+            return_exceptions=True
+        )
+
+    # ============= WEBSOCKETS =============
+
+    async def websocket(self, url: str, pool: Optional[str] = None) -> aiohttp.ClientWebSocketResponse:
+        """Shared WebSocket for a URL; reconnected only when it has closed."""
+        lock = self._ws_locks.setdefault(url, asyncio.Lock())
+        async with lock:
+            ws = self.websockets.get(url)
+            if ws is None or ws.closed:
+                session = self.get_session(pool or self.pool_name(url))
+                ws = await session.ws_connect(url, heartbeat=self.ws_heartbeat, autoping=True)
+                self.websockets[url] = ws
+            return ws
+
+    # ============= WARM STANDBY =============
+
+    async def warm(self, name: str, connections: Optional[int] = None) -> int:
+        """Open ``connections`` keepalive connections by hitting the host's warm path."""
+        host = self.hosts.get(name)
+        if not host or not host.get("warm_path"):
+            return 0
+        count = connections or host["warm_connections"] or 1
+        url = host["base_url"] + host["warm_path"]
+        results = await asyncio.gather(*(self.request("GET", url, pool=name) for _ in range(count)),
+                                       return_exceptions=True)
+        warmed = sum(1 for result in results if not isinstance(result, Exception))
+        if warmed < count:
+            self.logger.warning(f"Warmed {warmed}/{count} connections for {name}")
+        return warmed
+
+    async def keepalive(self, name: str) -> bool:
+        """Re-warm a host only if it has been idle long enough to lose its connections."""
+        stats = self.host_stats.get(name)
+        if stats and time.time() - stats.last_used < self.keepalive_interval:
+            return stats.consecutive_errors == 0
+        return await self.warm(name) > 0
+
+    async def start(self):
+        """Warm all registered hosts and keep them warm in the background."""
+        for name, host in self.hosts.items():
+            if host["warm_connections"]:
+                await self.warm(name)
+        if self.keepalive_task is None:
+            self.keepalive_task = asyncio.create_task(self._keepalive_loop())
+
+    async def _keepalive_loop(self):
+        while True:
+            try:
+                await asyncio.sleep(self.keepalive_interval)
+                for name, host in self.hosts.items():
+                    if host["warm_connections"]:
+                        await self.keepalive(name)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                self.logger.warning(f"Error in pool keepalive loop: {e}")
+
+    # ============= STATUS AND SHUTDOWN =============
+
+    def is_healthy(self, name: str, max_consecutive_errors: int = 3) -> bool:
+        stats = self.host_stats.get(name)
+        return stats is None or stats.consecutive_errors < max_consecutive_errors
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-host pool statistics."""
+        return {
+            "hosts": {name: stats.to_dict() for name, stats in self.host_stats.items()},
+            "open_sessions": sum(1 for session in self.sessions.values() if not session.closed),
+            "open_websockets": sum(1 for ws in self.websockets.values() if not ws.closed)
+        }
+
+    async def close(self):
+        """Close WebSockets and sessions."""
+        if self.keepalive_task:
+            self.keepalive_task.cancel()
+            self.keepalive_task = None
+        for ws in self.websockets.values():
+            if not ws.closed:
+                await ws.close()
+        self.websockets.clear()
+        for session in self.sessions.values():
+            if not session.closed:
+                await session.close()
+        self.sessions.clear()
+
+
+# Global pool shared by all broker adapters
+_global_connection_pool: Optional[AsyncConnectionPool] = None
+
+
+def get_connection_pool(config: Optional[Dict[str, Any]] = None) -> AsyncConnectionPool:
+    """Get the global shared connection pool."""
+    global _global_connection_pool
+
+    if _global_connection_pool is None:
+        _global_connection_pool = AsyncConnectionPool(config)
+
+    return _global_connection_pool
+
+
+if __name__ == "__main__":
+    async def benchmark_pool(requests: int = 200):
+        """Fresh connection per request versus the shared keepalive pool, against a local server."""
+        from aiohttp import web
+
+        async def ping(request):
+            return web.json_response({"ok": True})
+
+        app = web.Application()
+        app.router.add_get("/ping", ping)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        url = f"http://127.0.0.1:{port}/ping"
+
+        started = time.perf_counter()
+        for _ in range(requests):
+            async with aiohttp.ClientSession() as session:
+                async with session.get(url) as response:
+                    await response.json()
+        fresh = (time.perf_counter() - started) / requests * 1e6
+
+        pool = AsyncConnectionPool()
+        pool.register_host("local", f"http://127.0.0.1:{port}", warm_path="/ping", warm_connections=4)
+        await pool.start()
+        started = time.perf_counter()
+        for _ in range(requests):
+            await pool.request("GET", "/ping", pool="local")
+        pooled = (time.perf_counter() - started) / requests * 1e6
+        stats = pool.get_stats()["hosts"]["local"]
+
+        print(f"🧪 fresh connection: {fresh:.0f}us/request")
+        print(f"🧪 pooled keepalive: {pooled:.0f}us/request "
+              f"({stats['handshakes']} handshakes, reuse ratio {stats['reuse_ratio']:.2f})")
+        await pool.close()
+        await runner.cleanup()
+
+    asyncio.run(benchmark_pool())
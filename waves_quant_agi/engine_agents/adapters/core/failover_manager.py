@@ -21,6 +21,7 @@ class FailoverManager:
         self.max_retry_attempts = config.get("max_retry_attempts", 3)
         self.retry_delay = config.get("retry_delay", 5.0)  # seconds
         self.health_check_interval = config.get("health_check_interval", 30.0)  # seconds
+        self.passive_failure_threshold = config.get("passive_failure_threshold", 5)
         
         # Connection state
         self.primary_connection = None
@@ -33,6 +34,10 @@ class FailoverManager:
         self.failover_count = 0
         self.last_failover_time = 0
         
+        # Passive detection from request outcomes (see RetryHandler.set_failure_listener)
+        self.consecutive_failures = 0
+        self.passive_failovers = 0
+        
         # Health monitoring
         self.health_check_task = None
         self.is_monitoring = False
@@ -146,6 +151,22 @@ class FailoverManager:
         finally:
             self.is_failing_over = False
     
+    def record_request_failure(self, operation: str, error: Exception):
+        """Count a failed broker request; fail over without waiting for the health loop."""
+        self.consecutive_failures += 1
+        if (self.failover_enabled and not self.is_failing_over and
+                self.consecutive_failures >= self.passive_failure_threshold):
+            self.logger.warning(f"{self.consecutive_failures} consecutive request failures "
+                                f"(last {operation}: {error}), initiating failover")
+            self.consecutive_failures = 0
+            self.passive_failovers += 1
+            return self._initiate_failover()
+        return None
+    
+    def record_request_success(self):
+        """Reset the passive failure count after a successful request."""
+        self.consecutive_failures = 0
+    
     async def _find_next_healthy_connection(self) -> Optional[Dict[str, Any]]:
         """Find next healthy backup connection."""
         try:
@@ -267,6 +288,8 @@ class FailoverManager:
             "last_failover_time": self.last_failover_time,
             "current_connection": self.primary_connection.get("name") if self.primary_connection else "none",
             "backup_connections_count": len(self.backup_connections),
+            "consecutive_failures": self.consecutive_failures,
+            "passive_failovers": self.passive_failovers,
             "healthy_backup_connections": len([conn for conn in self.backup_connections if conn.get("status") == "healthy"])
         }
     
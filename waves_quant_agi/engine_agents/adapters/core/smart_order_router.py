@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+"""
+Smart Order Router - Latency-aware venue selection
+Keeps live per-broker latency histograms, fill and rejection rates and fee
+models, and picks venues by expected total cost from a ranking that is only
+rebuilt when venue statistics change. Supports parallel multi-venue sends
+with venue-level cancel-on-fill and overfill reconciliation.
+"""
+
+import json
+import time
+import random
+import asyncio
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+from ...shared_utils import get_shared_logger
+
+# Latency histogram bucket upper bounds in milliseconds
+LATENCY_BUCKETS_MS = (0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000)
+
+# Responses for legs the router cancelled
+CANCELLED_STATUSES = ("cancelled", "canceled")
+
+DEFAULT_FEE_DB_PATH = Path(__file__).resolve().parents[2] / "fees_monitor" / "broker_fee_models" / "broker_fee_db.json"
+
+
+def load_fee_models(path: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+    """Read per-broker fee schedules from the fees monitor fee database."""
+    fee_db_path = Path(path) if path else DEFAULT_FEE_DB_PATH
+    try:
+        with open(fee_db_path, "r") as f:
+            fee_db = json.load(f)
+        return {broker: model.get("fees", {}) for broker, model in fee_db.items()}
+    except Exception as e:
+        print(f"❌ Error loading fee models from {fee_db_path}: {e}")
+        return {}
+
+
+class VenueStats:
+    """Live execution statistics and fee model for one venue."""
+
+    def __init__(self, name: str, fee_model: Dict[str, float], alpha: float,
+                 prior_latency_ms: float, prior_fill_rate: float):
+        self.name = name
+        self.alpha = alpha
+        self.taker_fee = fee_model.get("taker_fee", fee_model.get("commission", 0.0))
+        self.spread = fee_model.get("spread", 0.0)
+        self.minimum_fee = fee_model.get("minimum_fee", 0.0)
+
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.ewma_latency_ms = prior_latency_ms
+        self.fill_rate = prior_fill_rate
+        self.reject_rate = 1.0 - prior_fill_rate
+        self.orders = 0
+        self.fills = 0
+        self.rejects = 0
+        self.errors = 0
+        self.enabled = True
+
+    def record(self, latency_ms: float, filled: bool, rejected: bool):
+        bucket = 0
+        for bound in LATENCY_BUCKETS_MS:
+            if latency_ms <= bound:
+                break
+            bucket += 1
+        self.latency_buckets[bucket] += 1
+        self.ewma_latency_ms += self.alpha * (latency_ms - self.ewma_latency_ms)
+        self.fill_rate += self.alpha * ((1.0 if filled else 0.0) - self.fill_rate)
+        self.reject_rate += self.alpha * ((1.0 if rejected else 0.0) - self.reject_rate)
+        self.orders += 1
+        if filled:
+            self.fills += 1
+        elif rejected:
+            self.rejects += 1
+        else:
+            self.errors += 1
+
+    def latency_quantile(self, q: float) -> float:
+        """Histogram quantile (bucket upper bound) in milliseconds."""
+        total = sum(self.latency_buckets)
+        if not total:
+            return self.ewma_latency_ms
+        threshold = q * total
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS + (float("inf"),), self.latency_buckets):
+            cumulative += count
+            if cumulative >= threshold:
+                return bound
+        return float("inf")
+
+    def expected_cost_bps(self, latency_cost_bps_per_ms: float, retry_penalty_bps: float) -> float:
+        """Fees plus half spread plus latency exposure, inflated for fills that do not happen."""
+        base = (self.taker_fee + self.spread / 2) * 10000
+        base += self.ewma_latency_ms * latency_cost_bps_per_ms
+        base += self.reject_rate * retry_penalty_bps
+        return base / max(self.fill_rate, 0.05)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "enabled": self.enabled,
+            "orders": self.orders,
+            "fills": self.fills,
+            "rejects": self.rejects,
+            "errors": self.errors,
+            "fill_rate": round(self.fill_rate, 4),
+            "reject_rate": round(self.reject_rate, 4),
+            "ewma_latency_ms": round(self.ewma_latency_ms, 3),
+            "p50_latency_ms": self.latency_quantile(0.5),
+            "p99_latency_ms": self.latency_quantile(0.99),
+            "taker_fee": self.taker_fee,
+            "spread": self.spread,
+            "minimum_fee": self.minimum_fee
+        }
+
+
+class SmartOrderRouter:
+    """Routes orders to the venue with the lowest expected total cost.
+
+    Venues are adapters with ``async execute_order(order)`` and optionally
+    ``cancel_order(order_id)`` (sync or async); a falsy response or ``status ==
+    "rejected"`` counts as a reject, ``status == "cancelled"`` as a leg the
+    router cancelled.
+    """
+
+    def __init__(self, config: Dict[str, Any], fee_models: Optional[Dict[str, Dict[str, float]]] = None):
+        self.config = config
+        self.logger = get_shared_logger("adapters", "smart_order_router")
+
+        self.alpha = config.get("router_stats_alpha", 0.05)
+        self.latency_cost_bps_per_ms = config.get("router_latency_cost_bps_per_ms", 0.01)
+        self.retry_penalty_bps = config.get("router_retry_penalty_bps", 5.0)
+        self.prior_latency_ms = config.get("router_prior_latency_ms", 50.0)
+        self.prior_fill_rate = config.get("router_prior_fill_rate", 0.95)
+        self.order_timeout = config.get("router_order_timeout_seconds", 5.0)
+
+        self.fee_models = fee_models if fee_models is not None else load_fee_models(config.get("fee_db_path"))
+        self.venues: Dict[str, VenueStats] = {}
+        self.adapters: Dict[str, Any] = {}
+
+        # Venues sorted by expected cost; rebuilt lazily after stats change
+        self._ranking: List[Tuple[float, str]] = []
+        self._dirty = True
+        self._parallel_sequence = 0
+
+        self.stats = {"orders_routed": 0, "fallbacks": 0, "parallel_sends": 0,
+                      "cancels_sent": 0, "overfills": 0, "unfilled": 0}
+
+    # ============= VENUES =============
+
+    def register_venue(self, name: str, adapter: Any = None, fee_model: Optional[Dict[str, float]] = None):
+        """Add a venue. Its fee model defaults to the fee database entry for ``name``
+        (or its broker prefix, e.g. ``exness`` for ``exness_mt5``)."""
+        fee_model = fee_model or self.fee_models.get(name) or self.fee_models.get(name.split("_")[0], {})
+        self.venues[name] = VenueStats(
+            name, fee_model, self.alpha,
+            self.prior_latency_ms, self.prior_fill_rate
+        )
+        if adapter is not None:
+            self.adapters[name] = adapter
+        self._dirty = True
+
+    def set_venue_enabled(self, name: str, enabled: bool):
+        venue = self.venues.get(name)
+        if venue is not None:
+            venue.enabled = enabled
+            self._dirty = True
+
+    def record_result(self, name: str, latency_ms: float, filled: bool, rejected: bool = False):
+        """Feed an execution outcome (from this router or any other path) into venue stats."""
+        venue = self.venues.get(name)
+        if venue is None:
+            return
+        venue.record(latency_ms, filled, rejected)
+        self._dirty = True
+
+    # ============= SELECTION =============
+
+    def _rank(self) -> List[Tuple[float, str]]:
+        if self._dirty:
+            self._ranking = sorted(
+                (venue.expected_cost_bps(self.latency_cost_bps_per_ms, self.retry_penalty_bps), name)
+                for name, venue in self.venues.items() if venue.enabled
+            )
+            self._dirty = False
+        return self._ranking
+
+    def rank_venues(self, order: Optional[Dict[str, Any]] = None,
+                    candidates: Optional[List[str]] = None) -> List[str]:
+        """Venues cheapest first; minimum fees are applied against the order notional."""
+        ranking = self._rank()
+        if candidates is not None:
+            allowed = set(candidates)
+            ranking = [entry for entry in ranking if entry[1] in allowed]
+        notional = self._notional(order) if order else 0.0
+        if notional <= 0:
+            return [name for _, name in ranking]
+
+        adjusted = []
+        for cost_bps, name in ranking:
+            minimum_fee = self.venues[name].minimum_fee
+            if minimum_fee:
+                cost_bps = max(cost_bps, minimum_fee / notional * 10000)
+            adjusted.append((cost_bps, name))
+        adjusted.sort()
+        return [name for _, name in adjusted]
+
+    def select_venue(self, order: Optional[Dict[str, Any]] = None,
+                     candidates: Optional[List[str]] = None) -> Optional[str]:
+        """Cheapest venue for the order, from the cached ranking."""
+        if order is None or not any(venue.minimum_fee for venue in self.venues.values()):
+            ranking = self._rank()
+            if candidates is None:
+                return ranking[0][1] if ranking else None
+            allowed = set(candidates)
+            for _, name in ranking:
+                if name in allowed:
+                    return name
+            return None
+        ranked = self.rank_venues(order, candidates)
+        return ranked[0] if ranked else None
+
+    @staticmethod
+    def _notional(order: Dict[str, Any]) -> float:
+        quantity = float(order.get("quantity", order.get("amount", order.get("volume", 0))) or 0)
+        price = float(order.get("price", order.get("expected_price", 0)) or 0)
+        return quantity * price
+
+    # ============= EXECUTION =============
+
+    async def _send(self, name: str, order: Dict[str, Any],
+                    unreachable: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        adapter = self.adapters[name]
+        started = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(adapter.execute_order(order), timeout=self.order_timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Connection failures never reached the venue; timeouts and other errors may have
+            if isinstance(e, ConnectionError) and unreachable is not None:
+                unreachable.append(name)
+            self.record_result(name, (time.perf_counter() - started) * 1000, filled=False)
+            self.logger.warning(f"Venue {name} error: {e}")
+            return None
+        latency_ms = (time.perf_counter() - started) * 1000
+        if response and response.get("status") in CANCELLED_STATUSES:
+            # Cancelled by us (losing parallel leg), not a venue outcome
+            return None
+        rejected = not response or response.get("status") == "rejected"
+        self.record_result(name, latency_ms, filled=not rejected, rejected=rejected)
+        if rejected:
+            return None
+        return {**response, "venue": name, "latency_ms": latency_ms}
+
+    async def route(self, order: Dict[str, Any], candidates: Optional[List[str]] = None,
+                    max_attempts: int = 3) -> Optional[Dict[str, Any]]:
+        """Send to the cheapest venue, falling back down the ranking on rejects.
+
+        Raises ConnectionError when no tried venue could be reached, i.e. the
+        order is known not to be anywhere and may be resent.
+        """
+        ranked = [name for name in self.rank_venues(order, candidates) if name in self.adapters]
+        self.stats["orders_routed"] += 1
+        tried = ranked[:max_attempts]
+        unreachable: List[str] = []
+        for attempt, name in enumerate(tried):
+            if attempt:
+                self.stats["fallbacks"] += 1
+            response = await self._send(name, order, unreachable)
+            if response is not None:
+                return response
+        self.stats["unfilled"] += 1
+        if tried and len(unreachable) == len(tried):
+            raise ConnectionError(f"No venue reachable: {', '.join(unreachable)}")
+        return None
+
+    async def route_parallel(self, order: Dict[str, Any], fan_out: int = 2,
+                             candidates: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """Send to the ``fan_out`` cheapest venues at once; the first fill wins.
+
+        Each leg carries its own client order id. Once a leg fills, the others
+        are cancelled at their venues and then awaited, so a leg that fills
+        anyway is returned under the winner's ``overfills`` for the caller to
+        unwind instead of being lost.
+        """
+        ranked = [name for name in self.rank_venues(order, candidates) if name in self.adapters][:fan_out]
+        if not ranked:
+            return None
+        self.stats["orders_routed"] += 1
+        self.stats["parallel_sends"] += 1
+
+        self._parallel_sequence += 1
+        parent_id = order.get("client_order_id") or order.get("order_id") or f"sor_{self._parallel_sequence}"
+        leg_ids = {name: f"{parent_id}:{name}" for name in ranked}
+        unreachable: List[str] = []
+        tasks = {asyncio.create_task(self._send(name, {**order, "client_order_id": leg_ids[name]}, unreachable)): name
+                 for name in ranked}
+        winner = None
+        overfills = []
+        pending = set(tasks)
+        while pending and winner is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                response = task.result()
+                if response is None:
+                    continue
+                if winner is None:
+                    winner = response
+                else:
+                    # Two venues filled in the same wakeup
+                    overfills.append(response)
+
+        if pending:
+            # Cancel at the venues, then let each send finish with the venue's answer
+            await asyncio.gather(*(self._cancel(tasks[task], leg_ids[tasks[task]]) for task in pending))
+            overfills.extend(response for response in await asyncio.gather(*pending) if response is not None)
+
+        if winner is None:
+            self.stats["unfilled"] += 1
+            if len(unreachable) == len(ranked):
+                raise ConnectionError(f"No venue reachable: {', '.join(unreachable)}")
+            return None
+        if overfills:
+            self.stats["overfills"] += len(overfills)
+            winner["overfills"] = overfills
+            self.logger.warning(f"Parallel route {parent_id} overfilled on "
+                                f"{[response['venue'] for response in overfills]}")
+        return winner
+
+    async def _cancel(self, name: str, order_id: str):
+        adapter = self.adapters.get(name)
+        cancel = getattr(adapter, "cancel_order", None)
+        if cancel is None:
+            return
+        self.stats["cancels_sent"] += 1
+        try:
+            result = cancel(order_id)
+            if asyncio.iscoroutine(result):
+                await result
+        except Exception as e:
+            self.logger.warning(f"Cancel on {name} failed: {e}")
+
+    # ============= STATUS =============
+
+    def get_venue_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Live stats and expected cost per venue."""
+        return {
+            name: {
+                **venue.to_dict(),
+                "expected_cost_bps": round(
+                    venue.expected_cost_bps(self.latency_cost_bps_per_ms, self.retry_penalty_bps), 4
+                )
+            }
+            for name, venue in self.venues.items()
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Router counters."""
+        return {
+            "venues": len(self.venues),
+            "ranking": [name for _, name in self._rank()],
+            **self.stats
+        }
+
+
+class FakeVenue:
+    """Fake broker with a latency distribution, reject probability and fill price noise."""
+
+    def __init__(self, name: str, latency_ms: float, jitter_ms: float, reject_probability: float, seed: int = 1):
+        self.name = name
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.reject_probability = reject_probability
+        self.random = random.Random(seed)
+        self.fills = 0
+        self.cancels = 0
+        self.cancelled_ids = set()
+
+    async def execute_order(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        delay_ms = max(0.0, self.random.gauss(self.latency_ms, self.jitter_ms))
+        await asyncio.sleep(delay_ms / 1000)
+        if order.get("client_order_id") in self.cancelled_ids:
+            return {"status": "cancelled"}
+        if self.random.random() < self.reject_probability:
+            return {"status": "rejected"}
+        self.fills += 1
+        return {"status": "filled", "order_id": f"{self.name}_{self.fills}", "price": order.get("price", 0.0)}
+
+    async def cancel_order(self, order_id: str) -> bool:
+        self.cancels += 1
+        self.cancelled_ids.add(order_id)
+        return True
+
+
+if __name__ == "__main__":
+    async def benchmark_router(num_orders: int = 300):
+        """Compare cost-based routing with static fastest/lowest-fee picks on fake brokers."""
+        profiles = {
+            # name: (latency_ms, jitter_ms, reject_probability, fee model)
+            "fast_expensive": (2.0, 0.5, 0.01, {"taker_fee": 0.0005, "spread": 0.0002}),
+            "slow_cheap": (40.0, 15.0, 0.02, {"taker_fee": 0.00005, "spread": 0.0001}),
+            "balanced": (8.0, 2.0, 0.03, {"taker_fee": 0.0001, "spread": 0.0001}),
+            "flaky_cheapest": (5.0, 1.0, 0.40, {"taker_fee": 0.0, "spread": 0.0001})
+        }
+        order = {"symbol": "EURUSD", "quantity": 10000, "price": 1.1}
+
+        async def run(label: str, choose):
+            router = SmartOrderRouter({}, fee_models={})
+            for seed, (name, (latency, jitter, reject, fees)) in enumerate(profiles.items()):
+                router.register_venue(name, FakeVenue(name, latency, jitter, reject, seed), fees)
+            started = time.perf_counter()
+            fills = 0
+            for _ in range(num_orders):
+                response = await choose(router)
+                fills += response is not None
+            elapsed = time.perf_counter() - started
+            stats = router.get_venue_stats()
+            fee_bps = sum(s["fills"] * (s["taker_fee"] + s["spread"] / 2) * 10000 for s in stats.values()) / max(fills, 1)
+            print(f"🧪 {label:>14}: {fills}/{num_orders} filled in {elapsed:.2f}s, "
+                  f"avg fee+spread {fee_bps:.2f}bps, venues {[(n, s['fills']) for n, s in stats.items() if s['fills']]}")
+
+        def fixed(name):
+            return lambda router: router.route(order, candidates=[name], max_attempts=1)
+
+        await run("fastest", fixed("fast_expensive"))
+        await run("lowest_fee", fixed("flaky_cheapest"))
+        await run("smart", lambda router: router.route(order))
+        await run("smart_parallel", lambda router: router.route_parallel(order, fan_out=2))
+
+        router = SmartOrderRouter({}, fee_models={})
+        for name in profiles:
+            router.register_venue(name, fee_model=profiles[name][3])
+        started = time.perf_counter()
+        for i in range(100000):
+            router.select_venue()
+            if i % 100 == 0:
+                router.record_result("balanced", 8.0, True)
+        elapsed = time.perf_counter() - started
+        print(f"🧪 select_venue: {elapsed / 100000 * 1e6:.2f}us per lookup (stats updated every 100 lookups)")
+
+    asyncio.run(benchmark_router())
@@ -8,6 +8,7 @@ Focuses exclusively on broker connections, routing, and failover management.
 import asyncio
 import time
 import json
+from collections import OrderedDict
 from typing import Dict, Any, List
 from engine_agents.shared_utils import BaseAgent, register_agent
 
@@ -20,6 +21,11 @@ class EnhancedAdaptersAgentV2(BaseAgent):
         self.connection_manager = None
         self.broker_router = None
         self.failover_manager = None
+        self.retry_handler = None
+        
+        # Routing outcome per client order id, so a resubmitted order is never routed twice
+        self.routed_orders: "OrderedDict[str, asyncio.Future]" = OrderedDict()
+        self.order_sequence = 0
         
         # Connection management state
         self.connection_state = {
@@ -40,6 +46,7 @@ class EnhancedAdaptersAgentV2(BaseAgent):
             "connection_failures": 0,
             "total_orders_routed": 0,
             "failovers_executed": 0,
+            "duplicate_orders": 0,
             "start_time": time.time()
         }
         
@@ -125,10 +132,17 @@ class EnhancedAdaptersAgentV2(BaseAgent):
             self.logger.error(f"Error monitoring broker health: {e}")
     
     async def _monitor_adapter_health(self):
-        """Monitor adapter health."""
+        """Monitor adapter health and keep broker symbol metadata fresh."""
         try:
-            # Placeholder for adapter health monitoring
-            pass
+            if self.broker_router:
+                for name, adapter in list(self.broker_router.smart_router.adapters.items()):
+                    refresh = getattr(adapter, "refresh_symbol_metadata", None)
+                    if refresh is None:
+                        continue
+                    # Terminal calls block; the cache itself limits how often they happen
+                    changed = await asyncio.to_thread(refresh)
+                    if changed:
+                        self.logger.info(f"Refreshed {changed} symbol specs for {name}")
         except Exception as e:
             self.logger.error(f"Error monitoring adapter health: {e}")
     
@@ -166,6 +180,12 @@ class EnhancedAdaptersAgentV2(BaseAgent):
             from .core.failover_manager import FailoverManager
             self.failover_manager = FailoverManager(self.config)
             
+            # Broker calls go through the retry handler; its failures drive passive failover
+            from .retry_engine.retry_handler import RetryHandler
+            self.retry_handler = RetryHandler(config=self.config)
+            self.retry_handler.set_failure_listener(self.failover_manager.record_request_failure,
+                                                    self.failover_manager.record_request_success)
+            
             self.logger.info("✅ Connection management components initialized")
             
         except Exception as e:
@@ -382,7 +402,7 @@ class EnhancedAdaptersAgentV2(BaseAgent):
             order_type = order.get("order_type", "market")
             
             # Route order to appropriate broker
-            routing_result = await self.broker_router.route_order(order, strategy_type)
+            routing_result = await self._route_with_retry(order, strategy_type)
             
             # Update statistics
             if routing_result.get("success", False):
@@ -399,6 +419,57 @@ class EnhancedAdaptersAgentV2(BaseAgent):
             self.logger.error(f"Error routing order: {e}")
             return False
     
+    async def _route_with_retry(self, order: Dict[str, Any], strategy_type: str) -> Dict[str, Any]:
+        """Route once per client order id, resending only when no venue was reached.
+
+        The router raises ConnectionError only when the order reached no venue,
+        so that is the one failure the retry handler's order policy resends;
+        rejects and timeouts come back as results. Every attempt carries the
+        same client order id, and a duplicate submission gets the first outcome.
+        """
+        client_order_id = order.get("client_order_id") or order.get("order_id")
+        if not client_order_id:
+            self.order_sequence += 1
+            client_order_id = f"route_{int(time.time() * 1000)}_{self.order_sequence}"
+        existing = self.routed_orders.get(client_order_id)
+        if existing is not None:
+            self.stats["duplicate_orders"] += 1
+            self.logger.warning(f"Order {client_order_id} already routed, not sending again")
+            return await asyncio.shield(existing)
+        
+        outcome = asyncio.get_running_loop().create_future()
+        self.routed_orders[client_order_id] = outcome
+        while len(self.routed_orders) > self.config.get("routed_order_retention", 10000):
+            self.routed_orders.popitem(last=False)
+        
+        order = {**order, "client_order_id": client_order_id}
+        last_error = None
+        
+        async def attempt():
+            nonlocal last_error
+            try:
+                return await self.broker_router.route_order(order, strategy_type)
+            except ConnectionError as e:
+                last_error = e
+                raise
+        
+        try:
+            if self.retry_handler:
+                result = await self.retry_handler.execute_with_retry(attempt, operation="order")
+            else:
+                result = await attempt()
+        except asyncio.CancelledError:
+            outcome.cancel()
+            raise
+        except Exception as e:
+            result = None
+            last_error = e
+        if result is None:
+            result = {"success": False, "order_id": client_order_id,
+                      "error": str(last_error) if last_error else "routing timed out", "timestamp": time.time()}
+        outcome.set_result(result)
+        return result
+    
     # ============= FAILOVER MANAGEMENT LOOP =============
     
     async def _failover_management_loop(self):
@@ -1,3 +1,4 @@
-from .order_normalizer import OrderNormalizer
+from .order_normalizer import OrderNormalizer, CompiledNormalizer
+from .symbol_metadata import SymbolMetadataCache, SymbolSpec
 
-__all__ = ["OrderNormalizer"]
\ No newline at end of file
+__all__ = ["OrderNormalizer", "CompiledNormalizer", "SymbolMetadataCache", "SymbolSpec"]
\ No newline at end of file
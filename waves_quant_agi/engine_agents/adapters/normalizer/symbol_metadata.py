@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Symbol Metadata - Cached broker symbol specifications
+Tick size, lot step, contract size, digits and trading days per symbol,
+loaded once from the broker and refreshed incrementally so the order path
+never queries the terminal for symbol specs.
+"""
+
+import time
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable, Iterable
+
+CRYPTO_BASES = ("BTC", "ETH", "LTC", "XRP", "ADA", "DOT", "LINK", "BCH", "XLM", "EOS",
+                "ATOM", "SOL", "MATIC", "AVAX", "UNI", "AAVE", "COMP", "MKR", "SNX", "SUSHI")
+
+# Weekday indices (Monday=0) each asset class trades on
+WEEKDAYS = (0, 1, 2, 3, 4)
+ALL_DAYS = (0, 1, 2, 3, 4, 5, 6)
+
+
+class SymbolSpec:
+    """Trading specification of one broker symbol."""
+
+    __slots__ = ("name", "base", "quote", "tick_size", "digits", "lot_step", "volume_min",
+                 "volume_max", "contract_size", "trading_days", "tradable", "updated_at")
+
+    def __init__(self, name: str, base: str = "", quote: str = "", tick_size: float = 0.00001,
+                 digits: int = 5, lot_step: float = 0.01, volume_min: float = 0.01,
+                 volume_max: float = 100.0, contract_size: float = 100000.0,
+                 trading_days: Iterable[int] = WEEKDAYS, tradable: bool = True):
+        self.name = name
+        self.base = base
+        self.quote = quote
+        self.tick_size = tick_size
+        self.digits = digits
+        self.lot_step = lot_step
+        self.volume_min = volume_min
+        self.volume_max = volume_max
+        self.contract_size = contract_size
+        self.trading_days = frozenset(trading_days)
+        self.tradable = tradable
+        self.updated_at = time.time()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SymbolSpec":
+        """Build from a broker spec dict (MT5 field names are accepted)."""
+        name = data["name"]
+        base = data.get("currency_base") or data.get("base", "")
+        quote = data.get("currency_profit") or data.get("quote", "")
+        is_crypto = any(crypto in name.upper() for crypto in CRYPTO_BASES)
+        digits = int(data.get("digits", 5))
+        return cls(
+            name=name,
+            base=base,
+            quote=quote,
+            tick_size=float(data.get("trade_tick_size") or data.get("tick_size") or data.get("point") or 10 ** -digits),
+            digits=digits,
+            lot_step=float(data.get("volume_step") or data.get("lot_step") or 0.01),
+            volume_min=float(data.get("volume_min", 0.01)),
+            volume_max=float(data.get("volume_max", 100.0)),
+            contract_size=float(data.get("trade_contract_size") or data.get("contract_size") or 100000.0),
+            trading_days=data.get("trading_days") or (ALL_DAYS if is_crypto else WEEKDAYS),
+            tradable=data.get("trade_mode", 4) != 0 and data.get("visible", True)
+        )
+
+    def same_as(self, other: "SymbolSpec") -> bool:
+        return all(getattr(self, field) == getattr(other, field)
+                   for field in self.__slots__ if field != "updated_at")
+
+    def trades_on(self, weekday: int) -> bool:
+        return weekday in self.trading_days
+
+
+class SymbolMetadataCache:
+    """Symbol specs for one broker, keyed by broker symbol and by base/quote pair.
+
+    ``loader(symbols)`` returns spec dicts; it is called with None for the
+    initial full load and with the stale symbol names on refresh. ``version``
+    increments whenever a spec actually changes, so compiled normalizers can
+    tell when to rebuild their tables. ``refresh_if_due`` is the scheduled
+    entry point: it refreshes at most every ``symbol_refresh_interval``.
+    """
+
+    def __init__(self, broker_name: str, loader: Callable[[Optional[List[str]]], List[Dict[str, Any]]],
+                 config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        self.broker_name = broker_name
+        self.loader = loader
+        self.refresh_ttl = config.get("symbol_refresh_ttl", 3600.0)
+        self.refresh_interval = config.get("symbol_refresh_interval", 300.0)
+        self.symbol_suffixes = tuple(config.get("symbol_suffixes", ("m", "")))
+
+        self.specs: Dict[str, SymbolSpec] = {}
+        self.pairs: Dict[tuple, str] = {}
+        self.version = 0
+        self.loaded_at = 0.0
+        self.next_refresh = 0.0
+        self.stats = {"full_loads": 0, "refreshes": 0, "symbols_updated": 0}
+
+    def load(self) -> int:
+        """Full load of every symbol the broker exposes."""
+        specs = [SymbolSpec.from_dict(data) for data in self.loader(None)]
+        self.specs = {spec.name: spec for spec in specs}
+        self._index_pairs()
+        self.version += 1
+        self.loaded_at = time.time()
+        self.stats["full_loads"] += 1
+        return len(self.specs)
+
+    def refresh(self, symbols: Optional[List[str]] = None) -> int:
+        """Re-fetch only the given symbols, or those older than ``symbol_refresh_ttl``."""
+        if not self.specs:
+            return self.load()
+        if symbols is None:
+            cutoff = time.time() - self.refresh_ttl
+            symbols = [name for name, spec in self.specs.items() if spec.updated_at < cutoff]
+        if not symbols:
+            return 0
+
+        changed = 0
+        for data in self.loader(symbols):
+            spec = SymbolSpec.from_dict(data)
+            current = self.specs.get(spec.name)
+            if current is not None and current.same_as(spec):
+                current.updated_at = spec.updated_at
+                continue
+            self.specs[spec.name] = spec
+            changed += 1
+        if changed:
+            self._index_pairs()
+            self.version += 1
+        self.stats["refreshes"] += 1
+        self.stats["symbols_updated"] += changed
+        return changed
+
+    def refresh_if_due(self, now: Optional[float] = None) -> int:
+        """Load or refresh stale specs once ``symbol_refresh_interval`` has passed since the last check."""
+        now = time.time() if now is None else now
+        if now < self.next_refresh:
+            return 0
+        self.next_refresh = now + self.refresh_interval
+        return self.refresh()
+
+    def _index_pairs(self):
+        """Map (BASE, QUOTE) to the broker symbol, preferring the configured suffix order."""
+        pairs: Dict[tuple, str] = {}
+        for suffix in reversed(self.symbol_suffixes):
+            for name, spec in self.specs.items():
+                plain = name[:-len(suffix)] if suffix and name.endswith(suffix) else name
+                if suffix and not name.endswith(suffix):
+                    continue
+                if spec.base:
+                    pairs[(spec.base.upper(), spec.quote.upper())] = name
+                pairs[(plain.upper(), "")] = name
+        self.pairs = pairs
+
+    def get(self, symbol: str) -> Optional[SymbolSpec]:
+        return self.specs.get(symbol)
+
+    def resolve(self, base: str, quote: str = "") -> Optional[str]:
+        """Broker symbol for a base/quote pair or a plain symbol name."""
+        base = base.upper()
+        quote = quote.upper()
+        return self.pairs.get((base, quote)) or self.pairs.get((base + quote, ""))
+
+    def symbols(self, weekday: Optional[int] = None, tradable_only: bool = True) -> List[str]:
+        """Symbol names, optionally only those trading on ``weekday`` (default: today)."""
+        if weekday is None:
+            weekday = datetime.now().weekday()
+        return [name for name, spec in self.specs.items()
+                if spec.trades_on(weekday) and (spec.tradable or not tradable_only)]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache counters."""
+        return {
+            "broker": self.broker_name,
+            "symbols": len(self.specs),
+            "version": self.version,
+            "loaded_at": self.loaded_at,
+            **self.stats
+        }
@@ -1,33 +1,203 @@
-from typing import Callable, Any, Optional
+#!/usr/bin/env python3
+"""
+Retry Handler - Budgeted retries for broker calls
+Per-operation policies with decorrelated jitter, deadline propagation and a
+global retry budget that caps retry storms.
+"""
+
+from typing import Callable, Any, Dict, Optional
 import asyncio
+import contextvars
+import random
 import time
-from ..logs.broker_logger import BrokerLogger
+from ...shared_utils import get_shared_logger
+
+# Absolute deadline (time.monotonic) of the call currently being retried
+current_deadline: contextvars.ContextVar = contextvars.ContextVar("retry_deadline", default=None)
+
+
+def get_remaining_time() -> Optional[float]:
+    """Seconds left before the propagated deadline, None when there is none."""
+    deadline = current_deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+class RetryPolicy:
+    """Retry settings for one operation type."""
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.1, max_delay: float = 5.0,
+                 attempt_timeout: Optional[float] = None, retry_on_timeout: bool = True):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.attempt_timeout = attempt_timeout
+        # A timed-out attempt may still have reached the broker; resending is only safe for idempotent calls
+        self.retry_on_timeout = retry_on_timeout
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RetryPolicy":
+        return cls(**data)
+
+
+# Order placement is never resent after a timeout, when the first attempt's outcome is unknown
+DEFAULT_POLICIES = {
+    "order": {"max_attempts": 2, "base_delay": 0.05, "max_delay": 0.5, "attempt_timeout": 10.0,
+              "retry_on_timeout": False},
+}
+
+
+class RetryBudget:
+    """Global token budget: retries may add at most ``ratio`` extra load.
+
+    Every first attempt deposits ``ratio`` tokens; every retry spends one. A
+    small per-second reserve keeps low-traffic paths retryable.
+    """
+
+    def __init__(self, ratio: float = 0.1, min_per_second: float = 5.0, max_tokens: float = 100.0):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self.tokens = min_per_second
+        self.last_refill = time.monotonic()
+        self.spent = 0
+        self.denied = 0
+
+    def deposit(self):
+        self._refill()
+        self.tokens = min(self.tokens + self.ratio, self.max_tokens)
+
+    def try_spend(self) -> bool:
+        self._refill()
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            self.spent += 1
+            return True
+        self.denied += 1
+        return False
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.last_refill
+        if elapsed > 0:
+            self.tokens = min(self.tokens + elapsed * self.min_per_second, self.max_tokens)
+            self.last_refill = now
+
 
 class RetryHandler:
-    def __init__(self, max_retries: int = 3, base_delay: float = 1.0, max_delay: float = 60.0):
+    def __init__(self, max_retries: int = 3, base_delay: float = 1.0, max_delay: float = 60.0,
+                 config: Optional[Dict[str, Any]] = None):
         self.max_retries = max_retries
         self.base_delay = base_delay
         self.max_delay = max_delay
-        self.logger = BrokerLogger("retry_handler")
+        self.config = config or {}
+        self.logger = get_shared_logger("adapters", "retry_handler")
+
+        self.policies: Dict[str, RetryPolicy] = {
+            name: RetryPolicy.from_dict(policy)
+            for name, policy in {**DEFAULT_POLICIES, **self.config.get("retry_policies", {})}.items()
+        }
+        self.budget = RetryBudget(
+            ratio=self.config.get("retry_budget_ratio", 0.1),
+            min_per_second=self.config.get("retry_budget_min_per_second", 5.0)
+        )
+        self.failure_listener: Optional[Callable[[str, Exception], Any]] = None
+        self.success_listener: Optional[Callable[[], Any]] = None
+        self.stats = {"calls": 0, "successes": 0, "failures": 0, "retries": 0,
+                      "budget_denied": 0, "deadline_exceeded": 0, "unknown_outcomes": 0}
+
+    def _policy(self, operation: str) -> RetryPolicy:
+        policy = self.policies.get(operation)
+        if policy is None:
+            # Unknown operations use the handler-wide settings, as before
+            policy = RetryPolicy(max_attempts=self.max_retries, base_delay=self.base_delay, max_delay=self.max_delay)
+        return policy
+
+    def set_failure_listener(self, listener: Callable[[str, Exception], Any],
+                             on_success: Optional[Callable[[], Any]] = None):
+        """Called with (operation, error) on every failed attempt, e.g. to drive failover.
 
-    async def execute_with_retry(self, func: Callable, *args, **kwargs) -> Optional[Any]:
-        """Execute a function with exponential backoff retries."""
+        Typically FailoverManager.record_request_failure / record_request_success.
+        """
+        self.failure_listener = listener
+        self.success_listener = on_success
+
+    async def execute_with_retry(self, func: Callable, *args, operation: str = "default",
+                                 deadline: Optional[float] = None, timeout: Optional[float] = None,
+                                 **kwargs) -> Optional[Any]:
+        """Execute ``func`` under the operation's retry policy.
+
+        ``deadline`` is absolute (time.monotonic); ``timeout`` is relative. An
+        outer deadline set by an enclosing call is inherited. Returns None once
+        attempts, budget or deadline run out.
+        """
+        policy = self._policy(operation)
+        if timeout is not None:
+            deadline = time.monotonic() + timeout if deadline is None else min(deadline, time.monotonic() + timeout)
+        inherited = current_deadline.get()
+        if inherited is not None:
+            deadline = inherited if deadline is None else min(deadline, inherited)
+        token = current_deadline.set(deadline)
+
+        self.stats["calls"] += 1
+        self.budget.deposit()
+        delay = policy.base_delay
         attempt = 0
-        delay = self.base_delay
-        while attempt < self.max_retries:
-            try:
-                result = await func(*args, **kwargs)
-                self.logger.log_request("retry", {"attempt": attempt, "success": True})
-                return result
-            except Exception as e:
+        try:
+            while True:
                 attempt += 1
-                if attempt == self.max_retries:
-                    self.logger.log_request("retry", {"attempt": attempt, "error": str(e), "success": False})
-                    return None
-                delay = min(delay * 2, self.max_delay)  # Exponential backoff
-                self.logger.log_request("retry", {"attempt": attempt, "error": str(e), "delay": delay})
-                await asyncio.sleep(delay)
-        return None
+                try:
+                    result = await asyncio.wait_for(func(*args, **kwargs),
+                                                    timeout=self._attempt_timeout(policy, deadline))
+                    self.stats["successes"] += 1
+                    if self.success_listener is not None:
+                        self.success_listener()
+                    return result
+                except Exception as e:
+                    self._notify_failure(operation, e)
+                    if isinstance(e, asyncio.TimeoutError) and deadline is not None and time.monotonic() >= deadline:
+                        self.stats["deadline_exceeded"] += 1
+                        self.logger.warning(f"{operation} deadline exceeded after {attempt} attempts")
+                        break
+                    if isinstance(e, asyncio.TimeoutError) and not policy.retry_on_timeout:
+                        self.stats["unknown_outcomes"] += 1
+                        self.logger.warning(f"{operation} timed out with unknown outcome, not resending")
+                        break
+                    if attempt >= policy.max_attempts:
+                        self.logger.warning(f"{operation} failed after {attempt} attempts: {e}")
+                        break
+                    if not self.budget.try_spend():
+                        self.stats["budget_denied"] += 1
+                        self.logger.warning(f"{operation} retry denied by budget: {e}")
+                        break
+
+                    # Decorrelated jitter, never sleeping past the deadline
+                    delay = min(policy.max_delay, random.uniform(policy.base_delay, delay * 3))
+                    if deadline is not None and time.monotonic() + delay >= deadline:
+                        self.stats["deadline_exceeded"] += 1
+                        break
+                    self.stats["retries"] += 1
+                    await asyncio.sleep(delay)
+            self.stats["failures"] += 1
+            return None
+        finally:
+            current_deadline.reset(token)
+
+    def _attempt_timeout(self, policy: RetryPolicy, deadline: Optional[float]) -> Optional[float]:
+        timeout = policy.attempt_timeout
+        if deadline is not None:
+            remaining = max(deadline - time.monotonic(), 0.0)
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        return timeout
+
+    def _notify_failure(self, operation: str, error: Exception):
+        if self.failure_listener is None:
+            return
+        try:
+            result = self.failure_listener(operation, error)
+            if asyncio.iscoroutine(result):
+                asyncio.get_running_loop().create_task(result)
+        except Exception as e:
+            self.logger.error(f"Retry failure listener error: {e}")
 
     def adjust_retry_params(self, success_rate: float):
         """Adjust retry parameters based on success rate."""
@@ -37,4 +207,13 @@ class RetryHandler:
         elif success_rate > 0.8:
             self.max_retries = max(self.max_retries - 1, 2)
             self.base_delay = max(self.base_delay / 1.5, 0.5)
-        self.logger.log_request("adjust_retry", {"success_rate": success_rate, "max_retries": self.max_retries, "base_delay": self.base_delay})
\ No newline at end of file
+        self.logger.info(f"Adjusted retry params: success_rate={success_rate}, "
+                         f"max_retries={self.max_retries}, base_delay={self.base_delay}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retry and budget counters."""
+        return {
+            **self.stats,
+            "budget_tokens": round(self.budget.tokens, 2),
+            "budget_spent": self.budget.spent
+        }
@@ -11,6 +11,8 @@ import uuid
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 
+from engine_agents.shared_utils.circuit_breaker_registry import CircuitBreakerRegistry
+
 class PipelineOrchestrator:
     """Orchestrates the complete trading pipeline with full visibility."""
     
@@ -63,12 +65,11 @@ class PipelineOrchestrator:
             "bottleneck_analysis": {}
         }
         
-        # Circuit breakers
-        self.circuit_breakers = {
-            "signal_processing": {"active": False, "trigger_count": 0, "last_trigger": 0},
-            "order_execution": {"active": False, "trigger_count": 0, "last_trigger": 0},
-            "data_flow": {"active": False, "trigger_count": 0, "last_trigger": 0}
-        }
+        # Circuit breakers - recovery is scheduled on the registry's timing wheel
+        self.circuit_breakers = CircuitBreakerRegistry({"circuit_recovery_timeout": 60.0})
+        for breaker_name in ("signal_processing", "order_execution", "data_flow"):
+            self.circuit_breakers.register(breaker_name, scope="pipeline", failure_threshold=1)
+        self.circuit_breakers.subscribe(self._on_circuit_breaker_event)
         
         # Running state
         self.running = False
@@ -86,7 +87,7 @@ class PipelineOrchestrator:
                 asyncio.create_task(self._signal_tracking_loop()),
                 asyncio.create_task(self._execution_tracking_loop()),
                 asyncio.create_task(self._performance_monitoring_loop()),
-                asyncio.create_task(self._circuit_breaker_monitoring_loop())
+                self.circuit_breakers.start()
             ]
             
             self.logger.info("✅ Pipeline Orchestrator started successfully")
@@ -146,6 +147,12 @@ class PipelineOrchestrator:
             # Get system health from Redis
             health_data = await self._get_system_health()
             
+            # Data flow breaker follows system health, so it closes again once health recovers
+            if health_data.get("overall_health", 0.0) < 0.5:
+                self.circuit_breakers.record_failure("data_flow", "degraded_health")
+            else:
+                self.circuit_breakers.record_success("data_flow")
+            
             # Determine current phase
             if health_data.get("overall_health", 0.0) >= 0.8:
                 if self.pipeline_state["current_phase"] == "initialization":
@@ -168,7 +175,7 @@ class PipelineOrchestrator:
         """Process signals in the pipeline signal queue."""
         try:
             # Check circuit breaker
-            if self.circuit_breakers["signal_processing"]["active"]:
+            if not self.circuit_breakers.is_allowed("signal_processing"):
                 return
             
             # Process up to 10 signals at a time
@@ -182,6 +189,8 @@ class PipelineOrchestrator:
                 # Remove processed signal
                 self.signal_tracker["signal_queue"].remove(signal)
                 self.signal_tracker["processed_signals"] += 1
+            
+            self.circuit_breakers.record_success("signal_processing")
                 
         except Exception as e:
             self.logger.error(f"Error processing signal queue: {e}")
@@ -191,7 +200,7 @@ class PipelineOrchestrator:
         """Process orders in the pipeline execution queue."""
         try:
             # Check circuit breaker
-            if self.circuit_breakers["order_execution"]["active"]:
+            if not self.circuit_breakers.is_allowed("order_execution"):
                 return
             
             # Process up to 5 orders at a time
@@ -205,6 +214,8 @@ class PipelineOrchestrator:
                 # Remove processed order
                 self.execution_tracker["execution_queue"].remove(order)
                 self.execution_tracker["processed_orders"] += 1
+            
+            self.circuit_breakers.record_success("order_execution")
                 
         except Exception as e:
             self.logger.error(f"Error processing execution queue: {e}")
@@ -542,61 +553,30 @@ class PipelineOrchestrator:
     
     # ============= CIRCUIT BREAKER MONITORING =============
     
-    async def _circuit_breaker_monitoring_loop(self):
-        """Monitor and manage circuit breakers."""
-        while self.running:
-            try:
-                # Check circuit breaker timeouts
-                await self._check_circuit_breaker_timeouts()
-                
-                # Attempt circuit breaker recovery
-                await self._attempt_circuit_breaker_recovery()
-                
-                await asyncio.sleep(5.0)  # 5 second cycle
-                
-            except Exception as e:
-                self.logger.error(f"Error in circuit breaker monitoring: {e}")
-                await asyncio.sleep(10.0)
-    
     async def _trigger_circuit_breaker(self, breaker_name: str):
         """Trigger a circuit breaker."""
         try:
-            if breaker_name in self.circuit_breakers:
-                self.circuit_breakers[breaker_name]["active"] = True
-                self.circuit_breakers[breaker_name]["trigger_count"] += 1
-                self.circuit_breakers[breaker_name]["last_trigger"] = time.time()
-                
-                self.logger.warning(f"⚠️ Circuit breaker triggered: {breaker_name}")
-                
+            self.circuit_breakers.record_failure(breaker_name, "pipeline_error")
+            
         except Exception as e:
             self.logger.error(f"Error triggering circuit breaker: {e}")
     
-    async def _check_circuit_breaker_timeouts(self):
-        """Check if circuit breakers should timeout."""
+    def _on_circuit_breaker_event(self, event: Dict[str, Any]):
+        """Log and broadcast circuit breaker state changes."""
         try:
-            current_time = time.time()
+            if event["to_state"] == "OPEN":
+                self.logger.warning(f"⚠️ Circuit breaker triggered: {event['name']}")
+            elif event["to_state"] == "HALF_OPEN":
+                self.logger.info(f"🔄 Circuit breaker half-open: {event['name']}")
+            else:
+                self.logger.info(f"✅ Circuit breaker recovered: {event['name']}")
+            
+            asyncio.get_running_loop().create_task(
+                self.redis_conn.publish_async("pipeline:circuit_breakers", json.dumps(event))
+            )
             
-            for breaker_name, breaker in self.circuit_breakers.items():
-                if breaker["active"]:
-                    # Timeout after 60 seconds
-                    if current_time - breaker["last_trigger"] > 60:
-                        breaker["active"] = False
-                        self.logger.info(f"✅ Circuit breaker timeout: {breaker_name}")
-                        
-        except Exception as e:
-            self.logger.error(f"Error checking circuit breaker timeouts: {e}")
-    
-    async def _attempt_circuit_breaker_recovery(self):
-        """Attempt to recover from circuit breaker state."""
-        try:
-            for breaker_name, breaker in self.circuit_breakers.items():
-                if not breaker["active"] and breaker["trigger_count"] > 0:
-                    # Reset trigger count after successful recovery
-                    breaker["trigger_count"] = 0
-                    self.logger.info(f"✅ Circuit breaker recovered: {breaker_name}")
-                    
         except Exception as e:
-            self.logger.error(f"Error attempting circuit breaker recovery: {e}")
+            self.logger.error(f"Error handling circuit breaker event: {e}")
     
     # ============= ROUTING METHODS =============
     
@@ -800,6 +780,6 @@ class PipelineOrchestrator:
         return {
             "throughput_metrics": self.pipeline_metrics,
             "bottleneck_analysis": self.performance_tracker["bottleneck_analysis"],
-            "circuit_breakers": self.circuit_breakers,
+            "circuit_breakers": self.circuit_breakers.get_status(include_closed=True),
             "last_update": time.time()
         }
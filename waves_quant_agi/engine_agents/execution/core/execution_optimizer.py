@@ -7,7 +7,8 @@ Provides intelligent trade execution optimization and cost management.
 import time
 import asyncio
 from typing import Dict, Any, List, Optional
-from ...shared_utils import get_shared_logger
+from ...shared_utils import get_shared_logger, get_slippage_analytics
+from .order_slicer import OrderSlicingEngine, SlicingAlgorithm
 
 class ExecutionOptimizer:
     """Optimizes trade execution for best price and minimal market impact."""
@@ -21,6 +22,12 @@ class ExecutionOptimizer:
         self.max_slippage = config.get("max_slippage", 0.001)  # 0.1%
         self.min_spread = config.get("min_spread", 0.0001)     # 0.01%
         self.execution_timeout = config.get("execution_timeout", 30)  # seconds
+        self.slicing_threshold = config.get("slicing_threshold_quantity", 1000000)
+        self.slippage_min_samples = config.get("slippage_min_samples", 20)
+        self.slippage_analytics = get_slippage_analytics(config)
+        
+        # Parent order slicing (attached once a broker is available)
+        self.slicing_engine: Optional[OrderSlicingEngine] = None
         
         # Optimization state
         self.optimization_history: List[Dict[str, Any]] = []
@@ -63,6 +70,20 @@ class ExecutionOptimizer:
             if len(self.optimization_history) > 1000:
                 self.optimization_history.pop(0)
             
+            # Hand large orders to the slicing engine as parent orders
+            if optimal_params.get("slice_with_engine") and self.slicing_engine:
+                optimal_params["parent_order_id"] = self.slicing_engine.submit({
+                    "order_id": order_data.get("order_id"),
+                    "symbol": symbol,
+                    "side": order_data.get("side", "buy"),
+                    "quantity": quantity,
+                    "algorithm": optimal_params["execution_strategy"],
+                    "duration_seconds": order_data.get("duration_seconds", self.config.get("slice_default_duration_seconds", 300.0)),
+                    "participation_rate": order_data.get("participation_rate", self.config.get("slice_pov_rate", 0.1)),
+                    "urgency": order_data.get("urgency", self.config.get("slice_is_urgency", 2.0)),
+                    "limit_price": order_data.get("limit_price")
+                })
+            
             self.logger.info(f"Execution optimized for {symbol} order")
             return optimal_params
             
@@ -92,8 +113,21 @@ class ExecutionOptimizer:
         try:
             optimized_order = order_data.copy()
             
+            # Historical slippage tail for this symbol/broker/order type
+            expected_p95 = self.slippage_analytics.expected_slippage(
+                order_data.get("symbol", "unknown"),
+                order_data.get("broker", "*"),
+                order_data.get("order_type", "market"),
+                quantile="p95",
+                min_samples=self.slippage_min_samples
+            )
+            if expected_p95 is not None:
+                optimized_order["expected_slippage_p95"] = expected_p95
+            
             # Adjust order type based on market conditions
-            if market_conditions.get("volatility", 0) > 0.2:  # High volatility
+            if market_conditions.get("volatility", 0) > 0.2 or (
+                expected_p95 is not None and expected_p95 > self.max_slippage
+            ):  # High volatility, or market orders here usually slip past the limit
                 if order_data.get("order_type") == "market":
                     optimized_order["order_type"] = "limit"
                     optimized_order["limit_price"] = self._calculate_limit_price(
@@ -102,9 +136,13 @@ class ExecutionOptimizer:
             
             # Adjust quantity for large orders to minimize market impact
             quantity = order_data.get("quantity", 0.0)
-            if quantity > 1000000:  # Large order
-                optimized_order["quantity"] = self._split_large_order(quantity, market_conditions)
-                optimized_order["execution_strategy"] = "iceberg"
+            if order_data.get("algorithm") or quantity > self.slicing_threshold:  # Large order
+                if self.slicing_engine:
+                    optimized_order["execution_strategy"] = self._select_slicing_algorithm(order_data, market_conditions)
+                    optimized_order["slice_with_engine"] = True
+                elif quantity > self.slicing_threshold:
+                    optimized_order["quantity"] = self._split_large_order(quantity, market_conditions)
+                    optimized_order["execution_strategy"] = "iceberg"
             
             # Set optimal time in force
             if market_conditions.get("liquidity") == "low":
@@ -140,6 +178,34 @@ class ExecutionOptimizer:
             self.logger.error(f"Error calculating limit price: {e}")
             return order_data.get("current_price", 0.0)
     
+    def _select_slicing_algorithm(self, order_data: Dict[str, Any],
+                                  market_conditions: Dict[str, Any]) -> str:
+        """Pick TWAP/VWAP/POV/IS for a parent order."""
+        requested = order_data.get("algorithm")
+        if requested:
+            return SlicingAlgorithm(requested.lower()).value
+        if order_data.get("urgency", 0) >= 2.0 or market_conditions.get("volatility", 0) > 0.2:
+            return SlicingAlgorithm.IS.value  # Front-load when waiting is the bigger risk
+        if order_data.get("participation_rate"):
+            return SlicingAlgorithm.POV.value
+        if market_conditions.get("liquidity") == "low":
+            return SlicingAlgorithm.TWAP.value
+        return SlicingAlgorithm.VWAP.value
+    
+    def should_slice(self, order_data: Dict[str, Any]) -> bool:
+        """Whether an order goes to the slicing engine as a parent (child orders never do)."""
+        if not self.optimization_enabled or not self.slicing_engine or order_data.get("parent_id"):
+            return False
+        quantity = order_data.get("quantity", order_data.get("volume", 0.0)) or 0.0
+        return bool(order_data.get("algorithm")) or quantity > self.slicing_threshold
+    
+    def attach_slicing_engine(self, broker) -> OrderSlicingEngine:
+        """Create the parent order slicing engine on top of a broker adapter."""
+        self.slicing_engine = OrderSlicingEngine(self.config, broker)
+        self.slicing_engine.start()
+        self.logger.info("Order slicing engine attached")
+        return self.slicing_engine
+    
     def _split_large_order(self, quantity: float, market_conditions: Dict[str, Any]) -> List[float]:
         """Split large orders to minimize market impact."""
         try:
@@ -184,7 +250,9 @@ class ExecutionOptimizer:
                 "recent_optimizations": len(recent_optimizations),
                 "market_impact_reduced": market_impact_reduced,
                 "optimization_rate": market_impact_reduced / len(recent_optimizations) if recent_optimizations else 0.0,
-                "last_optimization": self.optimization_history[-1].get("optimization_timestamp") if self.optimization_history else 0
+                "last_optimization": self.optimization_history[-1].get("optimization_timestamp") if self.optimization_history else 0,
+                "slicing": self.slicing_engine.get_stats() if self.slicing_engine else {},
+                "slicing_slippage": self.slicing_engine.get_slippage_summary() if self.slicing_engine else {}
             }
             
         except Exception as e:
@@ -227,6 +295,8 @@ class ExecutionOptimizer:
     async def cleanup(self):
         """Cleanup resources."""
         try:
+            if self.slicing_engine:
+                await self.slicing_engine.stop()
             self.optimization_history.clear()
             self.current_optimizations.clear()
             self.logger.info("Execution Optimizer cleaned up")
@@ -0,0 +1,610 @@
+#!/usr/bin/env python3
+"""
+Order Slicer - Parent order scheduling (TWAP / VWAP / POV / IS)
+Runs many parent orders concurrently on one timing wheel. Each slice sizes its
+child order from live liquidity and spread, and every parent reports realized
+slippage against its arrival price.
+"""
+
+import math
+import time
+import random
+import asyncio
+import itertools
+from collections import OrderedDict
+from enum import Enum
+from typing import Dict, Any, List, Optional, Callable, Awaitable
+
+import numpy as np
+
+from ...shared_utils import get_shared_logger, HierarchicalTimingWheel
+
+
+class SlicingAlgorithm(Enum):
+    """Parent order scheduling algorithms."""
+    TWAP = "twap"    # Even schedule over the horizon
+    VWAP = "vwap"    # Schedule follows the intraday volume curve
+    POV = "pov"      # Fixed share of observed market volume
+    IS = "is"        # Implementation shortfall: front-loaded by urgency
+
+
+# Relative traded volume per GMT hour (Asia quiet, London/New York overlap busiest)
+DEFAULT_HOURLY_VOLUME_CURVE = (
+    0.6, 0.5, 0.5, 0.5, 0.6, 0.7, 0.8, 1.0,
+    1.6, 1.8, 1.6, 1.4, 1.3, 1.8, 2.0, 2.0,
+    1.8, 1.4, 1.0, 0.8, 0.7, 0.6, 0.6, 0.6
+)
+
+
+class VolumeCurve:
+    """Cumulative intraday volume profile for VWAP targets."""
+
+    def __init__(self, weights=DEFAULT_HOURLY_VOLUME_CURVE):
+        weights = np.asarray(weights, dtype=float)
+        self.bucket_seconds = 86400.0 / len(weights)
+        self.edges = np.arange(len(weights) + 1) * self.bucket_seconds
+        self.cumulative = np.concatenate(([0.0], np.cumsum(weights / weights.sum())))
+
+    def _cumulative_at(self, timestamp: float) -> float:
+        days, seconds = divmod(timestamp, 86400.0)
+        return days + float(np.interp(seconds, self.edges, self.cumulative))
+
+    def fraction(self, start: float, end: float, now: float) -> float:
+        """Share of the start..end window's expected volume that trades by ``now``."""
+        total = self._cumulative_at(end) - self._cumulative_at(start)
+        if total <= 0:
+            return 1.0
+        return min(max((self._cumulative_at(now) - self._cumulative_at(start)) / total, 0.0), 1.0)
+
+
+class ParentOrder:
+    """A parent order and its execution progress."""
+
+    def __init__(self, order_id: str, symbol: str, side: str, quantity: float,
+                 algorithm: SlicingAlgorithm, start_time: float, end_time: float,
+                 participation_rate: float, urgency: float, limit_price: Optional[float]):
+        self.order_id = order_id
+        self.symbol = symbol
+        self.side = side.lower()
+        self.sign = 1.0 if self.side == "buy" else -1.0
+        self.quantity = quantity
+        self.algorithm = algorithm
+        self.start_time = start_time
+        self.end_time = end_time
+        self.participation_rate = participation_rate
+        self.urgency = urgency
+        self.limit_price = limit_price
+
+        self.arrival_price = 0.0
+        self.start_volume = 0.0
+        self.filled_quantity = 0.0
+        self.filled_notional = 0.0
+        # Child quantity still working at the venue: neither filled nor free to resend
+        self.pending_quantity = 0.0
+        self.children: List[Dict[str, Any]] = []
+        self.status = "pending"
+        self.in_flight = False
+        self.timer = None
+        self.completed_time = 0.0
+
+    @property
+    def committed(self) -> float:
+        return self.filled_quantity + self.pending_quantity
+
+    @property
+    def remaining(self) -> float:
+        return self.quantity - self.committed
+
+    @property
+    def average_price(self) -> float:
+        return self.filled_notional / self.filled_quantity if self.filled_quantity else 0.0
+
+    def slippage_bps(self) -> float:
+        """Realized slippage against arrival price; positive is a cost."""
+        if not self.filled_quantity or not self.arrival_price:
+            return 0.0
+        return self.sign * (self.average_price - self.arrival_price) / self.arrival_price * 10000
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "order_id": self.order_id,
+            "symbol": self.symbol,
+            "side": self.side,
+            "algorithm": self.algorithm.value,
+            "status": self.status,
+            "quantity": self.quantity,
+            "filled_quantity": self.filled_quantity,
+            "pending_quantity": self.pending_quantity,
+            "average_price": self.average_price,
+            "arrival_price": self.arrival_price,
+            "slippage_bps": round(self.slippage_bps(), 3),
+            "child_orders": len(self.children),
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "completed_time": self.completed_time
+        }
+
+
+class MarketImpactModel:
+    """Square-root impact: temporary cost per child plus a permanent mid shift."""
+
+    def __init__(self, temporary_coefficient: float = 0.1, permanent_coefficient: float = 0.05):
+        self.temporary_coefficient = temporary_coefficient
+        self.permanent_coefficient = permanent_coefficient
+
+    def temporary_impact(self, mid: float, spread: float, volatility: float,
+                         quantity: float, volume_rate: float) -> float:
+        """Price concession paid by one child order (half spread plus impact)."""
+        participation = quantity / max(volume_rate, 1e-9)
+        return spread / 2 + mid * volatility * self.temporary_coefficient * math.sqrt(participation)
+
+    def permanent_impact(self, mid: float, volatility: float, quantity: float, volume_rate: float) -> float:
+        """Mid-price shift left behind by a fill."""
+        return mid * volatility * self.permanent_coefficient * quantity / max(volume_rate, 1e-9)
+
+
+class SimulatedBroker:
+    """Fake broker with a random-walk mid, live volume and impact-driven fills.
+
+    Implements the broker interface the slicer needs:
+    ``get_market_snapshot(symbol)`` and ``async submit_child_order(child)``.
+    """
+
+    def __init__(self, impact_model: Optional[MarketImpactModel] = None, seed: int = 7,
+                 clock=time.monotonic, latency_seconds: float = 0.0):
+        self.impact_model = impact_model or MarketImpactModel()
+        self.random = random.Random(seed)
+        self.clock = clock
+        self.latency_seconds = latency_seconds
+        self.markets: Dict[str, Dict[str, float]] = {}
+        self.fills = 0
+
+    def add_market(self, symbol: str, mid: float, spread: float, volume_rate: float, volatility: float):
+        """volume_rate is market volume per second; volatility is per sqrt(second)."""
+        self.markets[symbol] = {
+            "mid": mid, "spread": spread, "volume_rate": volume_rate, "volatility": volatility,
+            "cumulative_volume": 0.0, "updated": self.clock()
+        }
+
+    def _evolve(self, market: Dict[str, float]):
+        now = self.clock()
+        elapsed = now - market["updated"]
+        if elapsed <= 0:
+            return
+        market["mid"] *= math.exp(market["volatility"] * math.sqrt(elapsed) * self.random.gauss(0.0, 1.0))
+        market["cumulative_volume"] += market["volume_rate"] * elapsed * self.random.uniform(0.5, 1.5)
+        market["updated"] = now
+
+    def get_market_snapshot(self, symbol: str) -> Dict[str, float]:
+        market = self.markets[symbol]
+        self._evolve(market)
+        return {
+            "mid": market["mid"],
+            "spread": market["spread"],
+            "volume_rate": market["volume_rate"],
+            "volatility": market["volatility"],
+            "cumulative_volume": market["cumulative_volume"]
+        }
+
+    async def submit_child_order(self, child: Dict[str, Any]) -> Dict[str, Any]:
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        market = self.markets[child["symbol"]]
+        self._evolve(market)
+        sign = 1.0 if child["side"] == "buy" else -1.0
+        quantity = child["quantity"]
+        concession = self.impact_model.temporary_impact(
+            market["mid"], market["spread"], market["volatility"], quantity, market["volume_rate"]
+        )
+        price = market["mid"] + sign * concession
+        limit_price = child.get("limit_price")
+        if limit_price is not None and sign * (price - limit_price) > 0:
+            return {"status": "rejected", "quantity": 0.0, "price": 0.0, "reason": "limit_price"}
+
+        market["mid"] += sign * self.impact_model.permanent_impact(
+            market["mid"], market["volatility"], quantity, market["volume_rate"]
+        )
+        market["cumulative_volume"] += quantity
+        self.fills += 1
+        return {"status": "filled", "quantity": quantity, "price": price}
+
+
+class AgentOrderBroker:
+    """Slicer broker interface over the live execution path.
+
+    Snapshots come from the ``market_data:{symbol}`` hashes. Children go out
+    through ``submit`` (the execution agent's order request), so they get the
+    normal lifecycle, journal and slippage records. Only fills confirmed on
+    the order state machine count; a child still working when the wait times
+    out is returned with its ``pending_quantity``, and its later fills or
+    cancellation are passed to ``on_child_update`` (set by the slicing engine).
+    """
+
+    def __init__(self, config: Dict[str, Any], redis_conn,
+                 submit: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]], order_states=None):
+        self.redis_conn = redis_conn
+        self.submit = submit
+        self.order_states = order_states
+        self.default_volume_rate = config.get("slice_default_volume_rate", 1000.0)
+        self.fill_timeout = config.get("slice_child_fill_timeout_seconds", 5.0)
+        self.fill_poll_seconds = config.get("slice_child_fill_poll_seconds", 0.05)
+
+        # Working children: order id -> [parent id, reported quantity, reported notional, pending quantity]
+        self.watching: Dict[str, List[Any]] = {}
+        self.on_child_update: Optional[Callable[[str, float, float, float], None]] = None
+        if order_states is not None:
+            order_states.subscribe(self._on_order_update)
+
+    def get_market_snapshot(self, symbol: str) -> Dict[str, float]:
+        data = self.redis_conn.hgetall(f"market_data:{symbol}") if self.redis_conn else {}
+        bid = float(data.get("bid") or 0.0)
+        ask = float(data.get("ask") or 0.0)
+        both_sides = bid > 0 and ask > 0
+        return {
+            "mid": (bid + ask) / 2 if both_sides else float(data.get("price") or 0.0),
+            "spread": ask - bid if both_sides else 0.0,
+            "volume_rate": float(data.get("volume_rate") or self.default_volume_rate),
+            "volatility": float(data.get("volatility") or 0.0),
+            "cumulative_volume": float(data.get("volume") or 0.0)
+        }
+
+    async def submit_child_order(self, child: Dict[str, Any]) -> Dict[str, Any]:
+        expected_price = self.get_market_snapshot(child["symbol"])["mid"]
+        result = await self.submit({
+            **child,
+            "order_type": "limit" if child.get("limit_price") is not None else "market",
+            "price": child.get("limit_price"),
+            "expected_price": expected_price
+        })
+        if not result.get("success", False):
+            return {"status": "rejected", "quantity": 0.0, "price": 0.0, "reason": result.get("error", "")}
+
+        order_id = result.get("order_id")
+        order = self.order_states.get(order_id) if self.order_states is not None and order_id else None
+        if order is None:
+            # No lifecycle to confirm against: only an explicitly reported execution counts
+            quantity = float(result.get("executed_quantity") or 0.0)
+            if quantity <= 0:
+                return {"status": "unfilled", "quantity": 0.0, "price": 0.0, "reason": "no confirmed fill"}
+            return {"status": "filled" if quantity >= child["quantity"] - 1e-9 else "partial",
+                    "quantity": quantity, "price": float(result.get("executed_price") or expected_price)}
+
+        # Wait for the execution reports of a forwarded order
+        deadline = time.monotonic() + self.fill_timeout
+        while order.is_open and time.monotonic() < deadline:
+            await asyncio.sleep(self.fill_poll_seconds)
+        fill = {"order_id": order.client_id, "quantity": order.filled_quantity, "price": order.avg_fill_price}
+        if order.is_open:
+            pending = max(order.quantity - order.filled_quantity, 0.0)
+            self.watching[order.client_id] = [child.get("parent_id"), order.filled_quantity,
+                                              order.filled_quantity * order.avg_fill_price, pending]
+            return {**fill, "status": "working", "pending_quantity": pending}
+        if order.filled_quantity >= order.quantity - 1e-9:
+            return {**fill, "status": "filled"}
+        if order.filled_quantity > 0:
+            return {**fill, "status": "partial", "reason": order.reason}
+        return {**fill, "status": "rejected", "reason": order.reason}
+
+    def _on_order_update(self, order, previous_status):
+        """Pass fills and closes of children that outlived the wait back to their parent."""
+        watch = self.watching.get(order.client_id)
+        if watch is None:
+            return
+        parent_id, reported_quantity, reported_notional, pending = watch
+        notional = order.filled_quantity * order.avg_fill_price
+        fill_quantity = order.filled_quantity - reported_quantity
+        new_pending = max(order.quantity - order.filled_quantity, 0.0) if order.is_open else 0.0
+        if order.is_open:
+            watch[1:] = [order.filled_quantity, notional, new_pending]
+        else:
+            del self.watching[order.client_id]
+        if self.on_child_update is not None and (fill_quantity > 0 or new_pending != pending):
+            self.on_child_update(parent_id, fill_quantity, notional - reported_notional, new_pending - pending)
+
+
+class OrderSlicingEngine:
+    """Schedules child orders for many parent orders on a shared timing wheel."""
+
+    def __init__(self, config: Dict[str, Any], broker, timing_wheel: Optional[HierarchicalTimingWheel] = None):
+        self.config = config
+        self.broker = broker
+        self.logger = get_shared_logger("execution", "order_slicer")
+
+        self.slice_interval = config.get("slice_interval_seconds", 5.0)
+        self.default_duration = config.get("slice_default_duration_seconds", 300.0)
+        self.max_participation = config.get("slice_max_participation", 0.2)
+        self.default_pov_rate = config.get("slice_pov_rate", 0.1)
+        self.default_urgency = config.get("slice_is_urgency", 2.0)
+        self.wide_spread_bps = config.get("slice_wide_spread_bps", 20.0)
+        self.catch_up_fraction = config.get("slice_catch_up_fraction", 0.1)
+        self.min_child_quantity = config.get("slice_min_child_quantity", 0.0)
+        self.retain_finished = config.get("slice_retain_finished_parents", 1000)
+        self.volume_curve = VolumeCurve(config.get("slice_volume_curve", DEFAULT_HOURLY_VOLUME_CURVE))
+
+        self.timing_wheel = timing_wheel or HierarchicalTimingWheel(
+            tick_seconds=config.get("slice_wheel_tick_seconds", 0.01)
+        )
+        self.parents: Dict[str, ParentOrder] = {}
+        self.active: Dict[str, ParentOrder] = {}
+        # Finished parents stay for get_parent_report() up to retain_finished, oldest evicted first
+        self.finished_ids: "OrderedDict[str, None]" = OrderedDict()
+        # Slippage of evicted parents, so the per-algorithm summary survives eviction
+        self.evicted_slippage: Dict[str, Dict[str, float]] = {}
+        self._id_counter = itertools.count(1)
+        self._tasks = set()
+        self.stats = {"parents_submitted": 0, "parents_completed": 0, "child_orders": 0,
+                      "child_rejects": 0, "deferred_slices": 0, "late_fills": 0}
+        if hasattr(broker, "on_child_update"):
+            broker.on_child_update = self.reconcile_child
+
+    # ============= SUBMISSION =============
+
+    def submit(self, order: Dict[str, Any]) -> str:
+        """Start working a parent order; returns its id."""
+        algorithm = SlicingAlgorithm(order.get("algorithm", "twap").lower())
+        now = time.time()
+        duration = order.get("duration_seconds", self.default_duration)
+        parent = ParentOrder(
+            order_id=order.get("order_id") or f"parent_{next(self._id_counter)}",
+            symbol=order["symbol"],
+            side=order.get("side", "buy"),
+            quantity=float(order["quantity"]),
+            algorithm=algorithm,
+            start_time=now,
+            end_time=now + duration,
+            participation_rate=order.get("participation_rate", self.default_pov_rate),
+            urgency=order.get("urgency", self.default_urgency),
+            limit_price=order.get("limit_price")
+        )
+        snapshot = self.broker.get_market_snapshot(parent.symbol)
+        parent.arrival_price = snapshot["mid"]
+        parent.start_volume = snapshot["cumulative_volume"]
+        parent.status = "working"
+
+        self.parents[parent.order_id] = parent
+        self.active[parent.order_id] = parent
+        self.stats["parents_submitted"] += 1
+        self._schedule_next(parent, 0.0)
+        self.logger.info(f"Working {algorithm.value} parent {parent.order_id}: "
+                         f"{parent.side} {parent.quantity} {parent.symbol}")
+        return parent.order_id
+
+    def cancel(self, order_id: str) -> bool:
+        """Stop scheduling further children for a parent."""
+        parent = self.active.pop(order_id, None)
+        if parent is None:
+            return False
+        if parent.timer is not None:
+            self.timing_wheel.cancel(parent.timer)
+        parent.status = "cancelled"
+        parent.completed_time = time.time()
+        self._retire(parent)
+        return True
+
+    def _schedule_next(self, parent: ParentOrder, delay: float):
+        parent.timer = self.timing_wheel.schedule(delay, self._on_slice_timer, parent.order_id)
+
+    def _on_slice_timer(self, order_id: str):
+        parent = self.active.get(order_id)
+        if parent is None or parent.in_flight:
+            return
+        task = asyncio.get_running_loop().create_task(self._work_slice(parent))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    # ============= SCHEDULES =============
+
+    def target_fraction(self, parent: ParentOrder, now: float) -> float:
+        """Share of the parent that should be done by ``now`` under its algorithm."""
+        horizon = parent.end_time - parent.start_time
+        if horizon <= 0 or now >= parent.end_time:
+            return 1.0
+        elapsed = max(now - parent.start_time, 0.0)
+
+        if parent.algorithm == SlicingAlgorithm.TWAP:
+            return elapsed / horizon
+        if parent.algorithm == SlicingAlgorithm.VWAP:
+            return self.volume_curve.fraction(parent.start_time, parent.end_time, now)
+        if parent.algorithm == SlicingAlgorithm.IS:
+            # Almgren-Chriss trajectory: remaining = sinh(k(T-t)) / sinh(kT)
+            kappa = parent.urgency / horizon
+            return 1.0 - math.sinh(kappa * (horizon - elapsed)) / math.sinh(kappa * horizon)
+        return 1.0  # POV has no time schedule; it is sized from volume below
+
+    def size_child(self, parent: ParentOrder, snapshot: Dict[str, float], now: float) -> float:
+        """Child quantity from the schedule, capped by live liquidity and spread."""
+        if parent.algorithm == SlicingAlgorithm.POV:
+            market_volume = snapshot["cumulative_volume"] - parent.start_volume
+            desired = parent.participation_rate * market_volume - parent.committed
+            if now >= parent.end_time:
+                desired = parent.remaining
+        else:
+            desired = self.target_fraction(parent, now) * parent.quantity - parent.committed
+
+        desired = min(desired, parent.remaining)
+        if desired <= 0:
+            return 0.0
+
+        final_slice = now >= parent.end_time
+        if not final_slice:
+            # Never take more than the participation cap of the volume expected this interval
+            liquidity_cap = self.max_participation * snapshot["volume_rate"] * self.slice_interval
+            desired = min(desired, max(liquidity_cap, self.min_child_quantity))
+
+            # Wide spread: wait unless the parent has fallen materially behind schedule
+            spread_bps = snapshot["spread"] / snapshot["mid"] * 10000 if snapshot["mid"] else 0.0
+            if spread_bps > self.wide_spread_bps and desired < self.catch_up_fraction * parent.quantity:
+                self.stats["deferred_slices"] += 1
+                return 0.0
+
+            if desired < self.min_child_quantity:
+                return 0.0
+        return desired
+
+    # ============= EXECUTION =============
+
+    async def _work_slice(self, parent: ParentOrder):
+        parent.in_flight = True
+        try:
+            now = time.time()
+            snapshot = self.broker.get_market_snapshot(parent.symbol)
+            quantity = self.size_child(parent, snapshot, now)
+            if quantity > 0:
+                child = {
+                    "parent_id": parent.order_id,
+                    "symbol": parent.symbol,
+                    "side": parent.side,
+                    "quantity": quantity,
+                    "limit_price": parent.limit_price
+                }
+                fill = await self.broker.submit_child_order(child)
+                self.stats["child_orders"] += 1
+                # Only confirmed fills count; a still-working child holds its rest as pending
+                if fill.get("quantity", 0) > 0:
+                    parent.filled_quantity += fill["quantity"]
+                    parent.filled_notional += fill["quantity"] * fill["price"]
+                parent.pending_quantity += fill.get("pending_quantity", 0.0)
+                if fill.get("quantity", 0) <= 0 and not fill.get("pending_quantity"):
+                    self.stats["child_rejects"] += 1
+                parent.children.append({**child, **fill, "timestamp": now})
+        except Exception as e:
+            self.logger.error(f"Error working slice for {parent.order_id}: {e}")
+        finally:
+            parent.in_flight = False
+
+        if parent.order_id not in self.active:
+            return
+        if parent.quantity - parent.filled_quantity <= 1e-9:
+            self._complete(parent, "filled")
+        elif time.time() >= parent.end_time:
+            if parent.pending_quantity > 1e-9:
+                # Past the horizon with children still working: wait for them before resending or stopping
+                self._schedule_next(parent, self.slice_interval)
+            else:
+                # The forced final slice could not fill (e.g. limit price); stop here
+                self._complete(parent, "expired")
+        else:
+            remaining_time = parent.end_time - time.time()
+            self._schedule_next(parent, min(self.slice_interval, max(remaining_time, 0.0)))
+
+    def reconcile_child(self, parent_id: str, fill_quantity: float, fill_notional: float, pending_change: float):
+        """Apply a late fill or close of a child that was still working when its slice returned."""
+        parent = self.parents.get(parent_id)
+        if parent is None:
+            return
+        if fill_quantity > 0:
+            self.stats["late_fills"] += 1
+            parent.filled_quantity += fill_quantity
+            parent.filled_notional += fill_notional
+        pending = parent.pending_quantity + pending_change
+        parent.pending_quantity = pending if pending > 1e-9 else 0.0
+        if parent.quantity - parent.filled_quantity > 1e-9:
+            return
+        if parent.order_id in self.active:
+            if parent.timer is not None:
+                self.timing_wheel.cancel(parent.timer)
+            self._complete(parent, "filled")
+        elif parent.status == "expired":
+            parent.status = "filled"
+
+    def _complete(self, parent: ParentOrder, status: str):
+        self.active.pop(parent.order_id, None)
+        parent.status = status
+        parent.completed_time = time.time()
+        self.stats["parents_completed"] += 1
+        self.logger.info(f"Parent {parent.order_id} {status}: {parent.filled_quantity}/{parent.quantity} "
+                         f"at {parent.average_price:.6f}, slippage {parent.slippage_bps():.2f}bps")
+        self._retire(parent)
+
+    def _retire(self, parent: ParentOrder):
+        self.finished_ids[parent.order_id] = None
+        while len(self.finished_ids) > self.retain_finished:
+            evicted_id, _ = self.finished_ids.popitem(last=False)
+            evicted = self.parents.pop(evicted_id, None)
+            if evicted is not None and evicted.filled_quantity:
+                self._add_slippage(self.evicted_slippage, evicted)
+
+    @staticmethod
+    def _add_slippage(summary: Dict[str, Dict[str, float]], parent: ParentOrder):
+        bucket = summary.setdefault(parent.algorithm.value, {"orders": 0, "quantity": 0.0, "weighted_bps": 0.0})
+        bucket["orders"] += 1
+        bucket["quantity"] += parent.filled_quantity
+        bucket["weighted_bps"] += parent.slippage_bps() * parent.filled_quantity
+
+    # ============= LIFECYCLE / REPORTING =============
+
+    def start(self):
+        """Start the timing wheel driver on the running loop."""
+        return self.timing_wheel.start()
+
+    async def stop(self):
+        """Stop the wheel and wait for in-flight child orders."""
+        await self.timing_wheel.stop()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def wait_all(self, poll_seconds: float = 0.05):
+        """Wait until every parent order has finished."""
+        while self.active:
+            await asyncio.sleep(poll_seconds)
+
+    def get_parent_report(self, order_id: str) -> Optional[Dict[str, Any]]:
+        """Progress and realized slippage for one parent."""
+        parent = self.parents.get(order_id)
+        return parent.to_dict() if parent else None
+
+    def get_slippage_summary(self) -> Dict[str, Any]:
+        """Quantity-weighted realized slippage against arrival, per algorithm."""
+        summary = {algorithm: dict(bucket) for algorithm, bucket in self.evicted_slippage.items()}
+        for parent in self.parents.values():
+            if parent.filled_quantity:
+                self._add_slippage(summary, parent)
+        return {
+            algorithm: {
+                "orders": bucket["orders"],
+                "filled_quantity": bucket["quantity"],
+                "avg_slippage_bps": round(bucket["weighted_bps"] / bucket["quantity"], 3)
+            }
+            for algorithm, bucket in summary.items()
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Engine counters."""
+        return {
+            "active_parents": len(self.active),
+            "retained_parents": len(self.parents),
+            "timing_wheel": self.timing_wheel.get_stats(),
+            **self.stats
+        }
+
+
+if __name__ == "__main__":
+    async def simulate_slicing(parents_per_algorithm: int = 50, duration: float = 2.0):
+        """Work TWAP/VWAP/POV/IS parents concurrently against the fake broker."""
+        broker = SimulatedBroker()
+        for i in range(10):
+            broker.add_market(f"SYM{i}", mid=100.0, spread=0.01, volume_rate=5000.0, volatility=0.0005)
+        engine = OrderSlicingEngine({"slice_interval_seconds": 0.1}, broker)
+        engine.start()
+
+        for algorithm in SlicingAlgorithm:
+            for i in range(parents_per_algorithm):
+                engine.submit({
+                    "symbol": f"SYM{i % 10}",
+                    "side": "buy" if i % 2 else "sell",
+                    "quantity": 2000.0,
+                    "algorithm": algorithm.value,
+                    "duration_seconds": duration,
+                    "participation_rate": 0.1
+                })
+        started = time.perf_counter()
+        await engine.wait_all()
+        elapsed = time.perf_counter() - started
+        await engine.stop()
+
+        print(f"🧪 {engine.stats['parents_completed']} parents done in {elapsed:.2f}s, "
+              f"{engine.stats['child_orders']} child orders")
+        for algorithm, summary in engine.get_slippage_summary().items():
+            print(f"   {algorithm}: {summary}")
+
+    asyncio.run(simulate_slicing())
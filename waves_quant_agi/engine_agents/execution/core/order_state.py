@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+Order State - Event-driven order lifecycle with write-behind persistence
+Single in-memory state machine (new -> sent -> ack -> partial -> filled /
+cancelled / rejected) with O(1) lookups by client and broker id. Every
+transition is appended to a batched journal (Redis list or local JSON lines
+file) that is replayed on startup for crash recovery.
+"""
+
+import os
+import json
+import time
+import asyncio
+from enum import Enum
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Callable
+from ...shared_utils import get_shared_logger
+
+
+class OrderStatus(Enum):
+    NEW = "new"
+    SENT = "sent"
+    ACK = "ack"
+    PARTIAL = "partial"
+    FILLED = "filled"
+    CANCELLED = "cancelled"
+    REJECTED = "rejected"
+
+
+TERMINAL_STATUSES = frozenset((OrderStatus.FILLED, OrderStatus.CANCELLED, OrderStatus.REJECTED))
+
+# Fills may arrive before the ack, so SENT can move straight to PARTIAL/FILLED
+ALLOWED_TRANSITIONS = {
+    OrderStatus.NEW: frozenset((OrderStatus.SENT, OrderStatus.CANCELLED, OrderStatus.REJECTED)),
+    OrderStatus.SENT: frozenset((OrderStatus.ACK, OrderStatus.PARTIAL, OrderStatus.FILLED,
+                                 OrderStatus.CANCELLED, OrderStatus.REJECTED)),
+    OrderStatus.ACK: frozenset((OrderStatus.PARTIAL, OrderStatus.FILLED,
+                                OrderStatus.CANCELLED, OrderStatus.REJECTED)),
+    OrderStatus.PARTIAL: frozenset((OrderStatus.PARTIAL, OrderStatus.FILLED, OrderStatus.CANCELLED)),
+}
+
+
+class ManagedOrder:
+    """Current state of one order."""
+
+    __slots__ = ("client_id", "broker_id", "symbol", "side", "quantity", "price", "strategy",
+                 "status", "filled_quantity", "avg_fill_price", "reason", "created_at", "updated_at")
+
+    def __init__(self, client_id: str, symbol: str, side: str, quantity: float,
+                 price: Optional[float] = None, strategy: str = ""):
+        self.client_id = client_id
+        self.broker_id: Optional[str] = None
+        self.symbol = symbol
+        self.side = side
+        self.quantity = quantity
+        self.price = price
+        self.strategy = strategy
+        self.status = OrderStatus.NEW
+        self.filled_quantity = 0.0
+        self.avg_fill_price = 0.0
+        self.reason = ""
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+
+    @property
+    def is_open(self) -> bool:
+        return self.status not in TERMINAL_STATUSES
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "client_id": self.client_id,
+            "broker_id": self.broker_id,
+            "symbol": self.symbol,
+            "side": self.side,
+            "quantity": self.quantity,
+            "price": self.price,
+            "strategy": self.strategy,
+            "status": self.status.value,
+            "filled_quantity": self.filled_quantity,
+            "avg_fill_price": self.avg_fill_price,
+            "reason": self.reason,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ManagedOrder":
+        order = cls(data["client_id"], data["symbol"], data["side"], data["quantity"],
+                    data.get("price"), data.get("strategy", ""))
+        order.broker_id = data.get("broker_id")
+        order.status = OrderStatus(data["status"])
+        order.filled_quantity = data.get("filled_quantity", 0.0)
+        order.avg_fill_price = data.get("avg_fill_price", 0.0)
+        order.reason = data.get("reason", "")
+        order.created_at = data.get("created_at", order.created_at)
+        order.updated_at = data.get("updated_at", order.updated_at)
+        return order
+
+
+class WriteBehindJournal:
+    """Append-only, batched order event log.
+
+    ``append`` only buffers; a background task flushes every
+    ``order_journal_flush_interval`` seconds or once ``order_journal_batch_size``
+    records are pending, with one RPUSH (Redis) or one write (file) per batch.
+    Records that fail to flush are kept for the next attempt.
+    """
+
+    def __init__(self, config: Dict[str, Any], redis_async=None):
+        self.logger = get_shared_logger("execution", "order_journal")
+        self.redis = redis_async if config.get("order_journal_backend", "redis") == "redis" else None
+        self.key = config.get("order_journal_key", "execution:order_journal")
+        self.path = config.get("order_journal_path", os.path.join("logs", "execution", "order_journal.jsonl"))
+        self.flush_interval = config.get("order_journal_flush_interval", 0.05)
+        self.batch_size = config.get("order_journal_batch_size", 256)
+        self.fsync = config.get("order_journal_fsync", False)
+
+        self.buffer: List[str] = []
+        self._wakeup = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self.flush_task: Optional[asyncio.Task] = None
+        self.generation = 0
+        self.stats = {"appended": 0, "flushed": 0, "batches": 0, "flush_errors": 0}
+
+    @property
+    def backend(self) -> str:
+        return "redis" if self.redis is not None else "file"
+
+    def append(self, record: Dict[str, Any]):
+        self.buffer.append(json.dumps(record, separators=(",", ":")))
+        self.stats["appended"] += 1
+        if len(self.buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        async with self._lock:
+            if not self.buffer:
+                return 0
+            batch, self.buffer = self.buffer, []
+            generation = self.generation
+            try:
+                if self.redis is not None:
+                    await self.redis.rpush(self.key, *batch)
+                else:
+                    self._write_lines(batch, "a")
+            except Exception as e:
+                # Keep ordering: failed records go back in front of newer ones,
+                # unless a compaction snapshot already covers them
+                if generation == self.generation:
+                    self.buffer = batch + self.buffer
+                self.stats["flush_errors"] += 1
+                self.logger.error(f"Order journal flush failed ({len(batch)} records pending): {e}")
+                return 0
+            self.stats["flushed"] += len(batch)
+            self.stats["batches"] += 1
+            return len(batch)
+
+    def _write_lines(self, lines: List[str], mode: str, path: Optional[str] = None):
+        path = path or self.path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, mode) as handle:
+            handle.write("\n".join(lines) + "\n")
+            if self.fsync:
+                handle.flush()
+                os.fsync(handle.fileno())
+
+    async def replay(self) -> List[Dict[str, Any]]:
+        """All persisted records, oldest first."""
+        if self.redis is not None:
+            lines = await self.redis.lrange(self.key, 0, -1)
+        elif os.path.exists(self.path):
+            with open(self.path) as handle:
+                lines = handle.read().splitlines()
+        else:
+            lines = []
+
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except (TypeError, json.JSONDecodeError):
+                # A torn final write after a crash is expected; skip it
+                self.logger.warning("Skipping unreadable order journal record")
+        return records
+
+    async def compact(self, snapshot: List[Dict[str, Any]]):
+        """Replace the log with a snapshot of the current state.
+
+        Must be called right after the snapshot is taken: buffered records are
+        already part of it and are dropped, anything appended later is kept.
+        """
+        self.buffer = []
+        self.generation += 1
+        async with self._lock:
+            lines = [json.dumps(record, separators=(",", ":")) for record in snapshot]
+            if self.redis is not None:
+                pipe = self.redis.pipeline(transaction=True)
+                pipe.delete(self.key)
+                if lines:
+                    pipe.rpush(self.key, *lines)
+                await pipe.execute()
+            else:
+                temp_path = self.path + ".tmp"
+                if lines:
+                    self._write_lines(lines, "w", temp_path)
+                else:
+                    open(temp_path, "w").close()
+                os.replace(temp_path, self.path)
+
+    async def start(self):
+        if self.flush_task is None:
+            self.flush_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        if self.flush_task:
+            self.flush_task.cancel()
+            self.flush_task = None
+        await self.flush()
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                await self.flush()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                self.logger.error(f"Error in order journal flush loop: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"backend": self.backend, "pending": len(self.buffer), **self.stats}
+
+
+class OrderStateMachine:
+    """In-memory order lifecycle, updated by broker/execution events.
+
+    Transitions are validated against ALLOWED_TRANSITIONS; invalid ones are
+    logged and ignored (e.g. a late cancel ack after a fill). Listeners are
+    called with (order, previous_status) after every transition. Terminal
+    orders are kept for ``order_state_retain_terminal`` lookups, then evicted.
+    """
+
+    def __init__(self, config: Dict[str, Any], journal: Optional[WriteBehindJournal] = None):
+        self.logger = get_shared_logger("execution", "order_state")
+        self.journal = journal
+        self.retain_terminal = config.get("order_state_retain_terminal", 10000)
+        self.compact_after = config.get("order_journal_compact_after", 100000)
+
+        self.orders: Dict[str, ManagedOrder] = {}
+        self.broker_index: Dict[str, str] = {}
+        self.open_ids: Dict[str, None] = {}
+        self.terminal_ids: "OrderedDict[str, None]" = OrderedDict()
+        self.listeners: List[Callable[[ManagedOrder, Optional[OrderStatus]], Any]] = []
+        self._replaying = False
+        self.stats = {"created": 0, "transitions": 0, "invalid_transitions": 0,
+                      "unknown_orders": 0, "recovered": 0, "expired": 0}
+
+    def subscribe(self, listener: Callable[[ManagedOrder, Optional[OrderStatus]], Any]):
+        """Register a callback for every new order and transition."""
+        self.listeners.append(listener)
+
+    # ============= LOOKUPS =============
+
+    def get(self, client_id: str) -> Optional[ManagedOrder]:
+        return self.orders.get(client_id)
+
+    def get_by_broker(self, broker_id: str) -> Optional[ManagedOrder]:
+        client_id = self.broker_index.get(str(broker_id))
+        return self.orders.get(client_id) if client_id is not None else None
+
+    def _find(self, order_id: str) -> Optional[ManagedOrder]:
+        return self.orders.get(order_id) or self.get_by_broker(order_id)
+
+    def open_orders(self) -> List[ManagedOrder]:
+        return [self.orders[client_id] for client_id in self.open_ids]
+
+    # ============= EVENTS =============
+
+    def create(self, client_id: str, symbol: str, side: str, quantity: float,
+               price: Optional[float] = None, strategy: str = "") -> ManagedOrder:
+        """Register a new order; re-creating an existing client id returns it unchanged."""
+        existing = self.orders.get(client_id)
+        if existing is not None:
+            return existing
+        order = ManagedOrder(client_id, symbol, side, float(quantity), price, strategy)
+        self.orders[client_id] = order
+        self.open_ids[client_id] = None
+        self.stats["created"] += 1
+        self._record({"e": "new", "id": client_id, "s": symbol, "d": side, "q": order.quantity,
+                      "p": price, "st": strategy, "t": order.created_at})
+        self._notify(order, None)
+        return order
+
+    def mark_sent(self, client_id: str) -> bool:
+        return self._transition(client_id, OrderStatus.SENT)
+
+    def acknowledge(self, order_id: str, broker_id: Optional[str] = None) -> bool:
+        return self._transition(order_id, OrderStatus.ACK, broker_id=broker_id)
+
+    def fill(self, order_id: str, quantity: float, price: float, broker_id: Optional[str] = None) -> bool:
+        """Apply an incremental fill; the order becomes FILLED once fully filled."""
+        return self._transition(order_id, OrderStatus.PARTIAL, broker_id=broker_id,
+                                fill_quantity=float(quantity), fill_price=float(price))
+
+    def cancel(self, order_id: str, reason: str = "") -> bool:
+        return self._transition(order_id, OrderStatus.CANCELLED, reason=reason)
+
+    def reject(self, order_id: str, reason: str = "") -> bool:
+        return self._transition(order_id, OrderStatus.REJECTED, reason=reason)
+
+    def expire_unreported(self, max_age: float, now: Optional[float] = None) -> List[str]:
+        """Cancel SENT orders that got no execution report within ``max_age`` seconds; returns their ids."""
+        now = time.time() if now is None else now
+        stale = [client_id for client_id in self.open_ids
+                 if self.orders[client_id].status == OrderStatus.SENT
+                 and now - self.orders[client_id].updated_at >= max_age]
+        for client_id in stale:
+            self.cancel(client_id, "expired: no execution report")
+        self.stats["expired"] += len(stale)
+        return stale
+
+    def _transition(self, order_id: str, status: OrderStatus, broker_id: Optional[str] = None,
+                    fill_quantity: float = 0.0, fill_price: float = 0.0, reason: str = "") -> bool:
+        order = self._find(order_id)
+        if order is None:
+            self.stats["unknown_orders"] += 1
+            self.logger.warning(f"Event {status.value} for unknown order {order_id}")
+            return False
+
+        total = order.filled_quantity + fill_quantity
+        if fill_quantity > 0 and total >= order.quantity - 1e-12:
+            status = OrderStatus.FILLED
+
+        previous = order.status
+        if status not in ALLOWED_TRANSITIONS.get(previous, ()):
+            self.stats["invalid_transitions"] += 1
+            self.logger.warning(f"Ignoring {previous.value} -> {status.value} for order {order.client_id}")
+            return False
+
+        if fill_quantity > 0:
+            order.avg_fill_price = (order.avg_fill_price * order.filled_quantity + fill_price * fill_quantity) / total
+            order.filled_quantity = total
+        if broker_id is not None and order.broker_id is None:
+            order.broker_id = str(broker_id)
+            self.broker_index[order.broker_id] = order.client_id
+        order.status = status
+        order.updated_at = time.time()
+        if reason:
+            order.reason = reason
+        self.stats["transitions"] += 1
+
+        record = {"e": status.value, "id": order.client_id, "t": order.updated_at}
+        if broker_id is not None:
+            record["b"] = str(broker_id)
+        if fill_quantity > 0:
+            record["fq"] = fill_quantity
+            record["fp"] = fill_price
+        if reason:
+            record["r"] = reason
+        self._record(record)
+
+        if status in TERMINAL_STATUSES:
+            self._retire(order.client_id)
+        self._notify(order, previous)
+        return True
+
+    def _retire(self, client_id: str):
+        self.open_ids.pop(client_id, None)
+        self.terminal_ids[client_id] = None
+        while len(self.terminal_ids) > self.retain_terminal:
+            evicted, _ = self.terminal_ids.popitem(last=False)
+            order = self.orders.pop(evicted, None)
+            if order is not None and order.broker_id is not None:
+                self.broker_index.pop(order.broker_id, None)
+
+    def _record(self, record: Dict[str, Any]):
+        if self.journal is not None and not self._replaying:
+            self.journal.append(record)
+
+    def _notify(self, order: ManagedOrder, previous: Optional[OrderStatus]):
+        if self._replaying:
+            return
+        for listener in self.listeners:
+            try:
+                result = listener(order, previous)
+                if asyncio.iscoroutine(result):
+                    asyncio.get_running_loop().create_task(result)
+            except Exception as e:
+                self.logger.error(f"Order state listener error: {e}")
+
+    # ============= RECOVERY =============
+
+    async def recover(self) -> int:
+        """Rebuild state by replaying the journal; returns how many orders are open afterwards."""
+        if self.journal is None:
+            return 0
+        records = await self.journal.replay()
+        self._replaying = True
+        try:
+            for record in records:
+                self._apply_record(record)
+        finally:
+            self._replaying = False
+        self.stats["recovered"] = len(self.open_ids)
+        self.logger.info(f"Recovered {len(self.orders)} orders ({len(self.open_ids)} open) "
+                         f"from {len(records)} journal records")
+        if len(records) > self.compact_after:
+            await self.compact()
+        return len(self.open_ids)
+
+    def _apply_record(self, record: Dict[str, Any]):
+        event = record.get("e")
+        client_id = record.get("id")
+        if event == "snapshot":
+            order = ManagedOrder.from_dict(record["order"])
+            self.orders[order.client_id] = order
+            if order.broker_id is not None:
+                self.broker_index[order.broker_id] = order.client_id
+            if order.is_open:
+                self.open_ids[order.client_id] = None
+            else:
+                self._retire(order.client_id)
+        elif event == "new":
+            order = self.create(client_id, record["s"], record["d"], record["q"], record.get("p"), record.get("st", ""))
+            order.created_at = order.updated_at = record.get("t", order.created_at)
+        elif event in ("partial", "filled"):
+            self._transition(client_id, OrderStatus.PARTIAL, broker_id=record.get("b"),
+                             fill_quantity=record.get("fq", 0.0), fill_price=record.get("fp", 0.0))
+            if event == "filled" and not record.get("fq"):
+                self._transition(client_id, OrderStatus.FILLED)
+        elif event is not None:
+            self._transition(client_id, OrderStatus(event), broker_id=record.get("b"), reason=record.get("r", ""))
+
+    async def compact(self):
+        """Rewrite the journal as one snapshot record per retained order."""
+        if self.journal is None:
+            return
+        snapshot = [{"e": "snapshot", "order": order.to_dict()} for order in self.orders.values()]
+        await self.journal.compact(snapshot)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """State machine counters."""
+        return {
+            "tracked_orders": len(self.orders),
+            "open_orders": len(self.open_ids),
+            "journal": self.journal.get_stats() if self.journal else None,
+            **self.stats
+        }
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Signal Intake - Batched execution signal consumption
+Pulls execution signals in blocking batches instead of one LPOP per signal:
+a Redis Stream consumer group (acknowledged, redelivered after a crash) or a
+plain list drained with BLMPOP/LPOP count. Batch size adapts to the backlog.
+"""
+
+import json
+import time
+import socket
+from typing import Dict, Any, List, Optional, Tuple
+
+
+class AdaptiveBatchSize:
+    """Grows the batch while reads come back full, shrinks it when they come back sparse."""
+
+    def __init__(self, minimum: int = 10, maximum: int = 500, initial: Optional[int] = None):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.current = initial or minimum
+
+    def update(self, received: int) -> int:
+        if received >= self.current:
+            self.current = min(self.current * 2, self.maximum)
+        elif received < self.current // 4:
+            self.current = max(self.current // 2, self.minimum)
+        return self.current
+
+
+class SignalIntake:
+    """Batched reader for the execution signal queue.
+
+    ``stream`` mode (default) uses XREADGROUP with COUNT/BLOCK. Entries stay
+    pending until ack() and are reclaimed with XAUTOCLAIM once idle longer
+    than ``signal_claim_idle_ms``, so a crashed consumer's signals are
+    redelivered. ``list`` mode keeps the legacy ``execution:signals`` list and
+    gives at-most-once delivery.
+    """
+
+    def __init__(self, redis_async, config: Dict[str, Any]):
+        self.redis = redis_async
+        self.mode = config.get("signal_intake_mode", "stream")
+        self.list_key = config.get("signal_list_key", "execution:signals")
+        self.stream_key = config.get("signal_stream_key", "execution:signals:stream")
+        self.group = config.get("signal_consumer_group", "execution_bridge")
+        self.consumer = config.get("signal_consumer_name", f"{socket.gethostname()}:{id(self)}")
+        self.block_ms = config.get("signal_block_ms", 1000)
+        self.claim_idle_ms = config.get("signal_claim_idle_ms", 30000)
+        self.claim_interval = config.get("signal_claim_interval_seconds", 5.0)
+        self.stream_maxlen = config.get("signal_stream_maxlen", 100000)
+        self.batch_size = AdaptiveBatchSize(
+            minimum=config.get("signal_batch_min", 10),
+            maximum=config.get("signal_batch_max", 500)
+        )
+
+        self._group_ready = False
+        self._recovered_own_pending = False
+        self._last_claim = 0.0
+        self.stats = {
+            "batches": 0,
+            "signals_received": 0,
+            "signals_acked": 0,
+            "signals_redelivered": 0,
+            "invalid_payloads": 0,
+            "empty_reads": 0
+        }
+
+    # ============= PRODUCER SIDE =============
+
+    async def send(self, signal: Dict[str, Any]) -> bool:
+        """Enqueue a signal for the intake mode in use."""
+        payload = json.dumps(signal)
+        if self.mode == "stream":
+            await self.redis.xadd(self.stream_key, {"signal": payload},
+                                  maxlen=self.stream_maxlen, approximate=True)
+        else:
+            await self.redis.rpush(self.list_key, payload)
+        return True
+
+    # ============= CONSUMER SIDE =============
+
+    async def next_batch(self) -> List[Tuple[Optional[str], Dict[str, Any]]]:
+        """Block up to ``signal_block_ms`` for signals; returns (entry_id, signal) pairs.
+
+        entry_id is None in list mode, where there is nothing to acknowledge.
+        """
+        if self.mode == "stream":
+            entries = await self._read_stream()
+        else:
+            entries = await self._read_list()
+
+        self.stats["batches"] += 1
+        if entries:
+            self.stats["signals_received"] += len(entries)
+        else:
+            self.stats["empty_reads"] += 1
+        self.batch_size.update(len(entries))
+        return entries
+
+    async def ack(self, entry_ids: List[Optional[str]]) -> int:
+        """Acknowledge processed stream entries so they are not redelivered."""
+        ids = [entry_id for entry_id in entry_ids if entry_id is not None]
+        if not ids or self.mode != "stream":
+            return 0
+        acked = await self.redis.xack(self.stream_key, self.group, *ids)
+        self.stats["signals_acked"] += acked
+        return acked
+
+    async def _read_list(self) -> List[Tuple[Optional[str], Dict[str, Any]]]:
+        count = self.batch_size.current
+        # Non-blocking drain first; block only when the queue is empty
+        raw = await self.redis.lpop(self.list_key, count)
+        if not raw:
+            popped = await self.redis.blmpop(self.block_ms / 1000, 1, self.list_key,
+                                             direction="LEFT", count=count)
+            raw = popped[1] if popped else []
+        return [(None, signal) for signal in map(self._decode, raw) if signal is not None]
+
+    async def _ensure_group(self):
+        if self._group_ready:
+            return
+        try:
+            await self.redis.xgroup_create(self.stream_key, self.group, id="0", mkstream=True)
+        except Exception as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._group_ready = True
+
+    async def _read_stream(self) -> List[Tuple[Optional[str], Dict[str, Any]]]:
+        await self._ensure_group()
+        count = self.batch_size.current
+
+        # After a restart, first replay what this consumer read but never acked
+        if not self._recovered_own_pending:
+            response = await self.redis.xreadgroup(self.group, self.consumer, {self.stream_key: "0"}, count=count)
+            entries = self._parse_stream_response(response)
+            if entries:
+                self.stats["signals_redelivered"] += len(entries)
+                return await self._drop_invalid(entries)
+            self._recovered_own_pending = True
+
+        # Periodically take over entries stuck with consumers that died
+        now = time.time()
+        if now - self._last_claim >= self.claim_interval:
+            self._last_claim = now
+            claimed = await self._claim_stale(count)
+            if claimed:
+                return claimed
+
+        response = await self.redis.xreadgroup(self.group, self.consumer, {self.stream_key: ">"},
+                                               count=count, block=self.block_ms)
+        return await self._drop_invalid(self._parse_stream_response(response))
+
+    async def _claim_stale(self, count: int) -> List[Tuple[Optional[str], Dict[str, Any]]]:
+        response = await self.redis.xautoclaim(self.stream_key, self.group, self.consumer,
+                                               min_idle_time=self.claim_idle_ms, start_id="0-0", count=count)
+        messages = response[1] if response and len(response) > 1 else []
+        entries = [(entry_id, fields) for entry_id, fields in messages if fields]
+        if entries:
+            self.stats["signals_redelivered"] += len(entries)
+        return await self._drop_invalid([(entry_id, self._decode(fields.get("signal")))
+                                         for entry_id, fields in entries])
+
+    def _parse_stream_response(self, response) -> List[Tuple[Optional[str], Optional[Dict[str, Any]]]]:
+        entries = []
+        for _stream, messages in response or []:
+            for entry_id, fields in messages:
+                entries.append((entry_id, self._decode((fields or {}).get("signal"))))
+        return entries
+
+    async def _drop_invalid(self, entries) -> List[Tuple[Optional[str], Dict[str, Any]]]:
+        """Ack undecodable entries right away so they are not redelivered forever."""
+        invalid = [entry_id for entry_id, signal in entries if signal is None]
+        if invalid:
+            await self.ack(invalid)
+        return [(entry_id, signal) for entry_id, signal in entries if signal is not None]
+
+    def _decode(self, payload) -> Optional[Dict[str, Any]]:
+        if payload is None:
+            self.stats["invalid_payloads"] += 1
+            return None
+        try:
+            signal = json.loads(payload)
+        except (TypeError, json.JSONDecodeError):
+            self.stats["invalid_payloads"] += 1
+            return None
+        if not isinstance(signal, dict):
+            self.stats["invalid_payloads"] += 1
+            return None
+        return signal
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Intake counters."""
+        return {
+            "mode": self.mode,
+            "batch_size": self.batch_size.current,
+            **self.stats
+        }
@@ -6,9 +6,11 @@ Provides comprehensive slippage management and monitoring for trade execution.
 
 import time
 import asyncio
+import itertools
+from collections import deque
 from enum import Enum
 from typing import Dict, Any, List, Optional, Tuple
-from ...shared_utils import get_shared_logger
+from ...shared_utils import get_shared_logger, get_slippage_analytics
 
 class SlippageType(Enum):
     """Types of slippage."""
@@ -42,8 +44,11 @@ class SlippageManager:
         self.slippage_alert_threshold = config.get("slippage_alert_threshold", 0.0005)  # 0.05%
         self.slippage_monitoring_enabled = config.get("slippage_monitoring_enabled", True)
         
-        # Slippage tracking
-        self.slippage_history: List[Dict[str, Any]] = []
+        # Slippage tracking (bounded; per-symbol views avoid filtering on every read)
+        self.history_limit = config.get("slippage_history_limit", 1000)
+        self.slippage_history: deque = deque(maxlen=self.history_limit)
+        self.symbol_history: Dict[str, deque] = {}
+        self.analytics = get_slippage_analytics(config)
         self.active_alerts: List[SlippageAlert] = []
         self.slippage_stats = {
             "total_trades": 0,
@@ -146,7 +151,8 @@ class SlippageManager:
             return 0.0, SlippageType.ZERO
     
     def record_slippage(self, symbol: str, order_id: str, expected_price: float, 
-                        actual_price: float, order_size: float = 0.0):
+                        actual_price: float, order_size: float = 0.0, side: Optional[str] = None,
+                        broker: str = "unknown", order_type: str = "market"):
         """Record slippage for a trade."""
         try:
             slippage_amount, slippage_type = self.calculate_slippage(expected_price, actual_price)
@@ -165,6 +171,19 @@ class SlippageManager:
             
             # Add to history
             self.slippage_history.append(slippage_record)
+            history = self.symbol_history.get(symbol)
+            if history is None:
+                history = self.symbol_history[symbol] = deque(maxlen=self.history_limit)
+            history.append(slippage_record)
+            
+            # Streaming quantiles are signed as a cost, which needs the side
+            if side:
+                self.analytics.record(
+                    symbol,
+                    self.analytics.to_cost(expected_price, actual_price, side),
+                    broker=broker,
+                    order_type=order_type
+                )
             
             # Update statistics
             self._update_slippage_stats(slippage_amount, slippage_type)
@@ -188,10 +207,6 @@ class SlippageManager:
                 )
                 self.active_alerts.append(alert)
             
-            # Keep only last 1000 records to prevent memory bloat
-            if len(self.slippage_history) > 1000:
-                self.slippage_history.pop(0)
-            
             self.logger.debug(f"Recorded slippage: {symbol} {order_id} {slippage_amount:.6f}")
         
         except Exception as e:
@@ -260,17 +275,19 @@ class SlippageManager:
     def get_recent_slippage(self, symbol: str = None, limit: int = 100) -> List[Dict[str, Any]]:
         """Get recent slippage records."""
         try:
-            recent_records = self.slippage_history[-limit:] if limit > 0 else self.slippage_history
-            
-            if symbol:
-                return [record for record in recent_records if record["symbol"] == symbol]
-            
-            return recent_records
+            records = self.symbol_history.get(symbol, ()) if symbol else self.slippage_history
+            if limit > 0 and len(records) > limit:
+                return list(itertools.islice(records, len(records) - limit, None))
+            return list(records)
         
         except Exception as e:
             self.logger.error(f"Error getting recent slippage: {e}")
             return []
     
+    def get_slippage_quantiles(self, symbol: str, broker: str = "*", order_type: str = "*") -> Dict[str, float]:
+        """Streaming p50/p95/p99 and EWMA bias for a symbol/broker/order type."""
+        return self.analytics.get_quantiles(symbol, broker, order_type)
+    
     def get_active_alerts(self) -> List[Dict[str, Any]]:
         """Get active slippage alerts."""
         try:
@@ -0,0 +1,546 @@
+#!/usr/bin/env python3
+"""
+Tick Simulator - Deterministic L2 matching simulator for offline execution
+Replays recorded or synthetic L2 book updates and trades on a virtual clock,
+matching our orders with decision-to-exchange latency, queue position for
+resting limit orders, partial fills and maker/taker fees. Exposes the broker
+interfaces used by the router, the slicer and the adapters.
+"""
+
+import json
+import heapq
+import random
+import bisect
+from typing import Dict, Any, List, Optional, Iterable, Iterator, Callable
+
+BUY = "buy"
+SELL = "sell"
+
+
+class MarketEvent:
+    """One L2 level update (``kind="book"``, size 0 removes the level) or trade (side = aggressor)."""
+
+    __slots__ = ("ts", "symbol", "kind", "side", "price", "size")
+
+    def __init__(self, ts: float, symbol: str, kind: str, side: str, price: float, size: float):
+        self.ts = ts
+        self.symbol = symbol
+        self.kind = kind
+        self.side = side
+        self.price = price
+        self.size = size
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MarketEvent":
+        return cls(float(data["ts"]), data["symbol"], data["kind"], data["side"].lower(),
+                   float(data["price"]), float(data["size"]))
+
+
+class L2Book:
+    """Price -> size per side with sorted price ladders for O(1) best bid/ask."""
+
+    __slots__ = ("bids", "asks", "bid_prices", "ask_prices")
+
+    def __init__(self):
+        self.bids: Dict[float, float] = {}
+        self.asks: Dict[float, float] = {}
+        self.bid_prices: List[float] = []
+        self.ask_prices: List[float] = []
+
+    def set_level(self, side: str, price: float, size: float) -> float:
+        levels, prices = (self.bids, self.bid_prices) if side == BUY else (self.asks, self.ask_prices)
+        old = levels.get(price, 0.0)
+        if size > 0:
+            if old == 0.0:
+                bisect.insort(prices, price)
+            levels[price] = size
+        elif old:
+            del levels[price]
+            del prices[bisect.bisect_left(prices, price)]
+        return old
+
+    def size_at(self, side: str, price: float) -> float:
+        return (self.bids if side == BUY else self.asks).get(price, 0.0)
+
+    @property
+    def best_bid(self) -> Optional[float]:
+        return self.bid_prices[-1] if self.bid_prices else None
+
+    @property
+    def best_ask(self) -> Optional[float]:
+        return self.ask_prices[0] if self.ask_prices else None
+
+
+class SimOrder:
+    """Our order inside the simulator."""
+
+    __slots__ = ("order_id", "client_id", "symbol", "side", "quantity", "limit_price", "ioc",
+                 "submit_ts", "arrive_ts", "filled", "notional", "fees", "maker_quantity",
+                 "queue_ahead", "status")
+
+    def __init__(self, order_id: str, client_id: str, symbol: str, side: str, quantity: float,
+                 limit_price: Optional[float], ioc: bool, submit_ts: float, arrive_ts: float):
+        self.order_id = order_id
+        self.client_id = client_id
+        self.symbol = symbol
+        self.side = side
+        self.quantity = quantity
+        self.limit_price = limit_price
+        self.ioc = ioc
+        self.submit_ts = submit_ts
+        self.arrive_ts = arrive_ts
+        self.filled = 0.0
+        self.notional = 0.0
+        self.fees = 0.0
+        self.maker_quantity = 0.0
+        self.queue_ahead = 0.0
+        self.status = "pending"
+
+    @property
+    def remaining(self) -> float:
+        return self.quantity - self.filled
+
+    @property
+    def avg_price(self) -> float:
+        return self.notional / self.filled if self.filled else 0.0
+
+    def to_result(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "order_id": self.order_id,
+            "client_order_id": self.client_id,
+            "symbol": self.symbol,
+            "side": self.side,
+            "quantity": self.filled,
+            "requested_quantity": self.quantity,
+            "price": self.avg_price,
+            "fees": self.fees,
+            "maker_quantity": self.maker_quantity,
+            "latency_ms": (self.arrive_ts - self.submit_ts) * 1000
+        }
+
+
+class TickSimulator:
+    """Event-driven matching simulator on a virtual clock.
+
+    Market events come from ``load()``; our orders reach the book after the
+    configured latency, cross against displayed liquidity up to their limit,
+    then rest at the back of the queue. Resting orders fill when trades at
+    their price have consumed the queue ahead (or trade through them), and
+    the queue ahead shrinks pro rata when displayed size is cancelled.
+    Runs as fast as events can be processed, independent of wall time.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        self.latency = config.get("sim_latency_ms", 1.0) / 1000
+        self.latency_jitter = config.get("sim_latency_jitter_ms", 0.0) / 1000
+        self.maker_fee = config.get("sim_maker_fee_bps", 0.0) / 10000
+        self.taker_fee = config.get("sim_taker_fee_bps", 0.5) / 10000
+        self.random = random.Random(config.get("sim_seed", 7))
+
+        self.now = 0.0
+        self.books: Dict[str, L2Book] = {}
+        self.orders: Dict[str, SimOrder] = {}
+        self.resting: Dict[str, List[SimOrder]] = {}
+        self.fills: List[Dict[str, Any]] = []
+        self.listeners: List[Callable[[Dict[str, Any]], Any]] = []
+
+        self._events: Iterator[MarketEvent] = iter(())
+        self._next_event: Optional[MarketEvent] = None
+        self._actions: List = []
+        self._sequence = 0
+        self._traded_at_level: Dict[tuple, float] = {}
+        self._market_stats: Dict[str, Dict[str, float]] = {}
+        self.stats = {"events": 0, "orders": 0, "fills": 0, "cancels": 0}
+
+    # ============= DATA =============
+
+    def load(self, events: Iterable[MarketEvent]):
+        """Set the market event source (must be time ordered)."""
+        self._events = iter(events)
+        self._next_event = next(self._events, None)
+
+    def subscribe(self, listener: Callable[[Dict[str, Any]], Any]):
+        """Called with every fill record."""
+        self.listeners.append(listener)
+
+    def book(self, symbol: str) -> L2Book:
+        book = self.books.get(symbol)
+        if book is None:
+            book = self.books[symbol] = L2Book()
+            self.resting[symbol] = []
+        return book
+
+    # ============= CLOCK =============
+
+    def advance_to(self, ts: float):
+        """Process market events and order actions up to ``ts``; market events go first on ties."""
+        while True:
+            event = self._next_event
+            action_ts = self._actions[0][0] if self._actions else None
+            if event is not None and event.ts <= ts and (action_ts is None or event.ts <= action_ts):
+                self.now = event.ts
+                self._on_market_event(event)
+                self._next_event = next(self._events, None)
+            elif action_ts is not None and action_ts <= ts:
+                _, _, action, order = heapq.heappop(self._actions)
+                self.now = action_ts
+                if action == "arrive":
+                    self._on_arrival(order)
+                else:
+                    self._on_cancel(order)
+            else:
+                break
+        self.now = max(self.now, ts)
+
+    def run(self):
+        """Replay all remaining events."""
+        while self._next_event is not None or self._actions:
+            next_ts = min(self._next_event.ts if self._next_event is not None else float("inf"),
+                          self._actions[0][0] if self._actions else float("inf"))
+            self.advance_to(next_ts)
+
+    def _schedule(self, ts: float, action: str, order: SimOrder):
+        self._sequence += 1
+        heapq.heappush(self._actions, (ts, self._sequence, action, order))
+
+    def _latency(self) -> float:
+        if self.latency_jitter:
+            return max(0.0, self.random.gauss(self.latency, self.latency_jitter))
+        return self.latency
+
+    # ============= ORDERS =============
+
+    def submit(self, symbol: str, side: str, quantity: float, limit_price: Optional[float] = None,
+               ioc: bool = False, client_id: str = "") -> SimOrder:
+        """Send an order now; it reaches the book after the simulated latency."""
+        self.stats["orders"] += 1
+        order_id = f"SIM{self.stats['orders']}"
+        order = SimOrder(order_id, client_id or order_id, symbol, side.lower(), float(quantity),
+                         limit_price, ioc or limit_price is None, self.now, self.now + self._latency())
+        self.orders[order_id] = order
+        self._schedule(order.arrive_ts, "arrive", order)
+        return order
+
+    def cancel(self, order_id: str) -> bool:
+        order = self.orders.get(order_id)
+        if order is None or order.status in ("filled", "cancelled", "rejected"):
+            return False
+        self._schedule(self.now + self._latency(), "cancel", order)
+        return True
+
+    def _on_arrival(self, order: SimOrder):
+        book = self.book(order.symbol)
+        buy = order.side == BUY
+        prices = book.ask_prices if buy else book.bid_prices
+        levels = book.asks if buy else book.bids
+        contra = SELL if buy else BUY
+
+        # Cross displayed liquidity up to the limit
+        while order.remaining > 1e-12 and prices:
+            price = prices[0] if buy else prices[-1]
+            if order.limit_price is not None and (price > order.limit_price if buy else price < order.limit_price):
+                break
+            take = min(order.remaining, levels[price])
+            self._fill(order, take, price, maker=False)
+            book.set_level(contra, price, levels[price] - take)
+
+        if order.remaining <= 1e-12:
+            order.status = "filled"
+        elif order.ioc:
+            order.status = "partial" if order.filled else ("cancelled" if order.limit_price is not None else "rejected")
+        else:
+            order.status = "partial" if order.filled else "open"
+            order.queue_ahead = book.size_at(order.side, order.limit_price)
+            self.resting[order.symbol].append(order)
+
+    def _on_cancel(self, order: SimOrder):
+        if order.status in ("open", "partial") and order in self.resting.get(order.symbol, ()):
+            self.resting[order.symbol].remove(order)
+            order.status = "cancelled"
+            self.stats["cancels"] += 1
+
+    def _fill(self, order: SimOrder, quantity: float, price: float, maker: bool):
+        fee = quantity * price * (self.maker_fee if maker else self.taker_fee)
+        order.filled += quantity
+        order.notional += quantity * price
+        order.fees += fee
+        if maker:
+            order.maker_quantity += quantity
+        self.stats["fills"] += 1
+        fill = {"order_id": order.order_id, "client_order_id": order.client_id, "symbol": order.symbol,
+                "side": order.side, "ts": self.now, "quantity": quantity, "price": price,
+                "liquidity": "maker" if maker else "taker", "fee": fee}
+        self.fills.append(fill)
+        for listener in self.listeners:
+            listener(fill)
+
+    # ============= MARKET EVENTS =============
+
+    def _on_market_event(self, event: MarketEvent):
+        self.stats["events"] += 1
+        book = self.book(event.symbol)
+        stats = self._market_stats.setdefault(event.symbol, {"volume": 0.0, "first_ts": event.ts,
+                                                             "last_mid": 0.0, "variance": 0.0, "last_ts": event.ts})
+        if event.kind == "trade":
+            stats["volume"] += event.size
+            key = (event.symbol, SELL if event.side == BUY else BUY, event.price)
+            self._traded_at_level[key] = self._traded_at_level.get(key, 0.0) + event.size
+            if self.resting[event.symbol]:
+                self._match_trade(event)
+            return
+
+        old = book.set_level(event.side, event.price, event.size)
+        resting = self.resting[event.symbol]
+        if resting:
+            self._update_queues(event, old, resting)
+            self._match_crossing_quote(event, resting)
+        self._update_volatility(book, stats, event.ts)
+
+    def _match_trade(self, event: MarketEvent):
+        """A trade against the passive side fills our resting orders once the queue ahead is consumed."""
+        passive = SELL if event.side == BUY else BUY
+        available = event.size
+        for order in list(self.resting[event.symbol]):
+            if order.side != passive or available <= 0:
+                continue
+            better = event.price < order.limit_price if passive == BUY else event.price > order.limit_price
+            if better:
+                # Traded through our price: we would have been filled first
+                take = min(order.remaining, available)
+            elif event.price == order.limit_price:
+                consumed = min(order.queue_ahead, available)
+                order.queue_ahead -= consumed
+                take = min(order.remaining, available - consumed)
+            else:
+                continue
+            if take > 0:
+                available -= take
+                self._fill(order, take, order.limit_price, maker=True)
+                self._settle(order)
+
+    def _update_queues(self, event: MarketEvent, old: float, resting: List[SimOrder]):
+        """Displayed size removed without trades is treated as cancels, taken pro rata from the queue ahead."""
+        key = (event.symbol, event.side, event.price)
+        traded = self._traded_at_level.pop(key, 0.0)
+        removed = old - event.size - traded
+        if removed <= 0 or old <= 0:
+            return
+        for order in resting:
+            if order.side == event.side and order.limit_price == event.price and order.queue_ahead > 0:
+                order.queue_ahead = max(0.0, min(order.queue_ahead - removed * order.queue_ahead / old, event.size))
+
+    def _match_crossing_quote(self, event: MarketEvent, resting: List[SimOrder]):
+        """Contra liquidity posted at or through our resting price trades with us at our price."""
+        if event.size <= 0:
+            return
+        available = event.size
+        for order in list(resting):
+            if order.side == event.side or available <= 0:
+                continue
+            crosses = event.price <= order.limit_price if order.side == BUY else event.price >= order.limit_price
+            if crosses:
+                take = min(order.remaining, available)
+                available -= take
+                self._fill(order, take, order.limit_price, maker=True)
+                self._settle(order)
+        if available < event.size:
+            self.book(event.symbol).set_level(event.side, event.price, available)
+
+    def _settle(self, order: SimOrder):
+        if order.remaining <= 1e-12:
+            order.status = "filled"
+            self.resting[order.symbol].remove(order)
+        else:
+            order.status = "partial"
+
+    def _update_volatility(self, book: L2Book, stats: Dict[str, float], ts: float):
+        if book.best_bid is None or book.best_ask is None:
+            return
+        mid = (book.best_bid + book.best_ask) / 2
+        last_mid = stats["last_mid"]
+        elapsed = ts - stats["last_ts"]
+        if last_mid and mid != last_mid and elapsed > 0:
+            ret = (mid - last_mid) / last_mid
+            stats["variance"] += 0.01 * (ret * ret / elapsed - stats["variance"])
+        stats["last_mid"] = mid
+        stats["last_ts"] = ts
+
+    # ============= BROKER INTERFACES =============
+
+    async def execute_order(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        """Router/adapter interface: submit and return the state once the order reached the book."""
+        sim_order = self.submit(order["symbol"], order.get("side", BUY), order.get("quantity", order.get("volume", 0.0)),
+                                order.get("limit_price") if order.get("type", "market") == "limit" else None,
+                                order.get("ioc", False), order.get("client_order_id", ""))
+        self.advance_to(sim_order.arrive_ts)
+        result = sim_order.to_result()
+        if result["status"] == "open":
+            result["status"] = "accepted"
+        return result
+
+    async def send_order(self, formatted_order: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """BaseAdapter-style entry point."""
+        return await self.execute_order(formatted_order)
+
+    async def cancel_order(self, order_id: str) -> bool:
+        accepted = self.cancel(order_id)
+        if accepted:
+            self.advance_to(self.now + self.latency)
+        return accepted
+
+    def confirm_order(self, order_id: str) -> bool:
+        order = self.orders.get(order_id)
+        return order is not None and order.status not in ("pending", "rejected")
+
+    async def submit_child_order(self, child: Dict[str, Any]) -> Dict[str, Any]:
+        """Slicer interface: children are immediate-or-cancel, optionally limited."""
+        sim_order = self.submit(child["symbol"], child["side"], child["quantity"], child.get("limit_price"), ioc=True)
+        self.advance_to(sim_order.arrive_ts)
+        if sim_order.filled <= 0:
+            return {"status": "rejected", "quantity": 0.0, "price": 0.0, "reason": "no_liquidity"}
+        return {"status": "filled", "quantity": sim_order.filled, "price": sim_order.avg_price, "fees": sim_order.fees}
+
+    def get_market_snapshot(self, symbol: str) -> Dict[str, float]:
+        book = self.book(symbol)
+        stats = self._market_stats.get(symbol, {})
+        bid, ask = book.best_bid, book.best_ask
+        mid = (bid + ask) / 2 if bid is not None and ask is not None else (bid or ask or 0.0)
+        elapsed = max(self.now - stats.get("first_ts", self.now), 1e-9)
+        return {
+            "mid": mid,
+            "spread": (ask - bid) / mid if bid is not None and ask is not None and mid else 0.0,
+            "volume_rate": stats.get("volume", 0.0) / elapsed,
+            "volatility": stats.get("variance", 0.0) ** 0.5,
+            "cumulative_volume": stats.get("volume", 0.0)
+        }
+
+    def get_ticker(self, symbol: str) -> Dict[str, Any]:
+        book = self.book(symbol)
+        return {"symbol": symbol, "bid": book.best_bid, "ask": book.best_ask, "timestamp": self.now}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Simulator counters."""
+        return {
+            "now": self.now,
+            "resting_orders": sum(len(orders) for orders in self.resting.values()),
+            **self.stats
+        }
+
+
+def load_recorded_events(path: str) -> Iterator[MarketEvent]:
+    """Stream events from a JSON lines file with ts, symbol, kind, side, price, size."""
+    with open(path) as handle:
+        for line in handle:
+            if line.strip():
+                yield MarketEvent.from_dict(json.loads(line))
+
+
+def synthetic_events(symbol: str, count: int, mid: float = 100.0, tick: float = 0.01, levels: int = 5,
+                     event_rate: float = 1000.0, seed: int = 11) -> Iterator[MarketEvent]:
+    """Deterministic synthetic L2 stream: level adds/cancels and trades that deplete the touch."""
+    rng = random.Random(seed)
+    ts = 0.0
+    best_bid = round(mid - tick / 2, 10)
+    book = {BUY: {}, SELL: {}}
+    for i in range(levels):
+        for side, price in ((BUY, best_bid - i * tick), (SELL, best_bid + (i + 1) * tick)):
+            price = round(price, 10)
+            book[side][price] = float(rng.randint(5, 50))
+            yield MarketEvent(ts, symbol, "book", side, price, book[side][price])
+
+    emitted = 0
+    while emitted < count:
+        ts += rng.expovariate(event_rate)
+        roll = rng.random()
+        if roll < 0.3:
+            # Trade at the touch, then the level update the feed would show
+            aggressor = BUY if rng.random() < 0.5 else SELL
+            passive = SELL if aggressor == BUY else BUY
+            prices = book[passive]
+            touch = min(prices) if passive == SELL else max(prices)
+            size = float(rng.randint(1, max(1, int(prices[touch]))))
+            yield MarketEvent(ts, symbol, "trade", aggressor, touch, size)
+            remaining = prices[touch] - size
+            if remaining > 0:
+                prices[touch] = remaining
+            else:
+                del prices[touch]
+            yield MarketEvent(ts, symbol, "book", passive, touch, max(remaining, 0.0))
+            emitted += 2
+            if len(prices) < levels:
+                # Refill the book behind the touch
+                far = max(prices) + tick if passive == SELL else min(prices) - tick
+                far = round(far, 10)
+                prices[far] = float(rng.randint(5, 50))
+                yield MarketEvent(ts, symbol, "book", passive, far, prices[far])
+                emitted += 1
+        else:
+            side = BUY if rng.random() < 0.5 else SELL
+            prices = book[side]
+            touch = max(prices) if side == BUY else min(prices)
+            other_touch = min(book[SELL]) if side == BUY else max(book[BUY])
+            if abs(other_touch - touch) > tick * 1.5 and rng.random() < 0.7:
+                # Improve the quote inside a wide spread
+                price = round(touch + tick if side == BUY else touch - tick, 10)
+                prices[price] = float(rng.randint(1, 20))
+            else:
+                price = rng.choice(list(prices))
+                delta = float(rng.randint(-10, 12))
+                new_size = prices[price] + delta
+                if new_size <= 0 and len(prices) > 1:
+                    del prices[price]
+                    yield MarketEvent(ts, symbol, "book", side, price, 0.0)
+                    emitted += 1
+                    continue
+                prices[price] = max(new_size, 1.0)
+            yield MarketEvent(ts, symbol, "book", side, price, prices[price])
+            emitted += 1
+
+
+if __name__ == "__main__":
+    import time
+    import asyncio
+
+    async def benchmark_simulator(events: int = 500000, parents: int = 200):
+        """Replay speed, then aggressive versus passive execution of the same parent orders."""
+        sim = TickSimulator({"sim_latency_ms": 0.5})
+        sim.load(synthetic_events("SIM", events))
+        started = time.perf_counter()
+        sim.run()
+        elapsed = time.perf_counter() - started
+        print(f"🧪 replay: {sim.stats['events']:,} events in {elapsed:.2f}s "
+              f"({sim.stats['events'] / elapsed:,.0f} events/s, {sim.now:.0f}s of market time)")
+
+        for label, passive in (("aggressive", False), ("passive", True)):
+            sim = TickSimulator({"sim_latency_ms": 0.5, "sim_maker_fee_bps": -0.2, "sim_taker_fee_bps": 0.5})
+            sim.load(synthetic_events("SIM", events))
+            sim.advance_to(0.001)
+            rng = random.Random(5)
+            costs, filled, fees = [], 0.0, 0.0
+            started = time.perf_counter()
+            for _ in range(parents):
+                sim.advance_to(sim.now + rng.uniform(0.5, 1.5))
+                book = sim.book("SIM")
+                side = rng.choice([BUY, SELL])
+                arrival_mid = (book.best_bid + book.best_ask) / 2
+                if passive:
+                    order = await sim.execute_order({"symbol": "SIM", "side": side, "quantity": 5, "type": "limit",
+                                                     "limit_price": book.best_bid if side == BUY else book.best_ask})
+                    sim.advance_to(sim.now + 2.0)
+                    await sim.cancel_order(order["order_id"])
+                    order = sim.orders[order["order_id"]].to_result()
+                else:
+                    order = await sim.execute_order({"symbol": "SIM", "side": side, "quantity": 5})
+                if order["quantity"]:
+                    sign = 1 if side == BUY else -1
+                    costs.append(sign * (order["price"] - arrival_mid) / arrival_mid * 10000)
+                    filled += order["quantity"]
+                    fees += order["fees"]
+            elapsed = time.perf_counter() - started
+            print(f"🧪 {label:>10}: fill rate {filled / (parents * 5):.1%}, "
+                  f"avg cost {sum(costs) / max(len(costs), 1):+.2f} bps vs mid, fees {fees:+.4f}, "
+                  f"{sim.now:.0f}s market time in {elapsed:.2f}s")
+
+    asyncio.run(benchmark_simulator())
@@ -22,8 +22,10 @@ class EnhancedExecutionAgentV2(BaseAgent):
         """Initialize execution-specific components."""
         # Initialize execution components
         self.execution_bridge = None
+        self.order_gateway = None
         self.slippage_manager = None
         self.execution_optimizer = None
+        self.order_states = None
         
         # Execution state
         self.execution_state = {
@@ -31,6 +33,7 @@ class EnhancedExecutionAgentV2(BaseAgent):
             "execution_history": [],
             "last_execution_time": None
         }
+        self.execution_sequence = 0
         
         # Execution statistics
         self.execution_stats = {
@@ -57,6 +60,9 @@ class EnhancedExecutionAgentV2(BaseAgent):
     async def _agent_specific_startup(self):
         """Initialize execution-specific components."""
         try:
+            # Restore order lifecycle state before accepting new orders
+            await self._initialize_order_state()
+            
             # Initialize execution bridge
             await self._initialize_execution_bridge()
             
@@ -135,8 +141,11 @@ class EnhancedExecutionAgentV2(BaseAgent):
     async def _monitor_execution_health(self):
         """Monitor execution health."""
         try:
-            # Placeholder for execution health monitoring
-            pass
+            # Orders forwarded over Redis that never got an execution report would stay open forever
+            if self.order_states:
+                expired = self.order_states.expire_unreported(self.config.get("order_report_timeout_seconds", 30.0))
+                if expired:
+                    self.logger.warning(f"Expired {len(expired)} orders with no execution report")
         except Exception as e:
             self.logger.error(f"Error monitoring execution health: {e}")
     
@@ -153,19 +162,42 @@ class EnhancedExecutionAgentV2(BaseAgent):
         return [
             (self._order_execution_loop, "Order Execution", "fast"),
             (self._slippage_monitoring_loop, "Slippage Monitoring", "fast"),
+            (self._execution_report_loop, "Execution Reports", "fast"),
             (self._execution_health_monitoring_loop, "Execution Health Monitoring", "tactical"),
             (self._execution_reporting_loop, "Execution Reporting", "strategic")
         ]
     
     # ============= EXECUTION INITIALIZATION =============
     
+    async def _initialize_order_state(self):
+        """Initialize the order state machine and replay its journal."""
+        try:
+            from .core.order_state import OrderStateMachine, WriteBehindJournal
+            redis_async = self.redis_conn.redis_async if await self.redis_conn.ensure_async_connection() else None
+            journal = WriteBehindJournal(self.config, redis_async)
+            self.order_states = OrderStateMachine(self.config, journal)
+            self.order_states.subscribe(self._publish_order_update)
+            
+            recovered = await self.order_states.recover()
+            await journal.start()
+            
+            self.logger.info(f"✅ Order state initialized ({journal.backend} journal, {recovered} open orders recovered)")
+            
+        except Exception as e:
+            self.logger.error(f"❌ Error initializing order state: {e}")
+            raise
+    
     async def _initialize_execution_bridge(self):
         """Initialize execution bridge."""
         try:
             # Initialize execution bridge
             self.execution_bridge = ExecutionBridge(self.config)
             
-            self.logger.info("✅ Execution bridge initialized")
+            # In-process Rust execution when the extension is built, Redis bridge otherwise
+            from .core.native_executor import NativeOrderGateway
+            self.order_gateway = NativeOrderGateway(self.config, self.redis_conn)
+            
+            self.logger.info(f"✅ Execution bridge initialized (order submission: {self.order_gateway.mode})")
             
         except Exception as e:
             self.logger.error(f"❌ Error initializing execution bridge: {e}")
@@ -191,63 +223,29 @@ class EnhancedExecutionAgentV2(BaseAgent):
             from .core.execution_optimizer import ExecutionOptimizer
             self.execution_optimizer = ExecutionOptimizer(self.config)
             
+            # Large orders are worked as parents; their children come back through execute_order_request
+            if self.config.get("order_slicing_enabled", True):
+                from .core.order_slicer import AgentOrderBroker
+                self.execution_optimizer.attach_slicing_engine(AgentOrderBroker(
+                    self.config, self.redis_conn,
+                    lambda child: self.execute_order_request(child, "order_slicing"),
+                    self.order_states
+                ))
+            
             self.logger.info("✅ Execution optimization initialized")
             
         except Exception as e:
             self.logger.error(f"❌ Error initializing execution optimization: {e}")
             raise
     
-    # ============= EXECUTION PROCESSING LOOP =============
-    
-    async def _execution_processing_loop(self):
-        """Execution monitoring loop (100ms intervals)."""
-        while self.is_running:
-            try:
-                start_time = time.time()
-                
-                # Monitor execution status and health
-                await self._monitor_execution_status()
-                
-                # Record operation
-                duration_ms = (time.time() - start_time) * 1000
-                if hasattr(self, 'status_monitor') and self.status_monitor:
-                    self.status_monitor.record_operation(duration_ms, True)
-                
-                await asyncio.sleep(0.1)  # 100ms for execution monitoring
-                
-            except Exception as e:
-                self.logger.error(f"Error in execution monitoring loop: {e}")
-                await asyncio.sleep(0.1)
-    
-    async def _monitor_execution_status(self):
-        """Monitor execution status and health."""
-        try:
-            # Update last execution time
-            if self.execution_state["execution_history"]:
-                self.execution_state["last_execution_time"] = self.execution_state["execution_history"][-1]["timestamp"]
-            
-            # Check execution bridge health
-            if self.execution_bridge:
-                bridge_status = await self.execution_bridge.get_status()
-                if not bridge_status.get("healthy", False):
-                    self.logger.warning("Execution bridge health check failed")
-            
-            # Clean up old active executions
-            current_time = time.time()
-            expired_executions = []
-            for exec_id, exec_data in self.execution_state["active_executions"].items():
-                if current_time - exec_data.get("start_time", 0) > 300:  # 5 minutes
-                    expired_executions.append(exec_id)
-            
-            for exec_id in expired_executions:
-                del self.execution_state["active_executions"][exec_id]
-                
-        except Exception as e:
-            self.logger.error(f"Error monitoring execution status: {e}")
+    # ============= ORDER EXECUTION =============
     
     async def _execute_order(self, order_data: Dict[str, Any], strategy_type: str) -> Dict[str, Any]:
         """Execute an order using the execution bridge."""
         try:
+            if self.order_gateway:
+                return await self.order_gateway.submit(order_data)
+            
             if not self.execution_bridge:
                 return {"success": False, "error": "Execution bridge not available"}
             
@@ -418,6 +416,10 @@ class EnhancedExecutionAgentV2(BaseAgent):
     async def _cleanup_execution_components(self):
         """Cleanup execution components."""
         try:
+            # Flush pending order journal records
+            if self.order_states and self.order_states.journal:
+                await self.order_states.journal.stop()
+            
             # Cleanup execution bridge
             if self.execution_bridge:
                 await self.execution_bridge.stop()
@@ -452,6 +454,94 @@ class EnhancedExecutionAgentV2(BaseAgent):
         except Exception as e:
             self.logger.error(f"Error publishing execution result: {e}")
     
+    def on_execution_report(self, report: Dict[str, Any]) -> bool:
+        """Drive an order's lifecycle from an execution report (ack, partial/fill, cancel, reject)."""
+        if not self.order_states:
+            return False
+        order_id = report.get("client_order_id") or report.get("order_id")
+        if not order_id:
+            return False
+        order_id = str(order_id)
+        broker_id = report.get("broker_order_id")
+        broker_id = str(broker_id) if broker_id is not None else None
+        status = str(report.get("status", "")).lower()
+        
+        if status in ("ack", "accepted", "new"):
+            return self.order_states.acknowledge(order_id, broker_id)
+        if status in ("partial", "partially_filled", "fill", "filled"):
+            quantity = report.get("fill_quantity", report.get("executed_quantity"))
+            price = report.get("fill_price", report.get("executed_price"))
+            if not quantity or price is None:
+                return False
+            if not self.order_states.fill(order_id, quantity, price, broker_id):
+                return False
+            self._record_fill_slippage(order_id, float(price), float(quantity),
+                                       report.get("broker", "unknown"), report.get("order_type", "market"))
+            return True
+        if status in ("cancelled", "canceled", "expired"):
+            return self.order_states.cancel(order_id, str(report.get("reason", status)))
+        if status in ("rejected", "failed"):
+            return self.order_states.reject(order_id, str(report.get("reason", report.get("error", ""))))
+        return False
+    
+    def _record_fill_slippage(self, order_id: str, fill_price: float, fill_quantity: float,
+                              broker: str, order_type: str):
+        """Feed a fill's slippage against the order's expected price into the slippage analytics."""
+        if not self.slippage_manager:
+            return
+        order = self.order_states.get(order_id) or self.order_states.get_by_broker(order_id)
+        if order is None or not order.price or not order.side:
+            return
+        self.slippage_manager.record_slippage(order.symbol, order.client_id, float(order.price), fill_price,
+                                              order_size=fill_quantity, side=order.side,
+                                              broker=broker, order_type=order_type)
+    
+    async def _execution_report_loop(self):
+        """Execution reports from the Rust service and brokers into the order state machine."""
+        channel = self.config.get("execution_report_channel", "execution:reports")
+        while self.is_running:
+            try:
+                if not self.order_states or not await self.redis_conn.ensure_async_connection():
+                    await asyncio.sleep(1.0)
+                    continue
+                
+                # Blocks on the subscription; transitions are published by the state machine listener
+                pubsub = self.redis_conn.redis_async.pubsub(ignore_subscribe_messages=True)
+                await pubsub.subscribe(channel)
+                try:
+                    async for message in pubsub.listen():
+                        if message.get("type") != "message":
+                            continue
+                        try:
+                            report = json.loads(message["data"])
+                        except (TypeError, ValueError):
+                            continue
+                        if isinstance(report, dict):
+                            self.on_execution_report(report)
+                finally:
+                    await pubsub.unsubscribe()
+                    await pubsub.aclose()
+                
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Error in execution report loop: {e}")
+                await asyncio.sleep(1.0)
+    
+    async def _publish_order_update(self, order, previous_status):
+        """Publish an order lifecycle transition."""
+        try:
+            order_update = {
+                "order": order.to_dict(),
+                "previous_status": previous_status.value if previous_status else None,
+                "agent": self.agent_name
+            }
+            
+            await self.redis_conn.publish_async("execution:order_updates", json.dumps(order_update))
+            
+        except Exception as e:
+            self.logger.error(f"Error publishing order update: {e}")
+    
     async def _trigger_slippage_alert(self, slippage_event: Dict[str, Any]):
         """Trigger slippage alert."""
         try:
@@ -489,6 +579,8 @@ class EnhancedExecutionAgentV2(BaseAgent):
             "execution_state": self.execution_state,
             "execution_stats": self.execution_stats,
             "execution_config": self.execution_config,
+            "order_state": self.order_states.get_stats() if self.order_states else None,
+            "order_submission": self.order_gateway.get_stats() if self.order_gateway else None,
             "last_update": time.time()
         }
     
@@ -497,37 +589,98 @@ class EnhancedExecutionAgentV2(BaseAgent):
         return self.execution_state.get("execution_history", [])
     
     async def get_active_executions(self) -> Dict[str, Any]:
-        """Get active executions."""
+        """Get active executions (orders not yet filled, cancelled or rejected)."""
+        if self.order_states:
+            return {order.client_id: order.to_dict() for order in self.order_states.open_orders()}
         return self.execution_state.get("active_executions", {})
     
     async def execute_order_request(self, order_data: Dict[str, Any], strategy_type: str = "general") -> Dict[str, Any]:
         """Execute an order request (called by Strategy Engine)."""
         try:
-            execution_id = f"exec_{int(time.time() * 1000)}_{len(self.execution_state['execution_history'])}"
+            if self.execution_optimizer and self.execution_optimizer.should_slice(order_data):
+                optimized = await self.execution_optimizer.optimize_execution({
+                    **order_data, "quantity": order_data.get("quantity", order_data.get("volume", 0.0))
+                })
+                if optimized.get("parent_order_id"):
+                    return {"success": True, "status": "working", "parent_order_id": optimized["parent_order_id"],
+                            "execution_strategy": optimized.get("execution_strategy")}
+            
+            execution_id = self._open_execution(order_data, strategy_type)
+            order_data = {**order_data, "client_order_id": execution_id}
             
             # Execute the order directly
             execution_result = await self._execute_order(order_data, strategy_type)
             
-            # Store execution result
-            self.execution_state["execution_history"].append({
-                "execution_id": execution_id,
-                "order_data": order_data,
-                "result": execution_result,
-                "timestamp": time.time()
-            })
-            
-            # Update statistics
-            self.execution_stats["total_signals_processed"] += 1
-            if execution_result.get("success", False):
-                self.execution_stats["successful_executions"] += 1
-            else:
-                self.execution_stats["failed_executions"] += 1
-            
-            # Publish execution result
-            await self._publish_execution_result(execution_id, execution_result)
-            
+            await self._record_execution(execution_id, order_data, execution_result)
             return execution_result
             
         except Exception as e:
             self.logger.error(f"Error executing order request: {e}")
             return {"success": False, "error": str(e)}
+    
+    async def execute_order_batch(self, orders: List[Dict[str, Any]], strategy_type: str = "general") -> List[Dict[str, Any]]:
+        """Execute several order requests with one submission to the Rust executor."""
+        try:
+            if not self.order_gateway:
+                return [await self.execute_order_request(order_data, strategy_type) for order_data in orders]
+            
+            execution_ids = [self._open_execution(order_data, strategy_type) for order_data in orders]
+            orders = [{**order_data, "client_order_id": execution_id}
+                      for order_data, execution_id in zip(orders, execution_ids)]
+            results = await self.order_gateway.submit_batch(orders)
+            
+            for execution_id, order_data, execution_result in zip(execution_ids, orders, results):
+                await self._record_execution(execution_id, order_data, execution_result)
+            return results
+            
+        except Exception as e:
+            self.logger.error(f"Error executing order batch: {e}")
+            return [{"success": False, "error": str(e)} for _ in orders]
+    
+    def _open_execution(self, order_data: Dict[str, Any], strategy_type: str) -> str:
+        """Assign the execution id and open the order's lifecycle."""
+        self.execution_sequence += 1
+        execution_id = order_data.get("client_order_id") or f"exec_{int(time.time() * 1000)}_{self.execution_sequence}"
+        
+        if self.order_states:
+            self.order_states.create(execution_id, order_data.get("symbol", ""), order_data.get("side", ""),
+                                     order_data.get("quantity", order_data.get("volume", 0.0)),
+                                     order_data.get("price", order_data.get("expected_price")), strategy_type)
+            self.order_states.mark_sent(execution_id)
+        return execution_id
+    
+    async def _record_execution(self, execution_id: str, order_data: Dict[str, Any], execution_result: Dict[str, Any]):
+        """Drive the lifecycle from the broker result, then store, count and publish it."""
+        if self.order_states:
+            if execution_result.get("status") == "submitted":
+                # Forwarded to the Rust service: stays SENT until its execution reports arrive (or it expires)
+                pass
+            elif execution_result.get("success", False):
+                order = self.order_states.get(execution_id)
+                broker_id = execution_result.get("order_id")
+                self.order_states.acknowledge(execution_id, str(broker_id) if broker_id is not None else None)
+                filled = execution_result.get("executed_quantity", execution_result.get("volume", order.quantity))
+                fill_price = execution_result.get("executed_price", execution_result.get("price"))
+                if filled and fill_price is not None and self.order_states.fill(execution_id, filled, fill_price):
+                    self._record_fill_slippage(execution_id, float(fill_price), float(filled),
+                                               order_data.get("broker", "unknown"), order_data.get("order_type", "market"))
+            else:
+                self.order_states.reject(execution_id, str(execution_result.get("error", "")))
+        
+        # Store execution result
+        self.execution_state["execution_history"].append({
+            "execution_id": execution_id,
+            "order_data": order_data,
+            "result": execution_result,
+            "timestamp": time.time()
+        })
+        
+        # Update statistics
+        self.execution_stats["total_signals_processed"] += 1
+        if execution_result.get("success", False):
+            self.execution_stats["successful_executions"] += 1
+        else:
+            self.execution_stats["failed_executions"] += 1
+        
+        # Publish execution result
+        await self._publish_execution_result(execution_id, execution_result)
@@ -11,6 +11,7 @@ import MetaTrader5 as mt5
 from typing import Dict, Any, Optional
 from dotenv import load_dotenv
 from engine_agents.shared_utils import get_shared_logger, get_shared_redis
+from .core.order_state import OrderStateMachine
 
 # Load environment variables from .env file
 load_dotenv()
@@ -21,7 +22,7 @@ class LiveMT5ExecutionBridge:
     This replaces placeholder execution with REAL TRADES.
     """
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], order_states: Optional[OrderStateMachine] = None):
         self.config = config
         self.logger = get_shared_logger("execution", "mt5_bridge")
         self.redis_conn = get_shared_redis()
@@ -40,8 +41,8 @@ class LiveMT5ExecutionBridge:
         self.max_slippage = 3  # Max slippage in points
         self.magic_number = 12345  # Unique identifier for our trades
         
-        # Track active orders
-        self.active_orders = {}
+        # Order lifecycle; pass the agent's journaled state machine to persist it
+        self.order_states = order_states or OrderStateMachine(config)
         
     async def connect(self):
         """Connect to live MT5 for trading."""
@@ -80,6 +81,7 @@ class LiveMT5ExecutionBridge:
         if not self.is_connected:
             await self.connect()
             
+        client_id = None
         try:
             symbol = signal.get("symbol", "EURUSD")
             action = signal.get("action", "HOLD")
@@ -97,6 +99,10 @@ class LiveMT5ExecutionBridge:
             # Calculate lot size based on confidence and risk management
             adjusted_lot_size = self.lot_size * confidence
             
+            client_id = signal.get("client_order_id") or f"mt5_{strategy}_{symbol}_{int(time.time() * 1000)}"
+            self.order_states.create(client_id, symbol, action, adjusted_lot_size, strategy=strategy)
+            self.order_states.mark_sent(client_id)
+            
             if self.demo_mode:
                 # DEMO MODE: Simulate trade execution
                 import random
@@ -106,6 +112,7 @@ class LiveMT5ExecutionBridge:
                 trade_info = {
                     "status": "executed",
                     "order_id": order_id,
+                    "client_order_id": client_id,
                     "symbol": symbol,
                     "action": action,
                     "volume": adjusted_lot_size,
@@ -116,8 +123,9 @@ class LiveMT5ExecutionBridge:
                     "demo_mode": True
                 }
                 
-                # Store simulated order
-                self.active_orders[order_id] = trade_info
+                # Simulated deal: acknowledged and filled at once
+                self.order_states.acknowledge(client_id, str(order_id))
+                self.order_states.fill(client_id, adjusted_lot_size, simulated_price)
                 
                 # Log simulated trade
                 self.logger.info(f"📊 DEMO TRADE EXECUTED: {action} {adjusted_lot_size} {symbol} @ {simulated_price} (Strategy: {strategy})")
@@ -131,6 +139,7 @@ class LiveMT5ExecutionBridge:
             # Get current price
             tick = mt5.symbol_info_tick(symbol)
             if not tick:
+                self.order_states.reject(client_id, "no price data")
                 return {"status": "error", "reason": f"No price data for {symbol}"}
             
             price = tick.ask if action == "BUY" else tick.bid
@@ -157,12 +166,14 @@ class LiveMT5ExecutionBridge:
             if result.retcode != mt5.TRADE_RETCODE_DONE:
                 error_msg = f"Order failed: {result.retcode} - {result.comment}"
                 self.logger.error(error_msg)
+                self.order_states.reject(client_id, error_msg)
                 return {"status": "error", "reason": error_msg}
             
             # Trade successful!
             trade_info = {
                 "status": "executed",
                 "order_id": result.order,
+                "client_order_id": client_id,
                 "symbol": symbol,
                 "action": action,
                 "volume": adjusted_lot_size,
@@ -172,20 +183,21 @@ class LiveMT5ExecutionBridge:
                 "timestamp": time.time()
             }
             
-            # Store active order
-            self.active_orders[result.order] = trade_info
+            # IOC deal: acknowledged and filled with the executed volume
+            self.order_states.acknowledge(client_id, str(result.order))
+            self.order_states.fill(client_id, result.volume or adjusted_lot_size, result.price)
             
             # Log successful trade
             self.logger.info(f"🚀 LIVE TRADE EXECUTED: {action} {adjusted_lot_size} {symbol} @ {result.price} (Strategy: {strategy})")
             
-            # Store trade in Redis for monitoring
-            await self.redis_conn.hset_field(f"live_trades:{result.order}", "trade_data", str(trade_info))
-            
             return trade_info
             
         except Exception as e:
             error_msg = f"Execution error: {e}"
             self.logger.error(error_msg)
+            order = self.order_states.get(client_id) if client_id else None
+            if order is not None and order.is_open:
+                self.order_states.reject(client_id, error_msg)
             return {"status": "error", "reason": error_msg}
     
     async def get_account_info(self) -> Dict[str, Any]:
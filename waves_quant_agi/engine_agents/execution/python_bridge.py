@@ -7,7 +7,7 @@ Integrates Rust-based execution with Python learning layer and other agents.
 import asyncio
 import json
 import time
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 import pandas as pd
 from engine_agents.shared_utils import (
     get_shared_redis,
@@ -15,6 +15,7 @@ from engine_agents.shared_utils import (
     get_agent_learner,
     LearningType
 )
+from engine_agents.execution.core.signal_intake import SignalIntake
 
 class ExecutionBridge:
     """Bridge between Rust execution agent and Python learning layer."""
@@ -42,6 +43,8 @@ class ExecutionBridge:
         
         # Signal processing state
         self.is_running = False
+        self.signal_intake: Optional[SignalIntake] = None
+        self.last_maintenance = 0.0
 
 
 
@@ -51,6 +54,10 @@ class ExecutionBridge:
             self.logger.info("Starting Execution Bridge...")
             self.is_running = True
             
+            # Batched intake runs on the async client
+            if self.redis_client and await self.redis_client.ensure_async_connection():
+                self.signal_intake = SignalIntake(self.redis_client.redis_async, self.config)
+            
             # Start signal processing loop
             await self._signal_processing_loop()
             
@@ -67,49 +74,43 @@ class ExecutionBridge:
         """Main loop for processing trading signals."""
         while self.is_running:
             try:
-                # Get signals from Redis
-                signals = await self._get_pending_signals()
+                # Blocks until signals arrive (or the block timeout), so no idle polling
+                entries = await self._get_pending_entries()
                 
-                for signal in signals:
+                for _, signal in entries:
                     await self._process_signal(signal)
                 
-                # Update execution optimizations periodically
-                await self._update_execution_optimizations()
+                # Acknowledge only after processing so a crash leads to redelivery
+                if entries and self.signal_intake:
+                    await self.signal_intake.ack([entry_id for entry_id, _ in entries])
                 
-                # Report statistics
-                await self._report_stats()
+                # Optimizations and stats run on their own interval, not per batch
+                now = time.time()
+                if now - self.last_maintenance >= self.config.get("signal_processing_interval", 1):
+                    self.last_maintenance = now
+                    await self._update_execution_optimizations()
+                    await self._report_stats()
                 
-                await asyncio.sleep(self.config.get("signal_processing_interval", 1))
+                if not self.signal_intake:
+                    await asyncio.sleep(self.config.get("signal_processing_interval", 1))
                 
             except Exception as e:
                 self.logger.log_error(f"Error in signal processing loop: {e}")
                 await asyncio.sleep(5)
 
+    async def _get_pending_entries(self) -> List[Tuple[Optional[str], Dict[str, Any]]]:
+        """Get the next batch of (entry_id, signal) pairs from the intake.
+        
+        Intake errors propagate so the processing loop backs off instead of
+        spinning on an empty result.
+        """
+        if not self.signal_intake:
+            return []
+        return await self.signal_intake.next_batch()
+
     async def _get_pending_signals(self) -> List[Dict[str, Any]]:
         """Get pending trading signals from Redis."""
-        try:
-            if not self.redis_client:
-                return []
-            
-            # Get signals from Redis queue
-            signals = []
-            for _ in range(10):  # Process up to 10 signals per cycle
-                signal_data = self.redis_client.lpop("execution:signals")
-                if signal_data:
-                    try:
-                        signal = json.loads(signal_data)
-                        signals.append(signal)
-                    except json.JSONDecodeError as e:
-                        self.logger.log_error(f"Invalid signal format: {e}")
-                        continue
-                else:
-                    break
-            
-            return signals
-            
-        except Exception as e:
-            self.logger.log_error(f"Error getting pending signals: {e}")
-            return []
+        return [signal for _, signal in await self._get_pending_entries()]
 
     async def _process_signal(self, signal: Dict[str, Any]):
         """Process a single trading signal."""
@@ -322,6 +323,7 @@ class ExecutionBridge:
             "is_running": self.is_running,
             "uptime_seconds": uptime,
             "stats": self.stats,
+            "signal_intake": self.signal_intake.get_stats() if self.signal_intake else {},
             "redis_connected": self.redis_client is not None
         }
 
@@ -332,9 +334,13 @@ class ExecutionBridge:
                 self.logger.log_error(f"Invalid signal format: {signal}")
                 return False
             
-            # Add to Redis queue
+            # Add to the intake queue
             if self.redis_client:
-                self.redis_client.rpush("execution:signals", json.dumps(signal))
+                if not self.signal_intake:
+                    if not await self.redis_client.ensure_async_connection():
+                        return False
+                    self.signal_intake = SignalIntake(self.redis_client.redis_async, self.config)
+                await self.signal_intake.send(signal)
                 self.logger.log_execution("signal_sent", {
                     "symbol": signal.get("symbol", ""),
                     "signal": signal.get("signal", ""),
@@ -0,0 +1,10 @@
+// Python extension module (built with maturin: `maturin develop --release`)
+pub mod python;
+
+use pyo3::prelude::*;
+
+#[pymodule]
+fn quantum_execution(_py: Python, m: &PyModule) -> PyResult<()> {
+    m.add_class::<python::NativeExecutor>()?;
+    Ok(())
+}
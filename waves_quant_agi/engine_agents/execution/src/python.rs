@@ -0,0 +1,237 @@
+// In-process Python bindings: batched order execution (validation, risk filters and
+// placement as OrderExecutor::execute_order does it) returning each order's result
+// to the caller, plus latency histograms. No Redis is involved on this path.
+use pyo3::exceptions::PyValueError;
+use pyo3::prelude::*;
+use std::collections::HashMap;
+use std::time::Instant;
+
+// Bucket i counts latencies below 2^i nanoseconds (last bucket is open ended)
+const BUCKETS: usize = 40;
+
+#[derive(Clone)]
+struct LatencyHistogram {
+    counts: Vec<u64>,
+    total: u64,
+    sum_ns: u128,
+    max_ns: u64,
+}
+
+impl LatencyHistogram {
+    fn new() -> Self {
+        LatencyHistogram {
+            counts: vec![0; BUCKETS],
+            total: 0,
+            sum_ns: 0,
+            max_ns: 0,
+        }
+    }
+
+    fn record(&mut self, nanos: u64) {
+        let bucket = ((64 - nanos.leading_zeros()) as usize).min(BUCKETS - 1);
+        self.counts[bucket] += 1;
+        self.total += 1;
+        self.sum_ns += nanos as u128;
+        self.max_ns = self.max_ns.max(nanos);
+    }
+
+    fn upper_bound(bucket: usize) -> u64 {
+        if bucket >= BUCKETS - 1 {
+            u64::MAX
+        } else {
+            1u64 << bucket
+        }
+    }
+
+    fn percentile(&self, percentile: f64) -> Option<u64> {
+        if self.total == 0 {
+            return None;
+        }
+        let rank = ((percentile.clamp(0.0, 1.0) * self.total as f64).ceil() as u64).max(1);
+        let mut seen = 0;
+        for (bucket, count) in self.counts.iter().enumerate() {
+            seen += count;
+            if seen >= rank {
+                return Some(Self::upper_bound(bucket).min(self.max_ns));
+            }
+        }
+        Some(self.max_ns)
+    }
+}
+
+#[pyclass]
+pub struct NativeExecutor {
+    max_order_size: f64,
+    max_daily_loss: f64,
+    max_slippage_bps: f64,
+    daily_loss: HashMap<String, f64>,
+    histograms: HashMap<String, LatencyHistogram>,
+    executed: u64,
+    rejected: u64,
+}
+
+impl NativeExecutor {
+    fn check_risk(&self, symbol: &str, size: f64) -> Result<(), String> {
+        if size > self.max_order_size {
+            return Err(format!("Order size {} exceeds limit {}", size, self.max_order_size));
+        }
+        let daily_loss = self.daily_loss.get(symbol).copied().unwrap_or(0.0);
+        if daily_loss >= self.max_daily_loss {
+            return Err(format!("Daily loss {} exceeds limit {}", daily_loss, self.max_daily_loss));
+        }
+        Ok(())
+    }
+
+    fn check_order(&self, symbol: &str, side: &str, size: f64, expected_price: f64, price: f64) -> Result<(), String> {
+        if !side.eq_ignore_ascii_case("BUY") && !side.eq_ignore_ascii_case("SELL") {
+            return Err(format!("Invalid side {}", side));
+        }
+        if size <= 0.0 || symbol.is_empty() {
+            return Err("Invalid order parameters".to_string());
+        }
+        self.check_risk(symbol, size)?;
+        if expected_price > 0.0 && price > 0.0 {
+            let slippage_bps = ((price - expected_price).abs() / expected_price) * 10000.0;
+            if slippage_bps > self.max_slippage_bps {
+                return Err(format!("Slippage {} bps exceeds limit {} bps", slippage_bps, self.max_slippage_bps));
+            }
+        }
+        Ok(())
+    }
+
+    fn record(&mut self, operation: &str, nanos: u64) {
+        match self.histograms.get_mut(operation) {
+            Some(histogram) => histogram.record(nanos),
+            None => {
+                let mut histogram = LatencyHistogram::new();
+                histogram.record(nanos);
+                self.histograms.insert(operation.to_string(), histogram);
+            }
+        }
+    }
+}
+
+#[pymethods]
+impl NativeExecutor {
+    #[new]
+    #[args(max_order_size = "100000.0", max_daily_loss = "0.05", max_slippage_bps = "50.0")]
+    fn new(max_order_size: f64, max_daily_loss: f64, max_slippage_bps: f64) -> Self {
+        NativeExecutor {
+            max_order_size,
+            max_daily_loss,
+            max_slippage_bps,
+            daily_loss: HashMap::new(),
+            histograms: HashMap::new(),
+            executed: 0,
+            rejected: 0,
+        }
+    }
+
+    /// Validate, risk-filter and execute (symbol, side, size, expected_price, price) orders.
+    /// Returns (status, filled_size, fill_price, reason) per order in input order, where status
+    /// is "filled" or "rejected". Placement is immediate like OrderExecutor's broker step, at
+    /// the order price or, for market orders without one, the expected price.
+    fn execute_batch(&mut self, orders: Vec<(String, String, f64, f64, f64)>) -> Vec<(String, f64, f64, String)> {
+        let batch_start = Instant::now();
+        let mut results = Vec::with_capacity(orders.len());
+        for (symbol, side, size, expected_price, price) in orders.iter() {
+            let start = Instant::now();
+            let fill_price = if *price > 0.0 { *price } else { *expected_price };
+            let checked = self.check_order(symbol, side, *size, *expected_price, *price).and_then(|_| {
+                if fill_price > 0.0 {
+                    Ok(())
+                } else {
+                    Err("No price to execute at".to_string())
+                }
+            });
+            let result = match checked {
+                Ok(()) => {
+                    self.executed += 1;
+                    ("filled".to_string(), *size, fill_price, String::new())
+                }
+                Err(reason) => {
+                    self.rejected += 1;
+                    ("rejected".to_string(), 0.0, 0.0, reason)
+                }
+            };
+            self.record("order_execution", start.elapsed().as_nanos() as u64);
+            results.push(result);
+        }
+        self.record("batch_execution", batch_start.elapsed().as_nanos() as u64);
+        results
+    }
+
+    /// Risk filters only, for (symbol, size) pairs.
+    fn filter_orders(&self, orders: Vec<(String, f64)>) -> Vec<bool> {
+        orders.iter().map(|(symbol, size)| self.check_risk(symbol, *size).is_ok()).collect()
+    }
+
+    fn set_daily_loss(&mut self, symbol: String, loss: f64) {
+        self.daily_loss.insert(symbol, loss);
+    }
+
+    fn update_risk_limits(&mut self, max_daily_loss: f64, max_order_size: f64) -> PyResult<()> {
+        if max_daily_loss <= 0.0 || max_order_size <= 0.0 {
+            return Err(PyValueError::new_err("Invalid risk limits"));
+        }
+        self.max_daily_loss = max_daily_loss;
+        self.max_order_size = max_order_size;
+        Ok(())
+    }
+
+    fn update_slippage_limit(&mut self, max_slippage_bps: f64) -> PyResult<()> {
+        if max_slippage_bps <= 0.0 {
+            return Err(PyValueError::new_err("Invalid slippage limit"));
+        }
+        self.max_slippage_bps = max_slippage_bps;
+        Ok(())
+    }
+
+    /// Record an externally measured latency (e.g. a broker round trip).
+    fn record_latency(&mut self, operation: &str, nanos: u64) {
+        self.record(operation, nanos);
+    }
+
+    /// Non-empty (upper bound ns, count) buckets for an operation.
+    fn latency_histogram(&self, operation: &str) -> Vec<(u64, u64)> {
+        match self.histograms.get(operation) {
+            Some(histogram) => histogram
+                .counts
+                .iter()
+                .enumerate()
+                .filter(|(_, count)| **count > 0)
+                .map(|(bucket, count)| (LatencyHistogram::upper_bound(bucket), *count))
+                .collect(),
+            None => Vec::new(),
+        }
+    }
+
+    fn latency_percentile(&self, operation: &str, percentile: f64) -> Option<u64> {
+        self.histograms.get(operation).and_then(|histogram| histogram.percentile(percentile))
+    }
+
+    fn latency_stats(&self) -> HashMap<String, HashMap<String, f64>> {
+        let mut all_stats = HashMap::new();
+        for (operation, histogram) in self.histograms.iter() {
+            let mut stats = HashMap::new();
+            stats.insert("count".to_string(), histogram.total as f64);
+            stats.insert("avg_ns".to_string(), histogram.sum_ns as f64 / histogram.total.max(1) as f64);
+            stats.insert("p50_ns".to_string(), histogram.percentile(0.5).unwrap_or(0) as f64);
+            stats.insert("p99_ns".to_string(), histogram.percentile(0.99).unwrap_or(0) as f64);
+            stats.insert("max_ns".to_string(), histogram.max_ns as f64);
+            all_stats.insert(operation.clone(), stats);
+        }
+        all_stats
+    }
+
+    fn reset_latency(&mut self) {
+        self.histograms.clear();
+    }
+
+    fn stats(&self) -> HashMap<String, u64> {
+        let mut stats = HashMap::new();
+        stats.insert("executed".to_string(), self.executed);
+        stats.insert("rejected".to_string(), self.rejected);
+        stats
+    }
+}
@@ -1,4 +1,6 @@
+import time
 from typing import Dict, Any
+from ...shared_utils import get_slippage_analytics
 from ..logs.failure_agent_logger import FailureAgentLogger
 from ..memory.incident_cache import IncidentCache
 
@@ -8,6 +10,7 @@ class SlippageDetector:
         self.logger = logger
         self.cache = cache
         self.slippage_threshold = config.get("slippage_threshold", 0.001)  # 0.1% price deviation
+        self.analytics = get_slippage_analytics(config)
 
     async def detect_slippage(self, trade: Dict[str, Any]) -> Dict[str, Any]:
         """Detect slippage by comparing expected and executed prices."""
@@ -19,6 +22,17 @@ class SlippageDetector:
                 return {}
 
             slippage = abs(executed_price - expected_price) / expected_price
+            broker = trade.get("broker", "unknown")
+            symbol = trade.get("symbol", "unknown")
+            # Streaming quantiles are signed as a cost, which needs the side
+            side = trade.get("side")
+            if side:
+                self.analytics.record(
+                    symbol,
+                    self.analytics.to_cost(expected_price, executed_price, side),
+                    broker=broker,
+                    order_type=trade.get("order_type", "market")
+                )
             if slippage > self.slippage_threshold:
                 issue = {
                     "type": "slippage_detected",
@@ -26,6 +40,7 @@ class SlippageDetector:
                     "symbol": trade.get("symbol", "unknown"),
                     "slippage": slippage,
                     "threshold": self.slippage_threshold,
+                    "p95_slippage": self.analytics.get_quantiles(symbol, broker)["p95"],
                     "timestamp": int(time.time()),
                     "description": f"Slippage {slippage:.4f} exceeds threshold {self.slippage_threshold} for {trade.get('symbol')}"
                 }
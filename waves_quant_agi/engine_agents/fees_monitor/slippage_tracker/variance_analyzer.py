@@ -1,3 +1,4 @@
+import time
 from typing import Dict, Any, List
 import statistics
 from ..logs.failure_agent_logger import FailureAgentLogger
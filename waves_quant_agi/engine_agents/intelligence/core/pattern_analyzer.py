@@ -14,6 +14,7 @@ import time
 import numpy as np
 from typing import Dict, Any, List, Optional, Tuple
 from ...shared_utils import get_shared_logger
+from ...shared_utils.bounded_cache import BoundedCache, symbol_key, quantize, quantize_log
 
 class PatternAnalyzer:
     """
@@ -36,8 +37,15 @@ class PatternAnalyzer:
         }
         
         # Pattern cache for performance
-        self.pattern_cache = {}
         self.cache_ttl = config.get("pattern_cache_ttl", 300)  # 5 minutes
+        self.cache_price_step = config.get("pattern_cache_price_step", 0.001)  # 0.1% price buckets
+        self.pattern_cache = BoundedCache(
+            "pattern_analysis",
+            max_entries=config.get("pattern_cache_size", 100),
+            ttl=self.cache_ttl,
+            policy=config.get("pattern_cache_policy", "lru"),
+            owner="intelligence"
+        )
         
         # Pattern detection thresholds
         self.pattern_thresholds = {
@@ -504,31 +512,21 @@ class PatternAnalyzer:
     
     # ============= CACHING AND LEARNING =============
     
-    def _generate_cache_key(self, market_data: Dict[str, Any], strategy_type: str) -> str:
-        """Generate cache key for pattern analysis."""
+    def _generate_cache_key(self, market_data: Dict[str, Any], strategy_type: str) -> Tuple:
+        """Generate cache key for pattern analysis: per symbol, relative price buckets, 0.1% volatility buckets."""
         price = market_data.get("price", 0)
         volatility = market_data.get("volatility", 0)
-        return f"{strategy_type}_{int(price)}_{int(volatility*1000)}"
+        return symbol_key(strategy_type, market_data.get("symbol", "unknown"),
+                          price=quantize_log(price, self.cache_price_step),
+                          volatility=quantize(volatility, 0.001))
     
-    def _get_from_cache(self, cache_key: str) -> Optional[Dict[str, Any]]:
+    def _get_from_cache(self, cache_key: Tuple) -> Optional[Dict[str, Any]]:
         """Get analysis from cache if valid."""
-        if cache_key in self.pattern_cache:
-            cached_data, timestamp = self.pattern_cache[cache_key]
-            if time.time() - timestamp < self.cache_ttl:
-                return cached_data
-            else:
-                del self.pattern_cache[cache_key]
-        return None
+        return self.pattern_cache.get(cache_key)
     
-    def _cache_result(self, cache_key: str, result: Dict[str, Any]):
+    def _cache_result(self, cache_key: Tuple, result: Dict[str, Any]):
         """Cache analysis result."""
-        self.pattern_cache[cache_key] = (result, time.time())
-        
-        # Limit cache size
-        if len(self.pattern_cache) > 100:
-            oldest_key = min(self.pattern_cache.keys(), 
-                           key=lambda k: self.pattern_cache[k][1])
-            del self.pattern_cache[oldest_key]
+        self.pattern_cache.set(cache_key, result)
     
     # async def _learn_from_analysis(self, market_data: Dict[str, Any], 
     #                              analysis: Dict[str, Any], start_time: float):
@@ -544,7 +542,8 @@ class PatternAnalyzer:
             "detection_rate": self.analysis_stats["patterns_detected"] / max(self.analysis_stats["patterns_analyzed"], 1),
             "cache_hit_rate": self.analysis_stats["pattern_cache_hits"] / max(self.analysis_stats["patterns_analyzed"], 1),
             "current_thresholds": self.pattern_thresholds,
-            "cache_size": len(self.pattern_cache)
+            "cache_size": len(self.pattern_cache),
+            "cache": self.pattern_cache.get_stats()
         }
     
     def adjust_thresholds(self, threshold_adjustments: Dict[str, float]):
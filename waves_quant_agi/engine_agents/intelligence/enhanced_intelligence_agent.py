@@ -9,7 +9,7 @@ import asyncio
 import time
 import json
 from typing import Dict, Any, List
-from engine_agents.shared_utils import BaseAgent, register_agent
+from engine_agents.shared_utils import BaseAgent, register_agent, get_correlation_service
 
 class EnhancedIntelligenceAgent(BaseAgent):
     """Enhanced intelligence agent - focused solely on pattern recognition."""
@@ -20,6 +20,8 @@ class EnhancedIntelligenceAgent(BaseAgent):
         self.pattern_recognizer = None
         self.pattern_analyzer = None
         self.market_intelligence = None
+        self.correlation_service = None
+        self.correlation_matrix = None
         
         # Pattern recognition state
         self.intelligence_state = {
@@ -27,7 +29,8 @@ class EnhancedIntelligenceAgent(BaseAgent):
             "pattern_insights": [],
             "pattern_confidence": {},
             "last_pattern_scan": time.time(),
-            "pattern_history": []
+            "pattern_history": [],
+            "last_correlation_timestamp": None
         }
         
         # Pattern recognition statistics
@@ -55,6 +58,9 @@ class EnhancedIntelligenceAgent(BaseAgent):
             # Initialize market intelligence
             await self._initialize_market_intelligence()
             
+            # Initialize cross-asset correlation analysis
+            await self._initialize_correlation_analysis()
+            
             self.logger.info("✅ Intelligence Agent: Pattern recognition systems initialized")
             
         except Exception as e:
@@ -154,6 +160,7 @@ class EnhancedIntelligenceAgent(BaseAgent):
             self.logger.info("Importing PatternAnalyzer...")
             
             self.pattern_analyzer = PatternAnalyzer(self.config)
+            self.pattern_analyzer.pattern_cache.owner = self.agent_name
             self.logger.info("PatternAnalyzer instance created")
             
             self.logger.info("✅ Pattern analysis systems initialized")
@@ -184,6 +191,23 @@ class EnhancedIntelligenceAgent(BaseAgent):
             self.logger.error(f"❌ Error initializing market intelligence: {e}")
             self.market_intelligence = None
     
+    async def _initialize_correlation_analysis(self):
+        """Initialize cross-asset correlation analysis over this process's shared correlation service."""
+        try:
+            self.correlation_service = get_correlation_service(self.config)
+            
+            from .pattern_recognition.correlation_matrix import CorrelationMatrix
+            self.correlation_matrix = CorrelationMatrix(self.config)
+            
+            self.logger.info("✅ Correlation analysis initialized")
+            
+        except ImportError as e:
+            self.logger.error(f"❌ Import error in correlation analysis: {e}")
+            self.correlation_matrix = None
+        except Exception as e:
+            self.logger.error(f"❌ Error initializing correlation analysis: {e}")
+            self.correlation_matrix = None
+    
     # ============= PATTERN RECOGNITION LOOP =============
     
     async def _pattern_recognition_loop(self):
@@ -196,6 +220,10 @@ class EnhancedIntelligenceAgent(BaseAgent):
                 market_data = await self._get_market_data_for_patterns()
                 
                 if market_data:
+                    # Feed this snapshot's prices to the correlation service as one bar
+                    if self.correlation_service:
+                        await self._update_correlations(market_data)
+                    
                     # Perform pattern recognition
                     patterns = await self._recognize_patterns(market_data)
                     
@@ -217,6 +245,27 @@ class EnhancedIntelligenceAgent(BaseAgent):
                 self.logger.error(f"Error in pattern recognition loop: {e}")
                 await asyncio.sleep(1.0)
     
+    async def _update_correlations(self, market_data: Dict[str, Any]):
+        """Fold a new price snapshot into the correlation service once, then report cross-asset correlations."""
+        timestamp = market_data.get("timestamp")
+        if timestamp is None or timestamp == self.intelligence_state["last_correlation_timestamp"]:
+            return  # Same bar already folded in
+        self.intelligence_state["last_correlation_timestamp"] = timestamp
+        
+        prices = {}
+        for symbol, data in market_data.get("price_data", {}).items():
+            price = data.get("price") if isinstance(data, dict) else data
+            try:
+                prices[symbol] = float(price)
+            except (TypeError, ValueError):
+                continue
+        if not prices:
+            return
+        self.correlation_service.update_prices(prices)
+        
+        if self.correlation_matrix:
+            await self.correlation_matrix.analyze_cross_asset_correlations()
+    
     async def _get_market_data_for_patterns(self) -> Dict[str, Any]:
         """Get market data for pattern recognition."""
         try:
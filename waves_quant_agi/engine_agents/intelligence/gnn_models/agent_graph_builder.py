@@ -1,7 +1,8 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Set
 import networkx as nx
 import time
 from ..logs.intelligence_logger import IntelligenceLogger
+from .sparse_graph import SparseAgentGraph
 
 class AgentGraphBuilder:
     def __init__(self, config: Dict[str, Any], logger: IntelligenceLogger):
@@ -9,43 +10,100 @@ class AgentGraphBuilder:
         self.logger = logger
         self.dependency_threshold = config.get("dependency_threshold", 0.5)
 
+        # Persistent graph, updated in place from one metrics batch to the next
+        self.graph = nx.DiGraph()
+        self.sparse_graph = SparseAgentGraph()
+        self._task_of: Dict[str, Any] = {}
+        self._groups: Dict[Any, Set[str]] = {}
+        self._edge_list: List[Any] = []
+
     async def build_agent_graph(self, agent_metrics: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Build a graph of agent relationships based on metrics and interactions."""
+        """Build a graph of agent relationships based on metrics and interactions.
+
+        Dependencies depend only on task type, so agents are grouped by task
+        type and only agents that joined, left or changed task type have their
+        edges recomputed; an unchanged batch leaves the edges (and the compiled
+        CSR adjacency) untouched.
+        """
         try:
-            graph = nx.DiGraph()
+            graph, sparse_graph = self.graph, self.sparse_graph
+            present = {}
             for metric in agent_metrics:
                 agent = metric.get("agent", "unknown")
+                present[agent] = metric
+                if agent in graph:
+                    graph.nodes[agent].clear()
                 graph.add_node(agent, **{k: v for k, v in metric.items() if k != "agent"})
+                sparse_graph.add_node(agent)
 
-            # Add edges based on metric correlations or shared tasks
-            for i, m1 in enumerate(agent_metrics):
-                for m2 in agent_metrics[i+1:]:
-                    agent1, agent2 = m1.get("agent"), m2.get("agent")
-                    if agent1 and agent2:
-                        # Placeholder: Calculate dependency score (e.g., shared task overlap)
-                        dependency_score = self._calculate_dependency(m1, m2)
-                        if dependency_score > self.dependency_threshold:
-                            graph.add_edge(agent1, agent2, weight=dependency_score)
-                            graph.add_edge(agent2, agent1, weight=dependency_score)
+            edge_updates = sparse_graph.stats["edge_updates"]
+            for agent in [a for a in graph if a not in present]:
+                self._detach(agent)
+                graph.remove_node(agent)
+                sparse_graph.remove_node(agent)
+            for agent, metric in present.items():
+                # Agents without a name get a node but no dependencies
+                if not metric.get("agent"):
+                    continue
+                task_type = metric.get("task_type")
+                if agent in self._task_of and self._task_of[agent] == task_type:
+                    continue
+                self._detach(agent)
+                self._attach(agent, task_type)
+            edges_changed = sparse_graph.stats["edge_updates"] != edge_updates
+            if edges_changed:
+                self._edge_list = list(graph.edges(data=True))
 
             result = {
                 "type": "agent_graph",
                 "nodes": list(graph.nodes),
-                "edges": list(graph.edges(data=True)),
+                "edges": self._edge_list,
+                "edges_changed": edges_changed,
                 "timestamp": int(time.time()),
                 "description": f"Built agent graph with {len(graph.nodes)} nodes and {len(graph.edges)} edges"
             }
             self.logger.log_alert(result)
             await self.notify_core(result)
-            return {"graph": graph, "metadata": result}
+            return {"graph": graph, "sparse_graph": sparse_graph, "metadata": result}
         except Exception as e:
             self.logger.log_error(f"Error building agent graph: {e}")
             return {}
 
+    def _attach(self, agent: str, task_type: Any):
+        """Connect an agent to every member of the task groups it depends on, in both directions."""
+        for other_type, members in self._groups.items():
+            dependency_score = self._task_dependency(task_type, other_type)
+            if dependency_score <= self.dependency_threshold:
+                continue
+            for other in members:
+                self.graph.add_edge(agent, other, weight=dependency_score)
+                self.graph.add_edge(other, agent, weight=dependency_score)
+                self.sparse_graph.set_edge(agent, other, dependency_score)
+                self.sparse_graph.set_edge(other, agent, dependency_score)
+        self._task_of[agent] = task_type
+        self._groups.setdefault(task_type, set()).add(agent)
+
+    def _detach(self, agent: str):
+        if agent not in self._task_of:
+            return
+        task_type = self._task_of.pop(agent)
+        self._groups[task_type].discard(agent)
+        if not self._groups[task_type]:
+            del self._groups[task_type]
+        if agent in self.graph:
+            self.graph.remove_edges_from(list(self.graph.out_edges(agent)) + list(self.graph.in_edges(agent)))
+        for other in self.sparse_graph.neighbors(agent):
+            self.sparse_graph.remove_edge(agent, other)
+            self.sparse_graph.remove_edge(other, agent)
+
     def _calculate_dependency(self, m1: Dict[str, Any], m2: Dict[str, Any]) -> float:
         """Calculate dependency score between two agents (placeholder)."""
+        return self._task_dependency(m1.get("task_type"), m2.get("task_type"))
+
+    def _task_dependency(self, task1: Any, task2: Any) -> float:
+        """Dependency score between two task types (placeholder)."""
         # Mock: Based on shared task overlap or metric similarity
-        return 0.6 if m1.get("task_type") == m2.get("task_type") else 0.3
+        return 0.6 if task1 == task2 else 0.3
 
     async def notify_core(self, issue: Dict[str, Any]):
         """Notify Core Agent of graph construction."""
@@ -1,7 +1,7 @@
 import numpy as np
-import networkx as nx
 import time
 from typing import Dict, Any, List
+from scipy import sparse
 from ..logs.intelligence_logger import IntelligenceLogger
 from .agent_graph_builder import AgentGraphBuilder
 
@@ -17,16 +17,14 @@ class CoordinationGNN:
         """Initialize node embeddings using NumPy."""
         return np.random.randn(num_nodes, self.embedding_dim) * 0.1
 
-    def _aggregate_neighbors(self, embeddings: np.ndarray, graph: nx.DiGraph) -> np.ndarray:
-        """Aggregate neighbor embeddings (simplified GNN operation)."""
-        new_embeddings = embeddings.copy()
-        for node in graph.nodes():
-            neighbors = list(graph.neighbors(node))
-            if neighbors:
-                neighbor_embeddings = embeddings[[list(graph.nodes()).index(n) for n in neighbors]]
-                aggregated = np.mean(neighbor_embeddings, axis=0)
-                new_embeddings[list(graph.nodes()).index(node)] += self.learning_rate * aggregated
-        return new_embeddings
+    def _aggregate_neighbors(self, embeddings: np.ndarray, mean_adjacency: sparse.csr_matrix) -> np.ndarray:
+        """Aggregate neighbor embeddings (simplified GNN operation) as one sparse-dense matmul.
+
+        ``mean_adjacency`` is the row-normalized CSR adjacency, so each row of
+        the product is the mean of that node's neighbor embeddings and nodes
+        without neighbors are left unchanged.
+        """
+        return embeddings + self.learning_rate * (mean_adjacency @ embeddings)
 
     async def train_gnn(self, agent_metrics: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Train lightweight GNN to optimize agent coordination based on graph structure."""
@@ -36,15 +34,16 @@ class CoordinationGNN:
                 self.logger.log_info("Empty graph data for GNN training")
                 return {}
 
-            graph = graph_data["graph"]
-            num_nodes = len(graph.nodes)
+            sparse_graph = graph_data["sparse_graph"]
+            num_nodes = len(sparse_graph)
+            mean_adjacency = sparse_graph.mean_adjacency
             
-            # Initialize embeddings
-            embeddings = self._initialize_embeddings(num_nodes)
+            # Initialize embeddings (one row per index slot; free slots have no edges)
+            embeddings = self._initialize_embeddings(mean_adjacency.shape[0])
             
             # Simple training loop (3 iterations)
             for _ in range(3):
-                embeddings = self._aggregate_neighbors(embeddings, graph)
+                embeddings = self._aggregate_neighbors(embeddings, mean_adjacency)
                 # Apply simple activation
                 embeddings = np.tanh(embeddings)
 
@@ -69,22 +68,26 @@ class CoordinationGNN:
             if not graph_data:
                 return {}
 
-            graph = graph_data["graph"]
-            num_nodes = len(graph.nodes)
+            sparse_graph = graph_data["sparse_graph"]
+            num_nodes = len(sparse_graph)
+            mean_adjacency = sparse_graph.mean_adjacency
             
             # Get embeddings
-            embeddings = self._initialize_embeddings(num_nodes)
-            embeddings = self._aggregate_neighbors(embeddings, graph)
+            embeddings = self._initialize_embeddings(mean_adjacency.shape[0])
+            embeddings = self._aggregate_neighbors(embeddings, mean_adjacency)
             
             # Generate suggestions based on embedding similarity
+            slots = sparse_graph.active_slots()
+            active_embeddings = embeddings[slots]
+            # Calculate coordination score based on embedding
+            coordination_scores = active_embeddings.mean(axis=1)
             suggestions = []
-            for i, node in enumerate(graph.nodes()):
-                # Calculate coordination score based on embedding
-                coordination_score = np.mean(embeddings[i])
+            for slot, coordination_score, embedding in zip(slots.tolist(), coordination_scores.tolist(),
+                                                           active_embeddings.tolist()):
                 suggestions.append({
-                    "agent": node,
-                    "priority": float(coordination_score),
-                    "embedding": embeddings[i].tolist()
+                    "agent": sparse_graph.nodes[slot],
+                    "priority": coordination_score,
+                    "embedding": embedding
                 })
 
             optimizations = {
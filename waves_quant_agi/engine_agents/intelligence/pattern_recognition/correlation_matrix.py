@@ -4,6 +4,7 @@ import pandas as pd
 import numpy as np
 import redis
 from ..logs.intelligence_logger import IntelligenceLogger
+from ...shared_utils import get_correlation_service
 
 class CorrelationMatrix:
     """Advanced correlation analysis for agent performance metrics and market patterns."""
@@ -18,6 +19,7 @@ class CorrelationMatrix:
         self.min_data_points = config.get("min_data_points", 10)
         self.correlation_window = config.get("correlation_window", 3600)  # 1 hour
         self.update_interval = config.get("update_interval", 300)  # 5 minutes
+        self.correlation_service = get_correlation_service(config)
         
         # Performance tracking
         self.stats = {
@@ -80,17 +82,7 @@ class CorrelationMatrix:
             corr_matrix = metrics_df[numeric_columns].corr()
             
             # Find significant correlations
-            high_correlations = {}
-            for col1 in corr_matrix.columns:
-                for col2 in corr_matrix.columns:
-                    if col1 != col2:
-                        correlation = corr_matrix.loc[col1, col2]
-                        if abs(correlation) > self.correlation_threshold:
-                            high_correlations[f"{col1}_vs_{col2}"] = {
-                                "correlation": float(correlation),
-                                "strength": "strong" if abs(correlation) > 0.8 else "moderate",
-                                "direction": "positive" if correlation > 0 else "negative"
-                            }
+            high_correlations = self._significant_correlations(corr_matrix)
 
             # Calculate additional statistics
             stats = {
@@ -168,17 +160,7 @@ class CorrelationMatrix:
             corr_matrix = market_df.corr()
             
             # Find significant market correlations
-            market_correlations = {}
-            for col1 in corr_matrix.columns:
-                for col2 in corr_matrix.columns:
-                    if col1 != col2:
-                        correlation = corr_matrix.loc[col1, col2]
-                        if abs(correlation) > self.correlation_threshold:
-                            market_correlations[f"{col1}_vs_{col2}"] = {
-                                "correlation": float(correlation),
-                                "strength": "strong" if abs(correlation) > 0.8 else "moderate",
-                                "direction": "positive" if correlation > 0 else "negative"
-                            }
+            market_correlations = self._significant_correlations(corr_matrix)
 
             result = {
                 "type": "market_correlation_matrix",
@@ -195,6 +177,44 @@ class CorrelationMatrix:
             self.logger.log_error(f"Error analyzing market correlations: {e}")
             return {}
 
+    async def analyze_cross_asset_correlations(self) -> Dict[str, Any]:
+        """Significant cross-asset return correlations from the shared incremental correlation service."""
+        try:
+            pairs = self.correlation_service.pairs_above(self.correlation_threshold)
+            cross_asset = {f"{a}_vs_{b}": self._describe_correlation(correlation) for a, b, correlation in pairs}
+
+            result = {
+                "type": "cross_asset_correlation_matrix",
+                "correlations": cross_asset,
+                "instruments": self.correlation_service.size,
+                "timestamp": int(time.time()),
+                "description": f"Found {len(cross_asset)} significant cross-asset correlations"
+            }
+
+            self.logger.log_pattern("cross_asset_correlation", result)
+            await self.notify_core(result)
+            return result
+
+        except Exception as e:
+            self.logger.log_error(f"Error analyzing cross-asset correlations: {e}")
+            return {}
+
+    def _describe_correlation(self, correlation: float) -> Dict[str, Any]:
+        return {
+            "correlation": float(correlation),
+            "strength": "strong" if abs(correlation) > 0.8 else "moderate",
+            "direction": "positive" if correlation > 0 else "negative"
+        }
+
+    def _significant_correlations(self, corr_matrix: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+        """Ordered pairs above the threshold, found with one vectorized mask instead of nested column loops."""
+        values = corr_matrix.values
+        mask = np.abs(values) > self.correlation_threshold
+        np.fill_diagonal(mask, False)
+        columns = corr_matrix.columns
+        return {f"{columns[i]}_vs_{columns[j]}": self._describe_correlation(values[i, j])
+                for i, j in zip(*np.nonzero(mask))}
+
     async def detect_correlation_changes(self, current_correlations: Dict[str, Any], 
                                        previous_correlations: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Detect significant changes in correlation patterns."""
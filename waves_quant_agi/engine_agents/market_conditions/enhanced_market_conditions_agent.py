@@ -8,8 +8,8 @@ Focuses exclusively on market anomaly detection, regime analysis, and early warn
 import asyncio
 import time
 import json
-from typing import Dict, Any, List
-from engine_agents.shared_utils import BaseAgent, register_agent
+from typing import Dict, Any, List, Optional
+from engine_agents.shared_utils import BaseAgent, register_agent, get_correlation_service
 
 class EnhancedMarketConditionsAgent(BaseAgent):
     """Enhanced market conditions agent - focused solely on market anomaly detection."""
@@ -20,6 +20,12 @@ class EnhancedMarketConditionsAgent(BaseAgent):
         self.anomaly_detector = None
         self.early_warning = None
         self.regime_analyzer = None
+        self.detector_runtime = None
+        self.regime_engine = None
+        self.imbalance_monitor = None
+        self.liquidity_engine = None
+        self.anomaly_engine = None
+        self.correlation_service = None
         
         # Market conditions state
         self.market_state = {
@@ -29,7 +35,9 @@ class EnhancedMarketConditionsAgent(BaseAgent):
             "market_regime": "unknown",
             "detected_anomalies": [],
             "active_warnings": [],
-            "regime_history": []
+            "regime_history": [],
+            "sensor_incidents": {},
+            "symbol_regimes": {}
         }
         
         # Market conditions statistics
@@ -57,6 +65,24 @@ class EnhancedMarketConditionsAgent(BaseAgent):
             # Initialize regime analysis
             await self._initialize_regime_analysis()
             
+            # Shared incremental cross-asset correlation (feeds entanglement pairs and domino contagion)
+            self.correlation_service = get_correlation_service(self.config)
+            
+            # Initialize vectorized sensor detectors
+            await self._initialize_detector_runtime()
+            
+            # Initialize streaming per-symbol regime engine
+            await self._initialize_regime_engine()
+            
+            # Initialize event-driven imbalance monitor
+            await self._initialize_imbalance_monitor()
+            
+            # Initialize streaming order book liquidity engine
+            await self._initialize_liquidity_engine()
+            
+            # Initialize multivariate per-symbol anomaly baselines
+            await self._initialize_anomaly_engine()
+            
             self.logger.info("✅ Market Conditions Agent: Anomaly detection systems initialized")
             
         except Exception as e:
@@ -145,13 +171,63 @@ class EnhancedMarketConditionsAgent(BaseAgent):
             self.logger.error(f"Error analyzing market regime: {e}")
     
     async def _monitor_market_conditions(self):
-        """Monitor market conditions."""
+        """Monitor market conditions: run all sensor detectors and regime updates over one batch of symbols."""
         try:
-            # Placeholder for market conditions monitoring
-            pass
+            if not self.detector_runtime and not self.regime_engine and not self.anomaly_engine:
+                return
+            
+            market_data = await self._get_comprehensive_market_data()
+            data_timestamp = market_data.get("timestamp")
+            if data_timestamp is not None and data_timestamp == self.market_state.get("last_monitored_timestamp"):
+                return  # Unchanged snapshot, nothing new to scan
+            self.market_state["last_monitored_timestamp"] = data_timestamp
+            rows = [{"symbol": symbol, **data} for symbol, data in market_data.get("symbols", {}).items()
+                    if isinstance(data, dict)]
+            rows.extend({"symbol_pair": pair, **data} for pair, data in market_data.get("pairs", {}).items()
+                        if isinstance(data, dict))
+            if not rows:
+                return
+            
+            if self.correlation_service:
+                self._update_correlations(rows)
+            
+            if self.detector_runtime:
+                results = await self.detector_runtime.run_cycle(rows)
+                self.market_state["sensor_incidents"] = {name: len(incidents) for name, incidents in results.items()}
+            
+            if self.regime_engine:
+                self.regime_engine.ingest(rows)
+                changes = self.regime_engine.classify()
+                self.market_state["symbol_regimes"] = self.regime_engine.regime_counts()
+                if changes:
+                    await self._publish_symbol_regime_changes(changes)
+            
+            if self.anomaly_engine:
+                anomalies = self.anomaly_engine.scan(rows, self.config.get("max_anomalies_per_scan", 20))
+                for anomaly in anomalies:
+                    await self._process_anomaly(anomaly)
+            
         except Exception as e:
             self.logger.error(f"Error monitoring market conditions: {e}")
     
+    def _update_correlations(self, rows: List[Dict[str, Any]]):
+        """Feed this cycle's returns to the correlation service as one bar and add its strongest pairs as pair rows."""
+        returns = {}
+        for row in rows:
+            if "symbol" in row and "price_change" in row:
+                try:
+                    returns[row["symbol"]] = float(row["price_change"])
+                except (TypeError, ValueError):
+                    continue
+        self.correlation_service.update_bar(returns)
+        
+        known = {row["symbol_pair"] for row in rows if "symbol_pair" in row}
+        pairs = [(a, b, correlation) for a, b, correlation
+                 in self.correlation_service.pairs_above(self.config.get("correlation_threshold", 0.8))
+                 if f"{a}/{b}" not in known]
+        rows.extend({"symbol_pair": f"{a}/{b}", "correlation": correlation}
+                    for a, b, correlation in pairs[:self.config.get("max_correlation_pairs", 200)])
+    
     async def _report_anomalies(self):
         """Report anomalies."""
         try:
@@ -164,6 +240,8 @@ class EnhancedMarketConditionsAgent(BaseAgent):
         """Get background tasks for this agent."""
         return [
             (self._anomaly_detection_loop, "Anomaly Detection", "fast"),
+            (self._fast_imbalance_detection_loop, "Imbalance Events", "fast"),
+            (self._liquidity_event_loop, "Liquidity Events", "fast"),
             (self._regime_analysis_loop, "Regime Analysis", "tactical"),
             (self._market_conditions_monitoring_loop, "Market Conditions Monitoring", "tactical"),
             (self._anomaly_reporting_loop, "Anomaly Reporting", "strategic")
@@ -219,34 +297,114 @@ class EnhancedMarketConditionsAgent(BaseAgent):
             self.logger.error(f"❌ Error initializing regime analysis: {e}")
             raise
     
+    async def _initialize_detector_runtime(self):
+        """Initialize the vectorized sensor detector runtime."""
+        try:
+            from .core.detector_runtime import DetectorRuntime
+            redis_async = self.redis_conn.redis_async if await self.redis_conn.ensure_async_connection() else None
+            self.detector_runtime = DetectorRuntime(self.config, redis_async, correlation_service=self.correlation_service)
+            
+            self.logger.info(f"✅ Detector runtime initialized ({len(self.detector_runtime.detectors)} detectors)")
+            
+        except Exception as e:
+            self.logger.error(f"❌ Error initializing detector runtime: {e}")
+            raise
+    
+    async def _initialize_regime_engine(self):
+        """Initialize the streaming per-symbol regime engine."""
+        try:
+            from .core.regime_engine import StreamingRegimeEngine
+            self.regime_engine = StreamingRegimeEngine(self.config)
+            
+            self.logger.info("✅ Streaming regime engine initialized")
+            
+        except Exception as e:
+            self.logger.error(f"❌ Error initializing regime engine: {e}")
+            raise
+    
+    async def _initialize_imbalance_monitor(self):
+        """Initialize the event-driven imbalance monitor."""
+        try:
+            from .core.imbalance_monitor import ImbalanceMonitor
+            self.imbalance_monitor = ImbalanceMonitor(self.config)
+            self.imbalance_monitor.subscribe(self._on_imbalance_alert)
+            
+            self.logger.info("✅ Imbalance monitor initialized")
+            
+        except Exception as e:
+            self.logger.error(f"❌ Error initializing imbalance monitor: {e}")
+            raise
+    
+    async def _initialize_liquidity_engine(self):
+        """Initialize the streaming per-level liquidity engine."""
+        try:
+            from .core.liquidity_engine import LiquidityEngine
+            self.liquidity_engine = LiquidityEngine(self.config)
+            self.liquidity_engine.subscribe(self._on_liquidity_alert)
+            
+            self.logger.info("✅ Liquidity engine initialized")
+            
+        except Exception as e:
+            self.logger.error(f"❌ Error initializing liquidity engine: {e}")
+            raise
+    
+    async def _initialize_anomaly_engine(self):
+        """Initialize the multivariate streaming anomaly engine."""
+        try:
+            from .core.multivariate_anomaly import MultivariateAnomalyEngine
+            self.anomaly_engine = MultivariateAnomalyEngine(self.config)
+            
+            self.logger.info("✅ Multivariate anomaly engine initialized")
+            
+        except Exception as e:
+            self.logger.error(f"❌ Error initializing multivariate anomaly engine: {e}")
+            raise
+    
     # ============= FAST IMBALANCE DETECTION LOOP =============
     
     async def _fast_imbalance_detection_loop(self):
-        """Fast market imbalance detection for immediate anomalies (100ms)."""
+        """Event-driven imbalance detection: state updates on each order book or trade event."""
         while self.is_running:
             try:
-                start_time = time.time()
+                if not self.imbalance_monitor or not await self.redis_conn.ensure_async_connection():
+                    await asyncio.sleep(1.0)
+                    continue
                 
-                # Get real-time market data
-                market_data = await self._get_real_time_market_data()
+                # Blocks on the subscription; alerts fire from threshold crossing callbacks
+                await self.imbalance_monitor.consume(self.redis_conn.redis_async)
                 
-                if market_data:
-                    # Quick imbalance detection (for immediate response)
-                    imbalances = await self._detect_immediate_imbalances(market_data)
-                    
-                    if imbalances:
-                        await self._handle_immediate_imbalances(imbalances)
-                    
-                    # Record operation
-                    duration_ms = (time.time() - start_time) * 1000
-                    if hasattr(self, 'status_monitor') and self.status_monitor:
-                        self.status_monitor.record_operation(duration_ms, len(imbalances) > 0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Error in imbalance event loop: {e}")
+                await asyncio.sleep(1.0)
+    
+    async def _on_imbalance_alert(self, alert: Dict[str, Any]):
+        """Threshold crossing callback from the imbalance monitor."""
+        await self._handle_immediate_imbalances([alert])
+        if hasattr(self, 'status_monitor') and self.status_monitor:
+            self.status_monitor.record_operation(alert.get("detection_latency_ms", 0.0), True)
+    
+    async def _liquidity_event_loop(self):
+        """Order book and trade events into the per-level liquidity engine."""
+        while self.is_running:
+            try:
+                if not self.liquidity_engine or not await self.redis_conn.ensure_async_connection():
+                    await asyncio.sleep(1.0)
+                    continue
                 
-                await asyncio.sleep(0.1)  # 100ms for fast imbalance detection
+                # Blocks on the subscription; iceberg and flicker alerts fire from callbacks
+                await self.liquidity_engine.consume(self.redis_conn.redis_async)
                 
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
-                self.logger.error(f"Error in fast imbalance detection loop: {e}")
-                await asyncio.sleep(0.1)
+                self.logger.error(f"Error in liquidity event loop: {e}")
+                await asyncio.sleep(1.0)
+    
+    async def _on_liquidity_alert(self, alert: Dict[str, Any]):
+        """Iceberg or flickering quote callback from the liquidity engine."""
+        await self._process_anomaly(alert)
     
     async def _get_real_time_market_data(self) -> Dict[str, Any]:
         """Get real-time market data from Redis."""
@@ -695,6 +853,21 @@ class EnhancedMarketConditionsAgent(BaseAgent):
         except Exception as e:
             self.logger.error(f"Error publishing regime change alert: {e}")
     
+    async def _publish_symbol_regime_changes(self, changes: List[tuple]):
+        """Publish all per-symbol regime changes of one cycle as a single alert."""
+        try:
+            regime_change_alert = {
+                "alert_type": "symbol_regime_change",
+                "changes": [{"symbol": symbol, "old_regime": old, "new_regime": new} for symbol, old, new in changes],
+                "timestamp": time.time(),
+                "agent": self.agent_name
+            }
+            
+            await self.redis_conn.publish_async("market_conditions:regime_change_alerts", json.dumps(regime_change_alert))
+            
+        except Exception as e:
+            self.logger.error(f"Error publishing symbol regime changes: {e}")
+    
     # ============= PUBLIC INTERFACE =============
     
     async def get_market_conditions_status(self) -> Dict[str, Any]:
@@ -702,9 +875,24 @@ class EnhancedMarketConditionsAgent(BaseAgent):
         return {
             "market_state": self.market_state,
             "stats": self.stats,
+            "detector_runtime": self.detector_runtime.get_stats() if self.detector_runtime else None,
+            "regime_engine": self.regime_engine.get_stats() if self.regime_engine else None,
+            "imbalance_monitor": self.imbalance_monitor.get_stats() if self.imbalance_monitor else None,
+            "liquidity_engine": self.liquidity_engine.get_stats() if self.liquidity_engine else None,
+            "anomaly_engine": self.anomaly_engine.get_stats() if self.anomaly_engine else None,
+            "correlation_service": self.correlation_service.get_stats() if self.correlation_service else None,
             "last_update": time.time()
         }
     
+    async def get_liquidity_heatmap(self, symbol: str, levels: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Per-level depth and activity around the mid, with detected hidden liquidity."""
+        if not self.liquidity_engine:
+            return None
+        heatmap = self.liquidity_engine.heatmap(symbol, levels)
+        if heatmap is not None:
+            heatmap["hidden_liquidity"] = self.liquidity_engine.hidden_liquidity(symbol)
+        return heatmap
+    
     async def get_detected_anomalies(self) -> List[Dict[str, Any]]:
         """Get currently detected anomalies."""
         return self.market_state.get("detected_anomalies", [])
@@ -719,6 +907,7 @@ class EnhancedMarketConditionsAgent(BaseAgent):
             "current_regime": self.market_state["market_regime"],
             "regime_history": self.market_state.get("regime_history", []),
             "behavior_predictions": self.market_state.get("behavior_predictions", {}),
+            "symbol_regimes": self.market_state.get("symbol_regimes", {}),
             "last_update": time.time()
         }
     
@@ -21,11 +21,15 @@ class DynamicWeightUpdater:
         """Dynamically adjust model weights based on performance."""
         try:
             updates = []
-            for data in model_data:
+            # One round trip for all previous weights instead of a GET per record
+            keys = [f"market_conditions:weight:{data.get('symbol', 'unknown')}" for data in model_data]
+            previous_weights = self.redis_client.mget(keys) if keys else []
+            pipe = self.redis_client.pipeline()
+            for data, key, previous in zip(model_data, keys, previous_weights):
                 symbol = data.get("symbol", "unknown")
                 current_weight = float(data.get("current_weight", 0.5))
                 performance = float(data.get("performance", 0.5))
-                previous_weight = float(self.redis_client.get(f"market_conditions:weight:{symbol}") or 0.5)
+                previous_weight = float(previous or 0.5)
 
                 if abs(current_weight - previous_weight) > self.weight_threshold:
                     update = {
@@ -39,7 +43,8 @@ class DynamicWeightUpdater:
                     updates.append(update)
                     self.logger.log_issue(update)
                     self.cache.store_incident(update)
-                    self.redis_client.set(f"market_conditions:weight:{symbol}", str(current_weight), ex=604800)  # Expire after 7 days
+                    pipe.set(key, str(current_weight), ex=604800)  # Expire after 7 days
+            pipe.execute()
 
             summary = {
                 "type": "weight_update_summary",
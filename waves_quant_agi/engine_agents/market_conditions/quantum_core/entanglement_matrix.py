@@ -1,8 +1,9 @@
 import time
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import redis
 from ..logs.failure_agent_logger import FailureAgentLogger
 from ..logs.incident_cache import IncidentCache
+from ...shared_utils import get_correlation_service
 
 class EntanglementMatrix:
     def __init__(self, config: Dict[str, Any], logger: FailureAgentLogger, cache: IncidentCache):
@@ -16,15 +17,34 @@ class EntanglementMatrix:
             decode_responses=True
         )
         self.correlation_threshold = config.get("correlation_threshold", 0.8)  # Correlation threshold
+        self.correlation_service = get_correlation_service(config)
 
-    async def compute_entanglement(self, market_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Compute quantum-inspired entanglement matrix for market assets."""
+    def _pair_correlation(self, data: Dict[str, Any]) -> float:
+        """Explicit correlation if given, otherwise the shared service's value for an "A/B" pair."""
+        if "correlation" in data:
+            return float(data["correlation"])
+        symbols = str(data.get("symbol_pair", "")).split("/")
+        if len(symbols) == 2:
+            correlation = self.correlation_service.correlation(symbols[0], symbols[1])
+            if correlation is not None:
+                return correlation
+        return 0.0
+
+    async def compute_entanglement(self, market_data: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """Compute quantum-inspired entanglement matrix for market assets.
+
+        Without explicit pairs, every pair above the threshold in the shared
+        correlation service is reported.
+        """
         try:
-            entanglements = []
-            for data in market_data:
-                symbol_pair = data.get("symbol_pair", "unknown")
-                correlation = float(data.get("correlation", 0.0))
+            if market_data:
+                pairs = [(data.get("symbol_pair", "unknown"), self._pair_correlation(data)) for data in market_data]
+            else:
+                pairs = [(f"{a}/{b}", correlation) for a, b, correlation
+                         in self.correlation_service.pairs_above(self.correlation_threshold)]
 
+            entanglements = []
+            for symbol_pair, correlation in pairs:
                 if abs(correlation) > self.correlation_threshold:
                     entanglement = {
                         "type": "entanglement_matrix",
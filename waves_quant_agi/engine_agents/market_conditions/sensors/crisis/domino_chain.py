@@ -3,6 +3,7 @@ from typing import Dict, Any, List
 import redis
 from ...logs.failure_agent_logger import FailureAgentLogger
 from ...logs.incident_cache import IncidentCache
+from ....shared_utils import get_correlation_service
 
 class DominoChain:
     def __init__(self, config: Dict[str, Any], logger: FailureAgentLogger, cache: IncidentCache):
@@ -16,6 +17,10 @@ class DominoChain:
             decode_responses=True
         )
         self.chain_threshold = config.get("chain_threshold", 0.7)  # Confidence for chain reaction
+        self.contagion_threshold = config.get("contagion_correlation_threshold", 0.7)
+        self.contagion_depth = config.get("contagion_max_depth", 3)
+        self.contagion_exposure_high = config.get("contagion_exposure_high", 2.0)
+        self.correlation_service = get_correlation_service(config)
 
     async def predict_domino_chain(self, crisis_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Predict chain reactions from initial crisis signs."""
@@ -26,11 +31,18 @@ class DominoChain:
                 crisis_score = float(data.get("crisis_score", 0.0))
 
                 if crisis_score > self.chain_threshold:
+                    contagion = self.correlation_service.contagion_paths(
+                        symbol, self.contagion_threshold, self.contagion_depth)
+                    exposure = sum(reach["strength"] for reach in contagion.values())
                     chain = {
                         "type": "domino_chain",
                         "symbol": symbol,
                         "crisis_score": crisis_score,
-                        "predicted_impact": self._predict_impact(crisis_score),
+                        "predicted_impact": self._predict_impact(crisis_score, exposure),
+                        "contagion_exposure": exposure,
+                        "contagion_paths": sorted(
+                            ({"symbol": target, **reach} for target, reach in contagion.items()),
+                            key=lambda reach: -reach["strength"])[:10],
                         "timestamp": int(time.time()),
                         "description": f"Domino chain predicted for {symbol}: score {crisis_score:.2f}"
                     }
@@ -58,9 +70,9 @@ class DominoChain:
             })
             return []
 
-    def _predict_impact(self, crisis_score: float) -> str:
-        """Predict impact of crisis (placeholder)."""
-        return "high" if crisis_score > 0.8 else "moderate"
+    def _predict_impact(self, crisis_score: float, exposure: float = 0.0) -> str:
+        """Predict impact of crisis from its score and correlated exposure along contagion paths."""
+        return "high" if crisis_score > 0.8 or exposure > self.contagion_exposure_high else "moderate"
 
     async def notify_core(self, issue: Dict[str, Any]):
         """Notify Core Agent of domino chain predictions."""
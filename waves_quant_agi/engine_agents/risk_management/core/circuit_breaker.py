@@ -8,13 +8,9 @@ Provides automatic fallback and recovery mechanisms
 import time
 import asyncio
 from typing import Dict, Any, Callable, Optional, Union
-from enum import Enum
 
-class CircuitState(Enum):
-    """Circuit breaker states."""
-    CLOSED = "CLOSED"      # Normal operation
-    OPEN = "OPEN"          # Circuit is open, calls fail fast
-    HALF_OPEN = "HALF_OPEN"  # Testing if service is recovered
+# Shared with the agent-wide CircuitBreakerRegistry
+from ...shared_utils.circuit_breaker_registry import CircuitState
 
 class CircuitBreaker:
     """Circuit breaker implementation for fault tolerance."""
@@ -10,6 +10,7 @@ import asyncio
 import numpy as np
 from typing import Dict, Any, List, Optional
 from .connection_manager import ConnectionManager
+from engine_agents.shared_utils.bounded_cache import BoundedCache
 
 class DynamicRiskLimits:
     """Dynamic risk limits based on real-time market data."""
@@ -17,9 +18,10 @@ class DynamicRiskLimits:
     def __init__(self, connection_manager: ConnectionManager, config: Dict[str, Any]):
         self.connection_manager = connection_manager
         self.config = config
-        self.cache = {}
         self.cache_ttl = config.get('cache_ttl', 300)  # 5 minutes default
         self.max_cache_size = config.get('max_cache_size', 1000)
+        self.cache = BoundedCache('risk_limits', max_entries=self.max_cache_size, ttl=self.cache_ttl,
+                                  owner='risk_management')
         
         # Base risk limits (fallback values)
         self.base_limits = {
@@ -60,12 +62,9 @@ class DynamicRiskLimits:
         cache_key = f"{strategy_type}:{symbol}"
         
         # Check cache first
-        if cache_key in self.cache:
-            cache_entry = self.cache[cache_key]
-            if time.time() < cache_entry['expiry']:
-                return cache_entry['data']
-            else:
-                del self.cache[cache_key]
+        cached_limits = self.cache.get(cache_key)
+        if cached_limits is not None:
+            return cached_limits
         
         # Fetch real-time risk limits
         try:
@@ -311,16 +310,8 @@ class DynamicRiskLimits:
         return self.base_limits.get(strategy_type, self.base_limits["htf"])
     
     def _update_cache(self, key: str, data: Dict[str, Any]):
-        """Update cache with new data."""
-        # Remove oldest entries if cache is full
-        if len(self.cache) >= self.max_cache_size:
-            oldest_key = min(self.cache.keys(), key=lambda k: self.cache[k]['expiry'])
-            del self.cache[oldest_key]
-        
-        self.cache[key] = {
-            'data': data,
-            'expiry': time.time() + self.cache_ttl
-        }
+        """Update cache with new data (least recently used entry evicted when full)."""
+        self.cache.set(key, data)
     
     def clear_cache(self):
         """Clear the entire cache."""
@@ -329,8 +320,9 @@ class DynamicRiskLimits:
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
         return {
+            **self.cache.get_stats(),
             'cache_size': len(self.cache),
             'max_cache_size': self.max_cache_size,
             'cache_ttl': self.cache_ttl,
-            'cache_keys': list(self.cache.keys())
+            'cache_keys': self.cache.keys()
         }
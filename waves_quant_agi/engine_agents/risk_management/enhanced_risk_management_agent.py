@@ -9,8 +9,12 @@ Focuses exclusively on risk validation and portfolio monitoring.
 import asyncio
 import time
 import json
-from typing import Dict, Any, List
-from engine_agents.shared_utils import BaseAgent, register_agent
+from typing import Dict, Any, List, Optional, Set
+from engine_agents.shared_utils import BaseAgent, register_agent, CircuitBreakerRegistry
+
+# Breakers driven by portfolio risk alerts and by risk limit violations respectively
+ALERT_BREAKERS = ("max_daily_loss", "max_position_size", "max_drawdown")
+LIMIT_BREAKERS = ("max_position_size", "max_leverage")
 
 class EnhancedRiskManagementAgent(BaseAgent):
     """Enhanced risk management agent - focused solely on risk validation."""
@@ -180,12 +184,15 @@ class EnhancedRiskManagementAgent(BaseAgent):
     async def _initialize_circuit_breakers(self):
         """Initialize circuit breakers for risk management."""
         try:
-            from .core.circuit_breaker import CircuitBreakerManager
-            self.circuit_breaker = CircuitBreakerManager(self.config)
+            self.circuit_breaker = CircuitBreakerRegistry(self.config)
+            self.circuit_breaker.subscribe(self._on_circuit_breaker_event)
             
             # Set up default circuit breakers
             await self._setup_default_circuit_breakers()
             
+            # Half-open recovery runs on the registry's timing wheel - no polling loop
+            self.circuit_breaker.start()
+            
             self.logger.info("✅ Circuit breakers initialized")
             
         except Exception as e:
@@ -197,6 +204,7 @@ class EnhancedRiskManagementAgent(BaseAgent):
         try:
             from .core.dynamic_risk_limits import DynamicRiskLimits
             self.risk_limits = DynamicRiskLimits(self.config)
+            self.risk_limits.cache.owner = self.agent_name
             
             # Set up default risk limits
             await self._setup_default_risk_limits()
@@ -219,10 +227,12 @@ class EnhancedRiskManagementAgent(BaseAgent):
             }
             
             for name, config in circuit_breakers_config.items():
-                await self.circuit_breaker.create_circuit_breaker(
+                self.circuit_breaker.register(
                     name=name,
-                    threshold=config["threshold"],
-                    timeout=config["timeout"]
+                    scope="risk",
+                    failure_threshold=1,
+                    recovery_timeout=config["timeout"],
+                    metadata={"threshold": config["threshold"]}
                 )
                 
         except Exception as e:
@@ -258,10 +268,13 @@ class EnhancedRiskManagementAgent(BaseAgent):
                 start_time = time.time()
                 
                 # Monitor portfolio risk
-                await self._monitor_portfolio_risk()
+                alert_conditions = await self._monitor_portfolio_risk()
                 
                 # Check risk limits
-                await self._check_risk_limits()
+                limit_conditions = await self._check_risk_limits()
+                
+                # Trip breached breakers, close recovered ones
+                self._apply_risk_conditions(alert_conditions, limit_conditions)
                 
                 # Update risk state
                 self._update_risk_state()
@@ -277,8 +290,8 @@ class EnhancedRiskManagementAgent(BaseAgent):
                 self.logger.error(f"Error in risk monitoring loop: {e}")
                 await asyncio.sleep(30)
     
-    async def _monitor_portfolio_risk(self):
-        """Monitor overall portfolio risk."""
+    async def _monitor_portfolio_risk(self) -> Optional[Dict[str, Optional[str]]]:
+        """Monitor overall portfolio risk; returns the alert breakers' conditions, None if not evaluated."""
         try:
             if self.portfolio_monitor:
                 # Get portfolio risk metrics
@@ -289,13 +302,14 @@ class EnhancedRiskManagementAgent(BaseAgent):
                 self.risk_state["last_risk_assessment"] = time.time()
                 
                 # Check for risk alerts
-                await self._check_risk_alerts(risk_metrics)
+                return self._check_risk_alerts(risk_metrics)
                 
         except Exception as e:
             self.logger.error(f"Error monitoring portfolio risk: {e}")
+        return None
     
-    async def _check_risk_limits(self):
-        """Check risk limits for all asset classes."""
+    async def _check_risk_limits(self) -> Optional[Dict[str, Optional[str]]]:
+        """Check risk limits for all asset classes; returns the limit breakers' conditions, None if not evaluated."""
         try:
             if self.risk_limits:
                 # Check all risk limits
@@ -303,49 +317,75 @@ class EnhancedRiskManagementAgent(BaseAgent):
                 
                 if limit_violations:
                     self.stats["risk_limit_violations"] += len(limit_violations)
-                    await self._handle_risk_limit_violations(limit_violations)
+                return self._handle_risk_limit_violations(limit_violations or [])
                     
         except Exception as e:
             self.logger.error(f"Error checking risk limits: {e}")
+        return None
     
-    async def _check_risk_alerts(self, risk_metrics: Dict[str, Any]):
-        """Check for risk alerts and trigger circuit breakers if needed."""
-        try:
-            # Check daily loss
-            daily_loss = risk_metrics.get("daily_loss", 0)
-            if daily_loss < -0.05:  # 5% daily loss
-                await self.circuit_breaker.trigger("max_daily_loss")
-                self.stats["circuit_breakers_triggered"] += 1
-            
-            # Check position size
-            max_position = risk_metrics.get("max_position_size", 0)
-            if max_position > 0.1:  # 10% position size
-                await self.circuit_breaker.trigger("max_position_size")
-                self.stats["circuit_breakers_triggered"] += 1
-            
-            # Check drawdown
-            drawdown = risk_metrics.get("drawdown", 0)
-            if drawdown < -0.15:  # 15% drawdown
-                await self.circuit_breaker.trigger("max_drawdown")
-                self.stats["circuit_breakers_triggered"] += 1
-                
-        except Exception as e:
-            self.logger.error(f"Error checking risk alerts: {e}")
-    
-    async def _handle_risk_limit_violations(self, violations: List[Dict[str, Any]]):
-        """Handle risk limit violations."""
-        try:
-            for violation in violations:
-                self.logger.warning(f"Risk limit violation: {violation}")
-                
-                # Trigger appropriate circuit breaker
-                if violation.get("type") == "exposure":
-                    await self.circuit_breaker.trigger("max_position_size")
-                elif violation.get("type") == "leverage":
-                    await self.circuit_breaker.trigger("max_leverage")
-                    
-        except Exception as e:
-            self.logger.error(f"Error handling risk limit violations: {e}")
+    def _check_risk_alerts(self, risk_metrics: Dict[str, Any]) -> Dict[str, Optional[str]]:
+        """Map risk metrics to alert breaker conditions: breach reason, or None when clear."""
+        conditions: Dict[str, Optional[str]] = dict.fromkeys(ALERT_BREAKERS)
+        
+        # Check daily loss
+        daily_loss = risk_metrics.get("daily_loss", 0)
+        if daily_loss < -0.05:  # 5% daily loss
+            conditions["max_daily_loss"] = f"daily_loss={daily_loss:.4f}"
+        
+        # Check position size
+        max_position = risk_metrics.get("max_position_size", 0)
+        if max_position > 0.1:  # 10% position size
+            conditions["max_position_size"] = f"max_position_size={max_position:.4f}"
+        
+        # Check drawdown
+        drawdown = risk_metrics.get("drawdown", 0)
+        if drawdown < -0.15:  # 15% drawdown
+            conditions["max_drawdown"] = f"drawdown={drawdown:.4f}"
+        
+        return conditions
+    
+    def _handle_risk_limit_violations(self, violations: List[Dict[str, Any]]) -> Dict[str, Optional[str]]:
+        """Map risk limit violations to limit breaker conditions."""
+        conditions: Dict[str, Optional[str]] = dict.fromkeys(LIMIT_BREAKERS)
+        for violation in violations:
+            self.logger.warning(f"Risk limit violation: {violation}")
+            
+            # Trigger appropriate circuit breaker
+            if violation.get("type") == "exposure":
+                conditions["max_position_size"] = "exposure_violation"
+            elif violation.get("type") == "leverage":
+                conditions["max_leverage"] = "leverage_violation"
+        return conditions
+    
+    def _apply_risk_conditions(self, *source_conditions: Optional[Dict[str, Optional[str]]]):
+        """Trip every breached breaker and close breakers every covering source reported clear.
+        
+        Breakers are re-tripped while their condition holds (restarting the recovery
+        timeout). Once the condition clears, record_success closes the breaker as
+        soon as it reaches HALF_OPEN. A source that could not be evaluated (None)
+        leaves the breakers it covers as they are.
+        """
+        if not self.circuit_breaker:
+            return
+        breaches: Dict[str, str] = {}
+        cleared: Set[str] = set()
+        unknown: Set[str] = set()
+        for names, conditions in zip((ALERT_BREAKERS, LIMIT_BREAKERS), source_conditions):
+            if conditions is None:
+                unknown.update(names)
+                continue
+            for name in names:
+                reason = conditions.get(name)
+                if reason:
+                    breaches.setdefault(name, reason)
+                else:
+                    cleared.add(name)
+        
+        for name, reason in breaches.items():
+            self.circuit_breaker.trip(name, reason)
+            self.stats["circuit_breakers_triggered"] += 1
+        for name in cleared - unknown - breaches.keys():
+            self.circuit_breaker.record_success(name)
     
     # ============= PORTFOLIO EXPOSURE TRACKING =============
     
@@ -385,36 +425,21 @@ class EnhancedRiskManagementAgent(BaseAgent):
     
     # ============= CIRCUIT BREAKER MONITORING =============
     
-    async def _circuit_breaker_monitoring(self):
-        """Monitor circuit breakers (100ms intervals)."""
-        while self.is_running:
-            try:
-                if self.circuit_breaker:
-                    # Check circuit breaker status
-                    circuit_status = await self.circuit_breaker.get_status()
-                    
-                    # Update risk state
-                    self.risk_state["active_circuit_breakers"] = circuit_status
-                    
-                    # Check for circuit breaker resets
-                    await self._check_circuit_breaker_resets(circuit_status)
-                
-                await asyncio.sleep(0.1)  # 100ms circuit breaker monitoring
-                
-            except Exception as e:
-                self.logger.error(f"Error in circuit breaker monitoring: {e}")
-                await asyncio.sleep(0.1)
-    
-    async def _check_circuit_breaker_resets(self, circuit_status: Dict[str, Any]):
-        """Check if circuit breakers can be reset."""
+    async def _on_circuit_breaker_event(self, event: Dict[str, Any]):
+        """Handle circuit breaker state changes pushed by the registry."""
         try:
-            for circuit_name, status in circuit_status.items():
-                if status.get("state") == "open" and status.get("can_reset", False):
-                    await self.circuit_breaker.reset(circuit_name)
-                    self.logger.info(f"Circuit breaker {circuit_name} reset")
-                    
+            # Risk state only tracks tripped breakers; recomputed per event, not per poll
+            self.risk_state["active_circuit_breakers"] = self.circuit_breaker.get_status()
+            
+            if event["to_state"] == "OPEN":
+                self.logger.warning(f"⚠️ Circuit breaker {event['name']} opened: {event['reason']}")
+            else:
+                self.logger.info(f"Circuit breaker {event['name']} -> {event['to_state']}")
+            
+            await self.redis_conn.publish_async("risk:circuit_breakers", json.dumps(event))
+            
         except Exception as e:
-            self.logger.error(f"Error checking circuit breaker resets: {e}")
+            self.logger.error(f"Error handling circuit breaker event: {e}")
     
     # ============= RISK VALIDATION METHODS =============
     
@@ -465,11 +490,9 @@ class EnhancedRiskManagementAgent(BaseAgent):
             if not self.circuit_breaker:
                 return False
             
-            # Check if any circuit breakers are active
-            circuit_status = await self.circuit_breaker.get_status()
-            
-            for circuit_name, status in circuit_status.items():
-                if status.get("state") == "open":
+            # Only tripped breakers are visited; closed breakers cost nothing
+            for circuit_name in list(self.circuit_breaker.tripped):
+                if self.circuit_breaker.is_open(circuit_name):
                     # Check if this trade would violate the circuit breaker
                     if await self._trade_violates_circuit_breaker(trade_request, circuit_name):
                         return True
@@ -551,7 +574,7 @@ class EnhancedRiskManagementAgent(BaseAgent):
         try:
             # Cleanup circuit breakers
             if self.circuit_breaker:
-                await self.circuit_breaker.cleanup()
+                await self.circuit_breaker.stop()
             
             # Cleanup risk limits
             if hasattr(self, 'risk_limits') and self.risk_limits:
@@ -586,7 +609,7 @@ class EnhancedRiskManagementAgent(BaseAgent):
         """Reset a specific circuit breaker."""
         try:
             if self.circuit_breaker:
-                return await self.circuit_breaker.reset(circuit_name)
+                return self.circuit_breaker.reset(circuit_name)
             return False
             
         except Exception as e:
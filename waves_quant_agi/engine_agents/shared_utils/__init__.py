@@ -11,6 +11,19 @@ from .shared_logger import get_shared_logger
 from .shared_status_monitor import SharedStatusMonitor, get_agent_monitor
 from .market_data_utils import MarketDataUtils, get_market_data_utils
 
+# Circuit breakers and timers
+from .timing_wheel import HierarchicalTimingWheel
+from .circuit_breaker_registry import CircuitBreakerRegistry
+
+# Streaming slippage analytics
+from .slippage_analytics import SlippageAnalytics, DDSketch, get_slippage_analytics
+
+# Incremental cross-asset correlation
+from .correlation_service import IncrementalCorrelationService, get_correlation_service
+
+# Bounded TTL caches
+from .bounded_cache import BoundedCache, get_cache_stats, symbol_key, quantize, quantize_log
+
 # Simplified timing system
 from .simplified_timing import (
     SimplifiedTimingCoordinator, 
@@ -34,6 +47,18 @@ __all__ = [
     'get_agent_monitor',
     'MarketDataUtils',
     'get_market_data_utils',
+    'HierarchicalTimingWheel',
+    'CircuitBreakerRegistry',
+    'SlippageAnalytics',
+    'DDSketch',
+    'get_slippage_analytics',
+    'IncrementalCorrelationService',
+    'get_correlation_service',
+    'BoundedCache',
+    'get_cache_stats',
+    'symbol_key',
+    'quantize',
+    'quantize_log',
     
     # Simplified timing
     'SimplifiedTimingCoordinator',
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Bounded Cache - TTL cache with O(1) LRU or LFU eviction
+Replaces ad hoc dict caches that evict with a min() scan over every entry.
+Entries share one TTL, so expiry order is insertion order and expired
+entries are purged from the front in amortized O(1). Capacity eviction is
+O(1) for both policies. Every cache keeps hit/miss/eviction counters and an
+approximate memory footprint, and registers under its owning agent so the
+status monitor can report them.
+"""
+
+import math
+import sys
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+
+def quantize(value: float, step: float) -> int:
+    """Bucket index of ``value`` on a linear grid of width ``step``."""
+    return int(math.floor(value / step + 0.5))
+
+
+def quantize_log(value: float, relative_step: float) -> int:
+    """Bucket index on a log grid: buckets are ``relative_step`` wide in relative terms at any price level."""
+    if value <= 0:
+        return 0
+    return int(math.floor(math.log(value) / math.log1p(relative_step) + 0.5))
+
+
+def symbol_key(namespace: str, symbol: str, **quantized: int) -> Tuple[Hashable, ...]:
+    """Cache key scoped to a symbol; pass already-quantized fields so nearby inputs share an entry."""
+    return (namespace, symbol) + tuple(sorted(quantized.items()))
+
+
+def approx_size(value: Any, depth: int = 4) -> int:
+    """Shallow-recursive byte estimate of a cached value (dicts, sequences and scalars)."""
+    size = sys.getsizeof(value)
+    if depth <= 0:
+        return size
+    if isinstance(value, dict):
+        size += sum(approx_size(k, depth - 1) + approx_size(v, depth - 1) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(approx_size(v, depth - 1) for v in value)
+    elif hasattr(value, "nbytes"):
+        size += int(value.nbytes)
+    return size
+
+
+class BoundedCache:
+    """Fixed-capacity cache with a shared TTL and ``lru`` or ``lfu`` eviction.
+
+    LRU keeps one access-ordered dict. LFU keeps one insertion-ordered dict
+    per access count plus the current minimum count, so the least frequently
+    used entry (least recently used among ties) is found without a scan.
+    """
+
+    def __init__(self, name: str, max_entries: int = 1000, ttl: Optional[float] = 300.0,
+                 policy: str = "lru", owner: Optional[str] = None):
+        if policy not in ("lru", "lfu"):
+            raise ValueError(f"Unknown cache policy: {policy}")
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.policy = policy
+        self.owner = owner
+
+        # key -> [value, expires, frequency, size]
+        self._entries: Dict[Hashable, List[Any]] = {}
+        self._expiry: "OrderedDict[Hashable, None]" = OrderedDict()
+        self._recency: "OrderedDict[Hashable, None]" = OrderedDict()
+        self._frequency: Dict[int, "OrderedDict[Hashable, None]"] = {}
+        self._min_frequency = 0
+        self.memory_bytes = 0
+        self.stats = {"hits": 0, "misses": 0, "sets": 0, "evictions": 0, "expirations": 0}
+        _register(self)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and not self._expired(entry, time.time())
+
+    def _expired(self, entry: List[Any], now: float) -> bool:
+        return entry[1] is not None and now >= entry[1]
+
+    # ============= ACCESS =============
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return default
+        if self._expired(entry, time.time()):
+            self._remove(key)
+            self.stats["expirations"] += 1
+            self.stats["misses"] += 1
+            return default
+        self._touch(key, entry)
+        self.stats["hits"] += 1
+        return entry[0]
+
+    def set(self, key: Hashable, value: Any):
+        now = time.time()
+        self._purge_expired(now)
+        size = approx_size(value)
+        expires = now + self.ttl if self.ttl is not None else None
+        entry = self._entries.get(key)
+        if entry is not None:
+            # Overwrite keeps the entry's recency/frequency standing and restarts its TTL
+            self.memory_bytes += size - entry[3]
+            entry[0], entry[1], entry[3] = value, expires, size
+            self._expiry.move_to_end(key)
+            self._touch(key, entry)
+            self.stats["sets"] += 1
+            return
+        if len(self._entries) >= self.max_entries:
+            self._evict()
+
+        self._entries[key] = [value, expires, 1, size]
+        self._expiry[key] = None
+        if self.policy == "lru":
+            self._recency[key] = None
+        else:
+            self._frequency.setdefault(1, OrderedDict())[key] = None
+            self._min_frequency = 1
+        self.memory_bytes += size
+        self.stats["sets"] += 1
+
+    def keys(self) -> List[Hashable]:
+        return list(self._entries)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        self._remove(key)
+        return entry[0]
+
+    def clear(self):
+        self._entries.clear()
+        self._expiry.clear()
+        self._recency.clear()
+        self._frequency.clear()
+        self._min_frequency = 0
+        self.memory_bytes = 0
+
+    # ============= BOOKKEEPING =============
+
+    def _touch(self, key: Hashable, entry: List[Any]):
+        if self.policy == "lru":
+            self._recency.move_to_end(key)
+            return
+        frequency = entry[2]
+        bucket = self._frequency[frequency]
+        del bucket[key]
+        if not bucket:
+            del self._frequency[frequency]
+            if self._min_frequency == frequency:
+                self._min_frequency = frequency + 1
+        entry[2] = frequency + 1
+        self._frequency.setdefault(frequency + 1, OrderedDict())[key] = None
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key)
+        del self._expiry[key]
+        if self.policy == "lru":
+            del self._recency[key]
+        else:
+            bucket = self._frequency[entry[2]]
+            del bucket[key]
+            if not bucket:
+                del self._frequency[entry[2]]
+        self.memory_bytes -= entry[3]
+
+    def _evict(self):
+        if self.policy == "lru":
+            key = next(iter(self._recency))
+        else:
+            if self._min_frequency not in self._frequency:
+                # Minimum went stale after removals; buckets are few, so this stays cheap
+                self._min_frequency = min(self._frequency)
+            key = next(iter(self._frequency[self._min_frequency]))
+        self._remove(key)
+        self.stats["evictions"] += 1
+
+    def _purge_expired(self, now: float):
+        """Drop expired entries from the front of the insertion-ordered expiry list."""
+        if self.ttl is None:
+            return
+        while self._expiry:
+            key = next(iter(self._expiry))
+            if not self._expired(self._entries[key], now):
+                break
+            self._remove(key)
+            self.stats["expirations"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            "name": self.name,
+            "policy": self.policy,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+            "memory_bytes": self.memory_bytes,
+            **self.stats
+        }
+
+
+# Live caches by owner, for status reporting; weak so dropped caches disappear
+_registry: "weakref.WeakSet[BoundedCache]" = weakref.WeakSet()
+
+
+def _register(cache: BoundedCache):
+    _registry.add(cache)
+
+
+def get_cache_stats(owner: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """Stats of every live cache, or only those owned by ``owner``."""
+    return {cache.name: cache.get_stats() for cache in list(_registry)
+            if owner is None or cache.owner == owner}
+
+
+if __name__ == "__main__":
+    import random
+
+    def benchmark_cache(entries: int = 1000, operations: int = 200000, symbols: int = 50):
+        """Set cost of min()-scan eviction versus O(1) eviction, and key collisions of int(price) keys."""
+        rng = random.Random(4)
+        prices = {f"SYM{i}": rng.choice([1.08, 1.27, 150.0, 2350.0, 43000.0]) * rng.uniform(0.9, 1.1)
+                  for i in range(symbols)}
+        names = list(prices)
+
+        legacy, started = {}, time.perf_counter()
+        for i in range(operations // 20):
+            legacy[i] = ({}, time.time())
+            if len(legacy) > entries:
+                del legacy[min(legacy, key=lambda k: legacy[k][1])]
+        scan = (time.perf_counter() - started) / (operations // 20)
+
+        cache = BoundedCache("benchmark", max_entries=entries, ttl=None, policy="lfu")
+        started = time.perf_counter()
+        for i in range(operations):
+            cache.set(i, {})
+        constant = (time.perf_counter() - started) / operations
+
+        legacy_keys = {f"general_{int(prices[s])}_{int(0.02 * 1000)}" for s in names}
+        new_keys = {symbol_key("general", s, price=quantize_log(prices[s], 0.001), volatility=quantize(0.02, 0.001))
+                    for s in names}
+        print(f"🧪 {entries}-entry cache: min() eviction {scan * 1e6:.1f}us/set, O(1) eviction {constant * 1e6:.2f}us/set")
+        print(f"🧪 {symbols} symbols at the same volatility: {len(legacy_keys)} distinct int(price) keys, "
+              f"{len(new_keys)} symbol-aware keys")
+        print(f"🧪 stats: {cache.get_stats()}")
+
+    benchmark_cache()
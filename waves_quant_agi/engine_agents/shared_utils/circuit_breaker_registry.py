@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Circuit Breaker Registry - Unified breakers for every agent
+O(1) trip/check against precomputed state, half-open recovery scheduled on a
+hierarchical timing wheel instead of polling, and state changes broadcast as
+events. Idle breakers cost nothing: no loop ever iterates over them.
+"""
+
+import asyncio
+import time
+from enum import Enum
+from typing import Dict, Any, Callable, List, Optional, Set
+
+from .timing_wheel import HierarchicalTimingWheel, TimerHandle
+
+
+class CircuitState(Enum):
+    """Circuit breaker states."""
+    CLOSED = "CLOSED"      # Normal operation
+    OPEN = "OPEN"          # Circuit is open, calls fail fast
+    HALF_OPEN = "HALF_OPEN"  # Testing if service is recovered
+
+
+class RegisteredBreaker:
+    """State for one breaker. Kept flat so checks are a single attribute read."""
+
+    __slots__ = ("name", "scope", "failure_threshold", "recovery_timeout", "half_open_probes",
+                 "state", "allows", "failure_count", "probe_count", "trip_count",
+                 "last_trip", "last_reason", "recovery_timer", "metadata")
+
+    def __init__(self, name: str, scope: str, failure_threshold: int, recovery_timeout: float,
+                 half_open_probes: int, metadata: Optional[Dict[str, Any]]):
+        self.name = name
+        self.scope = scope
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_probes = half_open_probes
+        self.state = CircuitState.CLOSED
+        self.allows = True  # Precomputed: does the current state admit a call?
+        self.failure_count = 0
+        self.probe_count = 0
+        self.trip_count = 0
+        self.last_trip = 0.0
+        self.last_reason = ""
+        self.recovery_timer: Optional[TimerHandle] = None
+        self.metadata = metadata or {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "scope": self.scope,
+            "state": self.state.value,
+            "active": self.state != CircuitState.CLOSED,
+            "failure_count": self.failure_count,
+            "failure_threshold": self.failure_threshold,
+            "recovery_timeout": self.recovery_timeout,
+            "trip_count": self.trip_count,
+            "last_trigger": self.last_trip,
+            "last_reason": self.last_reason,
+            "metadata": self.metadata
+        }
+
+
+class CircuitBreakerRegistry:
+    """Registry of named breakers (per symbol, broker, strategy or pipeline stage)."""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None,
+                 timing_wheel: Optional[HierarchicalTimingWheel] = None):
+        config = config or {}
+        self.default_failure_threshold = config.get("circuit_failure_threshold", 5)
+        self.default_recovery_timeout = config.get("circuit_recovery_timeout", 60.0)
+        self.default_half_open_probes = config.get("circuit_half_open_probes", 1)
+
+        self.breakers: Dict[str, RegisteredBreaker] = {}
+        self.tripped: Set[str] = set()  # Names of breakers not CLOSED
+        self.timing_wheel = timing_wheel or HierarchicalTimingWheel(
+            tick_seconds=config.get("circuit_wheel_tick_seconds", 0.05)
+        )
+        self.listeners: List[Callable[[Dict[str, Any]], Any]] = []
+        self.stats = {"trips": 0, "recoveries": 0, "rejections": 0, "events": 0}
+
+    # ============= REGISTRATION =============
+
+    def register(self, name: str, scope: str = "general", failure_threshold: Optional[int] = None,
+                 recovery_timeout: Optional[float] = None, half_open_probes: Optional[int] = None,
+                 metadata: Optional[Dict[str, Any]] = None) -> RegisteredBreaker:
+        """Register a breaker, or return the existing one with that name."""
+        breaker = self.breakers.get(name)
+        if breaker is not None:
+            return breaker
+        breaker = RegisteredBreaker(
+            name=name,
+            scope=scope,
+            failure_threshold=failure_threshold or self.default_failure_threshold,
+            recovery_timeout=self.default_recovery_timeout if recovery_timeout is None else recovery_timeout,
+            half_open_probes=half_open_probes or self.default_half_open_probes,
+            metadata=metadata
+        )
+        self.breakers[name] = breaker
+        return breaker
+
+    def unregister(self, name: str) -> bool:
+        """Remove a breaker and cancel its pending recovery."""
+        breaker = self.breakers.pop(name, None)
+        if breaker is None:
+            return False
+        if breaker.recovery_timer is not None:
+            self.timing_wheel.cancel(breaker.recovery_timer)
+        self.tripped.discard(name)
+        return True
+
+    def subscribe(self, listener: Callable[[Dict[str, Any]], Any]):
+        """Receive state change events. Coroutine listeners are scheduled as tasks."""
+        self.listeners.append(listener)
+
+    # ============= HOT PATH =============
+
+    def is_allowed(self, name: str) -> bool:
+        """O(1) check. Unknown breakers allow. HALF_OPEN admits a bounded number of probes."""
+        breaker = self.breakers.get(name)
+        if breaker is None or breaker.allows:
+            if breaker is not None and breaker.state == CircuitState.HALF_OPEN:
+                breaker.probe_count += 1
+                if breaker.probe_count >= breaker.half_open_probes:
+                    breaker.allows = False
+            return True
+        # Without a running driver, catch up the wheel lazily on the reject path
+        if not self.timing_wheel.is_running and self.timing_wheel.advance() and breaker.allows:
+            return self.is_allowed(name)
+        self.stats["rejections"] += 1
+        return False
+
+    def is_open(self, name: str) -> bool:
+        """True while the breaker is OPEN (no probes consumed)."""
+        breaker = self.breakers.get(name)
+        return breaker is not None and breaker.state == CircuitState.OPEN
+
+    def any_tripped(self) -> bool:
+        """True if any breaker is OPEN or HALF_OPEN."""
+        return bool(self.tripped)
+
+    def record_success(self, name: str):
+        """A protected call succeeded; closes a HALF_OPEN breaker."""
+        breaker = self.breakers.get(name)
+        if breaker is None:
+            return
+        breaker.failure_count = 0
+        if breaker.state == CircuitState.HALF_OPEN:
+            self._transition(breaker, CircuitState.CLOSED, "probe_succeeded")
+            self.stats["recoveries"] += 1
+
+    def record_failure(self, name: str, reason: str = "failure"):
+        """A protected call failed; trips once the failure threshold is reached."""
+        breaker = self.breakers.get(name) or self.register(name)
+        breaker.failure_count += 1
+        if breaker.state == CircuitState.HALF_OPEN or breaker.failure_count >= breaker.failure_threshold:
+            self.trip(name, reason)
+
+    def trip(self, name: str, reason: str = "manual", recovery_timeout: Optional[float] = None):
+        """Open the breaker and schedule its half-open transition on the wheel."""
+        breaker = self.breakers.get(name) or self.register(name)
+        breaker.trip_count += 1
+        breaker.last_trip = time.time()
+        breaker.last_reason = reason
+        self.stats["trips"] += 1
+
+        if breaker.recovery_timer is not None:
+            self.timing_wheel.cancel(breaker.recovery_timer)
+        timeout = breaker.recovery_timeout if recovery_timeout is None else recovery_timeout
+        breaker.recovery_timer = self.timing_wheel.schedule(timeout, self._on_recovery_timer, name)
+
+        if breaker.state != CircuitState.OPEN:
+            self._transition(breaker, CircuitState.OPEN, reason)
+
+    def reset(self, name: str, reason: str = "manual_reset") -> bool:
+        """Force a breaker closed."""
+        breaker = self.breakers.get(name)
+        if breaker is None:
+            return False
+        if breaker.recovery_timer is not None:
+            self.timing_wheel.cancel(breaker.recovery_timer)
+            breaker.recovery_timer = None
+        breaker.failure_count = 0
+        if breaker.state != CircuitState.CLOSED:
+            self._transition(breaker, CircuitState.CLOSED, reason)
+        return True
+
+    # ============= STATE CHANGES =============
+
+    def _on_recovery_timer(self, name: str):
+        breaker = self.breakers.get(name)
+        if breaker is None:
+            return
+        breaker.recovery_timer = None
+        if breaker.state == CircuitState.OPEN:
+            self._transition(breaker, CircuitState.HALF_OPEN, "recovery_timeout")
+
+    def _transition(self, breaker: RegisteredBreaker, new_state: CircuitState, reason: str):
+        old_state = breaker.state
+        breaker.state = new_state
+        breaker.probe_count = 0
+        breaker.allows = new_state != CircuitState.OPEN
+        if new_state == CircuitState.CLOSED:
+            self.tripped.discard(breaker.name)
+        else:
+            self.tripped.add(breaker.name)
+
+        event = {
+            "name": breaker.name,
+            "scope": breaker.scope,
+            "from_state": old_state.value,
+            "to_state": new_state.value,
+            "reason": reason,
+            "trip_count": breaker.trip_count,
+            "timestamp": time.time()
+        }
+        self._broadcast(event)
+
+    def _broadcast(self, event: Dict[str, Any]):
+        self.stats["events"] += 1
+        for listener in self.listeners:
+            try:
+                result = listener(event)
+                if asyncio.iscoroutine(result):
+                    asyncio.get_running_loop().create_task(result)
+            except Exception as e:
+                print(f"❌ Circuit breaker listener error: {e}")
+
+    # ============= LIFECYCLE / STATUS =============
+
+    def start(self):
+        """Start the timing wheel driver on the running loop."""
+        return self.timing_wheel.start()
+
+    async def stop(self):
+        """Stop the timing wheel driver."""
+        await self.timing_wheel.stop()
+
+    def get_status(self, include_closed: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Breaker details; by default only tripped breakers so the cost tracks open breakers."""
+        names = self.breakers.keys() if include_closed else self.tripped
+        return {name: self.breakers[name].to_dict() for name in names}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Registry counters."""
+        return {
+            "total_breakers": len(self.breakers),
+            "tripped_breakers": len(self.tripped),
+            "timing_wheel": self.timing_wheel.get_stats(),
+            **self.stats
+        }
@@ -21,6 +21,7 @@ from dataclasses import dataclass, field
 from enum import Enum
 from .redis_connector import get_shared_redis
 from .shared_logger import get_shared_logger
+from .bounded_cache import get_cache_stats
 
 class HealthStatus(Enum):
     """Health status levels."""
@@ -217,6 +218,11 @@ class SharedStatusMonitor:
             
             # Uptime
             self.status.performance_metrics.uptime_seconds = int(uptime)
+            
+            # Hit rate and footprint of this agent's bounded caches
+            caches = get_cache_stats(self.agent_name)
+            if caches:
+                self.add_custom_metric("caches", caches)
             self.status.performance_metrics.last_operation_time = current_time
             
             # Update timestamp
@@ -325,7 +331,11 @@ class SharedStatusMonitor:
             "cpu_usage_percent": self.status.performance_metrics.cpu_usage,
             "memory_usage_mb": self.status.performance_metrics.memory_usage_mb,
             "current_alerts": len(self.status.alerts),
-            "is_monitoring": self.is_monitoring
+            "is_monitoring": self.is_monitoring,
+            "caches": {
+                name: {"hit_rate": stats["hit_rate"], "size": stats["size"], "memory_bytes": stats["memory_bytes"]}
+                for name, stats in get_cache_stats(self.agent_name).items()
+            }
         }
     
     def set_health_thresholds(self, thresholds: Dict[str, float]):
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Slippage Analytics - Streaming slippage quantiles shared by all agents
+Mergeable DDSketch quantile sketches per symbol / broker / order type with an
+EWMA bias and variance estimate. Quantile reads are served from a cache that
+is refreshed only when new fills arrive.
+"""
+
+import math
+import time
+from typing import Dict, Any, Optional, Tuple
+
+# Quantiles kept hot for routing decisions
+TRACKED_QUANTILES = (0.5, 0.95, 0.99)
+
+# Wildcard used in rollup keys, e.g. (symbol, "*", "*") for all brokers and order types
+ANY = "*"
+
+
+class DDSketch:
+    """Relative-error quantile sketch (Masson et al.) over signed values.
+
+    Any quantile is returned within ``relative_accuracy`` of the true value.
+    Sketches with the same accuracy merge exactly by adding bucket counts.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 2048, min_value: float = 1e-9):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.max_bins = max_bins
+        self.min_value = min_value
+
+        self.positive: Dict[int, float] = {}
+        self.negative: Dict[int, float] = {}
+        self.zero_count = 0.0
+        self.count = 0.0
+        self.sum = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def _index(self, magnitude: float) -> int:
+        return math.ceil(math.log(magnitude) / self.log_gamma)
+
+    def _value(self, index: int) -> float:
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def add(self, value: float, weight: float = 1.0):
+        """Insert a value. O(1)."""
+        if value > self.min_value:
+            store = self.positive
+            key = self._index(value)
+            store[key] = store.get(key, 0.0) + weight
+            if len(store) > self.max_bins:
+                self._collapse(store)
+        elif value < -self.min_value:
+            store = self.negative
+            key = self._index(-value)
+            store[key] = store.get(key, 0.0) + weight
+            if len(store) > self.max_bins:
+                self._collapse(store)
+        else:
+            self.zero_count += weight
+        self.count += weight
+        self.sum += value * weight
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def _collapse(self, store: Dict[int, float]):
+        """Fold the two smallest-magnitude bins together to respect max_bins."""
+        lowest, second = sorted(store)[:2]
+        store[second] += store.pop(lowest)
+
+    def merge(self, other: "DDSketch"):
+        """Add another sketch's counts into this one."""
+        if abs(other.gamma - self.gamma) > 1e-12:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for source, target in ((other.positive, self.positive), (other.negative, self.negative)):
+            for key, count in source.items():
+                target[key] = target.get(key, 0.0) + count
+            while len(target) > self.max_bins:
+                self._collapse(target)
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantiles(self, qs) -> Tuple[float, ...]:
+        """Several quantiles in a single ordered pass over the bins."""
+        if self.count <= 0:
+            return tuple(0.0 for _ in qs)
+        ranks = sorted((q * (self.count - 1), position) for position, q in enumerate(qs))
+        results = [0.0] * len(qs)
+        pending = iter(ranks)
+        rank, position = next(pending)
+        cumulative = 0.0
+
+        # Most negative first, then zero, then positive ascending
+        buckets = [(-self._value(key), count) for key, count in sorted(self.negative.items(), reverse=True)]
+        buckets.append((0.0, self.zero_count))
+        buckets.extend((self._value(key), count) for key, count in sorted(self.positive.items()))
+        try:
+            for value, count in buckets:
+                cumulative += count
+                while cumulative > rank:
+                    results[position] = min(max(value, self.min), self.max)
+                    rank, position = next(pending)
+        except StopIteration:
+            return tuple(results)
+        # Rounding left the top ranks unassigned; they belong to the maximum
+        results[position] = self.max
+        for rank, position in pending:
+            results[position] = self.max
+        return tuple(results)
+
+    def quantile(self, q: float) -> float:
+        return self.quantiles((q,))[0]
+
+
+class SlippageSeries:
+    """Sketch plus EWMA bias/variance for one key, with cached hot quantiles."""
+
+    __slots__ = ("sketch", "alpha", "ewma_bias", "ewma_variance", "last_update", "_cached")
+
+    def __init__(self, relative_accuracy: float, alpha: float):
+        self.sketch = DDSketch(relative_accuracy)
+        self.alpha = alpha
+        self.ewma_bias = 0.0
+        self.ewma_variance = 0.0
+        self.last_update = 0.0
+        self._cached: Optional[Dict[str, float]] = None
+
+    def add(self, slippage: float, weight: float = 1.0):
+        if self.sketch.count == 0:
+            self.ewma_bias = slippage
+        else:
+            deviation = slippage - self.ewma_bias
+            self.ewma_bias += self.alpha * deviation
+            self.ewma_variance = (1 - self.alpha) * (self.ewma_variance + self.alpha * deviation * deviation)
+        self.sketch.add(slippage, weight)
+        self.last_update = time.time()
+        self._cached = None
+
+    def merge(self, other: "SlippageSeries"):
+        total = self.sketch.count + other.sketch.count
+        if total > 0:
+            # Count-weighted blend of the two EWMA states
+            weight = other.sketch.count / total
+            self.ewma_bias += weight * (other.ewma_bias - self.ewma_bias)
+            self.ewma_variance += weight * (other.ewma_variance - self.ewma_variance)
+        self.sketch.merge(other.sketch)
+        self.last_update = max(self.last_update, other.last_update)
+        self._cached = None
+
+    def summary(self) -> Dict[str, float]:
+        if self._cached is None:
+            p50, p95, p99 = self.sketch.quantiles(TRACKED_QUANTILES)
+            self._cached = {
+                "count": self.sketch.count,
+                "p50": p50,
+                "p95": p95,
+                "p99": p99,
+                "mean": self.sketch.sum / self.sketch.count if self.sketch.count else 0.0,
+                "ewma_bias": self.ewma_bias,
+                "ewma_std": math.sqrt(self.ewma_variance),
+                "min": self.sketch.min if self.sketch.count else 0.0,
+                "max": self.sketch.max if self.sketch.count else 0.0,
+                "last_update": self.last_update
+            }
+        return self._cached
+
+
+class SlippageAnalytics:
+    """Per (symbol, broker, order_type) slippage sketches with symbol and broker rollups.
+
+    Slippage is fractional, ``(actual - expected) / expected``. When the side
+    is known it is signed as a cost, so positive always means adverse.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        self.relative_accuracy = config.get("slippage_sketch_accuracy", 0.01)
+        self.alpha = config.get("slippage_ewma_alpha", 0.05)
+        self.series: Dict[Tuple[str, str, str], SlippageSeries] = {}
+        self.records = 0
+
+    def _series(self, key: Tuple[str, str, str]) -> SlippageSeries:
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = SlippageSeries(self.relative_accuracy, self.alpha)
+        return series
+
+    @staticmethod
+    def to_cost(expected_price: float, actual_price: float, side: Optional[str] = None) -> float:
+        """Fractional slippage; signed as a cost when ``side`` is given."""
+        if not expected_price:
+            return 0.0
+        slippage = (actual_price - expected_price) / expected_price
+        if side is not None and str(side).lower() in ("sell", "short"):
+            slippage = -slippage
+        return slippage
+
+    def record(self, symbol: str, slippage: float, broker: str = "unknown",
+               order_type: str = "market", weight: float = 1.0):
+        """Add one fill's slippage to its key and to the symbol/broker rollups."""
+        for key in ((symbol, broker, order_type), (symbol, ANY, ANY), (ANY, broker, ANY)):
+            self._series(key).add(slippage, weight)
+        self.records += 1
+
+    def get_quantiles(self, symbol: str = ANY, broker: str = ANY, order_type: str = ANY) -> Dict[str, float]:
+        """p50/p95/p99, mean and EWMA bias for a key. Cached between fills, so O(1) on repeat reads.
+
+        Unknown exact keys fall back to the symbol rollup, then the broker rollup.
+        """
+        for key in ((symbol, broker, order_type), (symbol, ANY, ANY), (ANY, broker, ANY)):
+            series = self.series.get(key)
+            if series is not None:
+                return series.summary()
+        return {"count": 0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "mean": 0.0,
+                "ewma_bias": 0.0, "ewma_std": 0.0, "min": 0.0, "max": 0.0, "last_update": 0.0}
+
+    def expected_slippage(self, symbol: str, broker: str = ANY, order_type: str = ANY,
+                          quantile: str = "p95", min_samples: int = 20) -> Optional[float]:
+        """Slippage quantile for routing decisions; None until enough fills were seen."""
+        summary = self.get_quantiles(symbol, broker, order_type)
+        if summary["count"] < min_samples:
+            return None
+        return summary[quantile]
+
+    def merge(self, other: "SlippageAnalytics"):
+        """Merge another instance (e.g. a different agent's) into this one."""
+        for key, series in other.series.items():
+            self._series(key).merge(series)
+        self.records += other.records
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Analytics counters."""
+        return {
+            "records": self.records,
+            "tracked_series": len(self.series)
+        }
+
+
+# Global per-process instance shared by the slippage recorders and routing
+_global_slippage_analytics: Optional[SlippageAnalytics] = None
+
+
+def get_slippage_analytics(config: Optional[Dict[str, Any]] = None) -> SlippageAnalytics:
+    """Get the global shared slippage analytics instance."""
+    global _global_slippage_analytics
+
+    if _global_slippage_analytics is None:
+        _global_slippage_analytics = SlippageAnalytics(config)
+
+    return _global_slippage_analytics
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Hierarchical Timing Wheel
+Schedules thousands of timers with O(1) insert/cancel and no polling.
+The driver task sleeps until the next slot that can hold a due timer and
+parks completely while no timers are pending.
+"""
+
+import asyncio
+import math
+import time
+from typing import Any, Callable, List, Optional
+
+
+class TimerHandle:
+    """Handle returned by HierarchicalTimingWheel.schedule()."""
+
+    __slots__ = ("expiry_tick", "callback", "args", "cancelled", "level", "slot")
+
+    def __init__(self, expiry_tick: int, callback: Callable, args: tuple):
+        self.expiry_tick = expiry_tick
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+        self.level = -1
+        self.slot = -1
+
+
+class HierarchicalTimingWheel:
+    """Multi-level timing wheel (Varghese & Lauck style).
+
+    Level 0 slots are one tick wide; every higher level is ``wheel_size`` times
+    coarser. Timers cascade down a level when their coarse slot comes due.
+    """
+
+    def __init__(self, tick_seconds: float = 0.01, wheel_size: int = 256, levels: int = 4,
+                 clock: Callable[[], float] = time.monotonic):
+        self.tick_seconds = tick_seconds
+        self.wheel_size = wheel_size
+        self.levels = levels
+        self.clock = clock
+
+        self.wheels: List[List[List[TimerHandle]]] = [
+            [[] for _ in range(wheel_size)] for _ in range(levels)
+        ]
+        self.level_counts = [0] * levels
+        self.level_spans = [wheel_size ** level for level in range(levels)]
+
+        self.start_time = clock()
+        self.current_tick = 0
+        self.pending = 0
+
+        self._wakeup: Optional[asyncio.Event] = None
+        self._runner: Optional[asyncio.Task] = None
+        self._advancing = False
+        self.fired = 0
+
+    # ============= SCHEDULING =============
+
+    def _tick_for(self, timestamp: float) -> int:
+        # Tolerance so a wakeup computed for tick n (start + n * tick) is not truncated to n - 1
+        return math.floor((timestamp - self.start_time) / self.tick_seconds + 1e-6)
+
+    def _place(self, handle: TimerHandle):
+        delta = max(0, handle.expiry_tick - self.current_tick)
+        level = 0
+        while level < self.levels - 1 and delta >= self.level_spans[level + 1]:
+            level += 1
+        # Timers beyond the top level's range wait in its furthest slot and re-cascade
+        expiry = min(handle.expiry_tick, self.current_tick + self.level_spans[level] * (self.wheel_size - 1))
+        expiry = max(expiry, self.current_tick)
+        slot = (expiry // self.level_spans[level]) % self.wheel_size
+        handle.level = level
+        handle.slot = slot
+        self.wheels[level][slot].append(handle)
+        self.level_counts[level] += 1
+
+    def schedule(self, delay_seconds: float, callback: Callable, *args: Any) -> TimerHandle:
+        """Run ``callback(*args)`` after ``delay_seconds``. O(1) amortized.
+
+        The wheel is first brought up to the current tick (firing anything
+        already due), since placement is relative to ``current_tick`` and the
+        driver only advances it when it wakes.
+        """
+        now = self.clock()
+        if not self._advancing:
+            self.advance(now)
+        expiry_tick = math.ceil((now + delay_seconds - self.start_time) / self.tick_seconds)
+        handle = TimerHandle(max(expiry_tick, self.current_tick + 1), callback, args)
+        self._place(handle)
+        self.pending += 1
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return handle
+
+    def cancel(self, handle: TimerHandle):
+        """Cancel a timer. The slot entry is dropped lazily when its slot comes due."""
+        if not handle.cancelled:
+            handle.cancelled = True
+            self.pending -= 1
+
+    # ============= ADVANCING =============
+
+    def _lowest_busy_level(self) -> int:
+        for level, count in enumerate(self.level_counts):
+            if count:
+                return level
+        return -1
+
+    def _cascade(self, level: int):
+        slot = (self.current_tick // self.level_spans[level]) % self.wheel_size
+        timers = self.wheels[level][slot]
+        if not timers:
+            return
+        self.wheels[level][slot] = []
+        self.level_counts[level] -= len(timers)
+        for handle in timers:
+            if not handle.cancelled:
+                self._place(handle)
+
+    def _fire_slot(self) -> int:
+        slot = self.current_tick % self.wheel_size
+        timers = self.wheels[0][slot]
+        if not timers:
+            return 0
+        self.wheels[0][slot] = []
+        self.level_counts[0] -= len(timers)
+
+        fired = 0
+        for handle in timers:
+            if handle.cancelled:
+                continue
+            if handle.expiry_tick > self.current_tick:
+                # Parked in a capped slot; needs another lap
+                self._place(handle)
+                continue
+            handle.cancelled = True
+            self.pending -= 1
+            fired += 1
+            try:
+                handle.callback(*handle.args)
+            except Exception as e:
+                print(f"❌ Timing wheel callback error: {e}")
+        return fired
+
+    def advance(self, now: Optional[float] = None) -> int:
+        """Fire every timer due at ``now``. Skips stretches with no timers."""
+        target_tick = self._tick_for(self.clock() if now is None else now)
+        fired = 0
+        self._advancing = True
+        try:
+            fired = self._advance_to(target_tick)
+        finally:
+            self._advancing = False
+        self.fired += fired
+        return fired
+
+    def _advance_to(self, target_tick: int) -> int:
+        fired = 0
+        while self.current_tick < target_tick:
+            busy_level = self._lowest_busy_level()
+            if busy_level < 0:
+                self.current_tick = target_tick
+                break
+            if busy_level > 0:
+                # Nothing can fire before the busy level's next slot boundary
+                span = self.level_spans[busy_level]
+                next_boundary = (self.current_tick // span + 1) * span
+                if next_boundary > target_tick:
+                    self.current_tick = target_tick
+                    break
+                self.current_tick = next_boundary
+            else:
+                self.current_tick += 1
+
+            for level in range(self.levels - 1, 0, -1):
+                if self.current_tick % self.level_spans[level] == 0:
+                    self._cascade(level)
+            fired += self._fire_slot()
+        return fired
+
+    def next_wakeup_delay(self) -> Optional[float]:
+        """Seconds until the earliest slot that may hold a due timer, None when idle."""
+        if self.pending <= 0:
+            return None
+        # A level-0 timer further out than a coarser level's next cascade must not hide that cascade
+        boundaries = [self._next_busy_boundary(level) for level in range(self.levels) if self.level_counts[level]]
+        if not boundaries:
+            return None
+        wake_time = self.start_time + min(boundaries) * self.tick_seconds
+        return max(0.0, wake_time - self.clock())
+
+    def _next_busy_boundary(self, level: int) -> int:
+        """Tick at which the nearest occupied slot of ``level`` fires (level 0) or cascades."""
+        span = self.level_spans[level]
+        base = self.current_tick // span
+        wheel = self.wheels[level]
+        for offset in range(1, self.wheel_size + 1):
+            if wheel[(base + offset) % self.wheel_size]:
+                return (base + offset) * span
+        return (base + self.wheel_size) * span
+
+    # ============= ASYNC DRIVER =============
+
+    async def run(self):
+        """Drive the wheel from the event loop until cancelled."""
+        self._wakeup = asyncio.Event()
+        try:
+            while True:
+                delay = self.next_wakeup_delay()
+                self._wakeup.clear()
+                try:
+                    if delay is None:
+                        await self._wakeup.wait()
+                    else:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                self.advance()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._wakeup = None
+
+    def start(self) -> asyncio.Task:
+        """Start the driver task on the running loop."""
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self.run(), name="timing_wheel")
+        return self._runner
+
+    async def stop(self):
+        """Stop the driver task."""
+        if self._runner is not None and not self._runner.done():
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+        self._runner = None
+
+    @property
+    def is_running(self) -> bool:
+        """True while the async driver task is active."""
+        return self._runner is not None and not self._runner.done()
+
+    def get_stats(self) -> dict:
+        """Wheel occupancy counters."""
+        return {
+            "pending_timers": self.pending,
+            "fired_timers": self.fired,
+            "current_tick": self.current_tick,
+            "level_counts": list(self.level_counts),
+            "running": self.is_running
+        }
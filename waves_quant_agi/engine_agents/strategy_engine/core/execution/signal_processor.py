@@ -5,6 +5,7 @@ Handles trading signal generation, validation, and processing
 """
 
 import asyncio
+import itertools
 import time
 from typing import Dict, Any, List, Optional
 from datetime import datetime
@@ -33,6 +34,7 @@ class TradingSignalProcessor:
             "signal_correlation_cache": {},
             "last_signal_time": None
         }
+        self._signal_sequence = itertools.count(1)
     
     def set_logger(self, logger):
         """Set logger for this module."""
@@ -153,11 +155,8 @@ class TradingSignalProcessor:
     
     def _check_signal_correlation(self, signal: Dict[str, Any]) -> Dict[str, Any]:
         """Check for signal correlation conflicts."""
-        # Get existing signals for correlation check
-        existing_signals = self.signal_state["processed_signals"]
-        
-        # Assess correlation
-        correlation_result = self.signal_quality_assessor.assess_signal_correlation(signal, existing_signals)
+        # Assess correlation against the assessor's active signal index
+        correlation_result = self.signal_quality_assessor.assess_signal_correlation(signal)
         
         return correlation_result
     
@@ -180,8 +179,8 @@ class TradingSignalProcessor:
     
     def _create_processed_signal(self, signal: Dict[str, Any], quality_result: Dict[str, Any], session_optimization: Dict[str, Any]) -> Dict[str, Any]:
         """Create the final processed signal."""
-        # Generate unique signal ID
-        signal_id = f"SIG_{int(time.time() * 1000)}_{signal.get('symbol', 'UNKNOWN')}"
+        # Generate unique signal ID (sequence keeps same-millisecond signals apart)
+        signal_id = f"SIG_{int(time.time() * 1000)}_{next(self._signal_sequence)}_{signal.get('symbol', 'UNKNOWN')}"
         
         # Create processed signal
         processed_signal = {
@@ -200,6 +199,12 @@ class TradingSignalProcessor:
         # Add to processed signals
         self.signal_state["processed_signals"].append(processed_signal)
         
+        # Index for correlation checks on later signals
+        self.signal_quality_assessor.register_active_signal({
+            **processed_signal["original_signal"],
+            "signal_id": processed_signal["signal_id"]
+        })
+        
         # Update last signal time
         self.signal_state["last_signal_time"] = time.time()
         
@@ -207,6 +212,10 @@ class TradingSignalProcessor:
         if len(self.signal_state["processed_signals"]) > 1000:
             self.signal_state["processed_signals"] = self.signal_state["processed_signals"][-1000:]
     
+    def release_signal(self, signal_id: str) -> bool:
+        """Drop a filled, closed or cancelled signal from correlation checks before its TTL."""
+        return self.signal_quality_assessor.release_active_signal(signal_id)
+    
     def _update_rate_limits(self, signal: Dict[str, Any]):
         """Update rate limiting tracking."""
         symbol = signal.get("symbol", "")
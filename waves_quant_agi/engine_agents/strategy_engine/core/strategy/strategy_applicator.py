@@ -18,6 +18,7 @@ from ..execution.signal_processor import TradingSignalProcessor
 from ..execution.flow_manager import FlowManager
 from ..memory.trading_context import TradingContext
 from ..interfaces.agent_io import TradingAgentIO
+from ...risk_management.sltp_calculators.strategy_sltp_calculator import StrategySLTPCalculator
 
 @dataclass
 class ApplicationRequest:
@@ -70,6 +71,7 @@ class StrategyApplicator:
         self.trading_logic_executor = TradingLogicExecutor(self.trading_signal_processor, self.trading_flow_manager)
         self.trading_context = TradingContext(max_history=1000)  # Fixed: pass integer instead of config
         self.trading_agent_io = TradingAgentIO(config)
+        self.sltp_calculator = StrategySLTPCalculator()
         
         # Application state
         self.application_queue: deque = deque(maxlen=100)
@@ -223,6 +225,10 @@ class StrategyApplicator:
                 signals
             )
             
+            # Attach SL/TP for the whole cycle in one batched pass before risk validation
+            self._update_sltp_indicators(request.market_data)
+            generated_signals = self._attach_sltp(generated_signals)
+            
             # Process signals through trading flow (delegates risk management)
             processed_signals = await self._process_signals_through_trading_flow(generated_signals)
             
@@ -294,6 +300,47 @@ class StrategyApplicator:
             print(f"❌ Error generating strategy signals: {e}")
             return []
 
+    def _update_sltp_indicators(self, market_data: Dict[str, Any]):
+        """Fold the request's bars (one bar, or bars keyed by symbol) into the streaming ATR."""
+        bars = {market_data.get("symbol", "unknown"): market_data} if "close" in market_data else market_data
+        for symbol, bar in bars.items():
+            if isinstance(bar, dict) and all(key in bar for key in ("high", "low", "close")):
+                self.sltp_calculator.update_indicators(
+                    symbol, float(bar["high"]), float(bar["low"]), float(bar["close"]),
+                    bar.get("bid"), bar.get("ask")
+                )
+
+    def _attach_sltp(self, signals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Return copies of the BUY/SELL signals with strategy-specific SL/TP attached."""
+        try:
+            tradable = [i for i, signal in enumerate(signals)
+                        if str(signal.get("action", "")).upper() in ("BUY", "SELL")]
+            if not tradable:
+                return signals
+            
+            batch = [
+                {
+                    **signals[i],
+                    "strategy_type": signals[i].get("strategy_type")
+                    or signals[i].get("strategy_parameters", {}).get("strategy_type", "trend_following")
+                }
+                for i in tradable
+            ]
+            enriched = list(signals)
+            for i, signal, sltp in zip(tradable, batch, self.sltp_calculator.calculate_sltp_batch(batch)):
+                enriched[i] = {
+                    **signal,
+                    "stop_loss": sltp["stop_loss"],
+                    "take_profit": sltp["take_profit"],
+                    "risk_reward_ratio": sltp["risk_reward_ratio"],
+                    "exit_strategy": sltp["exit_strategy"]
+                }
+            return enriched
+            
+        except Exception as e:
+            print(f"❌ Error attaching SL/TP to signals: {e}")
+            return signals
+
     async def _process_signals_through_trading_flow(self, signals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Process signals through the trading flow.
         
@@ -13,6 +13,9 @@ from .signal_quality import *
 # Import SL/TP calculators
 from .sltp_calculators import *
 
+# Import pre-trade checks
+from .pre_trade import *
+
 __all__ = [
     # Rate limiting
     'rate_limiting',
@@ -21,5 +24,8 @@ __all__ = [
     'signal_quality',
     
     # SL/TP calculators
-    'sltp_calculators'
+    'sltp_calculators',
+    
+    # Pre-trade checks
+    'pre_trade'
 ]
@@ -0,0 +1,8 @@
+#!/usr/bin/env python3
+"""
+Pre-Trade Check Module
+"""
+
+from .pre_trade_checker import PreTradeChecker, SymbolLimits, PreTradeVerdict
+
+__all__ = ["PreTradeChecker", "SymbolLimits", "PreTradeVerdict"]
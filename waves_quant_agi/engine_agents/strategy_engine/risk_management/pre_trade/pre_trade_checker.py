@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Pre-Trade Checker
+In-process fast path for HFT orders: max order size, fat-finger price band,
+position limit and per-symbol notional cap, evaluated against a precompiled
+limits table that is refreshed asynchronously.
+"""
+
+import asyncio
+import time
+from typing import Dict, Any, Callable, Awaitable, Optional
+
+
+class PreTradeVerdict:
+    """Verdict codes returned by PreTradeChecker.check()."""
+    ACCEPT = 0
+    UNKNOWN_SYMBOL = 1
+    MAX_ORDER_SIZE = 2
+    PRICE_BAND = 3
+    POSITION_LIMIT = 4
+    NOTIONAL_CAP = 5
+    INVALID_ORDER = 6
+
+    NAMES = ("ACCEPT", "UNKNOWN_SYMBOL", "MAX_ORDER_SIZE", "PRICE_BAND",
+             "POSITION_LIMIT", "NOTIONAL_CAP", "INVALID_ORDER")
+
+
+class SymbolLimits:
+    """Compiled limits for one symbol.
+
+    Every bound the hot path needs is precomputed here, so a check is a
+    handful of float comparisons with no dict lookups or allocations.
+    """
+
+    __slots__ = ("symbol", "max_order_size", "price_band_pct", "max_position", "max_notional",
+                 "reference_price", "position", "band_low", "band_high",
+                 "long_headroom", "short_headroom")
+
+    def __init__(self, symbol: str, max_order_size: float, price_band_pct: float,
+                 max_position: float, max_notional: float, reference_price: float = 0.0,
+                 position: float = 0.0):
+        self.symbol = symbol
+        self.max_order_size = max_order_size
+        self.price_band_pct = price_band_pct
+        self.max_position = max_position
+        self.max_notional = max_notional
+        self.reference_price = reference_price
+        self.position = position
+        self.compile()
+
+    def compile(self):
+        """Recompute derived bounds after any input changes."""
+        if self.reference_price > 0:
+            self.band_low = self.reference_price * (1.0 - self.price_band_pct)
+            self.band_high = self.reference_price * (1.0 + self.price_band_pct)
+        else:
+            # No reference yet: the band check is disabled rather than rejecting everything
+            self.band_low = 0.0
+            self.band_high = float("inf")
+        self.long_headroom = self.max_position - self.position
+        self.short_headroom = self.max_position + self.position
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "symbol": self.symbol,
+            "max_order_size": self.max_order_size,
+            "price_band_pct": self.price_band_pct,
+            "max_position": self.max_position,
+            "max_notional": self.max_notional,
+            "reference_price": self.reference_price,
+            "position": self.position
+        }
+
+
+# Latency histogram bucket upper bounds in nanoseconds
+LATENCY_BUCKETS_NS = (500, 1_000, 2_000, 5_000, 10_000, 50_000, 100_000)
+
+
+class PreTradeChecker:
+    """Sub-10us pre-trade checks with reject and latency counters."""
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        self.logger = None
+
+        defaults = config.get("pre_trade_default_limits", {})
+        self.default_limits = {
+            "max_order_size": defaults.get("max_order_size", 10.0),
+            "price_band_pct": defaults.get("price_band_pct", 0.05),
+            "max_position": defaults.get("max_position", 50.0),
+            "max_notional": defaults.get("max_notional", 1_000_000.0)
+        }
+        self.allow_unknown_symbols = config.get("pre_trade_allow_unknown_symbols", True)
+
+        self.limits: Dict[str, SymbolLimits] = {}
+        for symbol, limits in config.get("pre_trade_limits", {}).items():
+            self.limits[symbol] = self._compile_limits(symbol, limits)
+
+        # Counters
+        self.checks = 0
+        self.rejects = [0] * len(PreTradeVerdict.NAMES)
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS_NS) + 1)
+        self.latency_total_ns = 0
+        self.latency_max_ns = 0
+        self.last_refresh = 0.0
+        self.refresh_failures = 0
+
+    def set_logger(self, logger):
+        """Set logger for this checker."""
+        self.logger = logger
+
+    def _compile_limits(self, symbol: str, limits: Dict[str, Any],
+                        previous: Optional[SymbolLimits] = None) -> SymbolLimits:
+        # Partial updates (e.g. only a reference price) keep the symbol's current limits
+        merged = {**(previous.to_dict() if previous else self.default_limits), **limits}
+        return SymbolLimits(
+            symbol=symbol,
+            max_order_size=float(merged["max_order_size"]),
+            price_band_pct=float(merged["price_band_pct"]),
+            max_position=float(merged["max_position"]),
+            max_notional=float(merged["max_notional"]),
+            reference_price=float(merged.get("reference_price", 0.0)),
+            position=float(merged.get("position", 0.0))
+        )
+
+    # ============= HOT PATH =============
+
+    def check(self, symbol: str, is_buy: bool, quantity: float, price: float) -> int:
+        """Return a PreTradeVerdict code. Allocation-free on the accept path."""
+        started = time.perf_counter_ns()
+        limits = self.limits.get(symbol)
+
+        if limits is None:
+            if self.allow_unknown_symbols:
+                limits = self.limits[symbol] = self._compile_limits(symbol, {})
+                verdict = self._evaluate(limits, is_buy, quantity, price)
+            else:
+                verdict = PreTradeVerdict.UNKNOWN_SYMBOL
+        else:
+            verdict = self._evaluate(limits, is_buy, quantity, price)
+
+        elapsed = time.perf_counter_ns() - started
+        self.checks += 1
+        if verdict:
+            self.rejects[verdict] += 1
+        self.latency_total_ns += elapsed
+        if elapsed > self.latency_max_ns:
+            self.latency_max_ns = elapsed
+        bucket = 0
+        for bound in LATENCY_BUCKETS_NS:
+            if elapsed <= bound:
+                break
+            bucket += 1
+        self.latency_buckets[bucket] += 1
+        return verdict
+
+    @staticmethod
+    def _evaluate(limits: SymbolLimits, is_buy: bool, quantity: float, price: float) -> int:
+        if quantity <= 0 or price <= 0:
+            return PreTradeVerdict.INVALID_ORDER
+        if quantity > limits.max_order_size:
+            return PreTradeVerdict.MAX_ORDER_SIZE
+        if price < limits.band_low or price > limits.band_high:
+            return PreTradeVerdict.PRICE_BAND
+        if quantity > (limits.long_headroom if is_buy else limits.short_headroom):
+            return PreTradeVerdict.POSITION_LIMIT
+        if quantity * price > limits.max_notional:
+            return PreTradeVerdict.NOTIONAL_CAP
+        return PreTradeVerdict.ACCEPT
+
+    def check_order(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        """Dict wrapper around check() for callers outside the hot path."""
+        verdict = self.check(
+            order.get("symbol", ""),
+            str(order.get("action", order.get("side", "BUY"))).upper() == "BUY",
+            float(order.get("volume", order.get("quantity", 0)) or 0),
+            float(order.get("price", order.get("entry_price", 0)) or 0)
+        )
+        return {
+            "passed": verdict == PreTradeVerdict.ACCEPT,
+            "verdict": PreTradeVerdict.NAMES[verdict]
+        }
+
+    # ============= STATE UPDATES =============
+
+    def on_fill(self, symbol: str, signed_quantity: float):
+        """Apply a fill to the position and recompile headroom."""
+        limits = self.limits.get(symbol)
+        if limits is not None:
+            limits.position += signed_quantity
+            limits.compile()
+
+    def update_reference_price(self, symbol: str, price: float):
+        """Move the fat-finger band to a new reference price."""
+        if price <= 0:
+            return
+        limits = self.limits.get(symbol)
+        if limits is None:
+            if not self.allow_unknown_symbols:
+                return
+            limits = self.limits[symbol] = self._compile_limits(symbol, {})
+        limits.reference_price = price
+        limits.compile()
+    
+    def get_reference_price(self, symbol: str) -> float:
+        """Current band reference for a symbol, 0.0 if none has been seen."""
+        limits = self.limits.get(symbol)
+        return limits.reference_price if limits is not None else 0.0
+
+    def apply_limits(self, limits_table: Dict[str, Dict[str, Any]]):
+        """Compile a new limits table and swap it in with one reference assignment."""
+        compiled = dict(self.limits)
+        for symbol, limits in limits_table.items():
+            compiled[symbol] = self._compile_limits(symbol, limits, self.limits.get(symbol))
+        self.limits = compiled
+        self.last_refresh = time.time()
+
+    async def run_refresh_loop(self, loader: Callable[[], Awaitable[Dict[str, Dict[str, Any]]]],
+                               interval: float = 5.0):
+        """Refresh limits off the hot path; checks keep using the previous table meanwhile."""
+        while True:
+            try:
+                limits_table = await loader()
+                if limits_table:
+                    self.apply_limits(limits_table)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.refresh_failures += 1
+                if self.logger:
+                    self.logger.error(f"Error refreshing pre-trade limits: {e}")
+            await asyncio.sleep(interval)
+
+    # ============= COUNTERS =============
+
+    def get_counters(self) -> Dict[str, Any]:
+        """Reject and latency counters."""
+        bucket_labels = [f"<={bound}ns" for bound in LATENCY_BUCKETS_NS] + [f">{LATENCY_BUCKETS_NS[-1]}ns"]
+        return {
+            "checks": self.checks,
+            "rejects": {PreTradeVerdict.NAMES[code]: count
+                        for code, count in enumerate(self.rejects) if code and count},
+            "total_rejects": sum(self.rejects),
+            "avg_latency_ns": round(self.latency_total_ns / self.checks, 1) if self.checks else 0.0,
+            "max_latency_ns": self.latency_max_ns,
+            "latency_histogram": dict(zip(bucket_labels, self.latency_buckets)),
+            "symbols": len(self.limits),
+            "last_refresh": self.last_refresh,
+            "refresh_failures": self.refresh_failures
+        }
+
+
+if __name__ == "__main__":
+    def benchmark_pre_trade(num_checks: int = 1_000_000):
+        """Measure pre-trade check latency."""
+        checker = PreTradeChecker({
+            "pre_trade_limits": {f"SYM{i}": {"reference_price": 100.0} for i in range(100)}
+        })
+        symbols = [f"SYM{i}" for i in range(100)]
+        started = time.perf_counter()
+        for i in range(num_checks):
+            checker.check(symbols[i % 100], i & 1 == 0, 1.0 + (i % 15), 99.0 + (i % 3))
+        elapsed = time.perf_counter() - started
+        print(f"🧪 {num_checks} checks in {elapsed:.3f}s ({elapsed / num_checks * 1e6:.2f}us/check)")
+        print(checker.get_counters())
+
+    benchmark_pre_trade()
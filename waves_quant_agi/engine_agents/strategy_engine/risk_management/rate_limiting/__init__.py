@@ -4,5 +4,6 @@ Rate Limiting Module
 """
 
 from .rate_limiter import RateLimiter
+from .sliding_window import SlidingWindowCounter, GCRALimiter, MultiScopeRateLimiter, RedisRateLimiter
 
-__all__ = ["RateLimiter"]
+__all__ = ["RateLimiter", "SlidingWindowCounter", "GCRALimiter", "MultiScopeRateLimiter", "RedisRateLimiter"]
@@ -9,11 +9,12 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 
 from ...configs.strategy_configs import get_strategy_config
+from .sliding_window import SlidingWindowCounter, RedisRateLimiter
 
 class RateLimiter:
     """Manage rate limiting for different strategy types."""
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], redis_client: Optional[Any] = None):
         self.config = config
         self.logger = None
         
@@ -22,8 +23,10 @@ class RateLimiter:
         self.min_signal_interval = config.get("min_signal_interval", 8.5)
         self.daily_signal_limit = config.get("daily_signal_limit", 10000)
         
-        # Tracking
-        self.signal_timestamps = []
+        # Tracking - per-minute counts use O(1) sliding windows instead of timestamp scans
+        self.minute_window = SlidingWindowCounter(self.max_signals_per_minute, 60.0)
+        self.last_signal_time = 0.0
+        self.last_cleanup_time = 0.0
         self.symbol_last_signal = {}
         self.strategy_daily_counts = {}
         self.daily_signal_count = 0
@@ -31,7 +34,13 @@ class RateLimiter:
         
         # Strategy-specific rate limiting
         self.strategy_rate_limits = {}
+        self.strategy_minute_windows: Dict[str, SlidingWindowCounter] = {}
         self._initialize_strategy_limits()
+        
+        # Optional quotas shared across processes through Redis
+        self.shared_limiter = None
+        if redis_client is not None and config.get("shared_rate_limits"):
+            self.shared_limiter = RedisRateLimiter(redis_client, config["shared_rate_limits"])
     
     def set_logger(self, logger):
         """Set logger for this rate limiter."""
@@ -51,6 +60,8 @@ class RateLimiter:
                 "daily_count": 0,
                 "last_signal_time": 0
             }
+            if config.get("max_trades_per_minute"):
+                self.strategy_minute_windows[strategy_type] = SlidingWindowCounter(config["max_trades_per_minute"], 60.0)
     
     def check_rate_limits(self, symbol: str, strategy_name: str) -> bool:
         """Check if we can generate a new signal based on rate limits."""
@@ -67,18 +78,15 @@ class RateLimiter:
                 return False
             
             # Check global per-minute limit
-            current_minute = int(current_time / 60)
-            minute_signals = [ts for ts in self.signal_timestamps if int(ts / 60) == current_minute]
-            
-            if len(minute_signals) >= self.max_signals_per_minute:
+            if not self.minute_window.would_admit(1, current_time):
                 if self.logger:
-                    self.logger.warning(f"❌ Per-minute signal limit reached: {len(minute_signals)}/{self.max_signals_per_minute}")
+                    self.logger.warning(f"❌ Per-minute signal limit reached: {self.minute_window.total}/{self.max_signals_per_minute}")
                 return False
             
             # Check global minimum interval
-            if self.signal_timestamps and (current_time - self.signal_timestamps[-1]) < self.min_signal_interval:
+            if self.last_signal_time and (current_time - self.last_signal_time) < self.min_signal_interval:
                 if self.logger:
-                    self.logger.warning(f"❌ Signal interval too short: {current_time - self.signal_timestamps[-1]:.1f}s < {self.min_signal_interval}s")
+                    self.logger.warning(f"❌ Signal interval too short: {current_time - self.last_signal_time:.1f}s < {self.min_signal_interval}s")
                 return False
             
             # Check symbol-specific rate limiting
@@ -89,6 +97,16 @@ class RateLimiter:
             if not self._check_strategy_rate_limits(strategy_name, current_time):
                 return False
             
+            # Shared quotas are only checked here; update_rate_limits charges them once the signal is accepted
+            if self.shared_limiter is not None:
+                shared_result = self.shared_limiter.check(
+                    symbol=symbol, strategy=self._extract_strategy_type(strategy_name)
+                )
+                if not shared_result["admitted"]:
+                    if self.logger:
+                        self.logger.warning(f"❌ Shared rate limit reached: {shared_result}")
+                    return False
+            
             return True
             
         except Exception as e:
@@ -125,11 +143,9 @@ class RateLimiter:
                 return False
             
             # Check per-minute limit (if applicable)
-            if limits["max_trades_per_minute"]:
-                current_minute = int(current_time / 60)
-                minute_signals = [ts for ts in self.signal_timestamps if int(ts / 60) == current_minute]
-                
-                if len(minute_signals) >= limits["max_trades_per_minute"]:
+            minute_window = self.strategy_minute_windows.get(strategy_type)
+            if minute_window is not None:
+                if not minute_window.would_admit(1, current_time):
                     if self.logger:
                         self.logger.warning(f"❌ Strategy {strategy_type} per-minute limit reached")
                     return False
@@ -170,7 +186,8 @@ class RateLimiter:
             current_time = time.time()
             
             # Update global tracking
-            self.signal_timestamps.append(current_time)
+            self.minute_window.record(1, current_time)
+            self.last_signal_time = current_time
             self.daily_signal_count += 1
             
             # Update symbol tracking
@@ -181,6 +198,10 @@ class RateLimiter:
             if strategy_type in self.strategy_rate_limits:
                 self.strategy_rate_limits[strategy_type]["daily_count"] += 1
                 self.strategy_rate_limits[strategy_type]["last_signal_time"] = current_time
+            if strategy_type in self.strategy_minute_windows:
+                self.strategy_minute_windows[strategy_type].record(1, current_time)
+            if self.shared_limiter is not None:
+                self.shared_limiter.record(symbol=symbol, strategy=strategy_type)
             
             # Clean up old timestamps (keep only last 24 hours)
             self._cleanup_old_timestamps()
@@ -211,27 +232,29 @@ class RateLimiter:
     def _cleanup_old_timestamps(self):
         """Remove timestamps older than 24 hours."""
         current_time = time.time()
+        if current_time - self.last_cleanup_time < 60:
+            return
+        self.last_cleanup_time = current_time
         cutoff_time = current_time - (24 * 60 * 60)  # 24 hours ago
         
-        # Remove old timestamps
-        self.signal_timestamps = [ts for ts in self.signal_timestamps if ts > cutoff_time]
-        
         # Remove old symbol timestamps
         old_symbols = [symbol for symbol, timestamp in self.symbol_last_signal.items() if timestamp < cutoff_time]
         for symbol in old_symbols:
             del self.symbol_last_signal[symbol]
+        
+        # Forget fallback quota keys that have fully recovered
+        if self.shared_limiter is not None:
+            self.shared_limiter.purge_idle()
     
     def get_rate_limit_status(self) -> Dict[str, Any]:
         """Get current rate limit status."""
         current_time = time.time()
-        current_minute = int(current_time / 60)
-        minute_signals = [ts for ts in self.signal_timestamps if int(ts / 60) == current_minute]
         
         return {
             "global_limits": {
                 "daily_signal_count": self.daily_signal_count,
                 "daily_signal_limit": self.daily_signal_limit,
-                "signals_this_minute": len(minute_signals),
+                "signals_this_minute": self.minute_window.count(current_time),
                 "max_signals_per_minute": self.max_signals_per_minute,
                 "min_signal_interval": self.min_signal_interval
             },
@@ -271,10 +294,9 @@ class RateLimiter:
             return f"Daily signal limit reached: {self.daily_signal_count}/{self.daily_signal_limit}"
         
         # Check global per-minute limit
-        current_minute = int(current_time / 60)
-        minute_signals = [ts for ts in self.signal_timestamps if int(ts / 60) == current_minute]
-        if len(minute_signals) >= self.max_signals_per_minute:
-            return f"Per-minute limit reached: {len(minute_signals)}/{self.max_signals_per_minute}"
+        signals_this_minute = self.minute_window.count(current_time)
+        if signals_this_minute >= self.max_signals_per_minute:
+            return f"Per-minute limit reached: {signals_this_minute}/{self.max_signals_per_minute}"
         
         # Check symbol interval
         if symbol in self.symbol_last_signal:
@@ -4,5 +4,6 @@ Signal Quality Assessment Module
 """
 
 from .signal_quality_assessor import SignalQualityAssessor
+from .signal_index import ActiveSignalIndex, SignalLSH
 
-__all__ = ["SignalQualityAssessor"]
+__all__ = ["SignalQualityAssessor", "ActiveSignalIndex", "SignalLSH"]
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Active Signal Index
+Keeps live signals indexed by symbol, direction and time bucket so duplicate
+and correlation checks cost near-constant time regardless of how many signals
+are active. Optional LSH over feature vectors finds similar signals.
+"""
+
+import time
+import itertools
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+# Numeric signal fields used for the default feature vector
+SIGNAL_FEATURES = ("confidence", "pattern_strength", "risk_reward_ratio", "volatility")
+
+
+class SignalLSH:
+    """Random-hyperplane LSH for cosine similarity between signal feature vectors."""
+
+    def __init__(self, dimensions: int, num_bands: int = 8, rows_per_band: int = 4, seed: int = 42):
+        self.dimensions = dimensions
+        self.num_bands = num_bands
+        self.rows_per_band = rows_per_band
+        rng = np.random.default_rng(seed)
+        self.hyperplanes = rng.standard_normal((num_bands * rows_per_band, dimensions))
+        self.band_weights = 1 << np.arange(rows_per_band)
+
+        self.tables: List[Dict[int, set]] = [{} for _ in range(num_bands)]
+        self.vectors: Dict[str, np.ndarray] = {}
+        self.band_keys: Dict[str, Tuple[int, ...]] = {}
+
+    def _signature(self, vector: np.ndarray) -> Tuple[int, ...]:
+        bits = (self.hyperplanes @ vector > 0).reshape(self.num_bands, self.rows_per_band)
+        return tuple(int(k) for k in bits @ self.band_weights)
+
+    @staticmethod
+    def _normalize(vector) -> np.ndarray:
+        vector = np.asarray(vector, dtype=float)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def add(self, item_id: str, vector):
+        """Index a feature vector."""
+        vector = self._normalize(vector)
+        keys = self._signature(vector)
+        for table, key in zip(self.tables, keys):
+            table.setdefault(key, set()).add(item_id)
+        self.vectors[item_id] = vector
+        self.band_keys[item_id] = keys
+
+    def remove(self, item_id: str):
+        """Drop a feature vector from the index."""
+        keys = self.band_keys.pop(item_id, None)
+        if keys is None:
+            return
+        self.vectors.pop(item_id, None)
+        for table, key in zip(self.tables, keys):
+            bucket = table.get(key)
+            if bucket is not None:
+                bucket.discard(item_id)
+                if not bucket:
+                    del table[key]
+
+    def query(self, vector, min_similarity: float = 0.9, max_results: int = 10) -> List[Tuple[str, float]]:
+        """Return indexed items whose cosine similarity exceeds the threshold."""
+        vector = self._normalize(vector)
+        candidates = set()
+        for table, key in zip(self.tables, self._signature(vector)):
+            bucket = table.get(key)
+            if bucket:
+                candidates.update(bucket)
+        if not candidates:
+            return []
+
+        candidate_ids = list(candidates)
+        similarities = np.stack([self.vectors[c] for c in candidate_ids]) @ vector
+        order = np.argsort(-similarities)
+        results = []
+        for idx in order[:max_results]:
+            if similarities[idx] < min_similarity:
+                break
+            results.append((candidate_ids[idx], float(similarities[idx])))
+        return results
+
+
+class ActiveSignalIndex:
+    """Index of active signals for O(1) duplicate and conflict lookups."""
+
+    def __init__(self, config: Dict[str, Any]):
+        self.ttl_seconds = config.get("active_signal_ttl_seconds", 300)
+        self.duplicate_bucket_seconds = config.get("duplicate_bucket_seconds", 60)
+        self.max_active_signals = config.get("max_active_signals", 10000)
+
+        # signal_id -> indexed entry
+        self.signals: Dict[str, Dict[str, Any]] = {}
+        # symbol -> (action, strategy_type) -> active count
+        self.by_symbol: Dict[str, Dict[Tuple[str, str], int]] = {}
+        # (symbol, action, strategy_type, time_bucket) -> active count
+        self.time_buckets: Dict[Tuple[str, str, str, int], int] = {}
+        # Insertion-ordered expiry queue of (expires_at, signal_id)
+        self.expiry_queue: deque = deque()
+        self._id_counter = itertools.count()
+
+        self.lsh: Optional[SignalLSH] = None
+        self.lsh_min_similarity = config.get("signal_lsh_min_similarity", 0.95)
+        if config.get("signal_lsh_enabled", False):
+            self.lsh = SignalLSH(
+                dimensions=config.get("signal_lsh_dimensions", len(SIGNAL_FEATURES) + 1),
+                num_bands=config.get("signal_lsh_bands", 8),
+                rows_per_band=config.get("signal_lsh_rows_per_band", 4)
+            )
+
+    def _bucket(self, timestamp: float) -> int:
+        return int(timestamp // self.duplicate_bucket_seconds)
+
+    def add(self, signal: Dict[str, Any], now: Optional[float] = None) -> str:
+        """Register an accepted signal and return its index id."""
+        now = time.time() if now is None else now
+        self.expire(now)
+
+        signal_id = signal.get("signal_id") or f"idx_{next(self._id_counter)}"
+        if signal_id in self.signals:
+            self.remove(signal_id)
+
+        symbol = signal.get("symbol", "")
+        action = signal.get("action", "")
+        strategy_type = signal.get("strategy_type", "")
+        bucket_key = (symbol, action, strategy_type, self._bucket(signal.get("timestamp", now)))
+
+        expires_at = now + self.ttl_seconds
+        self.signals[signal_id] = {
+            "symbol": symbol,
+            "action": action,
+            "strategy_type": strategy_type,
+            "bucket_key": bucket_key,
+            "expires_at": expires_at
+        }
+        pair_counts = self.by_symbol.setdefault(symbol, {})
+        pair_counts[(action, strategy_type)] = pair_counts.get((action, strategy_type), 0) + 1
+        self.time_buckets[bucket_key] = self.time_buckets.get(bucket_key, 0) + 1
+        self.expiry_queue.append((expires_at, signal_id))
+
+        if self.lsh is not None:
+            self.lsh.add(signal_id, signal_feature_vector(signal))
+
+        # Bound memory by evicting the oldest signals first
+        while len(self.signals) > self.max_active_signals and self.expiry_queue:
+            expires_at, oldest_id = self.expiry_queue.popleft()
+            entry = self.signals.get(oldest_id)
+            if entry is not None and entry["expires_at"] == expires_at:
+                self.remove(oldest_id)
+
+        return signal_id
+
+    def remove(self, signal_id: str) -> bool:
+        """Remove a signal (closed, cancelled or expired)."""
+        entry = self.signals.pop(signal_id, None)
+        if entry is None:
+            return False
+
+        pair = (entry["action"], entry["strategy_type"])
+        pair_counts = self.by_symbol.get(entry["symbol"])
+        if pair_counts is not None:
+            remaining = pair_counts.get(pair, 0) - 1
+            if remaining > 0:
+                pair_counts[pair] = remaining
+            else:
+                pair_counts.pop(pair, None)
+                if not pair_counts:
+                    del self.by_symbol[entry["symbol"]]
+
+        bucket_key = entry["bucket_key"]
+        remaining = self.time_buckets.get(bucket_key, 0) - 1
+        if remaining > 0:
+            self.time_buckets[bucket_key] = remaining
+        else:
+            self.time_buckets.pop(bucket_key, None)
+
+        if self.lsh is not None:
+            self.lsh.remove(signal_id)
+        return True
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Drop signals whose TTL elapsed. Amortized O(1) per signal."""
+        now = time.time() if now is None else now
+        expired = 0
+        while self.expiry_queue and self.expiry_queue[0][0] <= now:
+            expires_at, signal_id = self.expiry_queue.popleft()
+            entry = self.signals.get(signal_id)
+            # Skip stale queue entries for ids that were re-added later
+            if entry is not None and entry["expires_at"] == expires_at:
+                self.remove(signal_id)
+                expired += 1
+        return expired
+
+    def is_duplicate(self, signal: Dict[str, Any], now: Optional[float] = None) -> bool:
+        """Same symbol, direction and strategy in the current or previous time bucket."""
+        now = time.time() if now is None else now
+        bucket = self._bucket(signal.get("timestamp", now))
+        key = (signal.get("symbol", ""), signal.get("action", ""), signal.get("strategy_type", ""))
+        return (key + (bucket,)) in self.time_buckets or (key + (bucket - 1,)) in self.time_buckets
+
+    def opposing_strategies(self, symbol: str, action: str) -> Dict[str, int]:
+        """Active strategy types holding a different direction on this symbol."""
+        opposing = {}
+        for (existing_action, existing_strategy), count in self.by_symbol.get(symbol, {}).items():
+            if existing_action != action:
+                opposing[existing_strategy] = opposing.get(existing_strategy, 0) + count
+        return opposing
+
+    def similar_signals(self, signal: Dict[str, Any], max_results: int = 10) -> List[Tuple[str, float]]:
+        """Active signals with near-identical feature vectors (requires LSH)."""
+        if self.lsh is None:
+            return []
+        return self.lsh.query(signal_feature_vector(signal), self.lsh_min_similarity, max_results)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Index size counters."""
+        return {
+            "active_signals": len(self.signals),
+            "indexed_symbols": len(self.by_symbol),
+            "time_buckets": len(self.time_buckets),
+            "lsh_enabled": self.lsh is not None
+        }
+
+
+def signal_feature_vector(signal: Dict[str, Any]) -> np.ndarray:
+    """Feature vector for LSH; uses signal["features"] when the strategy supplies one."""
+    features = signal.get("features")
+    if features is not None:
+        return np.asarray(features, dtype=float)
+
+    sltp_metadata = signal.get("sltp_metadata", {})
+    direction = 1.0 if signal.get("action") == "BUY" else -1.0
+    values = [direction]
+    for field in SIGNAL_FEATURES:
+        values.append(float(signal.get(field, sltp_metadata.get(field, 0.0)) or 0.0))
+    return np.asarray(values, dtype=float)
@@ -13,6 +13,7 @@ from ...configs.strategy_configs import (
     get_session_config, 
     get_current_session
 )
+from .signal_index import ActiveSignalIndex
 
 class SignalQualityAssessor:
     """Assess signal quality and reject poor signals."""
@@ -31,6 +32,13 @@ class SignalQualityAssessor:
         self.london_session_hours = config.get("london_session_hours", [8, 16])
         self.ny_session_hours = config.get("ny_session_hours", [13, 21])
         self.asia_session_hours = config.get("asia_session_hours", [0, 8])
+        
+        # Active signals indexed for constant-time duplicate/conflict checks
+        self.signal_index = ActiveSignalIndex(config)
+        # Repeats within a duplicate bucket are only flagged unless rejection is enabled;
+        # quoting strategies re-send the same symbol/side by design
+        self.reject_duplicate_signals = config.get("reject_duplicate_signals", False)
+        self.duplicate_exempt_strategies = set(config.get("duplicate_exempt_strategies", ["market_making"]))
     
     def set_logger(self, logger):
         """Set logger for this assessor."""
@@ -40,9 +48,19 @@ class SignalQualityAssessor:
         """Set current trading statistics."""
         self.stats = stats
     
-    def assess_signal_quality(self, signal: Dict[str, Any]) -> Dict[str, Any]:
+    def _build_assessment_context(self) -> Dict[str, Any]:
+        """Clock, session and config lookups shared by every signal in a batch."""
+        return {
+            "current_hour": datetime.now().hour,
+            "current_session": get_current_session(),
+            "strategy_configs": {}
+        }
+    
+    def assess_signal_quality(self, signal: Dict[str, Any], context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Assess signal quality and reject poor signals."""
         try:
+            if context is None:
+                context = self._build_assessment_context()
             quality_score = 0
             rejection_reasons = []
             
@@ -77,7 +95,7 @@ class SignalQualityAssessor:
                     quality_score += min(risk_reward * 10, 30)  # Cap at 30 points
             
             # 3. Session Timing Check
-            current_hour = datetime.now().hour
+            current_hour = context["current_hour"]
             strategy_type = signal.get("strategy_type", "unknown")
             
             # HFT strategies work best during London/NY sessions
@@ -115,7 +133,7 @@ class SignalQualityAssessor:
                 quality_score += pattern_strength * 15
             
             # 7. Strategy-Specific Quality Check
-            strategy_quality = self._assess_strategy_specific_quality(signal)
+            strategy_quality = self._assess_strategy_specific_quality(signal, context)
             quality_score += strategy_quality["score"]
             rejection_reasons.extend(strategy_quality["reasons"])
             
@@ -152,10 +170,14 @@ class SignalQualityAssessor:
                 "session_timing": "UNKNOWN"
             }
     
-    def _assess_strategy_specific_quality(self, signal: Dict[str, Any]) -> Dict[str, Any]:
+    def _assess_strategy_specific_quality(self, signal: Dict[str, Any], context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Assess quality based on strategy-specific requirements."""
+        if context is None:
+            context = self._build_assessment_context()
         strategy_type = signal.get("strategy_type", "unknown")
-        strategy_config = get_strategy_config(strategy_type)
+        strategy_config = context["strategy_configs"].get(strategy_type)
+        if strategy_config is None:
+            strategy_config = context["strategy_configs"][strategy_type] = get_strategy_config(strategy_type)
         
         score = 0
         reasons = []
@@ -184,7 +206,7 @@ class SignalQualityAssessor:
             score += 5
         
         # Check session preference
-        current_session = get_current_session()
+        current_session = context["current_session"]
         session_preference = strategy_config.get("session_preference", [])
         
         if session_preference and current_session not in session_preference:
@@ -209,8 +231,14 @@ class SignalQualityAssessor:
             "strategy_config": strategy_config
         }
     
-    def assess_signal_correlation(self, new_signal: Dict[str, Any], existing_signals: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Assess if new signal conflicts with existing signals."""
+    def assess_signal_correlation(self, new_signal: Dict[str, Any], existing_signals: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Assess if new signal conflicts with existing signals.
+        
+        Without ``existing_signals`` the check runs against the active signal index.
+        """
+        if existing_signals is None:
+            return self._assess_indexed_correlation(new_signal)
+        
         try:
             symbol = new_signal.get("symbol", "")
             action = new_signal.get("action", "")
@@ -253,6 +281,97 @@ class SignalQualityAssessor:
                 "recommendation": "REJECT"
             }
     
+    def _assess_indexed_correlation(self, new_signal: Dict[str, Any]) -> Dict[str, Any]:
+        """Correlation and duplicate check against the active signal index."""
+        try:
+            symbol = new_signal.get("symbol", "")
+            action = new_signal.get("action", "")
+            strategy_type = new_signal.get("strategy_type", "")
+            
+            self.signal_index.expire()
+            conflicts = []
+            is_legitimate_hedging = False
+            
+            # Bounded by the number of strategy types, not the number of live signals
+            for existing_strategy, count in self.signal_index.opposing_strategies(symbol, action).items():
+                if self._is_legitimate_hedging(strategy_type, existing_strategy, action, ""):
+                    is_legitimate_hedging = True
+                else:
+                    conflicts.append({
+                        "existing_strategy": existing_strategy,
+                        "active_count": count,
+                        "conflict_type": "contradictory_action"
+                    })
+            
+            is_duplicate = self.signal_index.is_duplicate(new_signal)
+            rejects_duplicate = (is_duplicate and self.reject_duplicate_signals
+                                 and strategy_type not in self.duplicate_exempt_strategies)
+            if rejects_duplicate:
+                conflicts.append({
+                    "existing_action": action,
+                    "existing_strategy": strategy_type,
+                    "conflict_type": "duplicate_signal"
+                })
+            
+            has_contradiction = any(c["conflict_type"] == "contradictory_action" for c in conflicts)
+            has_conflicts = rejects_duplicate or (has_contradiction and not is_legitimate_hedging)
+            
+            return {
+                "has_conflicts": has_conflicts,
+                "conflicts": conflicts,
+                "is_legitimate_hedging": is_legitimate_hedging and not rejects_duplicate,
+                "is_duplicate": is_duplicate,
+                "similar_signals": self.signal_index.similar_signals(new_signal),
+                "recommendation": "REJECT" if has_conflicts else "ACCEPT"
+            }
+            
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"Error assessing indexed signal correlation: {e}")
+            return {
+                "has_conflicts": True,
+                "conflicts": [{"error": str(e)}],
+                "is_legitimate_hedging": False,
+                "recommendation": "REJECT"
+            }
+    
+    def register_active_signal(self, signal: Dict[str, Any]) -> str:
+        """Add an accepted signal to the active signal index."""
+        return self.signal_index.add(signal)
+    
+    def release_active_signal(self, signal_id: str) -> bool:
+        """Remove a closed or cancelled signal from the active signal index."""
+        return self.signal_index.remove(signal_id)
+    
+    def assess_signals_batch(self, signals: List[Dict[str, Any]], register_accepted: bool = True) -> List[Dict[str, Any]]:
+        """Assess a burst of signals from one strategy cycle.
+        
+        Session and config lookups are done once for the batch, and each accepted
+        signal is indexed before the next one is checked so intra-batch
+        duplicates and contradictions are caught too.
+        """
+        context = self._build_assessment_context()
+        self.signal_index.expire()
+        results = []
+        
+        for signal in signals:
+            quality = self.assess_signal_quality(signal, context)
+            correlation = self._assess_indexed_correlation(signal)
+            is_acceptable = quality["is_acceptable"] and not correlation["has_conflicts"]
+            
+            result = {
+                "signal": signal,
+                "is_acceptable": is_acceptable,
+                "quality": quality,
+                "correlation": correlation,
+                "signal_id": None
+            }
+            if is_acceptable and register_accepted:
+                result["signal_id"] = self.signal_index.add(signal)
+            results.append(result)
+        
+        return results
+    
     def _is_legitimate_hedging(self, new_strategy: str, existing_strategy: str, new_action: str, existing_action: str) -> bool:
         """Determine if hedging is legitimate based on strategy types."""
         
@@ -5,20 +5,52 @@ Provides SL/TP calculations for each strategy type with their unique characteris
 """
 
 import math
-from typing import Dict, Any, Optional, Tuple
+import time
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
+import numpy as np
+
 from ...configs.strategy_configs import (
     get_strategy_config, 
     get_session_config, 
     get_current_session
 )
 
+# Columns of the per-strategy coefficient table used by calculate_sltp_batch()
+SLTP_COEFFICIENTS = (
+    "sl_percentage", "tp_percentage", "session_multiplier",
+    "sl_spread_multiple", "tp_spread_multiple", "sl_atr_multiple", "tp_atr_multiple"
+)
+
+
+def _round_like_python(values: np.ndarray, digits: int) -> List[float]:
+    """Vectorized round() that returns exactly what Python's round() would.
+    
+    np.round scales by 10**digits and can land on the wrong side of a .5 tie;
+    only values within one rounding error of a tie are redone with round().
+    """
+    scale = 10.0 ** digits
+    scaled = values * scale
+    rounded = (np.rint(scaled) / scale).tolist()
+    near_tie = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) <= np.abs(scaled) * 2.0 ** -52 + 1e-12)
+    for i in near_tie.tolist():
+        rounded[i] = round(float(values[i]), digits)
+    return rounded
+
+
 class StrategySLTPCalculator:
     """Calculate SL/TP for different strategy types."""
     
-    def __init__(self):
+    def __init__(self, atr_period: int = 14):
         self.logger = None  # Will be set by parent class
+        self.atr_period = atr_period
+        
+        # Streaming indicator state per symbol (Wilder ATR, last close, spread)
+        self.symbol_state: Dict[str, Dict[str, float]] = {}
+        # (strategy_type, session) -> (coefficient row, static result fields)
+        self._profile_cache: Dict[Tuple[str, str], Tuple[Tuple[float, ...], Dict[str, Any]]] = {}
+        self.batch_stats = {"batches": 0, "signals": 0, "total_ms": 0.0}
         
     def set_logger(self, logger):
         """Set logger for this calculator."""
@@ -76,6 +108,175 @@ class StrategySLTPCalculator:
                 action, entry_price, bid, ask, volatility, strategy_config, session_config
             )
     
+    # ============= BATCH PATH =============
+    
+    def update_indicators(self, symbol: str, high: float, low: float, close: float,
+                          bid: Optional[float] = None, ask: Optional[float] = None):
+        """Fold one bar into the symbol's streaming ATR. O(1) per bar."""
+        state = self.symbol_state.get(symbol)
+        if state is None:
+            state = self.symbol_state[symbol] = {"atr": high - low, "close": close, "bars": 1, "spread": 0.0}
+        else:
+            true_range = max(high - low, abs(high - state["close"]), abs(low - state["close"]))
+            bars = min(state["bars"] + 1, self.atr_period)
+            state["atr"] += (true_range - state["atr"]) / bars
+            state["close"] = close
+            state["bars"] = bars
+        if bid is not None and ask is not None:
+            state["spread"] = ask - bid
+        state["volatility"] = state["atr"] / close if close > 0 else 0.0
+        state["updated_at"] = time.time()
+    
+    def get_volatility_snapshot(self) -> Dict[str, float]:
+        """Current ATR-as-fraction-of-price per symbol, for sharing across a strategy cycle."""
+        return {symbol: state["volatility"] for symbol, state in self.symbol_state.items()}
+    
+    def _strategy_profile(self, strategy_type: str, session: str) -> Tuple[Tuple[float, ...], Dict[str, Any]]:
+        """Coefficients and static result fields for one strategy/session, cached."""
+        key = (strategy_type, session)
+        profile = self._profile_cache.get(key)
+        if profile is not None:
+            return profile
+        
+        strategy_config = get_strategy_config(strategy_type)
+        description = get_session_config(session)["description"]
+        sl_pct = strategy_config["stop_loss_percentage"]
+        tp_pct = strategy_config["take_profit_percentage"]
+        static = {
+            "partial_exits": strategy_config["partial_exit_levels"],
+            "trailing_stop": strategy_config["trailing_stop"],
+            "strategy_config": strategy_config
+        }
+        
+        # Mirrors the per-strategy methods below as max(pct, spread, ATR) terms
+        if strategy_type == "arbitrage":
+            multiplier = 0.8 if description.startswith("High volume") else 1.0
+            coefficients = (sl_pct, tp_pct, multiplier, 0.0, 0.0, 0.0, 0.0)
+            static.update(exit_strategy="hft_arbitrage", hold_time_seconds=strategy_config["min_hold_time_seconds"])
+        elif strategy_type == "market_making":
+            coefficients = (sl_pct, tp_pct, 1.0, 2.0, 1.5, 0.0, 0.0)
+            static.update(exit_strategy="market_making", hold_time_seconds=strategy_config["min_hold_time_seconds"])
+        elif strategy_type == "htf":
+            multiplier = 1.2 if "Lower volume" in description else 1.0
+            coefficients = (sl_pct, tp_pct, multiplier, 0.0, 0.0, 0.0, 0.0)
+            static.update(exit_strategy="htf", trailing_distance=strategy_config.get("trailing_distance", 0.05),
+                          hold_time_hours=strategy_config["min_hold_time_hours"])
+        elif strategy_type == "news_driven":
+            multiplier = 0.8 if "News-driven" in description else 1.0
+            coefficients = (sl_pct, tp_pct, multiplier, 0.0, 0.0, 0.0, 0.0)
+            static.update(exit_strategy="news_driven", hold_time_minutes=strategy_config["min_hold_time_minutes"])
+        elif strategy_type == "statistical_arbitrage":
+            multiplier = 0.9 if "Lower volume" in description else 1.0
+            coefficients = (sl_pct, tp_pct, multiplier, 0.0, 0.0, 0.0, 0.0)
+            static.update(exit_strategy="statistical_arbitrage", hold_time_minutes=strategy_config["min_hold_time_minutes"])
+        else:
+            # Default to trend following
+            coefficients = (sl_pct, tp_pct, 1.0, 0.0, 0.0, 1.0, strategy_config["risk_reward_ratio"])
+            static.update(exit_strategy="trend_following", trailing_distance=strategy_config.get("trailing_distance", 0.02),
+                          hold_time_minutes=strategy_config["min_hold_time_minutes"])
+        
+        profile = (coefficients, static)
+        self._profile_cache[key] = profile
+        return profile
+    
+    def calculate_sltp_batch(
+        self,
+        signals: List[Dict[str, Any]],
+        volatility_snapshot: Optional[Dict[str, float]] = None
+    ) -> List[Dict[str, Any]]:
+        """Calculate SL/TP for a block of signals in one vectorized pass.
+        
+        Volatility per signal comes from the signal itself, then the shared
+        snapshot, then the streaming indicator state, then the 0.02 default.
+        Results match calculate_sltp() field for field.
+        """
+        if not signals:
+            return []
+        started = time.perf_counter()
+        
+        session = get_current_session()
+        volatility_multiplier = get_session_config(session).get("volatility_multiplier", 1.0)
+        snapshot = volatility_snapshot if volatility_snapshot is not None else {}
+        
+        count = len(signals)
+        
+        # Column gather: one comprehension per field, profiles and fallbacks per unique key
+        strategy_types = [signal.get("strategy_type", "trend_following") for signal in signals]
+        type_index = {strategy_type: i for i, strategy_type in enumerate(dict.fromkeys(strategy_types))}
+        profiles = [self._strategy_profile(strategy_type, session) for strategy_type in type_index]
+        coefficients = np.array([profile[0] for profile in profiles])[[type_index[t] for t in strategy_types]]
+        statics = [profiles[type_index[t]][1] for t in strategy_types]
+        
+        entry = np.array([signal.get("entry_price", 0.0) for signal in signals], dtype=float)
+        # Missing bid/ask become NaN and fall back to the entry price (zero spread)
+        bid = np.array([signal.get("bid") for signal in signals], dtype=float)
+        ask = np.array([signal.get("ask") for signal in signals], dtype=float)
+        spread = np.where(np.isnan(ask), entry, ask) - np.where(np.isnan(bid), entry, bid)
+        direction = np.where(
+            [str(signal.get("action", "BUY")).upper() == "BUY" for signal in signals], 1.0, -1.0)
+        
+        volatility = np.array([signal.get("volatility") for signal in signals], dtype=float)
+        missing = np.flatnonzero(np.isnan(volatility))
+        if missing.size:
+            symbols = [signals[i].get("symbol", "") for i in missing.tolist()]
+            fallback = {}
+            for symbol in dict.fromkeys(symbols):
+                symbol_volatility = snapshot.get(symbol)
+                if symbol_volatility is None:
+                    state = self.symbol_state.get(symbol)
+                    symbol_volatility = state["volatility"] if state is not None else 0.02
+                fallback[symbol] = symbol_volatility
+            volatility[missing] = [fallback[symbol] for symbol in symbols]
+        
+        volatility *= volatility_multiplier
+        atr_distance = entry * volatility
+        sl_distance = np.maximum.reduce([
+            entry * coefficients[:, 0] * coefficients[:, 2],
+            spread * coefficients[:, 3],
+            atr_distance * coefficients[:, 5]
+        ])
+        tp_distance = np.maximum.reduce([
+            entry * coefficients[:, 1] * coefficients[:, 2],
+            spread * coefficients[:, 4],
+            atr_distance * coefficients[:, 6]
+        ])
+        stop_loss = entry - direction * sl_distance
+        take_profit = entry + direction * tp_distance
+        risk_reward = np.divide(tp_distance, sl_distance, out=np.zeros(count), where=sl_distance > 0)
+        
+        results = [
+            {
+                "stop_loss": sl,
+                "take_profit": tp,
+                "risk_reward_ratio": rr,
+                "volatility": vol,
+                **static
+            }
+            for sl, tp, rr, vol, static in zip(
+                _round_like_python(stop_loss, 6), _round_like_python(take_profit, 6),
+                _round_like_python(risk_reward, 2), volatility.tolist(), statics
+            )
+        ]
+        
+        self.batch_stats["batches"] += 1
+        self.batch_stats["signals"] += count
+        self.batch_stats["total_ms"] += (time.perf_counter() - started) * 1000
+        return results
+    
+    def clear_cache(self):
+        """Drop cached strategy profiles (e.g. after a config reload)."""
+        self._profile_cache.clear()
+    
+    def get_batch_stats(self) -> Dict[str, Any]:
+        """Batch throughput counters."""
+        signals = self.batch_stats["signals"]
+        return {
+            **self.batch_stats,
+            "avg_us_per_signal": round(self.batch_stats["total_ms"] * 1000 / signals, 2) if signals else 0.0,
+            "tracked_symbols": len(self.symbol_state),
+            "cached_profiles": len(self._profile_cache)
+        }
+    
     def _calculate_arbitrage_sltp(
         self, 
         action: str, 
@@ -328,3 +529,46 @@ class StrategySLTPCalculator:
             "hold_time_minutes": strategy_config["min_hold_time_minutes"],
             "strategy_config": strategy_config
         }
+
+
+if __name__ == "__main__":
+    def benchmark_sltp_batch(num_signals: int = 500, rounds: int = 20):
+        """Compare per-signal and batched SL/TP for one strategy cycle."""
+        strategy_types = ["arbitrage", "market_making", "trend_following", "htf", "news_driven", "statistical_arbitrage"]
+        signals = [
+            {
+                "symbol": f"SYM{i % 50}",
+                "strategy_type": strategy_types[i % len(strategy_types)],
+                "action": "BUY" if i % 2 else "SELL",
+                "entry_price": 100.0 + i % 7,
+                "bid": 99.95 + i % 7,
+                "ask": 100.05 + i % 7
+            }
+            for i in range(num_signals)
+        ]
+        calculator = StrategySLTPCalculator()
+        
+        started = time.perf_counter()
+        for _ in range(rounds):
+            single = [
+                calculator.calculate_sltp(
+                    strategy_type=s["strategy_type"], action=s["action"], entry_price=s["entry_price"],
+                    bid=s["bid"], ask=s["ask"]
+                )
+                for s in signals
+            ]
+        single_elapsed = (time.perf_counter() - started) / rounds
+        
+        started = time.perf_counter()
+        for _ in range(rounds):
+            batch = calculator.calculate_sltp_batch(signals)
+        batch_elapsed = (time.perf_counter() - started) / rounds
+        
+        mismatches = sum(
+            1 for a, b in zip(single, batch)
+            if (a["stop_loss"], a["take_profit"], a["risk_reward_ratio"]) != (b["stop_loss"], b["take_profit"], b["risk_reward_ratio"])
+        )
+        print(f"🧪 {num_signals} signals: per-signal {single_elapsed * 1000:.2f}ms, "
+              f"batch {batch_elapsed * 1000:.2f}ms, mismatches {mismatches}")
+    
+    benchmark_sltp_batch()
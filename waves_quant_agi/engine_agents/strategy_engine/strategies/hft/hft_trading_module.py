@@ -5,21 +5,24 @@ Ultra-fast trading operations for arbitrage and market making strategies
 """
 
 import asyncio
+import itertools
 import time
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Callable, Awaitable
 from datetime import datetime
 
 from ...configs.strategy_configs import get_strategy_config
 from ...risk_management.rate_limiting.rate_limiter import RateLimiter
 from ...risk_management.signal_quality.signal_quality_assessor import SignalQualityAssessor
+from ...risk_management.pre_trade.pre_trade_checker import PreTradeChecker, PreTradeVerdict
 from ...execution.session_management.session_manager import SessionManager
 
 class HFTTradingModule:
     """High-Frequency Trading module for ultra-fast operations."""
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], redis_client: Optional[Any] = None):
         self.config = config
         self.logger = None
+        self.redis_client = redis_client
         
         # HFT Configuration
         self.max_signals_per_minute = config.get("max_signals_per_minute", 7)
@@ -27,9 +30,15 @@ class HFTTradingModule:
         self.daily_signal_limit = config.get("daily_signal_limit", 10000)
         
         # Initialize sub-modules
-        self.rate_limiter = RateLimiter(config)
+        self.rate_limiter = RateLimiter(config, redis_client)
         self.signal_quality_assessor = SignalQualityAssessor(config)
         self.session_manager = SessionManager(config)
+        self.pre_trade_checker = PreTradeChecker(config)
+        self.pre_trade_refresh_interval = config.get("pre_trade_refresh_interval", 5.0)
+        self.pre_trade_refresh_task: Optional[asyncio.Task] = None
+        
+        # Optional TickSimulator for offline runs; fills come from its book instead of a fixed delay
+        self.execution_simulator = None
         
         # HFT state tracking
         self.hft_state = {
@@ -42,6 +51,11 @@ class HFTTradingModule:
             "daily_pnl": 0.0,
             "trade_count": 0
         }
+        self._trade_sequence = itertools.count(1)
+    
+    def set_execution_simulator(self, simulator):
+        """Execute trades against a TickSimulator (offline benchmarking)."""
+        self.execution_simulator = simulator
     
     def set_logger(self, logger):
         """Set logger for this module."""
@@ -49,11 +63,103 @@ class HFTTradingModule:
         self.rate_limiter.set_logger(logger)
         self.signal_quality_assessor.set_logger(logger)
         self.session_manager.set_logger(logger)
+        self.pre_trade_checker.set_logger(logger)
+    
+    # ============= PRE-TRADE STATE =============
+    
+    def start_pre_trade_refresh(self, loader: Optional[Callable[[], Awaitable[Dict[str, Dict[str, Any]]]]] = None) -> Optional[asyncio.Task]:
+        """Refresh pre-trade limits and reference prices in the background.
+        
+        Defaults to reading ``market_data:{symbol}`` from Redis; without a Redis
+        client or loader the compiled limits stay as configured.
+        """
+        if self.pre_trade_refresh_task is not None and not self.pre_trade_refresh_task.done():
+            return self.pre_trade_refresh_task
+        loader = loader or (self._load_pre_trade_limits if self.redis_client is not None else None)
+        if loader is None:
+            return None
+        self.pre_trade_refresh_task = asyncio.create_task(
+            self.pre_trade_checker.run_refresh_loop(loader, self.pre_trade_refresh_interval),
+            name="hft_pre_trade_refresh")
+        return self.pre_trade_refresh_task
+    
+    async def stop_pre_trade_refresh(self):
+        """Stop the background limits refresh."""
+        if self.pre_trade_refresh_task is not None and not self.pre_trade_refresh_task.done():
+            self.pre_trade_refresh_task.cancel()
+            try:
+                await self.pre_trade_refresh_task
+            except asyncio.CancelledError:
+                pass
+        self.pre_trade_refresh_task = None
+    
+    async def _load_pre_trade_limits(self) -> Dict[str, Dict[str, Any]]:
+        """Reference prices for every tracked symbol from the Redis market data hashes."""
+        symbols = list(self.pre_trade_checker.limits)
+        if not symbols:
+            return {}
+        pipe = self.redis_client.pipeline()
+        for symbol in symbols:
+            pipe.hgetall(f"market_data:{symbol}")
+        rows = await asyncio.to_thread(pipe.execute)
+        limits_table = {}
+        for symbol, market_data in zip(symbols, rows):
+            price = self._reference_price(market_data)
+            if price > 0:
+                limits_table[symbol] = {"reference_price": price}
+        return limits_table
+    
+    @staticmethod
+    def _reference_price(market_data: Dict[Any, Any]) -> float:
+        """Mid price from bid/ask, falling back to the last price."""
+        if not market_data:
+            return 0.0
+        data = {k.decode() if isinstance(k, bytes) else k: v for k, v in market_data.items()}
+        try:
+            bid, ask = float(data.get("bid") or 0), float(data.get("ask") or 0)
+            if bid > 0 and ask > 0:
+                return (bid + ask) / 2
+            return float(data.get("price") or 0)
+        except (TypeError, ValueError):
+            return 0.0
+    
+    def on_market_data(self, symbol: str, market_data: Dict[str, Any]):
+        """Move the fat-finger band to the latest market price."""
+        self.pre_trade_checker.update_reference_price(symbol, self._reference_price(market_data))
+    
+    def close_hft_trade(self, trade_id: str, exit_price: Optional[float] = None,
+                        reason: str = "closed") -> Optional[Dict[str, Any]]:
+        """Close an open HFT trade and release its pre-trade position."""
+        trade = self.hft_state["active_hft_trades"].pop(trade_id, None)
+        if trade is None:
+            return None
+        self.signal_quality_assessor.release_active_signal(trade_id)
+        is_buy = trade["action"] == "BUY"
+        self.pre_trade_checker.on_fill(trade["symbol"], -trade["volume"] if is_buy else trade["volume"])
+        if exit_price is not None:
+            direction = 1.0 if is_buy else -1.0
+            trade["pnl"] = (exit_price - trade["entry_price"]) * trade["volume"] * direction
+            self.hft_state["daily_pnl"] += trade["pnl"]
+        trade["exit_price"] = exit_price
+        trade["close_reason"] = reason
+        return trade
+    
+    def _close_expired_hft_trades(self, now: float) -> int:
+        """Close trades held past their session max hold time."""
+        expired = [trade_id for trade_id, trade in self.hft_state["active_hft_trades"].items()
+                   if now - trade["opened_at"] >= trade["session_optimization"].get("max_hold_time", 300)]
+        for trade_id in expired:
+            self.close_hft_trade(trade_id, reason="max_hold_time")
+        return len(expired)
     
     async def process_hft_signal(self, signal: Dict[str, Any]) -> Dict[str, Any]:
         """Process HFT trading signal with ultra-fast execution."""
         try:
             start_time = time.time()
+            self.start_pre_trade_refresh()
+            self._close_expired_hft_trades(start_time)
+            if signal.get("market_data"):
+                self.on_market_data(signal.get("symbol", ""), signal["market_data"])
             
             # 1. Rate limiting check
             if not self._check_hft_rate_limits(signal):
@@ -64,11 +170,18 @@ class HFTTradingModule:
             if not quality_result["is_acceptable"]:
                 return {"status": "REJECTED", "reason": "Poor quality", "details": quality_result}
             
+            # 2b. Conflicts with open HFT trades (indexed, released on close)
+            correlation_result = self.signal_quality_assessor.assess_signal_correlation(signal)
+            if correlation_result["has_conflicts"] and not correlation_result["is_legitimate_hedging"]:
+                return {"status": "REJECTED", "reason": "Signal correlation conflict", "details": correlation_result}
+            
             # 3. Session optimization
             session_optimization = self._optimize_for_session(signal)
             
-            # 4. Execute HFT trade
+            # 4. Execute HFT trade (pre-trade checks run in process on the fast path)
             trade_result = await self._execute_hft_trade(signal, session_optimization)
+            if trade_result.get("status") == "REJECTED":
+                return trade_result
             
             # 5. Update rate limits
             self._update_hft_rate_limits(signal)
@@ -191,28 +304,49 @@ class HFTTradingModule:
     async def _execute_hft_trade(self, signal: Dict[str, Any], session_optimization: Dict[str, Any]) -> Dict[str, Any]:
         """Execute HFT trade with session optimization."""
         try:
-            # Simulate ultra-fast trade execution
-            await asyncio.sleep(0.001)  # 1ms execution time
-            
             # Calculate trade parameters
             trade_params = self._calculate_hft_trade_params(signal, session_optimization)
             
+            # Compiled pre-trade checks instead of the tactical-tier risk round trip
+            symbol = signal.get("symbol", "")
+            is_buy = signal.get("action", "BUY") == "BUY"
+            verdict = self.pre_trade_checker.check(symbol, is_buy, trade_params["volume"], trade_params["entry_price"])
+            if verdict != PreTradeVerdict.ACCEPT:
+                if self.logger:
+                    self.logger.warning(f"❌ HFT pre-trade reject for {symbol}: {PreTradeVerdict.NAMES[verdict]}")
+                return {"status": "REJECTED", "reason": "Pre-trade check failed", "verdict": PreTradeVerdict.NAMES[verdict]}
+            
+            if self.execution_simulator:
+                # Marketable order against the simulated book; partial fills keep the filled volume
+                fill = await self.execution_simulator.execute_order(
+                    {"symbol": symbol, "side": "buy" if is_buy else "sell", "quantity": trade_params["volume"]})
+                if fill["quantity"] <= 0:
+                    return {"status": "REJECTED", "reason": "No liquidity", "order_id": fill["order_id"]}
+                trade_params["entry_price"] = fill["price"]
+                trade_params["volume"] = fill["quantity"]
+            else:
+                # Simulate ultra-fast trade execution
+                await asyncio.sleep(0.001)  # 1ms execution time
+            
             # Execute trade (simulated)
             trade_result = {
-                "trade_id": f"HFT_{int(time.time() * 1000)}",
+                "trade_id": f"HFT_{int(time.time() * 1000)}_{next(self._trade_sequence)}",
                 "symbol": signal.get("symbol", ""),
-                "action": signal.get("action", ""),
+                "action": signal.get("action", "BUY"),
                 "entry_price": trade_params["entry_price"],
                 "stop_loss": trade_params["stop_loss"],
                 "take_profit": trade_params["take_profit"],
                 "volume": trade_params["volume"],
                 "execution_time": trade_params["execution_time"],
-                "session_optimization": session_optimization
+                "session_optimization": session_optimization,
+                "opened_at": time.time()
             }
             
-            # Update HFT state
+            # Update HFT state; close_hft_trade() applies the offsetting fill
+            self.pre_trade_checker.on_fill(symbol, trade_params["volume"] if is_buy else -trade_params["volume"])
             self.hft_state["trade_count"] += 1
             self.hft_state["active_hft_trades"][trade_result["trade_id"]] = trade_result
+            self.signal_quality_assessor.register_active_signal({**signal, "signal_id": trade_result["trade_id"]})
             
             if self.logger:
                 self.logger.info(f"✅ HFT trade executed: {trade_result['trade_id']} for {signal.get('symbol', '')}")
@@ -229,13 +363,14 @@ class HFTTradingModule:
         strategy_type = signal.get("strategy_type", "")
         strategy_config = get_strategy_config(strategy_type)
         
-        # Get current market data (simulated)
-        entry_price = 100.0  # This would come from real market data
+        # Signal price, else the latest market reference (simulated 100.0 before any market data)
+        entry_price = float(signal.get("entry_price") or
+                            self.pre_trade_checker.get_reference_price(signal.get("symbol", "")) or 100.0)
         bid = entry_price * 0.9995
         ask = entry_price * 1.0005
         
         # Calculate SL/TP based on strategy
-        from ..sltp_calculators import StrategySLTPCalculator
+        from ...risk_management.sltp_calculators import StrategySLTPCalculator
         sltp_calculator = StrategySLTPCalculator()
         
         sltp_result = sltp_calculator.calculate_sltp(
@@ -314,6 +449,7 @@ class HFTTradingModule:
             "is_active": True,
             "hft_state": self.hft_state,
             "rate_limiting": self.rate_limiter.get_rate_limit_status(),
+            "pre_trade_checks": self.pre_trade_checker.get_counters(),
             "session_info": self.session_manager.get_current_session_info()
         }
     
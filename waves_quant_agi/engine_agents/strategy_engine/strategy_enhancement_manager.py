@@ -113,7 +113,11 @@ class StrategyEnhancementManager:
                 "last_update": time.time()
             }
     
-    async def process_enhanced_signal(self, signal: Dict[str, Any]) -> Dict[str, Any]:
+    async def process_enhanced_signal(
+        self,
+        signal: Dict[str, Any],
+        precomputed_sltp: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """Process a trading signal with comprehensive strategy-specific enhancements."""
         try:
             start_time = time.time()
@@ -144,7 +148,7 @@ class StrategyEnhancementManager:
                 )
             
             # 4. SIGNAL GENERATION: Calculate strategy-specific SL/TP
-            sltp_result = await self._generate_enhanced_sltp(signal, strategy_config)
+            sltp_result = await self._generate_enhanced_sltp(signal, strategy_config, precomputed_sltp)
             if not sltp_result["success"]:
                 return self._create_rejection_response(signal_id, sltp_result["reason"])
             
@@ -204,6 +208,25 @@ class StrategyEnhancementManager:
                 "signal_id": signal.get("signal_id", "unknown")
             }
     
+    async def process_enhanced_signals(
+        self,
+        signals: List[Dict[str, Any]],
+        volatility_snapshot: Optional[Dict[str, float]] = None
+    ) -> List[Dict[str, Any]]:
+        """Process a strategy cycle's signals with SL/TP computed in one batched pass."""
+        try:
+            sltp_results = self.sltp_calculator.calculate_sltp_batch(signals, volatility_snapshot)
+        except Exception as e:
+            # Fall back to per-signal SL/TP inside process_enhanced_signal
+            sltp_results = [None] * len(signals)
+            if self.logger:
+                self.logger.error(f"❌ Error in batched SL/TP calculation: {e}")
+        
+        return [
+            await self.process_enhanced_signal(signal, sltp_data)
+            for signal, sltp_data in zip(signals, sltp_results)
+        ]
+    
     async def _check_session_appropriateness(self, strategy_type: str) -> Dict[str, Any]:
         """Check if strategy is appropriate for current session."""
         try:
@@ -241,10 +264,17 @@ class StrategyEnhancementManager:
     async def _generate_enhanced_sltp(
         self, 
         signal: Dict[str, Any], 
-        strategy_config: Dict[str, Any]
+        strategy_config: Dict[str, Any],
+        precomputed_sltp: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """Generate enhanced strategy-specific SL/TP."""
         try:
+            if precomputed_sltp is not None:
+                return {
+                    "success": True,
+                    "sltp_data": precomputed_sltp
+                }
+            
             strategy_type = signal.get("strategy_type", "trend_following")
             action = signal.get("action", "BUY")
             entry_price = signal.get("entry_price", 0.0)